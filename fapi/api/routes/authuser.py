@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Security, Response
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db import schemas
 from fapi.db.models import AuthUserORM
 from fapi.utils import authuser_utils
@@ -23,7 +24,10 @@ def check_version(
     return get_users_version(db)
 
 
-@router.get("/users", response_model=List[schemas.AuthUserResponse])
+@router.get(
+    "/users", response_model=List[schemas.AuthUserResponse],
+    dependencies=[Depends(conditional_get(get_users_version))],
+)
 def get_all_users(
     db: Session = Depends(get_db),
     credentials: HTTPAuthorizationCredentials = Security(security)
@@ -35,7 +39,7 @@ def get_all_users(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/user", response_model=schemas.PaginatedUsers)
+@router.get("/user", response_model=schemas.PaginatedUsers, dependencies=[Depends(conditional_get(get_users_version))])
 def read_users(
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(100, ge=1, le=100, description="Users per page"),
@@ -3,6 +3,7 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db.schemas import (
     AutomationContactExtractCreate,
     AutomationContactExtractUpdate,
@@ -29,7 +30,10 @@ def check_version(
     return get_automation_extracts_version(db)
 
 
-@router.get("/automation-extracts", response_model=List[AutomationContactExtractOut])
+@router.get(
+    "/automation-extracts", response_model=List[AutomationContactExtractOut],
+    dependencies=[Depends(conditional_get(get_automation_extracts_version))],
+)
 async def read_automation_extracts(
     status: Optional[str] = None,
     source_email: Optional[str] = None,
@@ -47,7 +51,7 @@ async def read_automation_extracts(
     )
 
 
-@router.get("/automation-extracts/paginated")
+@router.get("/automation-extracts/paginated", dependencies=[Depends(conditional_get(get_automation_extracts_version))])
 def read_automation_extracts_paginated(
     page: int = 1,
     page_size: int = 5000,
@@ -4,6 +4,7 @@ import logging
 from sqlalchemy.orm import Session
 from typing import List
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db.schemas import AutomationWorkflow, AutomationWorkflowCreate, AutomationWorkflowUpdate
 from fapi.utils import automation_workflow_utils
 from fapi.utils.automation_workflow_utils import (
@@ -33,7 +34,10 @@ def check_version(
 ):
     return get_automation_workflows_version(db)
 
-@router.get("/", response_model=List[AutomationWorkflow])
+@router.get(
+    "/", response_model=List[AutomationWorkflow],
+    dependencies=[Depends(conditional_get(get_automation_workflows_version))],
+)
 def get_automation_workflows(db: Session = Depends(get_db)):
     return automation_workflow_utils.get_all_workflows(db)
 
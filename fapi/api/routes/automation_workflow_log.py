@@ -4,6 +4,7 @@ import logging
 from sqlalchemy.orm import Session
 from typing import List
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db.schemas import AutomationWorkflowLog, AutomationWorkflowLogCreate, AutomationWorkflowLogUpdate
 from fapi.utils import automation_workflow_log_utils
 from fapi.utils.automation_workflow_log_utils import (
@@ -29,7 +30,10 @@ def check_version(
 ):
     return get_automation_workflow_logs_version(db)
 
-@router.get("/", response_model=List[AutomationWorkflowLog])
+@router.get(
+    "/", response_model=List[AutomationWorkflowLog],
+    dependencies=[Depends(conditional_get(get_automation_workflow_logs_version))],
+)
 def get_automation_workflow_logs(db: Session = Depends(get_db)):
     return automation_workflow_log_utils.get_all_logs(db)
 
@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from typing import List
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db.schemas import AutomationWorkflowSchedule, AutomationWorkflowScheduleCreate, AutomationWorkflowScheduleUpdate
 from fapi.utils import automation_workflow_schedule_utils
 from fapi.utils.automation_workflow_schedule_utils import get_automation_workflow_schedules_version
@@ -19,7 +20,10 @@ def check_version(
 ):
     return get_automation_workflow_schedules_version(db)
 
-@router.get("/", response_model=List[AutomationWorkflowSchedule])
+@router.get(
+    "/", response_model=List[AutomationWorkflowSchedule],
+    dependencies=[Depends(conditional_get(get_automation_workflow_schedules_version))],
+)
 def get_automation_workflow_schedules(db: Session = Depends(get_db)):
     return automation_workflow_schedule_utils.get_automation_workflow_schedules(db)
 
@@ -5,14 +5,10 @@ from fapi.db.database import get_db
 from fapi.db.schemas import DashboardMetrics, FinancialMetrics, UpcomingBatch, BatchClassSummary, EmployeeTask
 from fapi.db.models import EmployeeORM
 from fapi.utils.avatar_dashboard_utils import (
-    get_batch_metrics,
     get_financial_metrics,
-    get_placement_metrics,
-    get_interview_metrics,
+    get_dashboard_metric_groups,
     get_upcoming_batches,
     get_classes_per_latest_batches,
-    get_employee_task_metrics,
-    get_job_metrics,
     get_tasks_by_employee_id_for_dashboard,
     get_job_types_by_employee_id_for_dashboard,
     get_top_batches_revenue,
@@ -30,16 +26,13 @@ def get_financial_metrics_endpoint(db: Session = Depends(get_db)):
 
 @router.get("/metrics/all", response_model=DashboardMetrics)
 def get_all_metrics_endpoint(db: Session = Depends(get_db), current_user = Depends(enforce_access)):
+    groups, errors = get_dashboard_metric_groups()
     metrics = {
-        "batch_metrics": get_batch_metrics(db),
-        "financial_metrics": get_financial_metrics(db),
-        "placement_metrics": get_placement_metrics(db),
-        "interview_metrics": get_interview_metrics(db),
-        "employee_task_metrics": get_employee_task_metrics(db),
-        "jobs_metrics": get_job_metrics(db),
+        **groups,
         "my_tasks": None,
         "my_jobs": None,
-        "employee_name": None
+        "employee_name": None,
+        "errors": errors,
     }
     email = getattr(current_user, "uname", None)
     if email:
@@ -5,6 +5,7 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 from fapi.db import schemas
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.utils import batch_utils
 from fapi.utils.batch_utils import get_batches_version
 
@@ -14,7 +15,10 @@ router = APIRouter()
 security = HTTPBearer()
 
 
-@router.get("/batch", response_model=List[schemas.BatchOut])
+@router.get(
+    "/batch", response_model=List[schemas.BatchOut],
+    dependencies=[Depends(conditional_get(get_batches_version))],
+)
 def read_batches(
     search: Optional[str] = Query(None, description="Search by batch name"),
     db: Session = Depends(get_db),
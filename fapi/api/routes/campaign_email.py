@@ -2,8 +2,9 @@ from fastapi import Security, APIRouter, Depends, HTTPException, status, Query
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 import logging
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db.schemas import (
     CampaignEmailOut, CampaignEmailCreate, CampaignEmailUpdate
 )
@@ -26,20 +27,38 @@ def check_version(
     return campaign_email_utils.get_version(db)
 
 
-@router.get("/paginated")
+@router.get("/paginated", dependencies=[Depends(conditional_get(campaign_email_utils.get_version))])
 def get_campaign_emails_paginated(
     page: int = 1,
     limit: int = 100,
     search: str = None,
     search_by: str = "all",
     sort: str = Query("created_at:desc"),
+    cursor: Optional[str] = Query(None, description="Opaque keyset cursor; pass an empty value for the first page"),
+    include_total: bool = False,
     db: Session = Depends(get_db),
     credentials: HTTPAuthorizationCredentials = Security(security),
 ):
-    return campaign_email_utils.get_paginated(db, page, limit, search, search_by, sort)
+    return campaign_email_utils.get_paginated(
+        db, page, limit, search, search_by, sort, cursor, include_total
+    )
 
 
-@router.get("/", response_model=List[CampaignEmailOut])
+@router.get("/export")
+def export_campaign_emails(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    search: str = None,
+    search_by: str = "all",
+    db: Session = Depends(get_db),
+    credentials: HTTPAuthorizationCredentials = Security(security),
+):
+    return campaign_email_utils.export(db, export_format, search, search_by)
+
+
+@router.get(
+    "/", response_model=List[CampaignEmailOut],
+    dependencies=[Depends(conditional_get(campaign_email_utils.get_version))],
+)
 def get_all_campaign_emails(
     db: Session = Depends(get_db),
     credentials: HTTPAuthorizationCredentials = Security(security),
@@ -1,11 +1,12 @@
 import logging
 import re
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from fastapi import APIRouter, Query, Path, HTTPException, Depends, Security, Response, BackgroundTasks
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy import func, or_
 from sqlalchemy.orm import Session
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.utils import candidate_utils
 from fapi.utils.auth_dependencies import get_current_user
 from fapi.db.schemas import (
@@ -33,17 +34,24 @@ logger = logging.getLogger(__name__)
 security = HTTPBearer()
 
 
-@router.get("/candidates", response_model=PaginatedCandidateResponse)
+@router.get(
+    "/candidates", response_model=PaginatedCandidateResponse,
+    dependencies=[Depends(conditional_get(candidate_utils.get_candidates_version))],
+)
 def list_candidates(
     page: int = 1,
     limit: int = 100,
     search: str = None,
     search_by: str = "all",
     sort: str = Query("enrolled_date:desc", description="Sort by field:direction (e.g., 'enrolled_date:desc')"),
+    cursor: Optional[str] = Query(None, description="Opaque keyset cursor; pass an empty value for the first page"),
+    include_total: bool = False,
     db: Session = Depends(get_db),
     credentials: HTTPAuthorizationCredentials = Security(security),
 ):
-    return candidate_utils.get_all_candidates_paginated(db, page, limit, search, search_by, sort)
+    return candidate_utils.get_all_candidates_paginated(
+        db, page, limit, search, search_by, sort, cursor, include_total
+    )
 
 @router.head("/candidates")
 def check_version(
@@ -119,6 +127,18 @@ def list_candidate_credentials(
 def get_server_time(_current_user: AuthUserORM = Depends(get_current_user)):
     return candidate_utils.get_server_time_utc()
 
+@router.get("/candidates/export")
+def export_candidates(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    search: str = None,
+    search_by: str = "all",
+    db: Session = Depends(get_db),
+    credentials: HTTPAuthorizationCredentials = Security(security),
+):
+    """Stream all matching candidates as NDJSON or CSV."""
+    return candidate_utils.export_candidates(db, export_format, search, search_by)
+
+
 @router.get("/candidates/{candidate_id}", response_model=dict)
 def get_candidate(
     candidate_id: int,
@@ -228,7 +248,10 @@ def delete_candidate(candidate_id: int):
 
 
 
-@router.get("/candidate/marketing", summary="Get all candidate marketing records")
+@router.get(
+    "/candidate/marketing", summary="Get all candidate marketing records",
+    dependencies=[Depends(conditional_get(candidate_utils.get_marketing_version))],
+)
 def read_all_marketing(
     page: int = Query(1, ge=1),
     limit: int = Query(100, ge=1, le=1000),
@@ -272,7 +295,7 @@ def delete_marketing_record(record_id: int):
 
 
 
-@router.get("/candidate/placements")
+@router.get("/candidate/placements", dependencies=[Depends(conditional_get(candidate_utils.get_placements_version))])
 def read_all_placements(
     page: int = Query(1, ge=1),
     limit: int = Query(100, ge=1, le=1000),
@@ -396,7 +419,10 @@ def generate_meet_for_interview(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/interviews", response_model=List[CandidateInterviewOut])
+@router.get(
+    "/interviews", response_model=List[CandidateInterviewOut],
+    dependencies=[Depends(conditional_get(candidate_utils.get_interviews_version))],
+)
 def list_interviews(db: Session = Depends(get_db)):
     interviews = candidate_utils.list_interviews_with_instructors(db)
     return [candidate_utils.serialize_interview(i) for i in interviews]
@@ -456,7 +482,10 @@ def get_prep(prep_id: int, db: Session = Depends(get_db)):
 def check_prep_version(db: Session = Depends(get_db)):
     return candidate_utils.get_preparations_version(db)
 
-@router.get("/candidate_preparations", response_model=list[CandidatePreparationOut])
+@router.get(
+    "/candidate_preparations", response_model=list[CandidatePreparationOut],
+    dependencies=[Depends(conditional_get(candidate_utils.get_preparations_version))],
+)
 def list_preps(
     db: Session = Depends(get_db),
     credentials: HTTPAuthorizationCredentials = Security(security),
@@ -179,13 +179,16 @@ def list_usage_users(
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=500),
     user_id: Optional[str] = Query(None, description="Filter by user email (partial match)"),
+    cursor: Optional[str] = Query(None, description="Opaque keyset cursor; pass an empty value for the first page"),
+    include_total: bool = False,
     db: Session = Depends(get_db),
     current_user=Depends(staff_or_admin_required),
 ):
     """Per-user job application totals (one row per WBL login)."""
     _ = current_user
     return cli_analytics_utils.get_paginated_users(
-        db, page=page, page_size=page_size, user_id=user_id
+        db, page=page, page_size=page_size, user_id=user_id,
+        cursor=cursor, include_total=include_total,
     )
 
 
@@ -202,3 +205,17 @@ def list_usage_events(
     return cli_analytics_utils.get_paginated_events(
         db, page=page, page_size=page_size, user_id=user_id
     )
+
+
+@router.get("/usage_events/export")
+def export_usage_events(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    user_id: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+    current_user=Depends(staff_or_admin_required),
+):
+    """Stream CLI usage events as NDJSON or CSV (constant memory)."""
+    _ = current_user
+    return cli_analytics_utils.export_usage_events(
+        db, export_format=export_format, user_id=user_id
+    )
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, Header, HTTPException, status, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Any, Dict, List, Optional
 from fapi.db.database import get_db
@@ -10,6 +11,7 @@ from fapi.db.schemas import (
     CodeSnippetListOut,
     CodeExecutionRequest,
     CodeExecutionWithTestsResponse,
+    CodeExecutionJobOut,
     CodeExecutionLogOut,
     CoderpadTrackingLogsResponse,
     CoderpadQuestionCreate,
@@ -35,7 +37,13 @@ from fapi.db.schemas import (
 )
 from fapi.utils.auth_dependencies import get_current_user, staff_or_admin_required
 from fapi.utils import coderpad_utils
-from fapi.utils.coderpad_llm_utils import llm_validate_code_submission, llm_generate_question_from_topic
+from fapi.utils.code_execution_queue import ExecutionJob, QueueFullError, execution_queue
+from fapi.utils.coderpad_llm_utils import (
+    llm_generate_question_from_topic,
+    llm_validate_code_submission,
+    stream_llm_generate_question_from_topic,
+    stream_llm_validate_code_submission,
+)
 from fapi.utils.coderpad_openai_key import (
     CODERPAD_MISSING_OPENAI_KEY_MSG,
     candidate_has_openai_key_in_db,
@@ -54,6 +62,9 @@ from fapi.utils.coderpad_openai_key import (
     validate_llm_key_batch_for_user,
     finish_setup_for_user,
 )
+import anyio
+import asyncio
+import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -397,14 +408,158 @@ def delete_snippet(
 
 # ==================== Code Execution ====================
 
+# Seconds between event-log checks in the SSE stream (local jobs, and jobs re-read from Redis
+# because they run on another instance), and the Retry-After sent with 429s
+_JOB_EVENT_POLL_SECONDS = 0.1
+_REMOTE_JOB_POLL_SECONDS = 0.5
+_QUEUE_FULL_RETRY_AFTER = 5
+
+
+def _admit(submit, *args) -> ExecutionJob:
+    """Queue a run, turning a refused admission into 429 with the would-be queue position."""
+    try:
+        return submit(*args)
+    except QueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail={"message": str(e), "queue_position": e.queue_position},
+            headers={"Retry-After": str(_QUEUE_FULL_RETRY_AFTER)},
+        )
+
+
+def _job_out(job: ExecutionJob) -> CodeExecutionJobOut:
+    return CodeExecutionJobOut(
+        job_id=job.id,
+        status=job.status,
+        queue_position=execution_queue.position(job),
+        result=job.result,
+        error=job.error,
+    )
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _await_job(job: ExecutionJob) -> Dict[str, Any]:
+    """Wait for a queued run without holding a threadpool slot."""
+    result = await asyncio.wrap_future(job.future)
+    if result is None:
+        raise HTTPException(status_code=500, detail=job.error or "Code execution failed")
+    return result
+
+
 @router.post("/execute", response_model=CodeExecutionWithTestsResponse)
-def execute_code(
+async def execute_code(
     request: CodeExecutionRequest,
     current_user: AuthUserORM = Depends(get_current_user),
-    db: Session = Depends(get_db),
 ):
-    """Execute code directly without saving. Optional test_cases runs stdin tests (Questions)."""
-    return coderpad_utils.execute_code_direct(db, current_user.id, request)
+    """
+    Execute code directly without saving. Optional test_cases runs stdin tests (Questions).
+    Runs on the bounded execution queue; 429 when the queue or the user's run limit is full.
+    """
+    job = await anyio.to_thread.run_sync(
+        _admit, coderpad_utils.submit_code_execution, current_user.id, request
+    )
+    return await _await_job(job)
+
+
+@router.post("/execute/jobs", response_model=CodeExecutionJobOut, status_code=status.HTTP_202_ACCEPTED)
+def submit_execute_code_job(
+    request: CodeExecutionRequest,
+    current_user: AuthUserORM = Depends(get_current_user),
+):
+    """Queue a direct execution and return its job id; poll the job or stream its events."""
+    return _job_out(_admit(coderpad_utils.submit_code_execution, current_user.id, request))
+
+
+@router.get("/execute/jobs/{job_id}", response_model=CodeExecutionJobOut)
+def get_execute_job(
+    job_id: str,
+    current_user: AuthUserORM = Depends(get_current_user),
+):
+    """Status, queue position and (when done) result of a queued run."""
+    job = execution_queue.get(job_id, current_user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Execution job not found")
+    return _job_out(job)
+
+
+@router.get("/execute/jobs/{job_id}/events")
+async def stream_execute_job_events(
+    job_id: str,
+    current_user: AuthUserORM = Depends(get_current_user),
+):
+    """
+    Server-sent events for a queued run: queued (with position updates), running, output,
+    one test_result per finished test case, then result or error.
+    """
+    job = await anyio.to_thread.run_sync(execution_queue.get, job_id, current_user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Execution job not found")
+
+    async def events():
+        nonlocal job
+        sent = 0
+        last_position = None
+        while True:
+            pending = job.events[sent:]
+            for event in pending:
+                if event["event"] == "queued":
+                    last_position = event["data"]["queue_position"]
+                yield _sse(event["event"], event["data"])
+            sent += len(pending)
+            if job.finished and sent == len(job.events):
+                return
+            position = execution_queue.position(job)
+            if position is not None and position != last_position:
+                last_position = position
+                yield _sse("queued", {"queue_position": position})
+            if not job.remote:
+                await asyncio.sleep(_JOB_EVENT_POLL_SECONDS)
+                continue
+            # Running on another instance: re-read its state and any new events from Redis
+            await asyncio.sleep(_REMOTE_JOB_POLL_SECONDS)
+            job = await anyio.to_thread.run_sync(execution_queue.refresh, job)
+            if job is None:
+                yield _sse("error", {"detail": "Execution job expired"})
+                return
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _require_coderpad_llm_key(db: Session, current_user: AuthUserORM, x_openai_api_key: Optional[str]) -> str:
+    key = resolve_coderpad_openai_api_key(db, current_user, x_openai_api_key)
+    if not key:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=CODERPAD_MISSING_OPENAI_KEY_MSG,
+        )
+    return key
+
+
+def _llm_event_stream(events, error_on_failure: bool = False) -> StreamingResponse:
+    """
+    SSE response for a ``stream_llm_*`` generator. Starlette pulls each event in the
+    threadpool, so no worker is parked for the whole completion. With error_on_failure a
+    failed result is sent as an ``error`` event (mirrors the 500 of the JSON endpoint).
+    """
+    def body():
+        for event, data in events:
+            if event == "result" and error_on_failure and data.get("error"):
+                yield _sse("error", {"detail": data["error"]})
+            else:
+                yield _sse(event, data)
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.post("/llm-validate", response_model=CoderpadLlmValidateResponse)
@@ -419,13 +574,7 @@ def llm_validate_coderpad(
     Uses ``X-OpenAI-Api-Key`` when provided; otherwise the candidate's **default**
   My LLM key when OpenAI, else latest OpenAI row, then server env keys.
     """
-    key = resolve_coderpad_openai_api_key(db, current_user, x_openai_api_key)
-
-    if not key:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=CODERPAD_MISSING_OPENAI_KEY_MSG,
-        )
+    key = _require_coderpad_llm_key(db, current_user, x_openai_api_key)
     if not (body.problem_statement or "").strip():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -453,12 +602,7 @@ def llm_generate_question(
     """
     Generate a CoderPad question (title, statement, starter code, test cases) from a topic.
     """
-    key = resolve_coderpad_openai_api_key(db, current_user, x_openai_api_key)
-    if not key:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=CODERPAD_MISSING_OPENAI_KEY_MSG,
-        )
+    key = _require_coderpad_llm_key(db, current_user, x_openai_api_key)
     if not (body.topic or "").strip():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -482,6 +626,59 @@ def llm_generate_question(
     return CoderpadLlmGenerateResponse(**result)
 
 
+@router.post("/llm-validate/stream")
+def llm_validate_coderpad_stream(
+    body: CoderpadLlmValidateRequest,
+    x_openai_api_key: Optional[str] = Header(None, alias="X-OpenAI-Api-Key"),
+    current_user: AuthUserORM = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Streaming ``/llm-validate`` (``text/event-stream``): ``token`` events carry raw model
+    text, ``text`` / ``field`` events carry summary, feedback, passed and confidence as they
+    are parsed, and a final ``result`` event carries the usual CoderpadLlmValidateResponse.
+    """
+    key = _require_coderpad_llm_key(db, current_user, x_openai_api_key)
+    if not (body.problem_statement or "").strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="problem_statement is required",
+        )
+    return _llm_event_stream(stream_llm_validate_code_submission(
+        problem_statement=body.problem_statement.strip(),
+        code=body.code,
+        language=body.language or "python",
+        test_cases=body.test_cases,
+        openai_api_key=key,
+        model=(body.model or "gpt-4o-mini").strip(),
+    ))
+
+
+@router.post("/llm-generate/stream")
+def llm_generate_question_stream(
+    body: CoderpadLlmGenerateRequest,
+    x_openai_api_key: Optional[str] = Header(None, alias="X-OpenAI-Api-Key"),
+    current_user: AuthUserORM = Depends(staff_or_admin_required),
+    db: Session = Depends(get_db),
+):
+    """
+    Streaming ``/llm-generate``: same events as ``/llm-validate/stream``; the final
+    ``result`` is a CoderpadLlmGenerateResponse, or an ``error`` event when generation failed.
+    """
+    key = _require_coderpad_llm_key(db, current_user, x_openai_api_key)
+    if not (body.topic or "").strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="topic is required",
+        )
+    return _llm_event_stream(stream_llm_generate_question_from_topic(
+        topic=body.topic.strip(),
+        language=body.language or "python",
+        openai_api_key=key,
+        model=(body.model or "gpt-4o-mini").strip(),
+    ), error_on_failure=True)
+
+
 @router.post("/questions/{question_id}/update-statement-with-llm", response_model=CoderpadLlmGenerateResponse)
 def update_question_statement_with_llm(
     question_id: int,
@@ -500,12 +697,7 @@ def update_question_statement_with_llm(
     if not question_row:
         raise HTTPException(status_code=404, detail="Question not found")
 
-    key = resolve_coderpad_openai_api_key(db, current_user, x_openai_api_key)
-    if not key:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=CODERPAD_MISSING_OPENAI_KEY_MSG,
-        )
+    key = _require_coderpad_llm_key(db, current_user, x_openai_api_key)
     if not (body.topic or "").strip():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -538,22 +730,58 @@ def update_question_statement_with_llm(
     return CoderpadLlmGenerateResponse(**result)
 
 
+def _submit_snippet_job(
+    db: Session,
+    user_id: int,
+    snippet_id: int,
+    input_data: Optional[str],
+    run_tests: bool,
+    fail_fast: bool,
+) -> ExecutionJob:
+    snippet = coderpad_utils.get_snippet_by_id(db, snippet_id, user_id)
+    if not snippet:
+        raise HTTPException(
+            status_code=404,
+            detail="Code snippet not found or access denied"
+        )
+    return _admit(
+        coderpad_utils.submit_snippet_execution, user_id, snippet_id, input_data, run_tests, fail_fast
+    )
+
+
 @router.post("/snippets/{snippet_id}/execute", response_model=CodeExecutionWithTestsResponse)
-def execute_snippet(
+async def execute_snippet(
     snippet_id: int,
     input_data: Optional[str] = None,
     run_tests: Optional[bool] = True,
+    fail_fast: Optional[bool] = False,
     current_user: AuthUserORM = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """Execute a saved code snippet with optional test cases"""
-    snippet = coderpad_utils.get_snippet_by_id(db, snippet_id, current_user.id)
-    if not snippet:
-        raise HTTPException(
-            status_code=404,
-            detail="Code snippet not found or access denied"
-        )
-    return coderpad_utils.execute_snippet(db, current_user.id, snippet, input_data, run_tests)
+    """Execute a saved code snippet with optional test cases (queued; 429 when full)"""
+    job = await anyio.to_thread.run_sync(
+        _submit_snippet_job, db, current_user.id, snippet_id, input_data, run_tests, fail_fast
+    )
+    return await _await_job(job)
+
+
+@router.post(
+    "/snippets/{snippet_id}/execute/jobs",
+    response_model=CodeExecutionJobOut,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def submit_execute_snippet_job(
+    snippet_id: int,
+    input_data: Optional[str] = None,
+    run_tests: Optional[bool] = True,
+    fail_fast: Optional[bool] = False,
+    current_user: AuthUserORM = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Queue a saved snippet run and return its job id (see /execute/jobs/{job_id})"""
+    return _job_out(
+        _submit_snippet_job(db, current_user.id, snippet_id, input_data, run_tests, fail_fast)
+    )
 
 
 @router.get("/execution-logs", response_model=List[CodeExecutionLogOut])
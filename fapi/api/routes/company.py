@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db.schemas import CompanyCreate, CompanyUpdate, CompanyOut
 from fapi.utils import company_utils
 from fapi.utils.company_utils import get_companies_version
@@ -13,7 +14,7 @@ router = APIRouter(prefix="/companies", tags=["Companies"], redirect_slashes=Fal
 def check_companies_version(db: Session = Depends(get_db)):
     return get_companies_version(db)
 
-@router.get("/", response_model=List[CompanyOut])
+@router.get("/", response_model=List[CompanyOut], dependencies=[Depends(conditional_get(get_companies_version))])
 def read_companies(skip: int = 0, limit: Optional[int] = None, db: Session = Depends(get_db)):
     """
     Get companies with pagination.
@@ -30,7 +31,7 @@ def read_companies(skip: int = 0, limit: Optional[int] = None, db: Session = Dep
     """
     return company_utils.get_companies(db, skip=skip, limit=limit)
 
-@router.get("/paginated")
+@router.get("/paginated", dependencies=[Depends(conditional_get(get_companies_version))])
 def read_companies_paginated(
     page: int = 1, 
     page_size: int = 5000, 
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db.schemas import CompanyContactCreate, CompanyContactUpdate, CompanyContactOut
 from fapi.utils import company_contact_utils
 from fapi.utils.company_contact_utils import get_company_contacts_version
@@ -13,11 +14,14 @@ router = APIRouter(prefix="/company-contacts", tags=["Company Contacts"], redire
 def check_company_contacts_version(db: Session = Depends(get_db)):
     return get_company_contacts_version(db)
 
-@router.get("/", response_model=List[CompanyContactOut])
+@router.get(
+    "/", response_model=List[CompanyContactOut],
+    dependencies=[Depends(conditional_get(get_company_contacts_version))],
+)
 def read_company_contacts(skip: int = 0, limit: Optional[int] = None, db: Session = Depends(get_db)):
     return company_contact_utils.get_company_contacts(db, skip=skip, limit=limit)
 
-@router.get("/paginated")
+@router.get("/paginated", dependencies=[Depends(conditional_get(get_company_contacts_version))])
 def read_company_contacts_paginated(
     page: int = 1, 
     page_size: int = 5000, 
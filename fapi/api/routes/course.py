@@ -3,6 +3,7 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 from typing import List
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db import schemas
 from fapi.utils import course_utils
 from fapi.utils.course_utils import get_courses_version
@@ -18,7 +19,10 @@ def check_courses_version(
 ):
     return get_courses_version(db)
 
-@router.get("/courses", response_model=List[schemas.CourseResponse])
+@router.get(
+    "/courses", response_model=List[schemas.CourseResponse],
+    dependencies=[Depends(conditional_get(get_courses_version))],
+)
 def get_courses(
     db: Session = Depends(get_db),
     credentials: HTTPAuthorizationCredentials = Security(security),
@@ -3,6 +3,7 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 from typing import List
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db import schemas
 from fapi.utils import course_content_utils
 from fapi.utils.course_content_utils import get_course_contents_version
@@ -19,7 +20,10 @@ def check_version(
     return get_course_contents_version(db)
 
 
-@router.get("/course-contents", response_model=List[schemas.CourseContentResponse])
+@router.get(
+    "/course-contents", response_model=List[schemas.CourseContentResponse],
+    dependencies=[Depends(conditional_get(get_course_contents_version))],
+)
 def get_all_course_contents(
     db: Session = Depends(get_db),
     credentials: HTTPAuthorizationCredentials = Security(security),
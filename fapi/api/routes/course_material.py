@@ -3,6 +3,7 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 from typing import List
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db import schemas
 from fapi.utils import course_material_utils
 from fapi.utils.course_material_utils import get_course_materials_version
@@ -18,7 +19,10 @@ def check_version(
 ):
     return get_course_materials_version(db)
 
-@router.get("/course-materials", response_model=List[schemas.CourseMaterialResponse])
+@router.get(
+    "/course-materials", response_model=List[schemas.CourseMaterialResponse],
+    dependencies=[Depends(conditional_get(get_course_materials_version))],
+)
 def get_all_course_materials(
     db: Session = Depends(get_db),
     credentials: HTTPAuthorizationCredentials = Security(security),
@@ -3,6 +3,7 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 from typing import List
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db import schemas
 from fapi.utils import course_subject_utils
 from fapi.utils.course_subject_utils import get_course_subjects_version
@@ -18,7 +19,10 @@ def check_version(
 ):
     return get_course_subjects_version(db)
 
-@router.get("/course-subjects", response_model=List[schemas.CourseSubjectResponse])
+@router.get(
+    "/course-subjects", response_model=List[schemas.CourseSubjectResponse],
+    dependencies=[Depends(conditional_get(get_course_subjects_version))],
+)
 def get_course_subjects(
     db: Session = Depends(get_db),
     credentials: HTTPAuthorizationCredentials = Security(security),
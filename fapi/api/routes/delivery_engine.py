@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db.schemas import DeliveryEngine, DeliveryEngineCreate, DeliveryEngineUpdate
 from fapi.utils import delivery_engine_utils
 from fapi.utils.delivery_engine_utils import get_delivery_engines_version
@@ -19,7 +20,10 @@ def check_version(
 ):
     return get_delivery_engines_version(db)
 
-@router.get("/", response_model=List[DeliveryEngine])
+@router.get(
+    "/", response_model=List[DeliveryEngine],
+    dependencies=[Depends(conditional_get(get_delivery_engines_version))],
+)
 def get_delivery_engines(db: Session = Depends(get_db)):
     return delivery_engine_utils.get_delivery_engines(db)
 
@@ -3,6 +3,7 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db.schemas import (
     EmailPositionCreate, 
     EmailPositionUpdate, 
@@ -25,11 +26,14 @@ def check_version(
 ):
     return get_email_positions_version(db)
 
-@router.get("/", response_model=List[EmailPositionOut])
+@router.get(
+    "/", response_model=List[EmailPositionOut],
+    dependencies=[Depends(conditional_get(get_email_positions_version))],
+)
 def read_email_positions(skip: int = 0, limit: Optional[int] = None, db: Session = Depends(get_db)):
     return email_position_utils.get_email_positions(db, skip=skip, limit=limit)
 
-@router.get("/paginated")
+@router.get("/paginated", dependencies=[Depends(conditional_get(get_email_positions_version))])
 def read_email_positions_paginated(
     page: int = 1, 
     page_size: int = 5000, 
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db.schemas import (
     EmailSMTPCredentialsOut, 
     EmailSMTPCredentialsCreate, 
@@ -22,7 +23,10 @@ def check_version(
 ):
     return get_email_smtp_credentials_version(db)
 
-@router.get("/email-smtp-credentials", response_model=List[EmailSMTPCredentialsOut])
+@router.get(
+    "/email-smtp-credentials", response_model=List[EmailSMTPCredentialsOut],
+    dependencies=[Depends(conditional_get(get_email_smtp_credentials_version))],
+)
 def read_email_smtp_credentials(
     skip: int = 0,
     limit: int = 100,
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db.schemas import EmailTemplate, EmailTemplateCreate, EmailTemplateUpdate
 from fapi.utils import email_template_utils
 from fapi.utils.email_template_utils import get_email_templates_version
@@ -19,7 +20,10 @@ def check_version(
 ):
     return get_email_templates_version(db)
 
-@router.get("/", response_model=List[EmailTemplate])
+@router.get(
+    "/", response_model=List[EmailTemplate],
+    dependencies=[Depends(conditional_get(get_email_templates_version))],
+)
 def get_email_templates(db: Session = Depends(get_db)):
     return email_template_utils.get_email_templates(db)
 
@@ -29,6 +29,7 @@ from fapi.utils.employee_utils import (
     get_employees_version
 )
 from fapi.utils.avatar_dashboard_utils import get_employee_birthdays
+from fapi.utils.table_fingerprint import conditional_get
 
 app = FastAPI()
 router = APIRouter()
@@ -42,7 +43,10 @@ def check_version(
     return get_employees_version(db)
 
 
-@router.get("/employees", response_model=List[Employee])
+@router.get(
+    "/employees", response_model=List[Employee],
+    dependencies=[Depends(conditional_get(get_employees_version))],
+)
 def get_employees(
     credentials: HTTPAuthorizationCredentials = Security(security),
 ):
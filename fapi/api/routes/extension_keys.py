@@ -3,6 +3,7 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db.schemas import (
     ExtensionKeyCreate, 
     ExtensionKeyUpdate, 
@@ -25,11 +26,14 @@ def check_version(
 ):
     return get_extension_keys_version(db)
 
-@router.get("/", response_model=List[ExtensionKeyOut])
+@router.get(
+    "/", response_model=List[ExtensionKeyOut],
+    dependencies=[Depends(conditional_get(get_extension_keys_version))],
+)
 def read_extension_keys(skip: int = 0, limit: Optional[int] = None, db: Session = Depends(get_db)):
     return extension_keys_utils.get_extension_keys(db, skip=skip, limit=limit)
 
-@router.get("/paginated")
+@router.get("/paginated", dependencies=[Depends(conditional_get(get_extension_keys_version))])
 def read_extension_keys_paginated(
     page: int = 1, 
     page_size: int = 5000, 
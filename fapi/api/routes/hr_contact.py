@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Path, Security
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db.schemas import HRContactCreate, HRContactUpdate, HRContact
 from fapi.utils import hr_contact_utils
 
@@ -20,7 +21,10 @@ def check_version(
 ):
     return hr_contact_utils.get_hr_contacts_version(db)
 
-@router.get("/hr-contacts", response_model=List[HRContact])
+@router.get(
+    "/hr-contacts", response_model=List[HRContact],
+    dependencies=[Depends(conditional_get(hr_contact_utils.get_hr_contacts_version))],
+)
 def read_hr_contacts(
     db: Session = Depends(get_db),
     credentials: HTTPAuthorizationCredentials = Security(security)
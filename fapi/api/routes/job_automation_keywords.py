@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from typing import Optional
 from fapi.db import schemas
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.utils import job_automation_keyword_utils
 from fapi.utils.job_automation_keyword_utils import get_keywords_version
 
@@ -19,7 +20,10 @@ def check_version(
 ):
     return get_keywords_version(db)
 
-@router.get("/job-automation-keywords", response_model=schemas.PaginatedJobAutomationKeywords)
+@router.get(
+    "/job-automation-keywords", response_model=schemas.PaginatedJobAutomationKeywords,
+    dependencies=[Depends(conditional_get(get_keywords_version))],
+)
 def get_keywords(
     category: Optional[str] = None,
     source: Optional[str] = None,
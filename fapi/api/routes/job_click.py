@@ -1,17 +1,19 @@
 from fapi.utils.permission_gate import enforce_access
 from fapi.utils.auth_dependencies import staff_or_admin_required
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 import logging
 
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db.schemas import JobLinkClickBatchIn, JobLinkClickAnalytics, TodayJobClickSummary
 from fapi.utils.job_click_utils import (
     bulk_upsert_job_clicks,
     get_job_click_analytics,
     get_my_job_click_analytics,
     get_paginated_job_click_analytics,
+    export_job_click_analytics,
     get_job_clicks_version,
     delete_job_click,
     track_clicks_with_cache_invalidation,
@@ -46,6 +48,8 @@ def track_clicks_batch_endpoint(
 def get_job_click_paginated_endpoint(
     page: int = 1,
     page_size: int = 5000,
+    cursor: Optional[str] = Query(None, description="Opaque keyset cursor; pass an empty value for the first page"),
+    include_total: bool = False,
     db: Session = Depends(get_db),
     user: any = Depends(enforce_access),
     _staff: any = Depends(staff_or_admin_required),
@@ -53,7 +57,22 @@ def get_job_click_paginated_endpoint(
     """
     **Get paginated comprehensive click analytics from MySQL**
     """
-    return get_paginated_job_click_analytics(db, page=page, page_size=page_size)
+    return get_paginated_job_click_analytics(
+        db, page=page, page_size=page_size, cursor=cursor, include_total=include_total
+    )
+
+
+@router.get("/click-analytics/export")
+def export_job_click_analytics_endpoint(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    db: Session = Depends(get_db),
+    user: any = Depends(enforce_access),
+    _staff: any = Depends(staff_or_admin_required),
+):
+    """
+    **Stream the full click analytics join as NDJSON or CSV**
+    """
+    return export_job_click_analytics(db, export_format)
 
 
 @router.get("/click-analytics/me")
@@ -67,7 +86,10 @@ def get_my_job_click_analytics_endpoint(
     return get_my_job_click_analytics(db, authuser_id=user.id)
 
 
-@router.get("/click-analytics", response_model=List[JobLinkClickAnalytics])
+@router.get(
+    "/click-analytics", response_model=List[JobLinkClickAnalytics],
+    dependencies=[Depends(conditional_get(get_job_clicks_version))],
+)
 def get_job_click_analytics_endpoint(
     db: Session = Depends(get_db),
     user: any = Depends(enforce_access),
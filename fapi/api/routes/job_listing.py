@@ -3,6 +3,7 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db.models import AuthUserORM
 from fapi.db.schemas import (
     JobListingCreate, 
@@ -29,11 +30,14 @@ def check_version(
 ):
     return get_positions_version(db)
 
-@router.get("/", response_model=List[JobListingOut])
+@router.get("/", response_model=List[JobListingOut], dependencies=[Depends(conditional_get(get_positions_version))])
 def read_positions(skip: int = 0, limit: Optional[int] = None, db: Session = Depends(get_db)):
     return job_listing_utils.get_positions(db, skip=skip, limit=limit)
 
-@router.get("/paginated", response_model=PaginatedJobListingResponse)
+@router.get(
+    "/paginated", response_model=PaginatedJobListingResponse,
+    dependencies=[Depends(conditional_get(get_positions_version))],
+)
 def read_positions_paginated(
     page: int = 1,
     page_size: int = 100,
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Path, Query, Security, Re
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.utils.user_dashboard_utils import get_current_user
 from fapi.db.schemas import (
     JobActivityLogCreate,
@@ -24,7 +25,10 @@ router = APIRouter()
 security = HTTPBearer()
 
 
-@router.get("/job_activity_logs", response_model=List[JobActivityLogOut])
+@router.get(
+    "/job_activity_logs", response_model=List[JobActivityLogOut],
+    dependencies=[Depends(conditional_get(jobs_utils.get_job_activity_logs_version))],
+)
 def get_all_job_activity_logs(
     db: Session = Depends(get_db),
     credentials: HTTPAuthorizationCredentials = Security(security)
@@ -111,7 +115,10 @@ def delete_job_activity_log(
     return jobs_utils.delete_job_activity_log(db, log_id)
 
 
-@router.get("/job-types", response_model=List[JobTypeOut])
+@router.get(
+    "/job-types", response_model=List[JobTypeOut],
+    dependencies=[Depends(conditional_get(jobs_utils.get_job_types_version))],
+)
 def get_all_job_types(
     db: Session = Depends(get_db),
     credentials: HTTPAuthorizationCredentials = Security(security)
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Query, Depends, HTTPException, Security, Response
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db.schemas import LeadCreate, LeadUpdate, LeadMetricsResponse
 from fapi.utils.lead_utils import (
     fetch_all_leads_paginated,
@@ -32,7 +33,7 @@ def get_leads_paginated(
 ):
     return fetch_all_leads_paginated(db, page, limit, search, search_by, sort)
 
-@router.get("/leads")
+@router.get("/leads", dependencies=[Depends(conditional_get(get_leads_version))])
 def get_all_leads(
     search: str = None,
     search_by: str = "name",
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db.schemas import LinkedinOnlyContactCreate, LinkedinOnlyContactUpdate, LinkedinOnlyContactOut, PaginatedLinkedinOnlyContactResponse
 from fapi.utils import linkedin_only_contact_utils
 from fapi.utils.linkedin_only_contact_utils import get_linkedin_only_contacts_version
@@ -13,11 +14,17 @@ router = APIRouter(prefix="/linkedin-only-contacts", tags=["Linkedin Only Contac
 def check_linkedin_contacts_version(db: Session = Depends(get_db)):
     return get_linkedin_only_contacts_version(db)
 
-@router.get("/", response_model=List[LinkedinOnlyContactOut])
+@router.get(
+    "/", response_model=List[LinkedinOnlyContactOut],
+    dependencies=[Depends(conditional_get(get_linkedin_only_contacts_version))],
+)
 def read_linkedin_only_contacts(skip: int = 0, limit: Optional[int] = None, db: Session = Depends(get_db)):
     return linkedin_only_contact_utils.get_linkedin_only_contacts(db, skip=skip, limit=limit)
 
-@router.get("/paginated", response_model=PaginatedLinkedinOnlyContactResponse)
+@router.get(
+    "/paginated", response_model=PaginatedLinkedinOnlyContactResponse,
+    dependencies=[Depends(conditional_get(get_linkedin_only_contacts_version))],
+)
 def read_linkedin_only_contacts_paginated(
     page: int = 1, 
     page_size: int = 5000, 
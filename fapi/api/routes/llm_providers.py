@@ -6,6 +6,7 @@ from pydantic import BaseModel, Field
 from fapi.utils.auth_dependencies import get_current_user
 from fapi.db.models import AuthUserORM
 from fapi.utils.llm_provider_registry import provider_registry
+from fapi.utils.llm_model_catalog import model_catalog
 
 router = APIRouter(prefix="/llm", tags=["LLM Providers"])
 
@@ -28,6 +29,8 @@ class ProviderMetadataOut(BaseModel):
     id: str
     label: str
     key_prefixes: List[str] = []
+    models: List[str] = []
+    default_model: Optional[str] = None
 
 
 @router.get("/providers", response_model=List[ProviderMetadataOut])
@@ -58,17 +61,18 @@ def get_provider_models(
     provider_id: str,
     current_user: AuthUserORM = Depends(get_current_user),
 ):
-    """Get static/fallback models for a registered provider by ID."""
+    """Models for a registered provider: the shared catalog when warm, else the static fallback list."""
     provider = provider_registry.get_provider_by_id(provider_id)
     if not provider:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Provider '{provider_id}' not found in registry",
         )
-    fallback_models = getattr(provider, "fallback_models", ["default"])
+    entry = model_catalog.latest(provider.provider_id)
+    models = list(entry.models) if entry else getattr(provider, "fallback_models", ["default"])
     return {
         "provider_id": provider.provider_id,
         "display_name": provider.display_name,
         "key_prefixes": provider.key_prefixes,
-        "models": fallback_models,
+        "models": models,
     }
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db.schemas import OutreachEmailCreate, OutreachEmailUpdate, OutreachEmailOut
 from fapi.utils import outreach_email_utils as utils
 
@@ -12,11 +13,14 @@ router = APIRouter(prefix="/outreach-emails", tags=["Outreach Emails"], redirect
 def check_emails_version(db: Session = Depends(get_db)):
     return utils.get_emails_version(db)
 
-@router.get("/", response_model=List[OutreachEmailOut])
+@router.get(
+    "/", response_model=List[OutreachEmailOut],
+    dependencies=[Depends(conditional_get(utils.get_emails_version))],
+)
 def read_emails(skip: int = 0, limit: Optional[int] = None, db: Session = Depends(get_db)):
     return utils.get_emails(db, skip=skip, limit=limit)
 
-@router.get("/paginated")
+@router.get("/paginated", dependencies=[Depends(conditional_get(utils.get_emails_version))])
 def read_emails_paginated(
     page: int = 1,
     page_size: int = 50,
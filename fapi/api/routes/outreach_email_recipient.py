@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db.schemas import OutreachEmailRecipientCreate, OutreachEmailRecipientUpdate, OutreachEmailRecipientOut
 from fapi.utils import outreach_email_recipient_utils as utils
 from fapi.utils.outreach_email_recipient_utils import get_recipients_version
@@ -13,11 +14,14 @@ router = APIRouter(prefix="/outreach-email-recipients", tags=["Outreach Email Re
 def check_recipients_version(db: Session = Depends(get_db)):
     return get_recipients_version(db)
 
-@router.get("/", response_model=List[OutreachEmailRecipientOut])
+@router.get(
+    "/", response_model=List[OutreachEmailRecipientOut],
+    dependencies=[Depends(conditional_get(get_recipients_version))],
+)
 def read_recipients(skip: int = 0, limit: Optional[int] = None, db: Session = Depends(get_db)):
     return utils.get_recipients(db, skip=skip, limit=limit)
 
-@router.get("/paginated")
+@router.get("/paginated", dependencies=[Depends(conditional_get(get_recipients_version))])
 def read_recipients_paginated(
     page: int = 1,
     page_size: int = 5000,
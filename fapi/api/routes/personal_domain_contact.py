@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db.schemas import PersonalDomainContactCreate, PersonalDomainContactUpdate, PersonalDomainContactOut
 from fapi.utils import personal_domain_contact_utils as utils
 from fapi.utils.personal_domain_contact_utils import get_personal_domain_contacts_version
@@ -13,11 +14,14 @@ router = APIRouter(prefix="/personal-domain-contacts", tags=["Personal Domain Co
 def check_personal_contacts_version(db: Session = Depends(get_db)):
     return get_personal_domain_contacts_version(db)
 
-@router.get("/", response_model=List[PersonalDomainContactOut])
+@router.get(
+    "/", response_model=List[PersonalDomainContactOut],
+    dependencies=[Depends(conditional_get(get_personal_domain_contacts_version))],
+)
 def read_contacts(skip: int = 0, limit: Optional[int] = None, db: Session = Depends(get_db)):
     return utils.get_personal_domain_contacts(db, skip=skip, limit=limit)
 
-@router.get("/paginated")
+@router.get("/paginated", dependencies=[Depends(conditional_get(get_personal_domain_contacts_version))])
 def read_contacts_paginated(
     page: int = 1,
     page_size: int = 5000,
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.utils.table_fingerprint import generate_version_for_model
 
 from fapi.db.schemas import (
@@ -34,7 +35,10 @@ router = APIRouter()
 # placement_commission endpoints
 # ---------------------------------------------------------------------------
 
-@router.get("/placement-commission", response_model=List[PlacementCommissionOut])
+@router.get(
+    "/placement-commission", response_model=List[PlacementCommissionOut],
+    dependencies=[Depends(conditional_get(get_placement_commissions_version))],
+)
 def list_commissions(db: Session = Depends(get_db)):
     """List all placement commissions enriched with employee/candidate/company names."""
     return utils.list_commissions(db)
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db.schemas import PlacementFeeCreate, PlacementFeeUpdate, PlacementFeeOut
 from fapi.utils import placement_fee_collection_utils as utils
 from fapi.utils.placement_fee_collection_utils import get_placement_fees_version
@@ -13,7 +14,10 @@ def check_placement_fees_version(db: Session = Depends(get_db)):
     return get_placement_fees_version(db)
 
 
-@router.get("/placement-fee", response_model=list[PlacementFeeOut])
+@router.get(
+    "/placement-fee", response_model=list[PlacementFeeOut],
+    dependencies=[Depends(conditional_get(get_placement_fees_version))],
+)
 def list_placement_fees(db: Session = Depends(get_db)):
     return utils.list_placement_fees(db)
 
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Query, Depends, HTTPException, Security, Response
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db.schemas import PotentialLeadCreate, PotentialLeadUpdate, PotentialLeadSchema
 from fapi.utils.potential_lead_utils import (
     fetch_all_potential_leads,
@@ -22,7 +23,7 @@ def check_version(
 ):
     return get_potential_leads_version(db)
 
-@router.get("/potential-leads")
+@router.get("/potential-leads", dependencies=[Depends(conditional_get(get_potential_leads_version))])
 def get_potential_leads(
     search: str = None,
     search_by: str = "all",
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db import schemas
 from fapi.utils import projects_utils
 from fapi.utils.projects_utils import get_projects_version
@@ -23,7 +24,10 @@ def create_project(project: schemas.ProjectCreate, db: Session = Depends(get_db)
         print(f"Project data received: {project.dict()}")
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/", response_model=List[schemas.ProjectOut])
+@router.get(
+    "/", response_model=List[schemas.ProjectOut],
+    dependencies=[Depends(conditional_get(get_projects_version))],
+)
 def list_projects(
     status: Optional[str] = None,
     priority: Optional[str] = None,
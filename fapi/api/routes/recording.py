@@ -5,12 +5,16 @@ from typing import Optional, List
 from fapi.db import schemas, database
 from fapi.utils import recording_utils
 from fapi.utils.recording_utils import get_recordings_version
+from fapi.utils.table_fingerprint import conditional_get
 
 router = APIRouter()
 
 security = HTTPBearer()
 
-@router.get("/recordings", response_model=List[schemas.RecordingOut])
+@router.get(
+    "/recordings", response_model=List[schemas.RecordingOut],
+    dependencies=[Depends(conditional_get(get_recordings_version))],
+)
 def get_recordings(
     search: Optional[str] = Query(None, description="Search by ID, batch name, subject, or description"),
     db: Session = Depends(database.get_db),
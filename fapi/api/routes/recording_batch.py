@@ -3,6 +3,7 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 from typing import List
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db import schemas
 from fapi.utils import recording_batch_utils
 from fapi.utils.recording_batch_utils import get_recording_batches_version
@@ -17,7 +18,10 @@ def check_version(
 ):
     return get_recording_batches_version(db)
 
-@router.get("/recording-batches", response_model=List[schemas.RecordingBatch])
+@router.get(
+    "/recording-batches", response_model=List[schemas.RecordingBatch],
+    dependencies=[Depends(conditional_get(get_recording_batches_version))],
+)
 def get_recording_batches(
     db: Session = Depends(get_db),
     credentials: HTTPAuthorizationCredentials = Security(security),
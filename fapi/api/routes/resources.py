@@ -33,7 +33,7 @@ from fapi.utils.resources_utils import (
     fetch_keyword_presentation,
 )
 from fapi.utils.avatar_dashboard_utils import get_batch_metrics
-from fapi.utils.table_fingerprint import generate_version_for_model
+from fapi.utils.table_fingerprint import generate_version_for_model, conditional_get
 
 router = APIRouter()
 security = HTTPBearer()
@@ -57,7 +57,10 @@ def extract_role_and_team_from_token(token: str):
 def check_course_content_version(db: Session = Depends(get_db)):
     return generate_version_for_model(db, CourseContentORM)
 
-@router.get("/course-content", response_model=List[CourseContentResponse])
+@router.get(
+    "/course-content", response_model=List[CourseContentResponse],
+    dependencies=[Depends(conditional_get(lambda db: generate_version_for_model(db, CourseContentORM)))],
+)
 async def get_course_content(
     credentials: HTTPAuthorizationCredentials = Security(security),
     db: Session = Depends(get_db),
@@ -207,7 +210,7 @@ async def get_github_classroom_repos(
 def check_batches_version(db: Session = Depends(get_db)):
     return generate_version_for_model(db, BatchORM)
 
-@router.get("/batches")
+@router.get("/batches", dependencies=[Depends(conditional_get(lambda db: generate_version_for_model(db, BatchORM)))])
 def get_batches(
     course: str = Query(..., description="Course alias (e.g., ML, UI, DS)"),
     db: Session = Depends(get_db)
@@ -224,7 +227,10 @@ def get_batch_metrics_endpoint(db: Session = Depends(get_db)):
 def check_recording_version(db: Session = Depends(get_db)):
     return generate_version_for_model(db, RecordingORM)
 
-@router.get("/recording")
+@router.get(
+    "/recording",
+    dependencies=[Depends(conditional_get(lambda db: generate_version_for_model(db, RecordingORM)))],
+)
 def get_recordings(
     course: str,
     batchid: int,
@@ -52,7 +52,7 @@ from fapi.db.database import get_db
 from fapi.db import schemas, models
 from fapi.utils import subject_utils
 import hashlib
-from fapi.utils.table_fingerprint import generate_version_for_model
+from fapi.utils.table_fingerprint import generate_version_for_model, conditional_get
 router = APIRouter()
 
 # Use HTTPBearer for Swagger authentication
@@ -65,7 +65,10 @@ def check_subjects_version(
 ):
     return subject_utils.get_subjects_version(db)
 
-@router.get("/subjects", response_model=List[schemas.SubjectResponse])
+@router.get(
+    "/subjects", response_model=List[schemas.SubjectResponse],
+    dependencies=[Depends(conditional_get(subject_utils.get_subjects_version))],
+)
 def get_subjects(
     db: Session = Depends(get_db),
     credentials: HTTPAuthorizationCredentials = Security(security),
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Path, Security, Response
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db.schemas import VendorCreate, VendorUpdate, Vendor
 from fapi.utils import vendor_utils
 from fapi.utils.vendor_utils import get_vendors_version
@@ -16,7 +17,7 @@ security = HTTPBearer()
 
 
 # ---------- CRUD: Vendor ----------
-@router.get("/vendors", response_model=List[Vendor])
+@router.get("/vendors", response_model=List[Vendor], dependencies=[Depends(conditional_get(get_vendors_version))])
 def read_vendors(
     db: Session = Depends(get_db),
     credentials: HTTPAuthorizationCredentials = Security(security)
@@ -4,6 +4,7 @@ from fastapi import APIRouter, HTTPException, Depends, Query, Security, Response
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 from fapi.db.database import get_db
+from fapi.utils.table_fingerprint import conditional_get
 from fapi.db.schemas import (
     VendorContactExtract,
     VendorContactExtractCreate,
@@ -39,7 +40,10 @@ def check_vendor_contacts_version(
 ):
     return get_vendor_contacts_version(db)
 
-@router.get("/vendor_contact_extracts", response_model=List[VendorContactExtract])
+@router.get(
+    "/vendor_contact_extracts", response_model=List[VendorContactExtract],
+    dependencies=[Depends(conditional_get(get_vendor_contacts_version))],
+)
 async def read_vendor_contact_extracts(db: Session = Depends(get_db)):
     try:
         return await get_all_vendor_contacts(db)
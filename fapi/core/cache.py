@@ -1,40 +1,45 @@
 import json
 import hashlib
 import functools
-from typing import Any, Callable, Optional
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional, Tuple
 from fastapi import Request
 from fapi.core.redis_client import redis_client
+from fapi.core.local_cache import local_cache, NEGATIVE
+from fapi.core import cache_codec
+from fapi.core.cache_codec import alchemy_encoder  # noqa: F401  re-exported for existing imports
 from fapi.core import config
 import logging
 
-from datetime import datetime, date
-from decimal import Decimal
-
 logger = logging.getLogger(__name__)
 
-def alchemy_encoder(obj: Any) -> Any:
-    """Helper to serialize SQLAlchemy objects and other types."""
-    if isinstance(obj, (datetime, date)):
-        return obj.isoformat()
-    if isinstance(obj, Decimal):
-        return float(obj)
-    if isinstance(obj, set):
-        return list(obj)
-    if hasattr(obj, "__dict__"):
-        # For SQLAlchemy ORM objects
-        data = dict(obj.__dict__)
-        data.pop("_sa_instance_state", None)
-        
-        for attr_name in dir(obj.__class__):
-            attr = getattr(obj.__class__, attr_name)
-            if isinstance(attr, property):
-                try:
-                    data[attr_name] = getattr(obj, attr_name)
-                except Exception:
-                    pass
-        return data
-    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+# Marks entries written with a stale-while-revalidate window: "swr:<fresh_until>:<json>"
+SWR_MARKER = "swr:"
+
+# Lua compare-and-delete so a worker only releases the recompute lock it owns
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+_refresh_executor = ThreadPoolExecutor(
+    max_workers=config.CACHE_REFRESH_WORKERS, thread_name_prefix="cache-refresh"
+)
+
+# Data version the current request is tagged with (its ETag); cache_result keys include it so a
+# body cached from an older version of the table is never served under the new version's ETag
+_request_data_version: ContextVar[Optional[str]] = ContextVar("request_data_version", default=None)
+
 
+def bind_data_version(version: Optional[str]) -> None:
+    """Key this request's cache_result lookups by the data version it answers for."""
+    _request_data_version.set(version)
 
 def generate_cache_key(prefix: str, path: str, params: dict) -> str:
     """Generate a unique cache key with environment isolation."""
@@ -45,13 +50,262 @@ def generate_cache_key(prefix: str, path: str, params: dict) -> str:
     # Use APP_ENV to isolate local dev from production
     return f"{config.APP_ENV}:cache:{prefix}:{path}:{params_hash}"
 
-def cache_result(ttl: int = config.REDIS_TTL_DEFAULT, prefix: str = "general"):
+
+def _read_through(client, prefix: str, cache_key: str) -> Any:
+    """
+    Look a key up in the local tier first, then Redis.
+    Returns the raw JSON string, NEGATIVE for a cached None result, or None on a miss.
+    Redis hits are promoted into the local tier.
+    """
+    cached_data = local_cache.get(prefix, cache_key)
+    if cached_data is not None:
+        return cached_data
+
+    try:
+        cached_data = client.get(cache_key)
+    except Exception as e:
+        local_cache.record("l2", "errors")
+        logger.error(f"Error fetching from Redis: {e}")
+        return None
+
+    if not cached_data:
+        local_cache.record("l2", "misses")
+        return None
+
+    local_cache.record("l2", "hits")
+    if isinstance(cached_data, (bytes, bytearray)):
+        cached_data = cached_data.decode()
+    local_cache.set(prefix, cache_key, cached_data, config.CACHE_L1_TTL)
+    return cached_data
+
+
+def _write_through(client, prefix: str, cache_key: str, value: Any, ttl: int, stale_ttl: int = 0) -> bool:
+    """
+    Store a result in both tiers. None results are only negatively cached locally.
+    With stale_ttl the entry outlives its TTL by that many seconds, marked with
+    the time it went stale so readers can serve it while it is refreshed.
+    """
+    if value is None:
+        local_cache.set_negative(prefix, cache_key)
+        return False
+    payload = cache_codec.encode(value)
+    if stale_ttl:
+        payload = f"{SWR_MARKER}{int(time.time()) + ttl}:{payload}"
+    local_cache.set(prefix, cache_key, payload, ttl + stale_ttl)
+    # Register the key under its prefix tag in the same round-trip as the write
+    tag_key = _tag_key(prefix)
+    pipe = client.pipeline()
+    pipe.set(cache_key, payload, ex=ttl + stale_ttl)
+    pipe.sadd(tag_key, cache_key)
+    pipe.expire(tag_key, max(ttl + stale_ttl, config.CACHE_TAG_TTL))
+    pipe.exec()
+    return True
+
+
+def _decode(cached_data: str) -> Tuple[Any, bool]:
+    """
+    Decode a cached payload, returning (value, is_stale).
+    Raises cache_codec.CodecError for entries this worker cannot read.
+    """
+    if cached_data.startswith(SWR_MARKER):
+        fresh_until, _, cached_data = cached_data[len(SWR_MARKER):].partition(":")
+        return cache_codec.decode(cached_data), int(fresh_until) <= time.time()
+    return cache_codec.decode(cached_data), False
+
+
+def _try_decode(cached_data: str) -> Optional[Tuple[Any, bool]]:
+    """_decode, treating unreadable entries (e.g. written by a newer format) as misses."""
+    try:
+        return _decode(cached_data)
+    except (cache_codec.CodecError, ValueError) as e:
+        logger.warning(f"Ignoring undecodable cache entry: {e}")
+        return None
+
+
+async def _read_through_async(batcher, prefix: str, cache_key: str) -> Any:
+    """Async counterpart of _read_through; Redis GETs are coalesced into MGETs by the batcher."""
+    cached_data = local_cache.get(prefix, cache_key)
+    if cached_data is not None:
+        return cached_data
+
+    try:
+        cached_data = await batcher.get(cache_key)
+    except Exception as e:
+        local_cache.record("l2", "errors")
+        logger.error(f"Error fetching from Redis: {e}")
+        return None
+
+    if not cached_data:
+        local_cache.record("l2", "misses")
+        return None
+
+    local_cache.record("l2", "hits")
+    if isinstance(cached_data, (bytes, bytearray)):
+        cached_data = cached_data.decode()
+    local_cache.set(prefix, cache_key, cached_data, config.CACHE_L1_TTL)
+    return cached_data
+
+
+async def _write_through_async(batcher, prefix: str, cache_key: str, value: Any, ttl: int) -> bool:
+    """Async counterpart of _write_through; the SET shares a pipeline with other in-flight writes."""
+    if value is None:
+        local_cache.set_negative(prefix, cache_key)
+        return False
+    payload = cache_codec.encode(value)
+    local_cache.set(prefix, cache_key, payload, ttl)
+    tag_key = _tag_key(prefix)
+    await batcher.execute([
+        ("set", (cache_key, payload), {"ex": ttl}),
+        ("sadd", (tag_key, cache_key), {}),
+        ("expire", (tag_key, max(ttl, config.CACHE_TAG_TTL)), {}),
+    ])
+    return True
+
+
+def _tag_key(prefix: str) -> str:
+    """Redis set holding every live cache key written under a prefix."""
+    return f"{config.APP_ENV}:cachetag:{prefix}"
+
+
+def get_cache_stats() -> dict:
+    """Hit/miss counters for the local (l1) and Redis (l2) tiers of this worker."""
+    return local_cache.stats()
+
+class _Flight:
+    """An in-progress recompute that concurrent callers for the same key wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+_flights: Dict[str, _Flight] = {}
+_flights_lock = threading.Lock()
+
+
+def _is_skipped_arg(value: Any) -> bool:
+    """db sessions and requests never take part in cache keys."""
+    class_name = value.__class__.__name__
+    return "Session" in class_name or "Request" in class_name
+
+
+def _build_key_params(args: tuple, kwargs: dict) -> dict:
+    """Build a list of relevant arguments for the cache key."""
+    key_params = {}
+    for i, arg in enumerate(args):
+        if _is_skipped_arg(arg):
+            continue
+        key_params[f"arg_{i}"] = str(arg)
+
+    for k, v in kwargs.items():
+        if k in ("db", "request") or _is_skipped_arg(v):
+            continue
+        key_params[k] = str(v)
+    return key_params
+
+
+def _acquire_lock(client, cache_key: str) -> Optional[str]:
+    """Take the short cross-worker recompute lock for a key; returns the owner token."""
+    token = uuid.uuid4().hex
+    try:
+        if client.set(f"{cache_key}:lock", token, nx=True, ex=config.CACHE_LOCK_TTL):
+            return token
+    except Exception as e:
+        logger.error(f"Error acquiring cache lock: {e}")
+    return None
+
+
+def _release_lock(client, cache_key: str, token: str) -> None:
+    try:
+        client.eval(_RELEASE_LOCK_SCRIPT, keys=[f"{cache_key}:lock"], args=[token])
+    except Exception as e:
+        logger.error(f"Error releasing cache lock: {e}")
+
+
+def _wait_for_peer(client, prefix: str, cache_key: str) -> Any:
+    """Poll briefly for a result another worker is computing under the lock."""
+    deadline = time.monotonic() + config.CACHE_LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(config.CACHE_LOCK_POLL_INTERVAL)
+        cached_data = _read_through(client, prefix, cache_key)
+        if cached_data is not None:
+            return cached_data
+    return None
+
+
+def _refresh_args(args: tuple, kwargs: dict, db) -> Tuple[tuple, dict]:
+    """Swap the caller's (request-scoped) session for one owned by the refresh."""
+    def is_session(value):
+        return "Session" in value.__class__.__name__
+
+    args = tuple(db if is_session(a) else a for a in args)
+    kwargs = {k: db if k == "db" or is_session(v) else v for k, v in kwargs.items()}
+    return args, kwargs
+
+
+def _schedule_refresh(func: Callable, client, prefix: str, cache_key: str, ttl: int, stale_ttl: int,
+                      args: tuple, kwargs: dict) -> None:
+    """Recompute a stale entry in the background; at most one refresh per key across workers."""
+    with _flights_lock:
+        if cache_key in _flights:
+            return
+        flight = _flights[cache_key] = _Flight()
+
+    def refresh():
+        from fapi.db import database
+
+        db = database.SessionLocal()
+        token = _acquire_lock(client, cache_key)
+        try:
+            if token:
+                refresh_args, refresh_kwargs = _refresh_args(args, kwargs, db)
+                result = func(*refresh_args, **refresh_kwargs)
+                _write_through(client, prefix, cache_key, result, ttl, stale_ttl)
+                logger.info(f"[REDIS CACHE REFRESH] Function: {func.__name__} | Key: {cache_key}")
+        except Exception as e:
+            logger.error(f"Error refreshing cache entry {cache_key}: {e}")
+        finally:
+            if token:
+                _release_lock(client, cache_key, token)
+            db.close()
+            with _flights_lock:
+                _flights.pop(cache_key, None)
+            flight.done.set()
+
+    try:
+        _refresh_executor.submit(refresh)
+    except RuntimeError:
+        # Executor already shut down (process exiting)
+        with _flights_lock:
+            _flights.pop(cache_key, None)
+
+
+def cache_result(ttl: int = config.REDIS_TTL_DEFAULT, prefix: str = "general", stale_ttl: int = 0):
     """
     Decorator to cache the result of any function.
     Keys are generated based on function name and its relevant arguments.
     Skips 'db' (Session) and 'request' (Request) arguments.
+
+    Concurrent misses for the same key are coalesced: one caller per worker
+    recomputes while the others wait for its result, and a short Redis lock
+    keeps other workers from recomputing at the same time.
+    With stale_ttl > 0, expired entries are still served for that many seconds
+    while one caller refreshes them in the background.
     """
     def decorator(func: Callable):
+        def load(client, cache_key: str, args: tuple, kwargs: dict) -> Tuple[Any, bool]:
+            """Return (value, found) from the cache, scheduling a refresh for stale entries."""
+            cached_data = _read_through(client, prefix, cache_key)
+            if cached_data is NEGATIVE:
+                return None, True
+            decoded = _try_decode(cached_data) if cached_data is not None else None
+            if decoded is None:
+                return None, False
+            value, stale = decoded
+            if stale:
+                _schedule_refresh(func, client, prefix, cache_key, ttl, stale_ttl, args, kwargs)
+            logger.info(f"[REDIS CACHE HIT] Function: {func.__name__} | Key: {cache_key}")
+            return value, True
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             # Check if Redis is enabled/connected
@@ -59,59 +313,61 @@ def cache_result(ttl: int = config.REDIS_TTL_DEFAULT, prefix: str = "general"):
             if not client:
                 return func(*args, **kwargs)
 
-            # Build a list of relevant arguments for the cache key
-            key_params = {}
-            for i, arg in enumerate(args):
-                # Skip db sessions, requests, etc.
-                if hasattr(arg, "__class__"):
-                    class_name = arg.__class__.__name__
-                    if "Session" in class_name or "Request" in class_name:
-                        continue
-                key_params[f"arg_{i}"] = str(arg)
-            
-            for k, v in kwargs.items():
-                if k in ("db", "request"):
-                    continue
-                if hasattr(v, "__class__"):
-                    class_name = v.__class__.__name__
-                    if "Session" in class_name or "Request" in class_name:
-                        continue
-                key_params[k] = str(v)
-
-            # Generate cache key using function name as path
+            # Generate cache key using function name as path (and the request's data version)
+            key_params = _build_key_params(args, kwargs)
+            data_version = _request_data_version.get()
+            if data_version:
+                key_params["data_version"] = data_version
             cache_key = generate_cache_key(prefix, func.__name__, key_params)
 
-            # Try to get data from cache
-            try:
-                cached_data = client.get(cache_key)
-                if cached_data:
-                    if isinstance(cached_data, (bytes, bytearray)):
-                        cached_data = cached_data.decode()
-                    msg = f"[REDIS CACHE HIT] Function: {func.__name__} | Key: {cache_key}"
-                    logger.info(msg)
-                    print(msg) # Ensure visibility in terminal
-                    return json.loads(cached_data)
-            except Exception as e:
-                logger.error(f"Error fetching from Redis: {e}")
+            # Try to get data from cache (local tier, then Redis)
+            value, found = load(client, cache_key, args, kwargs)
+            if found:
+                return value
 
-            # Cache miss: execute function
-            result = func(*args, **kwargs)
+            # Cache miss: only one caller per worker recomputes, the rest wait for it
+            with _flights_lock:
+                flight = _flights.get(cache_key)
+                leader = flight is None
+                if leader:
+                    flight = _flights[cache_key] = _Flight()
 
-            # Store result in cache
+            if not leader:
+                flight.done.wait(config.CACHE_LOCK_WAIT)
+                value, found = load(client, cache_key, args, kwargs)
+                if found:
+                    return value
+                return func(*args, **kwargs)
+
+            token = None
             try:
-                if result is not None:
-                    client.set(
-                        cache_key,
-                        json.dumps(result, default=alchemy_encoder),
-                        ex=ttl
-                    )
-                    msg = f"[REDIS CACHE MISS] Function: {func.__name__} | Key: {cache_key}"
-                    logger.info(msg)
-                    print(msg) # Ensure visibility in terminal
-            except Exception as e:
-                logger.error(f"Error storing in Redis: {e}")
+                token = _acquire_lock(client, cache_key)
+                if not token:
+                    # Another worker holds the lock; give it a moment to publish its result
+                    cached_data = _wait_for_peer(client, prefix, cache_key)
+                    if cached_data is NEGATIVE:
+                        return None
+                    decoded = _try_decode(cached_data) if cached_data is not None else None
+                    if decoded is not None:
+                        return decoded[0]
 
-            return result
+                # Cache miss: execute function
+                result = func(*args, **kwargs)
+
+                # Store result in cache
+                try:
+                    if _write_through(client, prefix, cache_key, result, ttl, stale_ttl):
+                        logger.info(f"[REDIS CACHE MISS] Function: {func.__name__} | Key: {cache_key}")
+                except Exception as e:
+                    logger.error(f"Error storing in Redis: {e}")
+
+                return result
+            finally:
+                if token:
+                    _release_lock(client, cache_key, token)
+                with _flights_lock:
+                    _flights.pop(cache_key, None)
+                flight.done.set()
         return wrapper
     return decorator
 
@@ -135,36 +391,29 @@ def cache_response(ttl: int = config.REDIS_TTL_DEFAULT, prefix: str = "general")
             if not request:
                 return await func(*args, **kwargs)
 
-            # Check if Redis is enabled/connected
-            client = redis_client.get_client()
-            if not client:
+            # Check if Redis is enabled/connected; async endpoints use the non-blocking client
+            batcher = redis_client.get_batcher()
+            if not batcher:
                 return await func(*args, **kwargs)
 
             # Generate cache key
             cache_key = generate_cache_key(prefix, request.url.path, dict(request.query_params))
 
-            # Try to get data from cache
-            try:
-                cached_data = client.get(cache_key)
-                if cached_data:
-                    if isinstance(cached_data, (bytes, bytearray)):
-                        cached_data = cached_data.decode()
-                    logger.info(f"CACHE HIT: {cache_key}")
-                    return json.loads(cached_data)
-            except Exception as e:
-                logger.error(f"Error fetching from Redis: {e}")
+            # Try to get data from cache (local tier, then Redis)
+            cached_data = await _read_through_async(batcher, prefix, cache_key)
+            if cached_data is NEGATIVE:
+                return None
+            decoded = _try_decode(cached_data) if cached_data is not None else None
+            if decoded is not None:
+                logger.info(f"CACHE HIT: {cache_key}")
+                return decoded[0]
 
             # Cache miss: execute function
             response_data = await func(*args, **kwargs)
 
             # Store result in cache
             try:
-                if response_data is not None:
-                    client.set(
-                        cache_key,
-                        json.dumps(response_data, default=alchemy_encoder),
-                        ex=ttl
-                    )
+                if await _write_through_async(batcher, prefix, cache_key, response_data, ttl):
                     logger.info(f"CACHE MISS (Stored in Redis): {cache_key}")
             except Exception as e:
                 logger.error(f"Error storing in Redis: {e}")
@@ -174,17 +423,33 @@ def cache_response(ttl: int = config.REDIS_TTL_DEFAULT, prefix: str = "general")
     return decorator
 
 def invalidate_cache(pattern: str):
-    """Invalidate cache keys matching a pattern."""
+    """
+    Invalidate all cache keys written under a prefix.
+    Drains the prefix's tag set in batches instead of scanning the keyspace with KEYS.
+    """
+    # Drop this worker's local copies first; other workers expire theirs within CACHE_L1_TTL
+    local_cache.invalidate(pattern)
     client = redis_client.get_client()
     if not client:
         return
-    
+
+    tag_key = _tag_key(pattern)
+    batch_size = config.CACHE_INVALIDATE_BATCH
+    removed = 0
     try:
-        # Include APP_ENV in the pattern to match keys generated by generate_cache_key
-        full_pattern = f"{config.APP_ENV}:cache:{pattern}:*"
-        keys = client.keys(full_pattern)
-        if keys:
-            client.delete(*keys)
-            logger.info(f"Invalidated {len(keys)} cache keys matching pattern: {full_pattern}")
+        while True:
+            # SPOP removes members atomically, so keys registered concurrently are never lost
+            keys = list(client.spop(tag_key, batch_size) or [])
+            if not keys:
+                break
+            pipe = client.pipeline()
+            for start in range(0, len(keys), config.CACHE_DELETE_CHUNK):
+                pipe.unlink(*keys[start:start + config.CACHE_DELETE_CHUNK])
+            pipe.exec()
+            removed += len(keys)
+            if len(keys) < batch_size:
+                break
+        if removed:
+            logger.info(f"Invalidated {removed} cache keys tagged: {tag_key}")
     except Exception as e:
         logger.error(f"Error invalidating cache: {e}")
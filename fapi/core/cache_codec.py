@@ -0,0 +1,137 @@
+import base64
+import functools
+import json
+import zlib
+from datetime import datetime, date
+from decimal import Decimal
+from typing import Any, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - runtime environment dependent
+    orjson = None  # type: ignore[assignment]
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - runtime environment dependent
+    zstandard = None  # type: ignore[assignment]
+from fapi.core import config
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Every encoded entry starts with "wbl:<version>:<codec>:<compression>:".
+# Entries without the header were written by the plain json.dumps cache and are read as JSON.
+HEADER_PREFIX = "wbl:"
+FORMAT_VERSION = "1"
+
+
+class CodecError(ValueError):
+    """Raised for cached payloads this worker cannot decode (unknown version/codec)."""
+
+
+@functools.lru_cache(maxsize=None)
+def _property_names(cls: type) -> Tuple[str, ...]:
+    """Names of the @property attributes on a class, resolved once per class."""
+    return tuple(
+        name for name in dir(cls)
+        if isinstance(getattr(cls, name, None), property)
+    )
+
+
+def alchemy_encoder(obj: Any) -> Any:
+    """Helper to serialize SQLAlchemy objects and other types."""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, set):
+        return list(obj)
+    if hasattr(obj, "__dict__"):
+        # For SQLAlchemy ORM objects: loaded attributes plus the class's properties
+        data = dict(obj.__dict__)
+        data.pop("_sa_instance_state", None)
+
+        for attr_name in _property_names(obj.__class__):
+            try:
+                data[attr_name] = getattr(obj, attr_name)
+            except Exception:
+                pass
+        return data
+    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+
+
+def _dumps_json(value: Any) -> bytes:
+    return json.dumps(value, default=alchemy_encoder).encode()
+
+
+def _dumps_orjson(value: Any) -> bytes:
+    try:
+        return orjson.dumps(value, default=alchemy_encoder, option=orjson.OPT_NON_STR_KEYS)
+    except TypeError:
+        # e.g. integers wider than 64 bits; the stdlib encoder handles everything we cache
+        return _dumps_json(value)
+
+
+_SERIALIZERS = {
+    "json": (_dumps_json, json.loads),
+}
+if orjson is not None:
+    _SERIALIZERS["orjson"] = (_dumps_orjson, orjson.loads)
+
+
+def _compress(data: bytes, method: str) -> bytes:
+    if method == "zstd":
+        return zstandard.ZstdCompressor().compress(data)
+    return zlib.compress(data, config.CACHE_COMPRESS_LEVEL)
+
+
+def _decompress(data: bytes, method: str) -> bytes:
+    if method == "zstd":
+        if zstandard is None:
+            raise CodecError("zstd payload but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if method == "zlib":
+        return zlib.decompress(data)
+    raise CodecError(f"Unknown compression: {method}")
+
+
+def _active_codec() -> str:
+    codec = config.CACHE_CODEC
+    if codec not in _SERIALIZERS:
+        return "orjson" if "orjson" in _SERIALIZERS else "json"
+    return codec
+
+
+def _active_compression() -> str:
+    if config.CACHE_COMPRESSION == "zstd" and zstandard is None:
+        return "zlib"
+    return config.CACHE_COMPRESSION
+
+
+def encode(value: Any) -> str:
+    """Serialize a value for Redis, compressing it once it is over CACHE_COMPRESS_MIN_BYTES."""
+    codec = _active_codec()
+    body = _SERIALIZERS[codec][0](value)
+    compression = _active_compression()
+    if compression != "none" and len(body) >= config.CACHE_COMPRESS_MIN_BYTES:
+        packed = base64.b64encode(_compress(body, compression)).decode("ascii")
+        return f"{HEADER_PREFIX}{FORMAT_VERSION}:{codec}:{compression}:{packed}"
+    return f"{HEADER_PREFIX}{FORMAT_VERSION}:{codec}:none:{body.decode()}"
+
+
+def decode(payload: str) -> Any:
+    """Inverse of encode; headerless payloads are legacy JSON entries."""
+    if not payload.startswith(HEADER_PREFIX):
+        return json.loads(payload)
+    try:
+        _, version, codec, compression, body = payload.split(":", 4)
+    except ValueError:
+        raise CodecError("Malformed cache header")
+    if version != FORMAT_VERSION:
+        raise CodecError(f"Unsupported cache format version: {version}")
+    if codec not in _SERIALIZERS:
+        raise CodecError(f"Unsupported cache codec: {codec}")
+    loads = _SERIALIZERS[codec][1]
+    if compression == "none":
+        return loads(body)
+    return loads(_decompress(base64.b64decode(body), compression))
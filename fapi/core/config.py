@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 # fapi/utils/limiter_config.py
 from slowapi import Limiter
@@ -42,4 +43,117 @@ if not UPSTASH_REDIS_REST_URL:
 if not UPSTASH_REDIS_REST_TOKEN:
     raise ValueError("UPSTASH_REDIS_REST_TOKEN not set")
 
-REDIS_TTL_DEFAULT = int(os.getenv("REDIS_TTL_DEFAULT", 300))
\ No newline at end of file
+REDIS_TTL_DEFAULT = int(os.getenv("REDIS_TTL_DEFAULT", 300))
+
+def _parse_prefix_sizes(raw: str) -> dict:
+    """Parse "prefix=size,prefix=size" into a dict, ignoring malformed pairs."""
+    sizes = {}
+    for pair in raw.split(","):
+        name, _, value = pair.partition("=")
+        if name.strip() and value.strip().isdigit():
+            sizes[name.strip()] = int(value.strip())
+    return sizes
+
+
+# In-process (L1) cache in front of Redis, per worker
+CACHE_L1_ENABLED = os.getenv("CACHE_L1_ENABLED", "true").lower() == "true"
+CACHE_L1_TTL = int(os.getenv("CACHE_L1_TTL", 30))
+CACHE_L1_NEGATIVE_TTL = int(os.getenv("CACHE_L1_NEGATIVE_TTL", 10))
+CACHE_L1_MAX_ENTRIES = int(os.getenv("CACHE_L1_MAX_ENTRIES", 256))
+CACHE_L1_PREFIX_SIZES = _parse_prefix_sizes(
+    os.getenv("CACHE_L1_PREFIX_SIZES", "extension_keys=512,employees=512,candidates=64")
+)
+
+# Tag-based invalidation: each prefix keeps a Redis set of its cache keys
+CACHE_TAG_TTL = int(os.getenv("CACHE_TAG_TTL", 86400))
+CACHE_INVALIDATE_BATCH = int(os.getenv("CACHE_INVALIDATE_BATCH", 1000))
+CACHE_DELETE_CHUNK = int(os.getenv("CACHE_DELETE_CHUNK", 100))
+
+# Stampede protection: cross-worker recompute lock and stale-while-revalidate refreshes
+CACHE_LOCK_TTL = int(os.getenv("CACHE_LOCK_TTL", 30))
+CACHE_LOCK_WAIT = float(os.getenv("CACHE_LOCK_WAIT", 5))
+CACHE_LOCK_POLL_INTERVAL = float(os.getenv("CACHE_LOCK_POLL_INTERVAL", 0.1))
+CACHE_REFRESH_WORKERS = int(os.getenv("CACHE_REFRESH_WORKERS", 4))
+
+# Async Redis batching: max keys per MGET request
+REDIS_MGET_CHUNK = int(os.getenv("REDIS_MGET_CHUNK", 100))
+
+# Cached payload encoding: serializer ("orjson" or "json") and compression ("zlib", "zstd" or "none")
+CACHE_CODEC = os.getenv("CACHE_CODEC", "orjson")
+CACHE_COMPRESSION = os.getenv("CACHE_COMPRESSION", "zlib")
+CACHE_COMPRESS_MIN_BYTES = int(os.getenv("CACHE_COMPRESS_MIN_BYTES", 16384))
+CACHE_COMPRESS_LEVEL = int(os.getenv("CACHE_COMPRESS_LEVEL", 6))
+
+# How often table_versions is re-checked against full-table checksums (catches manual DB edits)
+TABLE_VERSION_RECONCILE_MINUTES = int(os.getenv("TABLE_VERSION_RECONCILE_MINUTES", 15))
+
+# Streaming exports: rows fetched per server-side cursor batch (and flushed per response chunk)
+EXPORT_YIELD_PER = int(os.getenv("EXPORT_YIELD_PER", 1000))
+
+# Avatar dashboard /metrics/all: metric groups computed in parallel, each on its own session
+DASHBOARD_METRICS_WORKERS = int(os.getenv("DASHBOARD_METRICS_WORKERS", 6))
+DASHBOARD_METRIC_GROUP_TIMEOUT_SECONDS = float(os.getenv("DASHBOARD_METRIC_GROUP_TIMEOUT_SECONDS", 10))
+
+# Dashboard rollup tables: read instead of scanning fact tables; reconcile job catches non-ORM writes
+DASHBOARD_ROLLUPS_ENABLED = os.getenv("DASHBOARD_ROLLUPS_ENABLED", "true").lower() == "true"
+DASHBOARD_ROLLUP_RECONCILE_MINUTES = int(os.getenv("DASHBOARD_ROLLUP_RECONCILE_MINUTES", 15))
+
+# Weekly marketing report snapshots: days a window's stored report is kept after it ends
+MARKETING_REPORT_SNAPSHOT_RETENTION_DAYS = int(os.getenv("MARKETING_REPORT_SNAPSHOT_RETENTION_DAYS", 28))
+# Seconds a snapshot is still served when only the activity/click logs changed since it was built
+MARKETING_REPORT_ACTIVITY_MIN_AGE_SECONDS = int(os.getenv("MARKETING_REPORT_ACTIVITY_MIN_AGE_SECONDS", 300))
+
+# Rendered marketing report PDFs, keyed by a hash of the report data: render pool size, cached
+# PDFs per worker and their lifetime, and how long a request waits for a render in progress
+REPORT_PDF_RENDER_WORKERS = int(os.getenv("REPORT_PDF_RENDER_WORKERS", 2))
+REPORT_PDF_CACHE_MAX_ENTRIES = int(os.getenv("REPORT_PDF_CACHE_MAX_ENTRIES", 8))
+REPORT_PDF_CACHE_TTL_SECONDS = int(os.getenv("REPORT_PDF_CACHE_TTL_SECONDS", 86400))
+REPORT_PDF_RENDER_TIMEOUT_SECONDS = float(os.getenv("REPORT_PDF_RENDER_TIMEOUT_SECONDS", 60))
+
+# CoderPad test cases: concurrent cases per API worker, and per user across their requests
+CODERPAD_TEST_WORKERS = int(os.getenv("CODERPAD_TEST_WORKERS", 4))
+CODERPAD_TEST_WORKERS_PER_USER = int(os.getenv("CODERPAD_TEST_WORKERS_PER_USER", 2))
+
+# Compiled CoderPad languages: on-disk artifact cache (one directory per build, LRU-evicted)
+CODERPAD_ARTIFACT_CACHE_DIR = os.getenv(
+    "CODERPAD_ARTIFACT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "wbl-coderpad-artifacts")
+)
+CODERPAD_ARTIFACT_CACHE_MAX_ENTRIES = int(os.getenv("CODERPAD_ARTIFACT_CACHE_MAX_ENTRIES", 200))
+
+# CoderPad execution results, keyed by code/language/stdin/timeout class (TTL 0 disables)
+CODERPAD_RESULT_CACHE_MAX_ENTRIES = int(os.getenv("CODERPAD_RESULT_CACHE_MAX_ENTRIES", 5000))
+CODERPAD_RESULT_CACHE_TTL_SECONDS = int(os.getenv("CODERPAD_RESULT_CACHE_TTL_SECONDS", 900))
+
+# Warm Python workers for CoderPad (0 disables): jobs per worker before recycling, per-run memory cap
+CODERPAD_PY_WORKERS = int(os.getenv("CODERPAD_PY_WORKERS", 4))
+CODERPAD_PY_WORKER_MAX_RUNS = int(os.getenv("CODERPAD_PY_WORKER_MAX_RUNS", 100))
+CODERPAD_PY_MEMORY_LIMIT_MB = int(os.getenv("CODERPAD_PY_MEMORY_LIMIT_MB", 512))
+
+# CoderPad execution queue: concurrent runs, waiting jobs before 429, in-flight runs per user,
+# how long finished job results stay readable, and how often new job events are sent to Redis
+CODERPAD_EXEC_WORKERS = int(os.getenv("CODERPAD_EXEC_WORKERS", 8))
+CODERPAD_EXEC_MAX_QUEUED = int(os.getenv("CODERPAD_EXEC_MAX_QUEUED", 100))
+CODERPAD_EXEC_MAX_PER_USER = int(os.getenv("CODERPAD_EXEC_MAX_PER_USER", 3))
+CODERPAD_EXEC_JOB_TTL_SECONDS = int(os.getenv("CODERPAD_EXEC_JOB_TTL_SECONDS", 600))
+CODERPAD_EXEC_PUBLISH_INTERVAL_SECONDS = float(os.getenv("CODERPAD_EXEC_PUBLISH_INTERVAL_SECONDS", 0.25))
+
+# Batch LLM key validation: concurrent provider probes overall, and per provider
+LLM_KEY_VALIDATION_WORKERS = int(os.getenv("LLM_KEY_VALIDATION_WORKERS", 8))
+LLM_KEY_VALIDATION_PER_PROVIDER = int(os.getenv("LLM_KEY_VALIDATION_PER_PROVIDER", 3))
+
+# Unknown-prefix keys: providers probed in parallel; cache TTL for active/invalid outcomes (0 disables)
+LLM_PROVIDER_PROBE_WORKERS = int(os.getenv("LLM_PROVIDER_PROBE_WORKERS", 16))
+LLM_KEY_VALIDATION_CACHE_TTL_SECONDS = int(os.getenv("LLM_KEY_VALIDATION_CACHE_TTL_SECONDS", 300))
+
+# Pooled outbound HTTP clients for LLM providers (one per base URL), and retry on 429/5xx
+# (5xx only for idempotent methods)
+LLM_HTTP_TIMEOUT_SECONDS = float(os.getenv("LLM_HTTP_TIMEOUT_SECONDS", 15))
+LLM_HTTP_MAX_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", 50))
+LLM_HTTP_MAX_KEEPALIVE = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", 20))
+LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS", 60))
+LLM_HTTP_RETRIES = int(os.getenv("LLM_HTTP_RETRIES", 2))
+LLM_HTTP_RETRY_BASE_DELAY_SECONDS = float(os.getenv("LLM_HTTP_RETRY_BASE_DELAY_SECONDS", 0.5))
+LLM_HTTP_RETRY_MAX_DELAY_SECONDS = float(os.getenv("LLM_HTTP_RETRY_MAX_DELAY_SECONDS", 8))
+
+# Shared LLM model catalogs: age after which an entry is refreshed (stale copies are still served)
+LLM_MODEL_CATALOG_TTL_SECONDS = int(os.getenv("LLM_MODEL_CATALOG_TTL_SECONDS", 3600))
@@ -0,0 +1,139 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from fapi.core import config
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Sentinel stored for negative entries (the wrapped function returned None)
+NEGATIVE = object()
+
+
+class LRUCache:
+    """Bounded, thread-safe LRU with per-entry expiry."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(1, max_entries)
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class LocalCache:
+    """
+    Per-worker L1 tier sitting in front of Redis.
+    One LRU per cache prefix so a large prefix (e.g. candidates) cannot evict
+    small hot ones (e.g. extension_keys). Entries are kept for at most
+    CACHE_L1_TTL seconds since other workers can't invalidate them.
+    """
+
+    def __init__(self):
+        self._caches: Dict[str, LRUCache] = {}
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {
+            "l1": {"hits": 0, "misses": 0, "negative_hits": 0},
+            "l2": {"hits": 0, "misses": 0, "errors": 0},
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return config.CACHE_L1_ENABLED
+
+    def _cache_for(self, prefix: str) -> LRUCache:
+        cache = self._caches.get(prefix)
+        if cache is None:
+            with self._lock:
+                cache = self._caches.get(prefix)
+                if cache is None:
+                    size = config.CACHE_L1_PREFIX_SIZES.get(prefix, config.CACHE_L1_MAX_ENTRIES)
+                    cache = LRUCache(size)
+                    self._caches[prefix] = cache
+        return cache
+
+    def get(self, prefix: str, key: str) -> Optional[Any]:
+        """Return the cached value, NEGATIVE for a cached miss, or None when absent."""
+        if not self.enabled:
+            return None
+        value = self._cache_for(prefix).get(key)
+        if value is None:
+            self.record("l1", "misses")
+        elif value is NEGATIVE:
+            self.record("l1", "negative_hits")
+        else:
+            self.record("l1", "hits")
+        return value
+
+    def set(self, prefix: str, key: str, value: Any, ttl: int) -> None:
+        if not self.enabled:
+            return
+        self._cache_for(prefix).set(key, value, min(ttl, config.CACHE_L1_TTL))
+
+    def set_negative(self, prefix: str, key: str) -> None:
+        if not self.enabled:
+            return
+        self._cache_for(prefix).set(key, NEGATIVE, config.CACHE_L1_NEGATIVE_TTL)
+
+    def invalidate(self, prefix: str) -> None:
+        cache = self._caches.get(prefix)
+        if cache is not None:
+            cache.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            for cache in self._caches.values():
+                cache.clear()
+
+    def record(self, tier: str, counter: str) -> None:
+        with self._lock:
+            self._stats[tier][counter] = self._stats[tier].get(counter, 0) + 1
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for counters in self._stats.values():
+                for name in counters:
+                    counters[name] = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "l1": dict(self._stats["l1"]),
+                "l2": dict(self._stats["l2"]),
+                "l1_entries": {prefix: len(cache) for prefix, cache in self._caches.items()},
+            }
+
+
+local_cache = LocalCache()
@@ -1,14 +1,110 @@
+import asyncio
+from typing import Any, Dict, List, Tuple
+
 try:
     from upstash_redis import Redis
 except ImportError:  # pragma: no cover - runtime environment dependent
     Redis = None  # type: ignore[assignment]
+try:
+    from upstash_redis.asyncio import Redis as AsyncRedis
+except ImportError:  # pragma: no cover - runtime environment dependent
+    AsyncRedis = None  # type: ignore[assignment]
 from fapi.core import config
 import logging
 
 logger = logging.getLogger(__name__)
 
+# A queued pipeline command: (method name, positional args, keyword args)
+Command = Tuple[str, tuple, dict]
+
+
+class AsyncCommandBatcher:
+    """
+    Coalesces Redis traffic from concurrent coroutines on one event loop.
+    GETs issued in the same loop tick go out as a single MGET, and queued
+    write commands share one pipeline request, so a burst of cache lookups
+    costs one HTTP round-trip instead of one per request.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self._pending_gets: Dict[str, List[asyncio.Future]] = {}
+        self._pending_commands: List[Tuple[List[Command], asyncio.Future]] = []
+        self._flush_scheduled = False
+
+    async def get(self, key: str) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending_gets.setdefault(key, []).append(future)
+        self._schedule_flush(loop)
+        return await future
+
+    async def execute(self, commands: List[Command]) -> List[Any]:
+        """Queue commands for the next shared pipeline request and return their results."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending_commands.append((commands, future))
+        self._schedule_flush(loop)
+        return await future
+
+    def _schedule_flush(self, loop: asyncio.AbstractEventLoop) -> None:
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            loop.call_soon(lambda: asyncio.ensure_future(self._flush()))
+
+    async def _flush(self) -> None:
+        self._flush_scheduled = False
+        gets, self._pending_gets = self._pending_gets, {}
+        commands, self._pending_commands = self._pending_commands, []
+        await asyncio.gather(self._flush_gets(gets), self._flush_commands(commands))
+
+    async def _flush_gets(self, gets: Dict[str, List[asyncio.Future]]) -> None:
+        if not gets:
+            return
+        keys = list(gets)
+        try:
+            if len(keys) == 1:
+                values = [await self.client.get(keys[0])]
+            else:
+                values = []
+                for start in range(0, len(keys), config.REDIS_MGET_CHUNK):
+                    values.extend(await self.client.mget(*keys[start:start + config.REDIS_MGET_CHUNK]))
+        except Exception as e:
+            for futures in gets.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        for key, value in zip(keys, values):
+            for future in gets[key]:
+                if not future.done():
+                    future.set_result(value)
+
+    async def _flush_commands(self, batches: List[Tuple[List[Command], asyncio.Future]]) -> None:
+        if not batches:
+            return
+        pipe = self.client.pipeline()
+        for commands, _ in batches:
+            for name, args, kwargs in commands:
+                getattr(pipe, name)(*args, **kwargs)
+        try:
+            results = await pipe.exec()
+        except Exception as e:
+            for _, future in batches:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        offset = 0
+        for commands, future in batches:
+            if not future.done():
+                future.set_result(results[offset:offset + len(commands)])
+            offset += len(commands)
+
+
 class RedisClient:
     _client = None
+    _async_client = None
+    _batcher = None
 
     @classmethod
     def get_client(cls):
@@ -27,4 +123,42 @@ class RedisClient:
                 cls._client = None
         return cls._client
 
-redis_client = RedisClient()
\ No newline at end of file
+    @classmethod
+    def get_async_client(cls):
+        """asyncio-native client (pooled keep-alive httpx transport) for async endpoints."""
+        if AsyncRedis is None:
+            logger.warning("upstash_redis package is not installed; async Redis cache is disabled")
+            return None
+        if cls._async_client is None:
+            try:
+                cls._async_client = AsyncRedis(
+                    url=config.UPSTASH_REDIS_REST_URL,
+                    token=config.UPSTASH_REDIS_REST_TOKEN,
+                )
+                logger.info("Upstash async Redis connected")
+            except Exception as e:
+                logger.error(f"Upstash async Redis connection failed: {e}")
+                cls._async_client = None
+        return cls._async_client
+
+    @classmethod
+    def get_batcher(cls):
+        """Batching front for the async client; GETs become MGETs and writes share pipelines."""
+        client = cls.get_async_client()
+        if client is None:
+            return None
+        if cls._batcher is None or cls._batcher.client is not client:
+            cls._batcher = AsyncCommandBatcher(client)
+        return cls._batcher
+
+    @classmethod
+    async def close_async(cls):
+        if cls._async_client is not None:
+            try:
+                await cls._async_client.close()
+            except Exception as e:
+                logger.error(f"Error closing async Redis client: {e}")
+            cls._async_client = None
+            cls._batcher = None
+
+redis_client = RedisClient()
@@ -1899,3 +1899,54 @@ class EvalLoginORM(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     marketing_id = Column(Integer, nullable=False, unique=True, index=True)
     login_password = Column(String(255), nullable=False)
+
+
+class TableVersionORM(Base):
+    """Per-table change counter backing the HEAD version endpoints (see utils/table_fingerprint.py)."""
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(64), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    row_count = Column(BigInteger, nullable=True)
+    checksum = Column(String(32), nullable=True)
+    updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
+
+
+class DashboardDailyRollupORM(Base):
+    """Per-day (and per-dimension) aggregate of a dashboard fact table (see utils/dashboard_rollups.py)."""
+    __tablename__ = "dashboard_daily_rollup"
+
+    metric = Column(String(32), primary_key=True)
+    day = Column(Date, primary_key=True)
+    dimension = Column(String(64), primary_key=True, default="")
+    row_count = Column(BigInteger, nullable=False, default=0)
+    amount = Column(DECIMAL(14, 2), nullable=True)
+
+
+class DashboardBatchRollupORM(Base):
+    """Candidate count and fees paid per batch (see utils/dashboard_rollups.py)."""
+    __tablename__ = "dashboard_batch_rollup"
+
+    batchid = Column(Integer, primary_key=True)
+    candidate_count = Column(BigInteger, nullable=False, default=0)
+    fee_paid_total = Column(DECIMAL(14, 2), nullable=True)
+
+
+class DashboardRollupStateORM(Base):
+    """table_versions version of each source table the dashboard rollups currently reflect."""
+    __tablename__ = "dashboard_rollup_state"
+
+    source_table = Column(String(64), primary_key=True)
+    source_version = Column(BigInteger, nullable=True)
+    refreshed_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
+
+
+class MarketingReportSnapshotORM(Base):
+    """Weekly marketing report computed once per (window, data version) (see utils/marketing_report_snapshots.py)."""
+    __tablename__ = "marketing_report_snapshot"
+
+    window_start = Column(Date, primary_key=True)
+    window_end = Column(Date, primary_key=True)
+    data_version = Column(String(64), nullable=False)
+    payload = Column(JSON, nullable=False)
+    generated_at = Column(DateTime, nullable=False, server_default=func.now())
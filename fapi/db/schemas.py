@@ -884,10 +884,11 @@ class CandidateDelete(CandidateBase):
 
 
 class PaginatedCandidateResponse(BaseModel):
-    page: int
+    page: Optional[int] = None
     limit: int
-    total: int
+    total: Optional[int] = None
     data: List[CandidateBase]
+    next_cursor: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -2432,15 +2433,17 @@ class JobsMetrics(BaseModel):
     recent_activities: List[Dict[str, Any]]
 
 class DashboardMetrics(BaseModel):
-    batch_metrics: BatchMetrics
-    financial_metrics: FinancialMetrics
-    placement_metrics: PlacementMetrics
-    interview_metrics: InterviewMetrics
-    employee_task_metrics: EmployeeTaskMetrics
-    jobs_metrics: JobsMetrics
+    # A group is None when it failed or timed out; ``errors`` maps its name to the reason
+    batch_metrics: Optional[BatchMetrics] = None
+    financial_metrics: Optional[FinancialMetrics] = None
+    placement_metrics: Optional[PlacementMetrics] = None
+    interview_metrics: Optional[InterviewMetrics] = None
+    employee_task_metrics: Optional[EmployeeTaskMetrics] = None
+    jobs_metrics: Optional[JobsMetrics] = None
     my_tasks: Optional[List["EmployeeTask"]] = None
     my_jobs: Optional[List["JobTypeOut"]] = None
     employee_name: Optional[str] = None
+    errors: Dict[str, str] = {}
 
 
 class UpcomingBatch(BaseModel):
@@ -4308,6 +4311,7 @@ class CodeExecutionRequest(BaseModel):
     input_data: Optional[str] = None
     timeout: int = 5
     test_cases: Optional[List[TestCase]] = None
+    fail_fast: bool = False  # stop running test cases after the first failure
 
 
 class CodeExecutionResponse(BaseModel):
@@ -4324,6 +4328,7 @@ class TestCaseExecutionResult(BaseModel):
     actual: Optional[str] = None
     error: Optional[str] = None
     passed: bool
+    cached: bool = False  # served from the execution result cache
 
 
 class CodeExecutionWithTestsResponse(BaseModel):
@@ -4332,6 +4337,16 @@ class CodeExecutionWithTestsResponse(BaseModel):
     status: str
     execution_time_ms: int
     test_results: Optional[List[TestCaseExecutionResult]] = None
+    cached: bool = False  # main run served from the execution result cache
+
+
+class CodeExecutionJobOut(BaseModel):
+    """Queued CoderPad run; result is set once status is "done"."""
+    job_id: str
+    status: str  # queued, running, done, error
+    queue_position: Optional[int] = None  # 1-based while queued
+    result: Optional[CodeExecutionWithTestsResponse] = None
+    error: Optional[str] = None
 
 
 class CoderpadLlmValidateRequest(BaseModel):
@@ -4629,10 +4644,11 @@ class CliUsageUserMutationResponse(BaseModel):
 
 
 class PaginatedCliUsageUsers(BaseModel):
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     page_size: int
     users: List[CliUsageUserRow]
+    next_cursor: Optional[str] = None
 
 
 class CliUsageEventOut(BaseModel):
@@ -25,6 +25,8 @@ from fapi.utils.auth_dependencies import staff_or_admin_required
 import fapi.utils.workflow_scheduler_service_utils  # auto-starts the workflow scheduler
 import asyncio
 from fapi.core.redis_client import redis_client
+from fapi.utils.python_worker_pool import python_worker_pool
+from fapi.utils import http_client_pool
 from fapi.db.database import SessionLocal, engine
 from fastapi import FastAPI, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
@@ -140,7 +142,10 @@ async def startup_event():
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    pass  # Upstash Redis is HTTP-based; no persistent connection to close
+    # Upstash Redis is HTTP-based; only the async client's keep-alive pool needs closing
+    await redis_client.close_async()
+    python_worker_pool.shutdown()
+    http_client_pool.close_all()
 
 @app.get("/api/redis-health", tags=["Health"])
 async def redis_health():
@@ -148,7 +153,8 @@ async def redis_health():
     if client:
         try:
             client.ping()
-            return {"status": "connected", "message": "Redis is up and running"}
+            from fapi.core.cache import get_cache_stats
+            return {"status": "connected", "message": "Redis is up and running", "cache": get_cache_stats()}
         except Exception as e:
             return {"status": "error", "message": str(e)}
     return {"status": "disconnected", "message": "Redis client not initialized"}
@@ -159,7 +165,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["X-Data-Version", "Last-Modified", "Content-Length"],
+    expose_headers=["X-Data-Version", "Last-Modified", "Content-Length", "ETag"],
 )
 
 @app.middleware("http")
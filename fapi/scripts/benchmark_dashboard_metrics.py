@@ -0,0 +1,112 @@
+"""
+Benchmark the live dashboard metric queries: SQL statements issued and wall time per call.
+
+Seeds a throwaway SQLite database by default, or reads an existing database (read-only) with
+--database-url. Rollups and the result cache are bypassed, so the numbers cover what
+get_batch_metrics and get_lead_metrics run against the fact tables on a cache miss.
+In-memory SQLite has no network round trip; --latency-ms adds one per statement to model a
+remote database.
+
+    python fapi/scripts/benchmark_dashboard_metrics.py --candidates 50000 --leads 50000 --latency-ms 2
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Ensure wbl-backend is in the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from fapi.db.models import Batch, CandidateORM, CandidatePlacementORM, LeadORM  # noqa: E402
+from fapi.utils import avatar_dashboard_utils  # noqa: E402
+
+METRICS = {
+    "get_batch_metrics": avatar_dashboard_utils.get_batch_metrics,
+    "get_lead_metrics": avatar_dashboard_utils.get_lead_metrics,
+}
+
+
+def seed(engine, batches: int, candidates: int, leads: int) -> None:
+    tables = [Batch.__table__, CandidateORM.__table__, CandidatePlacementORM.__table__, LeadORM.__table__]
+    Batch.metadata.create_all(engine, tables=tables)
+    rng = random.Random(7)
+    today = date.today()
+    with engine.begin() as conn:
+        conn.execute(Batch.__table__.insert(), [
+            {"batchid": i + 1, "batchname": f"Batch {i + 1}", "subject": "ML",
+             "startdate": today - timedelta(days=30 * (batches - i) - 20),
+             "enddate": today - timedelta(days=30 * (batches - i) - 140)}
+            for i in range(batches)
+        ])
+        conn.execute(CandidateORM.__table__.insert(), [
+            {"full_name": f"Candidate {i}", "email": f"c{i}@example.com", "batchid": rng.randint(1, batches),
+             "status": rng.choice(["active", "inactive", "discontinued", "break", "closed"]),
+             "enrolled_date": today - timedelta(days=rng.randint(0, 900)), "fee_paid": rng.randint(0, 3000)}
+            for i in range(candidates)
+        ])
+        conn.execute(CandidatePlacementORM.__table__.insert(), [
+            {"candidate_id": rng.randint(1, candidates), "company": "Acme", "status": "Active",
+             "placement_date": today - timedelta(days=rng.randint(0, 900))}
+            for _ in range(candidates // 10)
+        ])
+        conn.execute(LeadORM.__table__.insert(), [
+            {"full_name": f"Lead {i}", "email": f"l{i}@example.com",
+             "status": rng.choice(["open", "closed", "future"]),
+             "entry_date": datetime.now() - timedelta(days=rng.randint(0, 900))}
+            for i in range(leads)
+        ])
+
+
+def run(engine, runs: int, latency_ms: float = 0.0) -> None:
+    statements = []
+
+    def on_statement(*args):
+        statements.append(1)
+        if latency_ms:
+            time.sleep(latency_ms / 1000)
+
+    event.listen(engine, "before_cursor_execute", on_statement)
+    Session = sessionmaker(bind=engine)
+    with patch.object(avatar_dashboard_utils.config, "DASHBOARD_ROLLUPS_ENABLED", False):
+        for name, func in METRICS.items():
+            compute = func.__wrapped__  # skip the cache_result layer
+            timings = []
+            for _ in range(runs):
+                db = Session()
+                statements.clear()
+                started = time.perf_counter()
+                compute(db)
+                timings.append((time.perf_counter() - started) * 1000)
+                db.close()
+            print(f"{name:<20} statements={len(statements):<3} "
+                  f"median={statistics.median(timings):8.2f} ms  min={min(timings):8.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", help="benchmark an existing database instead of a seeded SQLite one")
+    parser.add_argument("--batches", type=int, default=40)
+    parser.add_argument("--candidates", type=int, default=20000)
+    parser.add_argument("--leads", type=int, default=20000)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated round trip per statement")
+    args = parser.parse_args()
+
+    if args.database_url:
+        engine = create_engine(args.database_url)
+    else:
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        seed(engine, args.batches, args.candidates, args.leads)
+    run(engine, args.runs, args.latency_ms)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,90 +1,58 @@
 from sqlalchemy.orm import Session,aliased
 from sqlalchemy import func, desc, extract, or_, and_, case,text, String, cast, literal_column
 from fapi.core.cache import cache_result
+from fapi.core import config
+from fapi.db import database
+from fapi.utils import dashboard_rollups
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime, date, timedelta
-from typing import Dict, Any, List
-from fapi.db.models import Batch, CandidateORM, CandidateMarketingORM, CandidatePlacementORM, CandidateInterview, EmployeeORM, LeadORM, CandidatePreparation, Vendor, VendorContactExtractsORM, Recording, RecordingBatch, EmployeeTaskORM, JobTypeORM, JobActivityLogORM, PlacementFeeCollection, AmountCollectedEnum, AutomationContactExtractORM, EmailPositionORM
+from typing import Callable, Dict, Any, List, Tuple
+from fapi.db.models import Batch, CandidateORM, CandidateMarketingORM, CandidatePlacementORM, CandidateInterview, EmployeeORM, LeadORM, CandidatePreparation, Vendor, VendorContactExtractsORM, Recording, RecordingBatch, EmployeeTaskORM, JobTypeORM, JobActivityLogORM, PlacementFeeCollection, AmountCollectedEnum, AutomationContactExtractORM, DashboardBatchRollupORM, EmailPositionORM
 from fapi.db.schemas import CandidatePreparationMetrics, EmployeeTaskMetrics, JobsMetrics
+import logging
 import re
+import time
 
-@cache_result(ttl=300, prefix="metrics")
-def get_batch_metrics(db: Session) -> Dict[str, Any]:
-    today = date.today()
-    current_active_batches = db.query(Batch).filter(
-        Batch.startdate <= today,
-        Batch.enddate >= today
-    ).all()
-    if current_active_batches:
-        latest_batch = max(current_active_batches, key=lambda b: b.startdate)
-        current_active_batches_str = latest_batch.batchname
-    else:
-        current_active_batches_str = "No active batches"
-    # If multiple batches, show count and first batch name
-    current_active_batches_count = len(current_active_batches)
+logger = logging.getLogger(__name__)
 
-    # Enrolled candidates
-    latest_active_batch = (
-        db.query(Batch)
-        .filter(Batch.startdate <= today, Batch.enddate >= today)
-        .order_by(Batch.startdate.desc())
-        .first()
-    )
+_metrics_executor = ThreadPoolExecutor(
+    max_workers=config.DASHBOARD_METRICS_WORKERS, thread_name_prefix="dashboard-metrics"
+)
 
-    if latest_active_batch:
-        enrolled_candidates_current = (
-            db.query(CandidateORM)
-            .filter(CandidateORM.batchid == latest_active_batch.batchid)
-            .count()
-        )
-    else:
-        enrolled_candidates_current = 0
+@cache_result(ttl=300, prefix="metrics")
+def get_batch_metrics(db: Session) -> Dict[str, Any]:
+    if dashboard_rollups.rollups_ready(db):
+        return _batch_metrics_from_rollups(db)
 
-    total_candidates = db.query(CandidateORM).count()
-    # Candidates enrolled in Last Batch only for batches that have started
-    previous_batch = (
-            db.query(Batch)
-            .filter(Batch.startdate <= date.today())
-            .order_by(desc(Batch.startdate))
-            .offset(1)  
-            .first()
-        )
+    today = date.today()
+    active_count, latest_batch, previous_batch = _batch_landmarks(db, today)
 
-    candidates_previous_batch = 0
+    # One pass over candidate: per-status totals plus the batch / enrollment counters
+    counters = {"total": None, "new_this_month": CandidateORM.enrolled_date >= today.replace(day=1)}
+    if latest_batch:
+        counters["latest_batch"] = CandidateORM.batchid == latest_batch.batchid
     if previous_batch:
-        candidates_previous_batch = (
-                db.query(CandidateORM)
-                .filter(CandidateORM.batchid == previous_batch.batchid)
-                .count()
-            )
-
+        counters["previous_batch"] = CandidateORM.batchid == previous_batch.batchid
+    by_status = _conditional_counts(db, counters, group_by=CandidateORM.status)
 
-    # New Enrollments in this Month
-    first_day_month = today.replace(day=1)
-    new_enrollments_month = db.query(CandidateORM).filter(
-        CandidateORM.enrolled_date >= first_day_month
-    ).count()
-    status_breakdown = db.query(
-        CandidateORM.status,
-        func.count(CandidateORM.id)
-    ).group_by(CandidateORM.status).all()
-    status_dict = {status: count for status, count in status_breakdown}
-    
-    # Add Total Placements to status breakdown
-    total_placements = db.query(CandidatePlacementORM).count()
-    status_dict["Placements"] = total_placements
+    status_dict = {row["group"]: row["total"] for row in by_status}
+    status_dict["Placements"] = db.query(CandidatePlacementORM).count()
     return {
-        "current_active_batches": current_active_batches_str,
-        "current_active_batches_count": current_active_batches_count,
-        "enrolled_candidates_current": enrolled_candidates_current,
-        "total_candidates": total_candidates,
-        "candidates_previous_batch": candidates_previous_batch,
-        "new_enrollments_month": new_enrollments_month,
+        "current_active_batches": latest_batch.batchname if latest_batch else "No active batches",
+        "current_active_batches_count": active_count,
+        "enrolled_candidates_current": sum(row.get("latest_batch", 0) for row in by_status),
+        "total_candidates": sum(row["total"] for row in by_status),
+        "candidates_previous_batch": sum(row.get("previous_batch", 0) for row in by_status),
+        "new_enrollments_month": sum(row["new_this_month"] for row in by_status),
         "candidate_status_breakdown": status_dict
     }
 
 
 @cache_result(ttl=300, prefix="metrics")
 def get_financial_metrics(db: Session) -> Dict[str, Any]:
+    if dashboard_rollups.rollups_ready(db):
+        return _financial_metrics_from_rollups(db)
+
     today = date.today()
 
     # Current batch
@@ -189,6 +157,9 @@ def get_financial_metrics(db: Session) -> Dict[str, Any]:
 
 @cache_result(ttl=300, prefix="metrics")
 def get_placement_metrics(db: Session) -> Dict[str, Any]:
+    if dashboard_rollups.rollups_ready(db):
+        return _placement_metrics_from_rollups(db)
+
     today = date.today()
     first_day_year = today.replace(month=1, day=1)
     if today.month == 1:
@@ -213,27 +184,6 @@ def get_placement_metrics(db: Session) -> Dict[str, Any]:
         CandidatePlacementORM.placement_date >= first_day_prev_month,
         CandidatePlacementORM.placement_date <= last_day_prev_month
     ).count()
-    # Last Placement Done
-    last_placement = db.query(CandidatePlacementORM).order_by(
-        desc(CandidatePlacementORM.placement_date)
-    ).first()
-
-    last_placement_dict = None
-    if last_placement:
-        candidate_name = "Unknown"
-        if last_placement.candidate_id:
-            candidate = db.query(CandidateORM).filter(
-                CandidateORM.id == last_placement.candidate_id
-            ).first()
-            if candidate:
-                candidate_name = candidate.full_name or f"Candidate {last_placement.candidate_id}"
-
-    last_placement_dict = {
-            "candidate_name": candidate_name,
-            "company": last_placement.company,
-            "placement_date": last_placement.placement_date,
-            "position":last_placement.position
-        }
     # Currently Active Placements
     active_placements = db.query(CandidatePlacementORM).filter(
         CandidatePlacementORM.status == "Active"
@@ -242,20 +192,17 @@ def get_placement_metrics(db: Session) -> Dict[str, Any]:
         "total_placements": total_placements,
         "placements_year": placements_year,
         "placements_last_month": placements_last_month,
-        "last_placement": last_placement_dict,
+        "last_placement": _last_placement(db),
         "active_placements": active_placements
     }
 
 # Interview metrics
 @cache_result(ttl=300, prefix="metrics")
 def get_interview_metrics(db: Session) -> Dict[str, Any]:
+    if dashboard_rollups.rollups_ready(db):
+        return _interview_metrics_from_rollups(db)
+
     today = datetime.now().date()
-    next_week = today + timedelta(days=7)
-    # Upcoming Interviews
-    upcoming_interviews = db.query(CandidateInterview).filter(
-        CandidateInterview.interview_date >= datetime.now(),
-        CandidateInterview.interview_date <= datetime.combine(next_week, datetime.max.time())
-    ).count()
     # Total Interviews Scheduled
     total_interviews = db.query(CandidateInterview).count()
     # Interviews This Month
@@ -269,27 +216,10 @@ def get_interview_metrics(db: Session) -> Dict[str, Any]:
         func.date(CandidateInterview.interview_date) == today
     ).count()
 
-    marketing_candidates = db.query(CandidateORM).join(
-        CandidateMarketingORM,
-        CandidateMarketingORM.candidate_id == CandidateORM.id
-    ).filter(
-        CandidateMarketingORM.status == "active"
-    ).all()
-
-    priority_1_candidates = db.query(CandidateMarketingORM).filter(
-        CandidateMarketingORM.status == "active",
-        CandidateMarketingORM.priority == 1
-    ).count()
-
-    priority_2_candidates = db.query(CandidateMarketingORM).filter(
-        CandidateMarketingORM.status == "active",
-        CandidateMarketingORM.priority == 2
-    ).count()
-
-    priority_3_candidates = db.query(CandidateMarketingORM).filter(
-        CandidateMarketingORM.status == "active",
-        CandidateMarketingORM.priority == 3
-    ).count()    # Interview Feedback Breakdown
+    marketing_candidates, priority_1_candidates, priority_2_candidates, priority_3_candidates = (
+        _active_marketing_counts(db)
+    )
+    # Interview Feedback Breakdown
     feedback_breakdown = db.query(
         CandidateInterview.feedback,
         func.count(CandidateInterview.id)
@@ -301,11 +231,11 @@ def get_interview_metrics(db: Session) -> Dict[str, Any]:
         else:
             feedback_dict["No Feedback"] = count
     return {
-        "upcoming_interviews": upcoming_interviews,
+        "upcoming_interviews": _upcoming_interviews(db),
         "total_interviews": total_interviews,
         "interviews_month": interviews_month,
         "interviews_today": interviews_today,
-        "marketing_candidates":  len(marketing_candidates),
+        "marketing_candidates": marketing_candidates,
         "priority_1_candidates": priority_1_candidates,
         "priority_2_candidates": priority_2_candidates,
         "priority_3_candidates": priority_3_candidates,
@@ -407,54 +337,32 @@ def get_employee_birthdays(db: Session):
 
 @cache_result(ttl=300, prefix="metrics")
 def get_lead_metrics(db: Session) -> dict[str, any]:
-    
-    total_leads = db.query(func.count(LeadORM.id)).scalar() or 0
-
-    current_month = datetime.now().month
-    current_year = datetime.now().year
+    if dashboard_rollups.rollups_ready(db):
+        return _lead_metrics_from_rollups(db)
 
-    leads_this_month = db.query(func.count(LeadORM.id)).filter(
-        extract('month', LeadORM.entry_date) == current_month,
-        extract('year', LeadORM.entry_date) == current_year
-    ).scalar() or 0
-
-    start_of_week = datetime.combine(
-        (date.today() - timedelta(days=date.today().weekday())), datetime.min.time()
-    )
-    end_of_today = datetime.combine(date.today(), datetime.max.time())
-
-    leads_this_week = db.query(func.count(LeadORM.id)).filter(
-        LeadORM.entry_date >= start_of_week,
-        LeadORM.entry_date <= end_of_today
-    ).scalar() or 0
-
-    
-    open_leads = db.query(func.count(LeadORM.id)).filter(LeadORM.status == "open").scalar() or 0
-    closed_leads = db.query(func.count(LeadORM.id)).filter(LeadORM.status == "closed").scalar() or 0
-    future_leads = db.query(func.count(LeadORM.id)).filter(LeadORM.status == "future").scalar() or 0
-
-   
-    latest_lead = db.query(LeadORM).order_by(LeadORM.entry_date.desc()).first()
-    latest_lead_data = None
-    if latest_lead:
-        latest_lead_data = {
-            "id": latest_lead.id,
-            "full_name": latest_lead.full_name,
-            "entry_date": latest_lead.entry_date.isoformat() if latest_lead.entry_date else None,
-            "phone": latest_lead.phone,
-            "email": latest_lead.email,
-            "workstatus": latest_lead.workstatus,
-            "status": latest_lead.status
-        }
+    today = date.today()
+    start_of_month = datetime.combine(today.replace(day=1), datetime.min.time())
+    start_of_next_month = datetime.combine((today.replace(day=28) + timedelta(days=4)).replace(day=1), datetime.min.time())
+    start_of_week = datetime.combine(today - timedelta(days=today.weekday()), datetime.min.time())
+    end_of_today = datetime.combine(today, datetime.max.time())
+    counts = _conditional_counts(db, {
+        "total": None,
+        "this_month": and_(LeadORM.entry_date >= start_of_month, LeadORM.entry_date < start_of_next_month),
+        "this_week": and_(LeadORM.entry_date >= start_of_week, LeadORM.entry_date <= end_of_today),
+        # Lead status is free text: compare case-insensitively on every backend, like the rollups
+        "open": func.lower(LeadORM.status) == "open",
+        "closed": func.lower(LeadORM.status) == "closed",
+        "future": func.lower(LeadORM.status) == "future",
+    })[0]
 
     return {
-        "total_leads": total_leads,
-        "leads_this_month": leads_this_month,
-        "leads_this_week": leads_this_week,
-        "open_leads": open_leads,
-        "closed_leads": closed_leads,
-        "future_leads":future_leads,
-        "latest_lead": latest_lead_data,
+        "total_leads": counts["total"],
+        "leads_this_month": counts["this_month"],
+        "leads_this_week": counts["this_week"],
+        "open_leads": counts["open"],
+        "closed_leads": counts["closed"],
+        "future_leads": counts["future"],
+        "latest_lead": _latest_lead(db),
     }
 
 
@@ -514,7 +422,10 @@ def get_vendor_stats(db: Session):
     today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
     seven_days_ago = today_start - timedelta(days=7)
 
-    total_vendors = db.query(func.count(Vendor.id)).scalar()
+    if dashboard_rollups.rollups_ready(db):
+        total_vendors = dashboard_rollups.daily_totals(db, "vendors")[0]
+    else:
+        total_vendors = db.query(func.count(Vendor.id)).scalar()
 
     # Raw Contacts (AutomationContactExtractORM)
     raw_contacts_today = db.query(func.count(AutomationContactExtractORM.id)).filter(
@@ -673,6 +584,302 @@ def get_job_metrics(db: Session) -> JobsMetrics:
     )
 
 
+# --------------- Single-pass aggregation helpers ---------------
+
+def _conditional_counts(db: Session, counters: Dict[str, Any], group_by=None) -> List[Dict[str, Any]]:
+    """
+    Evaluate several counters over one table in a single query: each counter is a filter
+    condition (None counts every row) turned into SUM(CASE WHEN ... THEN 1 ELSE 0 END).
+    Returns one dict per group_by value (under "group"), or a single dict without group_by.
+    """
+    columns = [
+        (func.count() if condition is None else func.coalesce(func.sum(case((condition, 1), else_=0)), 0)).label(name)
+        for name, condition in counters.items()
+    ]
+    if group_by is None:
+        return [{name: int(value) for name, value in db.query(*columns).one()._mapping.items()}]
+    rows = db.query(group_by.label("group"), *columns).group_by(group_by).all()
+    return [
+        {name: value if name == "group" else int(value) for name, value in row._mapping.items()}
+        for row in rows
+    ]
+
+
+def _batch_landmarks(db: Session, today: date):
+    """
+    (active batch count, latest active batch, batch before the most recently started one)
+    from one pass over started batches, using window functions for the rankings.
+    """
+    active = case((Batch.enddate >= today, 1), else_=0)
+    started = (
+        db.query(
+            Batch.batchid,
+            Batch.batchname,
+            active.label("active"),
+            func.row_number().over(order_by=desc(Batch.startdate)).label("started_rank"),
+            func.row_number().over(partition_by=active, order_by=desc(Batch.startdate)).label("active_rank"),
+            func.sum(active).over().label("active_count"),
+        )
+        .filter(Batch.startdate <= today)
+        .subquery()
+    )
+    rows = db.query(started).filter(
+        or_(started.c.started_rank == 2, and_(started.c.active == 1, started.c.active_rank == 1))
+    ).all()
+    latest = next((row for row in rows if row.active == 1 and row.active_rank == 1), None)
+    previous = next((row for row in rows if row.started_rank == 2), None)
+    active_count = int(rows[0].active_count or 0) if rows else 0
+    return active_count, latest, previous
+
+
+# --------------- Shared single-row lookups ---------------
+
+def _last_placement(db: Session):
+    last_placement = db.query(CandidatePlacementORM).order_by(
+        desc(CandidatePlacementORM.placement_date)
+    ).first()
+    if not last_placement:
+        return None
+    candidate_name = "Unknown"
+    if last_placement.candidate_id:
+        candidate = db.query(CandidateORM).filter(
+            CandidateORM.id == last_placement.candidate_id
+        ).first()
+        if candidate:
+            candidate_name = candidate.full_name or f"Candidate {last_placement.candidate_id}"
+    return {
+        "candidate_name": candidate_name,
+        "company": last_placement.company,
+        "placement_date": last_placement.placement_date,
+        "position": last_placement.position
+    }
+
+
+def _latest_lead(db: Session):
+    latest_lead = db.query(LeadORM).order_by(LeadORM.entry_date.desc()).first()
+    if not latest_lead:
+        return None
+    return {
+        "id": latest_lead.id,
+        "full_name": latest_lead.full_name,
+        "entry_date": latest_lead.entry_date.isoformat() if latest_lead.entry_date else None,
+        "phone": latest_lead.phone,
+        "email": latest_lead.email,
+        "workstatus": latest_lead.workstatus,
+        "status": latest_lead.status
+    }
+
+
+def _upcoming_interviews(db: Session) -> int:
+    next_week = date.today() + timedelta(days=7)
+    return db.query(CandidateInterview).filter(
+        CandidateInterview.interview_date >= datetime.now(),
+        CandidateInterview.interview_date <= datetime.combine(next_week, datetime.max.time())
+    ).count()
+
+
+def _active_marketing_counts(db: Session) -> Tuple[int, int, int, int]:
+    """(active marketing candidates, priority 1, priority 2, priority 3)."""
+    row = db.query(
+        func.count(CandidateORM.id),
+        func.coalesce(func.sum(case((CandidateMarketingORM.priority == 1, 1), else_=0)), 0),
+        func.coalesce(func.sum(case((CandidateMarketingORM.priority == 2, 1), else_=0)), 0),
+        func.coalesce(func.sum(case((CandidateMarketingORM.priority == 3, 1), else_=0)), 0),
+    ).join(
+        CandidateMarketingORM,
+        CandidateMarketingORM.candidate_id == CandidateORM.id
+    ).filter(
+        CandidateMarketingORM.status == "active"
+    ).one()
+    return tuple(int(value) for value in row)
+
+
+# --------------- Rollup-backed metric groups (see utils/dashboard_rollups.py) ---------------
+
+def _batch_metrics_from_rollups(db: Session) -> Dict[str, Any]:
+    today = date.today()
+    active_count, latest, previous = _batch_landmarks(db, today)
+    per_batch = dashboard_rollups.batch_totals(
+        db, [b.batchid for b in (latest, previous) if b is not None]
+    )
+    status_dict = {
+        status or None: count
+        for status, count in dashboard_rollups.daily_breakdown(db, "candidates").items()
+    }
+    status_dict["Placements"] = dashboard_rollups.daily_totals(db, "placements")[0]
+    return {
+        "current_active_batches": latest.batchname if latest else "No active batches",
+        "current_active_batches_count": active_count,
+        "enrolled_candidates_current": per_batch.get(latest.batchid, (0, 0))[0] if latest else 0,
+        "total_candidates": dashboard_rollups.daily_totals(db, "candidates")[0],
+        "candidates_previous_batch": per_batch.get(previous.batchid, (0, 0))[0] if previous else 0,
+        "new_enrollments_month": dashboard_rollups.daily_totals(db, "candidates", start=today.replace(day=1))[0],
+        "candidate_status_breakdown": status_dict
+    }
+
+
+def _financial_metrics_from_rollups(db: Session) -> Dict[str, Any]:
+    today = date.today()
+    current_batch = (
+        db.query(Batch)
+        .filter(Batch.startdate <= today, Batch.enddate >= today)
+        .order_by(desc(Batch.startdate))
+        .first()
+    )
+    previous_batch = (
+        db.query(Batch)
+        .filter(Batch.startdate < today)
+        .order_by(desc(Batch.startdate))
+        .offset(1)
+        .first()
+    )
+    per_batch = dashboard_rollups.batch_totals(
+        db, [b.batchid for b in (current_batch, previous_batch) if b is not None]
+    )
+
+    rollup = DashboardBatchRollupORM
+    query = db.query(Batch.batchname, rollup.fee_paid_total).join(rollup, rollup.batchid == Batch.batchid).filter(
+        rollup.candidate_count > 0
+    )
+    if current_batch:
+        query = query.filter(Batch.batchid != current_batch.batchid)
+    top_batches_list = [
+        {"batch_name": name, "total_fee": float(total_fee or 0)}
+        for name, total_fee in query.order_by(desc(Batch.startdate)).limit(5).all()
+    ]
+
+    collected = [AmountCollectedEnum.yes.value]
+    _, total_expected = dashboard_rollups.daily_totals(db, "placement_fees")
+    completed_installments, total_collected = dashboard_rollups.daily_totals(
+        db, "placement_fees", dimensions=collected
+    )
+    _, collected_this_month = dashboard_rollups.daily_totals(
+        db, "placement_fees", start=today.replace(day=1), dimensions=collected
+    )
+    pending_installments, _ = dashboard_rollups.daily_totals(
+        db, "placement_fees", dimensions=[AmountCollectedEnum.no.value]
+    )
+
+    return {
+        "total_fee_current_batch": per_batch.get(current_batch.batchid, (0, 0.0))[1] if current_batch else 0.0,
+        "fee_collected_previous_batch": per_batch.get(previous_batch.batchid, (0, 0.0))[1] if previous_batch else 0.0,
+        "top_batches_fee": top_batches_list,
+        "placement_fee_metrics": {
+            "total_expected": total_expected,
+            "total_collected": total_collected,
+            "total_pending": total_expected - total_collected,
+            "collected_this_month": collected_this_month,
+            "installment_stats": {
+                "completed": completed_installments,
+                "pending": pending_installments
+            }
+        }
+    }
+
+
+def _placement_metrics_from_rollups(db: Session) -> Dict[str, Any]:
+    today = date.today()
+    last_day_prev_month = today.replace(day=1) - timedelta(days=1)
+    return {
+        "total_placements": dashboard_rollups.daily_totals(db, "placements")[0],
+        "placements_year": dashboard_rollups.daily_totals(db, "placements", start=today.replace(month=1, day=1))[0],
+        "placements_last_month": dashboard_rollups.daily_totals(
+            db, "placements", start=last_day_prev_month.replace(day=1), end=last_day_prev_month
+        )[0],
+        "last_placement": _last_placement(db),
+        "active_placements": dashboard_rollups.daily_totals(db, "placements", dimensions=["Active"])[0]
+    }
+
+
+def _interview_metrics_from_rollups(db: Session) -> Dict[str, Any]:
+    today = date.today()
+    next_month = (today.replace(day=28) + timedelta(days=4)).replace(day=1)
+    marketing_candidates, priority_1, priority_2, priority_3 = _active_marketing_counts(db)
+    return {
+        "upcoming_interviews": _upcoming_interviews(db),
+        "total_interviews": dashboard_rollups.daily_totals(db, "interviews")[0],
+        "interviews_month": dashboard_rollups.daily_totals(
+            db, "interviews", start=today.replace(day=1), end=next_month - timedelta(days=1)
+        )[0],
+        "interviews_today": dashboard_rollups.daily_totals(db, "interviews", start=today, end=today)[0],
+        "marketing_candidates": marketing_candidates,
+        "priority_1_candidates": priority_1,
+        "priority_2_candidates": priority_2,
+        "priority_3_candidates": priority_3,
+        "feedback_breakdown": {
+            feedback or "No Feedback": count
+            for feedback, count in dashboard_rollups.daily_breakdown(db, "interviews").items()
+        }
+    }
+
+
+def _lead_metrics_from_rollups(db: Session) -> Dict[str, Any]:
+    today = date.today()
+    next_month = (today.replace(day=28) + timedelta(days=4)).replace(day=1)
+    # Lead status is free text; match it case-insensitively like the MySQL collation does
+    by_status: Dict[str, int] = {}
+    for status, count in dashboard_rollups.daily_breakdown(db, "leads").items():
+        by_status[status.lower()] = by_status.get(status.lower(), 0) + count
+    return {
+        "total_leads": dashboard_rollups.daily_totals(db, "leads")[0],
+        "leads_this_month": dashboard_rollups.daily_totals(
+            db, "leads", start=today.replace(day=1), end=next_month - timedelta(days=1)
+        )[0],
+        "leads_this_week": dashboard_rollups.daily_totals(
+            db, "leads", start=today - timedelta(days=today.weekday()), end=today
+        )[0],
+        "open_leads": by_status.get("open", 0),
+        "closed_leads": by_status.get("closed", 0),
+        "future_leads": by_status.get("future", 0),
+        "latest_lead": _latest_lead(db),
+    }
+
+
+# Independent /metrics/all groups, computed concurrently by get_dashboard_metric_groups
+DASHBOARD_METRIC_GROUPS: Dict[str, Callable[[Session], Any]] = {
+    "batch_metrics": get_batch_metrics,
+    "financial_metrics": get_financial_metrics,
+    "placement_metrics": get_placement_metrics,
+    "interview_metrics": get_interview_metrics,
+    "employee_task_metrics": get_employee_task_metrics,
+    "jobs_metrics": get_job_metrics,
+}
+
+
+def _run_metric_group(func: Callable[[Session], Any]) -> Any:
+    db = database.SessionLocal()
+    try:
+        return func(db)
+    finally:
+        db.close()
+
+
+def get_dashboard_metric_groups() -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    Compute every DASHBOARD_METRIC_GROUPS entry in parallel, each on its own pooled session.
+    Returns (results, errors): a group that fails or misses the shared deadline is left out of
+    results and reported in errors as "timeout" or "error". A timed-out group keeps running
+    and its cached result serves the next request.
+    """
+    futures = {
+        name: _metrics_executor.submit(_run_metric_group, func)
+        for name, func in DASHBOARD_METRIC_GROUPS.items()
+    }
+    deadline = time.monotonic() + config.DASHBOARD_METRIC_GROUP_TIMEOUT_SECONDS
+    results: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    for name, future in futures.items():
+        try:
+            results[name] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            logger.warning(f"Dashboard metric group {name} timed out")
+            errors[name] = "timeout"
+        except Exception as e:
+            logger.error(f"Dashboard metric group {name} failed: {e}")
+            errors[name] = "error"
+    return results, errors
+
+
 # Dashboard-specific functions for employee tasks and jobs
 def get_tasks_by_employee_id_for_dashboard(db: Session, employee_id: int) -> List[dict]:
     tasks = db.query(EmployeeTaskORM).filter(EmployeeTaskORM.employee_id == employee_id).all()
@@ -6,7 +6,10 @@ from sqlalchemy.orm import Session
 from fapi.db.models import CampaignEmailORM
 from fapi.db.schemas import CampaignEmailCreate, CampaignEmailUpdate
 from fapi.utils.table_fingerprint import generate_version_for_model
+from fapi.utils.export_utils import export_response
+from fapi.utils.pagination_utils import apply_keyset, decode_cursor, encode_cursor, estimated_total, fetch_page
 from fastapi import Response, HTTPException
+from fastapi.responses import StreamingResponse
 from fapi.core.cache import cache_result, invalidate_cache
 
 logger = logging.getLogger(__name__)
@@ -39,12 +42,7 @@ def get_all(
     return query.all()
 
 
-@cache_result(ttl=300, prefix=CACHE_PREFIX)
-def get_paginated(
-    db: Session, page: int, limit: int, search: str, search_by: str, sort: str
-):
-    query = db.query(CampaignEmailORM)
-
+def _apply_search(query, search: Optional[str], search_by: str):
     if search:
         if search_by == "vendor_email":
             query = query.filter(CampaignEmailORM.vendor_email.ilike(f"%{search}%"))
@@ -63,6 +61,32 @@ def get_paginated(
                     cast(CampaignEmailORM.candidate_id, String).ilike(f"%{search}%"),
                 )
             )
+    return query
+
+
+@cache_result(ttl=300, prefix=CACHE_PREFIX)
+def get_paginated(
+    db: Session, page: int, limit: int, search: str, search_by: str, sort: str,
+    cursor: Optional[str] = None, include_total: bool = False,
+):
+    query = _apply_search(db.query(CampaignEmailORM), search, search_by)
+
+    if cursor is not None:
+        # Keyset mode: seek on (sort column, id); the cursor only fits the ordering asked for
+        sort_key = sort or "created_at:desc"
+        if "," in sort_key:
+            raise HTTPException(status_code=400, detail="Cursor pagination supports a single sort field")
+        col, _, direction = sort_key.partition(":")
+        if not hasattr(CampaignEmailORM, col):
+            raise HTTPException(status_code=400, detail=f"Cannot sort by field: {col}")
+        total = estimated_total(db, CampaignEmailORM, query, filtered=bool(search)) if include_total else None
+        query = apply_keyset(
+            query, getattr(CampaignEmailORM, col), CampaignEmailORM.id, direction == "desc",
+            decode_cursor(cursor, sort_key),
+        )
+        emails, has_next = fetch_page(query, limit)
+        next_cursor = encode_cursor(sort_key, getattr(emails[-1], col), emails[-1].id) if has_next else None
+        return {"data": emails, "total": total, "page": None, "limit": limit, "next_cursor": next_cursor}
 
     if sort:
         sort_fields = sort.split(",")
@@ -78,6 +102,15 @@ def get_paginated(
     return {"data": emails, "total": total, "page": page, "limit": limit}
 
 
+def export(
+    db: Session, export_format: str = "ndjson", search: Optional[str] = None, search_by: str = "all"
+) -> StreamingResponse:
+    """Stream campaign emails (newest first) as NDJSON or CSV."""
+    query = _apply_search(db.query(*CampaignEmailORM.__table__.columns), search, search_by)
+    query = query.order_by(CampaignEmailORM.created_at.desc(), CampaignEmailORM.id.desc())
+    return export_response(query, export_format, "campaign_emails")
+
+
 @cache_result(ttl=300, prefix=CACHE_PREFIX)
 def get_by_id(db: Session, record_id: int) -> CampaignEmailORM:
     row = db.query(CampaignEmailORM).filter(
@@ -1,6 +1,6 @@
 # wbl-backend/fapi/utils/candidate_utils.py
 from sqlalchemy.orm import Session, joinedload, selectinload,contains_eager
-from sqlalchemy import or_, func, distinct
+from sqlalchemy import or_, func, distinct, exists, case
 from fapi.db.database import SessionLocal,get_db
 from fapi.core.cache import cache_result, invalidate_cache
 from fapi.utils.google_calendar_utils import create_calendar_event, update_calendar_event, delete_calendar_event, create_meet_event
@@ -11,8 +11,11 @@ from fapi.utils.encryption_utils import decrypt_api_key
 from fapi.db.schemas import CandidateMarketingCreate, CandidateInterviewCreate, CandidateBase, BatchOut, CandidatePlacementUpdate, CandidateMarketingUpdate, CandidateInterviewUpdate, CandidatePreparationCreate, CandidatePreparationUpdate, CandidateInterviewOut
 from fapi.db.schemas import PositionStatusEnum, PositionTypeEnum, EmploymentModeEnum
 from fastapi import HTTPException, APIRouter, Depends, Response
+from fastapi.responses import StreamingResponse
 import hashlib
-from fapi.utils.table_fingerprint import generate_version_for_model, get_model_fingerprint
+from fapi.utils.table_fingerprint import generate_version_for_model, get_model_version_fingerprint
+from fapi.utils.export_utils import export_response
+from fapi.utils.pagination_utils import apply_keyset, decode_cursor, encode_cursor, estimated_total, fetch_page
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta, date
 import re
@@ -22,20 +25,7 @@ import logging
 logger = logging.getLogger(__name__)
 router = APIRouter()
       
-@cache_result(ttl=300, prefix="candidates")
-def get_all_candidates_paginated(
-    db: Session,
-    page: int = 1,
-    limit: int = 0,
-    search: str = None,
-    search_by: str = "all",
-    sort: str = "enrolled_date:desc"
-) -> Dict[str, Any]:
-    query = (
-        db.query(CandidateORM)
-        .options(joinedload(CandidateORM.batch)) 
-    )
-
+def _apply_candidate_search(query, search: Optional[str], search_by: str):
     if search:
         if search_by == "id":
             try:
@@ -56,23 +46,59 @@ def get_all_candidates_paginated(
                     CandidateORM.phone.ilike(f"%{search}%"),
                 )
             )
+    return query
 
-    # Apply sorting
-    if sort:
-        sort_fields = sort.split(",")
-        for field in sort_fields:
-            col, direction = field.split(":")
-            if not hasattr(CandidateORM, col):
-                raise HTTPException(status_code=400, detail=f"Cannot sort by field: {col}")
-            column = getattr(CandidateORM, col)
-            query = query.order_by(column.desc() if direction == "desc" else column.asc())
 
-    total = query.count()
-
-    if limit > 0:
-        candidates = query.offset((page - 1) * limit).limit(limit).all()
+@cache_result(ttl=300, prefix="candidates", stale_ttl=120)
+def get_all_candidates_paginated(
+    db: Session,
+    page: int = 1,
+    limit: int = 0,
+    search: str = None,
+    search_by: str = "all",
+    sort: str = "enrolled_date:desc",
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+) -> Dict[str, Any]:
+    query = (
+        db.query(CandidateORM)
+        .options(joinedload(CandidateORM.batch)) 
+    )
+    query = _apply_candidate_search(query, search, search_by)
+
+    next_cursor = None
+    if cursor is not None:
+        # Keyset mode: seek on (sort column, id) instead of OFFSET, no exact COUNT
+        sort = sort or "enrolled_date:desc"
+        if "," in sort:
+            raise HTTPException(status_code=400, detail="Cursor pagination supports a single sort field")
+        col, direction = sort.split(":")
+        if not hasattr(CandidateORM, col):
+            raise HTTPException(status_code=400, detail=f"Cannot sort by field: {col}")
+        column = getattr(CandidateORM, col)
+        total = estimated_total(db, CandidateORM, query, filtered=bool(search)) if include_total else None
+        query = apply_keyset(query, column, CandidateORM.id, direction == "desc", decode_cursor(cursor, sort))
+        candidates, has_next = fetch_page(query, limit if limit > 0 else 100)
+        if has_next:
+            last = candidates[-1]
+            next_cursor = encode_cursor(sort, getattr(last, col), last.id)
     else:
-        candidates = query.all()
+        # Apply sorting
+        if sort:
+            sort_fields = sort.split(",")
+            for field in sort_fields:
+                col, direction = field.split(":")
+                if not hasattr(CandidateORM, col):
+                    raise HTTPException(status_code=400, detail=f"Cannot sort by field: {col}")
+                column = getattr(CandidateORM, col)
+                query = query.order_by(column.desc() if direction == "desc" else column.asc())
+
+        total = query.count()
+
+        if limit > 0:
+            candidates = query.offset((page - 1) * limit).limit(limit).all()
+        else:
+            candidates = query.all()
 
     # Get active preparation and marketing statuses efficiently
     active_prep_ids = {r[0] for r in db.query(CandidatePreparation.candidate_id).filter(CandidatePreparation.status == "active").all()}
@@ -93,9 +119,43 @@ def get_all_candidates_paginated(
 
         data.append(item)
 
+    if cursor is not None:
+        return {"data": data, "total": total, "page": None, "limit": limit, "next_cursor": next_cursor}
     return {"data": data, "total": total, "page": page, "limit": limit}
 
 
+def export_candidates(
+    db: Session,
+    export_format: str = "ndjson",
+    search: str = None,
+    search_by: str = "all",
+) -> StreamingResponse:
+    """
+    Stream candidates with the same extra columns as the grid (batchname, is_in_prep,
+    is_in_marketing) as NDJSON or CSV, computed in SQL rather than per row.
+    """
+    in_prep = exists().where(
+        CandidatePreparation.candidate_id == CandidateORM.id,
+        CandidatePreparation.status == "active",
+    )
+    in_marketing = exists().where(
+        CandidateMarketingORM.candidate_id == CandidateORM.id,
+        CandidateMarketingORM.status == "active",
+    )
+    query = (
+        db.query(
+            *CandidateORM.__table__.columns,
+            Batch.batchname,
+            case((in_prep, "Yes"), else_="No").label("is_in_prep"),
+            case((in_marketing, "Yes"), else_="No").label("is_in_marketing"),
+        )
+        .outerjoin(Batch, CandidateORM.batchid == Batch.batchid)
+    )
+    query = _apply_candidate_search(query, search, search_by)
+    query = query.order_by(CandidateORM.enrolled_date.desc(), CandidateORM.id.desc())
+    return export_response(query, export_format, "candidates")
+
+
 @cache_result(ttl=300, prefix="candidates")
 def get_candidate_by_id(db: Session, candidate_id: int) -> Dict:
     try:
@@ -1646,10 +1706,10 @@ def get_marketing_version(db: Session) -> Response:
     active Preparation mappings (instructors), Employee/Instructor details, 
     and core Candidate details.
     """
-    f1 = get_model_fingerprint(db, CandidateMarketingORM)
-    f2 = get_model_fingerprint(db, CandidatePreparation)
-    f3 = get_model_fingerprint(db, EmployeeORM)
-    f4 = get_model_fingerprint(db, CandidateORM)
+    f1 = get_model_version_fingerprint(db, CandidateMarketingORM)
+    f2 = get_model_version_fingerprint(db, CandidatePreparation)
+    f3 = get_model_version_fingerprint(db, EmployeeORM)
+    f4 = get_model_version_fingerprint(db, CandidateORM)
     
     combined_fingerprint = f"{f1}|{f2}|{f3}|{f4}"
     version_hash = hashlib.md5(combined_fingerprint.encode()).hexdigest()
@@ -1673,9 +1733,9 @@ def get_preparations_version(db: Session) -> Response:
     Combined version of Preparation depends on Preparation records,
     Employee/Instructor details, and core Candidate details.
     """
-    f1 = get_model_fingerprint(db, CandidatePreparation)
-    f2 = get_model_fingerprint(db, EmployeeORM)
-    f3 = get_model_fingerprint(db, CandidateORM)
+    f1 = get_model_version_fingerprint(db, CandidatePreparation)
+    f2 = get_model_version_fingerprint(db, EmployeeORM)
+    f3 = get_model_version_fingerprint(db, CandidateORM)
     
     combined_fingerprint = f"{f1}|{f2}|{f3}"
     version_hash = hashlib.md5(combined_fingerprint.encode()).hexdigest()
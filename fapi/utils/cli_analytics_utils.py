@@ -6,6 +6,8 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy import and_, func
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
@@ -25,9 +27,15 @@ from fapi.db.schemas import (
     PaginatedCliUsageUsers,
     CliUsageEventOut,
 )
+from fapi.utils.export_utils import export_response
+from fapi.utils.pagination_utils import apply_keyset, decode_cursor, encode_cursor, estimated_total, fetch_page
 
 logger = logging.getLogger(__name__)
 
+# Cursor sort keys for get_paginated_users (analytics table vs. raw-event fallback)
+_ANALYTICS_SORT = "last_activity:desc"
+_EVENTS_SORT = "last_event_at:desc"
+
 _SENSITIVE_SUBSTRINGS = (
     "password",
     "token",
@@ -484,24 +492,54 @@ def get_paginated_users(
     page: int = 1,
     page_size: int = 50,
     user_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
 ) -> PaginatedCliUsageUsers:
-    """One row per user from wboxcli_apply_analytics (same columns as AG Grid)."""
+    """
+    One row per user from wboxcli_apply_analytics (same columns as AG Grid).
+    A cursor (empty for the first page) switches to keyset pagination on
+    (last activity, user_id); the total is then only computed on request.
+    """
     page = max(1, page)
     page_size = max(1, min(page_size, 500))
 
+    # Later cursor pages stay on the source (analytics table or raw events) the first page used
+    analytics_cursor = events_cursor = None
+    if cursor:
+        try:
+            analytics_cursor = decode_cursor(cursor, _ANALYTICS_SORT)
+        except HTTPException:
+            events_cursor = decode_cursor(cursor, _EVENTS_SORT)
+
     query = db.query(WboxcliApplyAnalyticsORM)
     if user_id:
         query = query.filter(WboxcliApplyAnalyticsORM.user_id.ilike(f"%{user_id.strip()}%"))
 
-    total = query.count()
-    analytics = (
-        query.order_by(WboxcliApplyAnalyticsORM.last_activity.desc())
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-        .all()
-    )
+    next_cursor = None
+    if cursor is not None:
+        analytics = []
+        if events_cursor is None:
+            total = (
+                estimated_total(db, WboxcliApplyAnalyticsORM, query, filtered=bool(user_id))
+                if include_total else None
+            )
+            keyset = apply_keyset(
+                query, WboxcliApplyAnalyticsORM.last_activity, WboxcliApplyAnalyticsORM.user_id,
+                True, analytics_cursor,
+            )
+            analytics, has_next = fetch_page(keyset, page_size)
+            if has_next:
+                next_cursor = encode_cursor(_ANALYTICS_SORT, analytics[-1].last_activity, analytics[-1].user_id)
+    else:
+        total = query.count()
+        analytics = (
+            query.order_by(WboxcliApplyAnalyticsORM.last_activity.desc())
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+            .all()
+        )
 
-    if analytics:
+    if analytics or analytics_cursor is not None:
         event_ids = [int(r.usage_event_id) for r in analytics if r.usage_event_id]
         events_by_id: Dict[int, CliUsageEventORM] = {}
         if event_ids:
@@ -522,10 +560,11 @@ def get_paginated_users(
             for row in analytics
         ]
         return PaginatedCliUsageUsers(
-            total=int(total),
-            page=page,
+            total=int(total) if total is not None else None,
+            page=None if cursor is not None else page,
             page_size=page_size,
             users=users,
+            next_cursor=next_cursor,
         )
 
     # Fallback before backfill / first apply ingest
@@ -536,14 +575,23 @@ def get_paginated_users(
     if user_id:
         base = base.filter(CliUsageEventORM.user_id.ilike(f"%{user_id.strip()}%"))
     grouped = base.group_by(CliUsageEventORM.user_id).subquery()
-    total = db.query(func.count()).select_from(grouped).scalar() or 0
-    rows = (
-        db.query(grouped)
-        .order_by(grouped.c.last_event_at.desc())
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-        .all()
-    )
+    if cursor is not None:
+        total = (db.query(func.count()).select_from(grouped).scalar() or 0) if include_total else None
+        keyset = apply_keyset(
+            db.query(grouped), grouped.c.last_event_at, grouped.c.user_id, True, events_cursor,
+        )
+        rows, has_next = fetch_page(keyset, page_size)
+        if has_next:
+            next_cursor = encode_cursor(_EVENTS_SORT, rows[-1].last_event_at, rows[-1].user_id)
+    else:
+        total = db.query(func.count()).select_from(grouped).scalar() or 0
+        rows = (
+            db.query(grouped)
+            .order_by(grouped.c.last_event_at.desc())
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+            .all()
+        )
     page_user_ids = [row.user_id for row in rows]
     events_by_user: Dict[str, CliUsageEventORM] = {}
     if page_user_ids:
@@ -564,10 +612,11 @@ def get_paginated_users(
             )
         )
     return PaginatedCliUsageUsers(
-        total=int(total),
-        page=page,
+        total=int(total) if total is not None else None,
+        page=None if cursor is not None else page,
         page_size=page_size,
         users=users,
+        next_cursor=next_cursor,
     )
 
 
@@ -664,3 +713,17 @@ def get_paginated_events(
         page_size=page_size,
         events=[CliUsageEventOut.model_validate(r) for r in rows],
     )
+
+
+def export_usage_events(
+    db: Session,
+    *,
+    export_format: str = "ndjson",
+    user_id: Optional[str] = None,
+) -> StreamingResponse:
+    """Stream CLI usage events (newest first) as NDJSON or CSV."""
+    query = db.query(*CliUsageEventORM.__table__.columns)
+    if user_id:
+        query = query.filter(CliUsageEventORM.user_id == user_id)
+    query = query.order_by(CliUsageEventORM.event_ts.desc(), CliUsageEventORM.id.desc())
+    return export_response(query, export_format, "cli_usage_events")
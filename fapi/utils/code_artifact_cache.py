@@ -0,0 +1,123 @@
+"""
+On-disk cache of compiled CoderPad artifacts (Java classes, C/C++, Go and Rust binaries).
+
+Entries are keyed by a hash of language, toolchain version and source, so a submission is
+compiled once and every test case (and every identical re-run) reuses the build. The cache
+is bounded by entry count and evicts least-recently-used entries by directory mtime. Entries
+held with use() (compiling or running) are never evicted by this process.
+"""
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from fapi.core import config
+
+logger = logging.getLogger(__name__)
+
+
+class ArtifactCache:
+    def __init__(self, root: str, max_entries: int):
+        self.root = root
+        self.max_entries = max_entries
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+        self._in_use: Dict[str, int] = {}
+
+    @staticmethod
+    def key(language: str, toolchain: str, code: str) -> str:
+        digest = hashlib.sha256()
+        for part in (language, toolchain, code):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def lock(self, key: str) -> threading.Lock:
+        """Per-key lock so concurrent test cases of one submission compile it only once."""
+        with self._locks_lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    @contextmanager
+    def use(self, key: str) -> Iterator[None]:
+        """Pin an entry while it is being built or executed so eviction skips it."""
+        with self._locks_lock:
+            self._in_use[key] = self._in_use.get(key, 0) + 1
+        try:
+            yield
+        finally:
+            with self._locks_lock:
+                remaining = self._in_use[key] - 1
+                if remaining:
+                    self._in_use[key] = remaining
+                else:
+                    del self._in_use[key]
+
+    def get(self, key: str) -> Optional[str]:
+        """Directory of a cached build, refreshing its LRU position, or None."""
+        path = os.path.join(self.root, key)
+        if not os.path.isdir(path):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def new_build_dir(self) -> str:
+        os.makedirs(self.root, exist_ok=True)
+        return tempfile.mkdtemp(prefix=".build-", dir=self.root)
+
+    def put(self, key: str, build_dir: str) -> str:
+        """Publish a finished build directory under its key and evict old entries."""
+        path = os.path.join(self.root, key)
+        try:
+            os.rename(build_dir, path)
+        except OSError:
+            # Another process published the same key first; keep theirs
+            shutil.rmtree(build_dir, ignore_errors=True)
+        self._evict(keep=key)
+        return path
+
+    def discard(self, build_dir: str) -> None:
+        shutil.rmtree(build_dir, ignore_errors=True)
+
+    def invalidate(self, key: str) -> None:
+        """Drop an entry found broken (e.g. partly removed by another process)."""
+        shutil.rmtree(os.path.join(self.root, key), ignore_errors=True)
+
+    def _evict(self, keep: str) -> None:
+        try:
+            entries = [
+                entry for entry in os.scandir(self.root)
+                if entry.is_dir() and not entry.name.startswith(".") and entry.name != keep
+            ]
+        except OSError:
+            return
+        excess = len(entries) + 1 - self.max_entries
+        if excess <= 0:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        evicted = 0
+        for entry in entries:
+            if evicted >= excess:
+                break
+            with self._locks_lock:
+                if entry.name in self._in_use:
+                    continue
+                self._locks.pop(entry.name, None)
+            shutil.rmtree(entry.path, ignore_errors=True)
+            evicted += 1
+        logger.debug(f"Evicted {evicted} compiled artifacts from {self.root}")
+
+
+artifact_cache = ArtifactCache(
+    root=config.CODERPAD_ARTIFACT_CACHE_DIR,
+    max_entries=config.CODERPAD_ARTIFACT_CACHE_MAX_ENTRIES,
+)
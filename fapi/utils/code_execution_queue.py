@@ -0,0 +1,342 @@
+"""
+Bounded execution queue for CoderPad runs.
+
+Runs are submitted as jobs and executed on a fixed pool of worker threads, so a burst of
+learners pressing Run cannot exhaust the API server's request threadpool. Admission control
+rejects new jobs (QueueFullError, surfaced as 429) when the queue is full or the user already
+has too many runs in flight. Each job keeps an ordered event log (queued, running, output,
+test_result, result/error) that the status and SSE endpoints read; finished jobs are kept for
+CODERPAD_EXEC_JOB_TTL_SECONDS.
+
+The API runs as several Cloud Run instances, so the queue is shared through Redis where it
+matters across instances, so a status or events request routed to another instance can be
+answered from there:
+- {APP_ENV}:coderpad:job:<id> holds the job's small status record.
+- {APP_ENV}:coderpad:job:<id>:events is a list the event log is appended to. Only new events
+  are sent. A background thread batches every job's pending events into one pipeline each
+  CODERPAD_EXEC_PUBLISH_INTERVAL_SECONDS. Admission and completion are written immediately.
+- {APP_ENV}:coderpad:inflight:<user> is a sorted set of the user's running job ids, scored
+  by when each slot lapses, so the per-user cap holds across instances. It is checked and
+  taken in one Lua script, and a slot leaked by a crashed instance lapses on its own after
+  CODERPAD_EXEC_JOB_TTL_SECONDS.
+Both fail open to this instance's own view when Redis is unavailable. The queue length cap
+stays per instance.
+
+Deployment: jobs accepted with 202 keep running after the response has been sent, so the
+service must run with CPU always allocated (gcloud run deploy --no-cpu-throttling);
+otherwise queued runs stall between requests. Without Redis, job reads also need session
+affinity (--session-affinity) to reach the instance that owns the job.
+"""
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from fapi.core import config
+from fapi.core.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_ERROR = "error"
+
+# Drop lapsed slots, then take one if the user is under the limit: 1 if taken, 0 if not
+_ACQUIRE_SLOT_SCRIPT = """
+redis.call('zremrangebyscore', KEYS[1], '-inf', ARGV[3])
+if redis.call('zcard', KEYS[1]) >= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('zadd', KEYS[1], ARGV[4], ARGV[2])
+redis.call('expire', KEYS[1], ARGV[5])
+return 1
+"""
+
+
+class QueueFullError(Exception):
+    def __init__(self, message: str, queue_position: int):
+        super().__init__(message)
+        self.queue_position = queue_position
+
+
+@dataclass
+class ExecutionJob:
+    id: str
+    user_id: Any
+    status: str = JOB_QUEUED
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    finished_at: Optional[float] = None
+    future: Optional[Future] = None
+    # Read from Redis: the job runs on another instance and this copy does not update
+    remote: bool = False
+    listener: Optional[Callable[["ExecutionJob"], None]] = field(default=None, repr=False)
+    # How many of events are already in Redis
+    published: int = field(default=0, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JOB_DONE, JOB_ERROR)
+
+    def emit(self, event: str, data: Dict[str, Any]) -> None:
+        # list.append is atomic; readers only ever look at a prefix of the log
+        self.events.append({"event": event, "data": data})
+        if self.listener is not None:
+            self.listener(self)
+
+
+class ExecutionQueue:
+    def __init__(
+        self, workers: int, max_queued: int, max_per_user: int, job_ttl_seconds: int,
+        publish_interval_seconds: float = 0.25,
+    ):
+        self.max_queued = max_queued
+        self.max_per_user = max_per_user
+        self.job_ttl_seconds = job_ttl_seconds
+        self.publish_interval_seconds = publish_interval_seconds
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="coderpad-exec")
+        self._jobs: Dict[str, ExecutionJob] = {}
+        self._queued: Deque[str] = deque()
+        # Jobs whose user holds a slot in the shared Redis in-flight counter
+        self._counted: set = set()
+        # Jobs with events or state not yet sent to Redis, flushed by the publisher thread
+        self._unpublished: Dict[str, ExecutionJob] = {}
+        self._publisher: Optional[threading.Thread] = None
+        self._publish_lock = threading.Lock()
+        self._lock = threading.Lock()
+
+    def submit(self, user_id: Any, fn: Callable[..., Dict[str, Any]], *args: Any) -> ExecutionJob:
+        """
+        Queue fn(job, *args) for execution. fn returns the JSON-able result and may call
+        job.emit for incremental events. Raises QueueFullError when admission is refused.
+        """
+        with self._lock:
+            self._prune()
+            if len(self._queued) >= self.max_queued:
+                raise QueueFullError("Execution queue is full, please retry shortly", len(self._queued) + 1)
+            in_flight = sum(
+                1 for job in self._jobs.values() if job.user_id == user_id and not job.finished
+            )
+        job_id = uuid.uuid4().hex
+        shared = self._acquire_slot(user_id, job_id)
+        if shared is False or (shared is None and in_flight >= self.max_per_user):
+            raise QueueFullError(
+                "Too many executions in progress, wait for one to finish", len(self._queued) + 1
+            )
+        with self._lock:
+            job = ExecutionJob(id=job_id, user_id=user_id, listener=self._mark_unpublished)
+            if shared:
+                self._counted.add(job.id)
+            self._jobs[job.id] = job
+            self._queued.append(job.id)
+            position = len(self._queued)
+        job.emit(JOB_QUEUED, {"queue_position": position})
+        # Readable from every instance before the 202 goes out
+        self._publish([job])
+        job.future = self._executor.submit(self._run, job, fn, args)
+        return job
+
+    def _run(self, job: ExecutionJob, fn: Callable[..., Dict[str, Any]], args: tuple) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._queued.remove(job.id)
+        job.status = JOB_RUNNING
+        job.emit(JOB_RUNNING, {})
+        try:
+            job.result = fn(job, *args)
+            job.emit("result", job.result)
+            job.status = JOB_DONE
+        except Exception as e:
+            logger.error(f"CoderPad execution job {job.id} failed: {e}", exc_info=True)
+            job.error = "Code execution failed"
+            job.emit(JOB_ERROR, {"detail": job.error})
+            job.status = JOB_ERROR
+        finally:
+            job.finished_at = time.monotonic()
+            self._publish([job])
+            if job.id in self._counted:
+                self._counted.discard(job.id)
+                self._release_slot(job.user_id, job.id)
+        return job.result
+
+    def get(self, job_id: str, user_id: Any) -> Optional[ExecutionJob]:
+        """
+        The job, if it exists and belongs to user_id: this instance's live copy, or a
+        snapshot from Redis (remote=True) for a job running on another instance.
+        """
+        job = self._jobs.get(job_id) or self._load(job_id)
+        if job is None or job.user_id != user_id:
+            return None
+        return job
+
+    def refresh(self, job: ExecutionJob) -> Optional[ExecutionJob]:
+        """
+        A newer copy of a remote job: its current state plus only the events published since
+        job was read. None once the job has expired. Local jobs are returned as they are.
+        """
+        if not job.remote:
+            return job
+        return self._load(job.id, job.events)
+
+    def position(self, job: ExecutionJob) -> Optional[int]:
+        """1-based position among queued jobs, or None once the job has started."""
+        if job.remote:
+            # Last position the owning instance published
+            if job.status != JOB_QUEUED:
+                return None
+            queued = [e["data"].get("queue_position") for e in job.events if e.get("event") == JOB_QUEUED]
+            return queued[-1] if queued else None
+        with self._lock:
+            try:
+                return self._queued.index(job.id) + 1
+            except ValueError:
+                return None
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self.job_ttl_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    @staticmethod
+    def _job_key(job_id: str) -> str:
+        return f"{config.APP_ENV}:coderpad:job:{job_id}"
+
+    @staticmethod
+    def _events_key(job_id: str) -> str:
+        return f"{config.APP_ENV}:coderpad:job:{job_id}:events"
+
+    @staticmethod
+    def _inflight_key(user_id: Any) -> str:
+        return f"{config.APP_ENV}:coderpad:inflight:{user_id}"
+
+    def _mark_unpublished(self, job: ExecutionJob) -> None:
+        """Job listener: queue the job for the publisher thread's next batch."""
+        with self._lock:
+            self._unpublished[job.id] = job
+            if self._publisher is None:
+                self._publisher = threading.Thread(
+                    target=self._publish_loop, daemon=True, name="coderpad-exec-publish"
+                )
+                self._publisher.start()
+
+    def _publish_loop(self) -> None:
+        while True:
+            time.sleep(self.publish_interval_seconds)
+            with self._lock:
+                jobs = list(self._unpublished.values())
+            if jobs:
+                self._publish(jobs)
+
+    def _publish(self, jobs: List[ExecutionJob]) -> None:
+        """
+        Send each job's status record and the events Redis does not have yet, for reads served
+        by other instances, in one pipeline. On failure the jobs stay queued for the next batch.
+        """
+        with self._lock:
+            for job in jobs:
+                self._unpublished.pop(job.id, None)
+        client = redis_client.get_client()
+        if not client:
+            return
+        ttl = max(self.job_ttl_seconds, 1)
+        with self._publish_lock:
+            pipe = client.pipeline()
+            counts = []
+            for job in jobs:
+                # Count before reading the status: a finished status implies its final event
+                count = len(job.events)
+                status = {"user_id": job.user_id, "status": job.status, "result": job.result, "error": job.error}
+                pipe.set(self._job_key(job.id), json.dumps(status, default=str), ex=ttl)
+                new = job.events[job.published:count]
+                if new:
+                    pipe.rpush(self._events_key(job.id), *[json.dumps(event, default=str) for event in new])
+                    pipe.expire(self._events_key(job.id), ttl)
+                counts.append(count)
+            try:
+                pipe.exec()
+            except Exception as e:
+                logger.warning(f"Could not publish {len(jobs)} CoderPad job(s) to Redis: {e}")
+                with self._lock:
+                    for job in jobs:
+                        self._unpublished.setdefault(job.id, job)
+                return
+            for job, count in zip(jobs, counts):
+                job.published = count
+
+    def _load(self, job_id: str, known_events: Optional[List[Dict[str, Any]]] = None) -> Optional[ExecutionJob]:
+        client = redis_client.get_client()
+        if not client:
+            return None
+        known_events = known_events or []
+        try:
+            pipe = client.pipeline()
+            pipe.get(self._job_key(job_id))
+            pipe.lrange(self._events_key(job_id), len(known_events), -1)
+            raw, new_events = pipe.exec()
+            status = json.loads(raw) if isinstance(raw, (str, bytes)) else None
+            events = known_events + [json.loads(event) for event in new_events or []]
+        except Exception as e:
+            logger.warning(f"Could not read CoderPad job {job_id} from Redis: {e}")
+            return None
+        if not isinstance(status, dict):
+            return None
+        return ExecutionJob(
+            id=job_id,
+            user_id=status.get("user_id"),
+            status=status.get("status", JOB_QUEUED),
+            result=status.get("result"),
+            error=status.get("error"),
+            events=events,
+            remote=True,
+        )
+
+    def _acquire_slot(self, user_id: Any, job_id: str) -> Optional[bool]:
+        """
+        Take one of the user's in-flight slots in Redis: True if taken, False if the user is
+        at the limit, None when Redis is unavailable (the caller falls back to local counts).
+        """
+        client = redis_client.get_client()
+        if not client:
+            return None
+        ttl = max(self.job_ttl_seconds, 1)
+        now = time.time()
+        try:
+            taken = client.eval(
+                _ACQUIRE_SLOT_SCRIPT,
+                keys=[self._inflight_key(user_id)],
+                args=[str(self.max_per_user), job_id, str(now), str(now + ttl), str(ttl)],
+            )
+        except Exception as e:
+            logger.warning(f"Redis in-flight count unavailable, using this instance's: {e}")
+            return None
+        if not isinstance(taken, int):
+            return None
+        return taken == 1
+
+    def _release_slot(self, user_id: Any, job_id: str) -> None:
+        client = redis_client.get_client()
+        if not client:
+            return
+        try:
+            client.zrem(self._inflight_key(user_id), job_id)
+        except Exception as e:
+            logger.warning(f"Could not release CoderPad in-flight slot for user {user_id}: {e}")
+
+
+execution_queue = ExecutionQueue(
+    workers=config.CODERPAD_EXEC_WORKERS,
+    max_queued=config.CODERPAD_EXEC_MAX_QUEUED,
+    max_per_user=config.CODERPAD_EXEC_MAX_PER_USER,
+    job_ttl_seconds=config.CODERPAD_EXEC_JOB_TTL_SECONDS,
+    publish_interval_seconds=config.CODERPAD_EXEC_PUBLISH_INTERVAL_SECONDS,
+)
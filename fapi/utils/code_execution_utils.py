@@ -2,20 +2,50 @@
 Code Execution Utilities for CodePad
 Provides safe, sandboxed code execution for multiple languages
 """
+import functools
 import subprocess
 import tempfile
 import os
+import re
 import sys
 import time
 import json
 import textwrap
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, Tuple, Callable, List
 from pathlib import Path
 import logging
 
+from fapi.utils.code_artifact_cache import artifact_cache
+from fapi.utils.code_result_cache import result_cache
+from fapi.utils.python_sandbox_worker import apply_limits
+from fapi.utils.python_worker_pool import python_worker_pool
+
 logger = logging.getLogger(__name__)
 
 
+# Version banner commands for compiled languages; part of the artifact cache key
+TOOLCHAIN_VERSION_COMMANDS = {
+    "java": ["javac", "-version"],
+    "cpp": ["g++", "--version"],
+    "c": ["gcc", "--version"],
+    "go": ["go", "version"],
+    "rust": ["rustc", "--version"],
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _toolchain_version(language: str) -> str:
+    """First line of the compiler's version banner, resolved once per process."""
+    try:
+        result = subprocess.run(
+            TOOLCHAIN_VERSION_COMMANDS[language], capture_output=True, text=True, timeout=10
+        )
+        banner = (result.stdout or result.stderr).strip()
+        return banner.splitlines()[0] if banner else "unknown"
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+
 class CodeExecutionError(Exception):
     """Custom exception for code execution errors"""
     pass
@@ -55,7 +85,19 @@ class CodeExecutor:
         """
         Run one assignment test case: prefer calling a user-defined function with stdin
         as the argument and printing the return value; fall back to plain stdin execution.
+        Repeatable results are served from the execution result cache.
         """
+        return result_cache.run(
+            "test_case", code, language, input_data, timeout, CodeExecutor._execute_for_test_case_uncached
+        )
+
+    @staticmethod
+    def _execute_for_test_case_uncached(
+        code: str,
+        language: str,
+        input_data: Optional[str],
+        timeout: int = 5,
+    ) -> Dict[str, Any]:
         language = language.lower().strip()
         if language in ("python", "python3"):
             harness_result = CodeExecutor._execute_python_test_harness(
@@ -66,7 +108,7 @@ class CodeExecutor:
                 return harness_result
             if harness_result.get("status") == "error" and harness_result.get("error"):
                 return harness_result
-        return CodeExecutor.execute(code, language, input_data, timeout)
+        return CodeExecutor._execute_uncached(code, language, input_data, timeout)
 
     @staticmethod
     def _build_python_test_harness_script(user_code: str) -> str:
@@ -172,7 +214,17 @@ class CodeExecutor:
         
         Returns:
             Dict with output, error, status, and execution_time_ms
+            (plus cached=True when served from the execution result cache)
         """
+        return result_cache.run("run", code, language, input_data, timeout, CodeExecutor._execute_uncached)
+
+    @staticmethod
+    def _execute_uncached(
+        code: str,
+        language: str,
+        input_data: Optional[str] = None,
+        timeout: int = 5,
+    ) -> Dict[str, Any]:
         try:
             # Normalize language
             language = language.lower().strip()
@@ -246,6 +298,27 @@ class CodeExecutor:
     @staticmethod
     def _execute_python(code: str, input_data: Optional[str], timeout: int) -> Dict[str, Any]:
         """Execute Python code"""
+        # Warm worker first (no interpreter cold start); falls through when none is idle
+        warm = python_worker_pool.run(code, input_data, timeout)
+        if warm is not None:
+            if warm["timed_out"]:
+                return {
+                    "output": None,
+                    "error": f"Execution timed out after {timeout} seconds",
+                    "status": "timeout",
+                }
+            if warm["returncode"] == 0:
+                return {
+                    "output": warm["stdout"],
+                    "error": None,
+                    "status": "success",
+                }
+            return {
+                "output": warm["stdout"] if warm["stdout"] else None,
+                "error": warm["stderr"],
+                "status": "error",
+            }
+
         with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False, encoding='utf-8') as f:
             f.write(code)
             temp_file = f.name
@@ -267,6 +340,11 @@ class CodeExecutor:
                         capture_output=True,
                         text=True,
                         timeout=timeout,
+                        # Same CPU and memory rlimits as a warm worker's run
+                        preexec_fn=(
+                            functools.partial(apply_limits, timeout, python_worker_pool.memory_mb)
+                            if os.name == "posix" else None
+                        ),
                     )
 
                     if result.returncode == 0:
@@ -399,213 +477,151 @@ class CodeExecutor:
                 pass
 
     @staticmethod
-    def _execute_java(code: str, input_data: Optional[str], timeout: int) -> Dict[str, Any]:
-        """Execute Java code"""
-        # Extract class name from code
-        import re
-        match = re.search(r'public\s+class\s+(\w+)', code)
-        class_name = match.group(1) if match else "Main"
+    def _build_plan(code: str, language: str) -> Tuple[str, Callable[[str, str], List[str]], Callable[[str], List[str]]]:
+        """
+        (source filename, compile command for (source, build dir), run command for build dir)
+        for a compiled language.
+        """
+        if language == "java":
+            # Extract class name from code
+            match = re.search(r'public\s+class\s+(\w+)', code)
+            class_name = match.group(1) if match else "Main"
+            return (
+                f"{class_name}.java",
+                lambda src, out_dir: ["javac", src],
+                lambda out_dir: ["java", "-cp", out_dir, class_name],
+            )
+        if language in ("cpp", "c"):
+            extension = ".cpp" if language == "cpp" else ".c"
+            compiler = "g++" if language == "cpp" else "gcc"
+            return (
+                f"program{extension}",
+                lambda src, out_dir: [compiler, src, "-o", os.path.join(out_dir, "program")],
+                lambda out_dir: [os.path.join(out_dir, "program")],
+            )
+        if language == "go":
+            return (
+                "main.go",
+                lambda src, out_dir: ["go", "build", "-o", os.path.join(out_dir, "program"), src],
+                lambda out_dir: [os.path.join(out_dir, "program")],
+            )
+        if language == "rust":
+            return (
+                "main.rs",
+                lambda src, out_dir: ["rustc", src, "-o", os.path.join(out_dir, "program")],
+                lambda out_dir: [os.path.join(out_dir, "program")],
+            )
+        raise CodeExecutionError(f"{language} is not a compiled language")
+
+    @staticmethod
+    def _compile(code: str, language: str, timeout: int, key: str) -> Tuple[Optional[List[str]], Optional[Dict[str, Any]]]:
+        """
+        Build a submission once and return (run command, None), or (None, error result).
+        Builds are cached on disk by language, toolchain version and source, so test cases
+        and re-runs of identical code skip compilation.
+        """
+        source_name, compile_command, run_command = CodeExecutor._build_plan(code, language)
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            java_file = os.path.join(tmpdir, f"{class_name}.java")
-            with open(java_file, 'w') as f:
-                f.write(code)
+        with artifact_cache.lock(key):
+            cached = artifact_cache.get(key)
+            if cached:
+                return run_command(cached), None
 
+            build_dir = artifact_cache.new_build_dir()
             try:
-                # Compile
+                source_file = os.path.join(build_dir, source_name)
+                with open(source_file, 'w') as f:
+                    f.write(code)
+
                 compile_result = subprocess.run(
-                    ["javac", java_file],
+                    compile_command(source_file, build_dir),
                     capture_output=True,
                     text=True,
                     timeout=timeout,
+                    cwd=build_dir,
                 )
-
                 if compile_result.returncode != 0:
-                    return {
+                    artifact_cache.discard(build_dir)
+                    return None, {
                         "output": None,
                         "error": compile_result.stderr,
                         "status": "error",
                     }
+            except BaseException:
+                artifact_cache.discard(build_dir)
+                raise
 
-                # Run
-                result = subprocess.run(
-                    ["java", "-cp", tmpdir, class_name],
-                    input=input_data,
-                    capture_output=True,
-                    text=True,
-                    timeout=timeout,
-                )
+            return run_command(artifact_cache.put(key, build_dir)), None
 
-                if result.returncode == 0:
-                    return {
-                        "output": result.stdout,
-                        "error": None,
-                        "status": "success",
-                    }
-                else:
-                    return {
-                        "output": result.stdout if result.stdout else None,
-                        "error": result.stderr,
-                        "status": "error",
-                    }
+    @staticmethod
+    def _execute_compiled(code: str, language: str, input_data: Optional[str], timeout: int) -> Dict[str, Any]:
+        """Compile (or reuse a cached build) and run it against stdin"""
+        key = artifact_cache.key(language, _toolchain_version(language), code)
+        try:
+            with artifact_cache.use(key):
+                for attempt in range(2):
+                    command, error = CodeExecutor._compile(code, language, timeout, key)
+                    if error:
+                        return error
+                    try:
+                        result = subprocess.run(
+                            command,
+                            input=input_data,
+                            capture_output=True,
+                            text=True,
+                            timeout=timeout,
+                        )
+                        break
+                    except OSError as e:
+                        # The cached build vanished under us (evicted by another process); rebuild once
+                        logger.warning(f"Cached {language} build {key[:12]} unusable ({e}); recompiling")
+                        artifact_cache.invalidate(key)
+                        if attempt:
+                            return {
+                                "output": None,
+                                "error": f"Execution error: compiled program unavailable ({e})",
+                                "status": "error",
+                            }
 
-            except subprocess.TimeoutExpired:
+            if result.returncode == 0:
                 return {
-                    "output": None,
-                    "error": f"Execution timed out after {timeout} seconds",
-                    "status": "timeout",
+                    "output": result.stdout,
+                    "error": None,
+                    "status": "success",
+                }
+            else:
+                return {
+                    "output": result.stdout if result.stdout else None,
+                    "error": result.stderr,
+                    "status": "error",
                 }
 
+        except subprocess.TimeoutExpired:
+            return {
+                "output": None,
+                "error": f"Execution timed out after {timeout} seconds",
+                "status": "timeout",
+            }
+
+    @staticmethod
+    def _execute_java(code: str, input_data: Optional[str], timeout: int) -> Dict[str, Any]:
+        """Execute Java code"""
+        return CodeExecutor._execute_compiled(code, "java", input_data, timeout)
+
     @staticmethod
     def _execute_cpp_c(code: str, language: str, input_data: Optional[str], timeout: int) -> Dict[str, Any]:
         """Execute C++ or C code"""
-        extension = ".cpp" if language == "cpp" else ".c"
-        compiler = "g++" if language == "cpp" else "gcc"
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            source_file = os.path.join(tmpdir, f"program{extension}")
-            output_file = os.path.join(tmpdir, "program")
-
-            with open(source_file, 'w') as f:
-                f.write(code)
-
-            try:
-                # Compile
-                compile_result = subprocess.run(
-                    [compiler, source_file, "-o", output_file],
-                    capture_output=True,
-                    text=True,
-                    timeout=timeout,
-                )
-
-                if compile_result.returncode != 0:
-                    return {
-                        "output": None,
-                        "error": compile_result.stderr,
-                        "status": "error",
-                    }
-
-                # Run
-                result = subprocess.run(
-                    [output_file],
-                    input=input_data,
-                    capture_output=True,
-                    text=True,
-                    timeout=timeout,
-                )
-
-                if result.returncode == 0:
-                    return {
-                        "output": result.stdout,
-                        "error": None,
-                        "status": "success",
-                    }
-                else:
-                    return {
-                        "output": result.stdout if result.stdout else None,
-                        "error": result.stderr,
-                        "status": "error",
-                    }
-
-            except subprocess.TimeoutExpired:
-                return {
-                    "output": None,
-                    "error": f"Execution timed out after {timeout} seconds",
-                    "status": "timeout",
-                }
+        return CodeExecutor._execute_compiled(code, language, input_data, timeout)
 
     @staticmethod
     def _execute_go(code: str, input_data: Optional[str], timeout: int) -> Dict[str, Any]:
         """Execute Go code"""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            go_file = os.path.join(tmpdir, "main.go")
-            with open(go_file, 'w') as f:
-                f.write(code)
-
-            try:
-                result = subprocess.run(
-                    ["go", "run", go_file],
-                    input=input_data,
-                    capture_output=True,
-                    text=True,
-                    timeout=timeout,
-                    cwd=tmpdir,
-                )
-
-                if result.returncode == 0:
-                    return {
-                        "output": result.stdout,
-                        "error": None,
-                        "status": "success",
-                    }
-                else:
-                    return {
-                        "output": result.stdout if result.stdout else None,
-                        "error": result.stderr,
-                        "status": "error",
-                    }
-
-            except subprocess.TimeoutExpired:
-                return {
-                    "output": None,
-                    "error": f"Execution timed out after {timeout} seconds",
-                    "status": "timeout",
-                }
+        return CodeExecutor._execute_compiled(code, "go", input_data, timeout)
 
     @staticmethod
     def _execute_rust(code: str, input_data: Optional[str], timeout: int) -> Dict[str, Any]:
         """Execute Rust code"""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            rs_file = os.path.join(tmpdir, "main.rs")
-            output_file = os.path.join(tmpdir, "program")
-
-            with open(rs_file, 'w') as f:
-                f.write(code)
-
-            try:
-                # Compile
-                compile_result = subprocess.run(
-                    ["rustc", rs_file, "-o", output_file],
-                    capture_output=True,
-                    text=True,
-                    timeout=timeout,
-                )
-
-                if compile_result.returncode != 0:
-                    return {
-                        "output": None,
-                        "error": compile_result.stderr,
-                        "status": "error",
-                    }
-
-                # Run
-                result = subprocess.run(
-                    [output_file],
-                    input=input_data,
-                    capture_output=True,
-                    text=True,
-                    timeout=timeout,
-                )
-
-                if result.returncode == 0:
-                    return {
-                        "output": result.stdout,
-                        "error": None,
-                        "status": "success",
-                    }
-                else:
-                    return {
-                        "output": result.stdout if result.stdout else None,
-                        "error": result.stderr,
-                        "status": "error",
-                    }
-
-            except subprocess.TimeoutExpired:
-                return {
-                    "output": None,
-                    "error": f"Execution timed out after {timeout} seconds",
-                    "status": "timeout",
-                }
+        return CodeExecutor._execute_compiled(code, "rust", input_data, timeout)
 
     @staticmethod
     def _execute_bash(code: str, input_data: Optional[str], timeout: int) -> Dict[str, Any]:
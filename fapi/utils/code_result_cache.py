@@ -0,0 +1,99 @@
+"""
+Content-addressed cache of CoderPad execution results.
+
+Learners re-run unchanged code and test cases re-execute identical inputs, so results are
+cached in-process keyed by a hash of (kind, language, timeout class, code, stdin). Only
+results that should repeat are stored: timeouts, executor/runtime failures and programs that
+use obvious sources of nondeterminism (randomness, clocks, threads, ...) always run again.
+Served results carry "cached": True.
+"""
+import hashlib
+import logging
+import re
+from typing import Any, Callable, Dict, Optional
+
+from fapi.core import config
+from fapi.core.local_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Timeouts are bucketed so e.g. 4s and 5s runs share entries; 30s is CodeExecutor.MAX_TIMEOUT
+TIMEOUT_CLASSES = (5, 10, 30)
+
+_NONDETERMINISTIC_CODE = re.compile(
+    r"random|rand\s*\(|uuid|secrets|urandom|datetime|time\s*\(|time\.|clock|chrono|Date|"
+    r"currentTimeMillis|nanoTime|Instant|thread|Thread|goroutine|go\s+func|getpid|hash\s*\(|"
+    r"environ|getenv|socket|requests|urllib|http",
+)
+# Errors raised by the executor or the environment rather than by the program itself
+_TRANSIENT_ERROR = re.compile(r"execution error|not found|not yet implemented|MemoryError|Killed", re.I)
+
+
+def timeout_class(timeout: int) -> int:
+    for bucket in TIMEOUT_CLASSES:
+        if timeout <= bucket:
+            return bucket
+    return TIMEOUT_CLASSES[-1]
+
+
+class ExecutionResultCache:
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._results = LRUCache(max_entries)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    @staticmethod
+    def key(kind: str, language: str, code: str, input_data: Optional[str], timeout: int) -> str:
+        digest = hashlib.sha256()
+        for part in (kind, language.lower().strip(), str(timeout_class(timeout)), code, input_data or ""):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    @staticmethod
+    def cacheable(code: str, result: Dict[str, Any]) -> bool:
+        status = result.get("status")
+        if status == "success":
+            pass
+        elif status == "error":
+            if _TRANSIENT_ERROR.search(result.get("error") or ""):
+                return False
+        else:
+            return False  # timeouts and anything unexpected
+        return not _NONDETERMINISTIC_CODE.search(code)
+
+    def run(
+        self,
+        kind: str,
+        code: str,
+        language: str,
+        input_data: Optional[str],
+        timeout: int,
+        execute: Callable[[str, str, Optional[str], int], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Serve a cached result for this run, or execute it and cache the result if it is repeatable."""
+        if not self.enabled:
+            return execute(code, language, input_data, timeout)
+
+        key = self.key(kind, language, code, input_data, timeout)
+        hit = self._results.get(key)
+        if hit is not None:
+            logger.debug(f"Execution result cache hit ({kind}, {language})")
+            return {**hit, "cached": True}
+
+        result = execute(code, language, input_data, timeout)
+        if self.cacheable(code, result):
+            self._results.set(key, dict(result), self.ttl_seconds)
+        return result
+
+    def clear(self) -> None:
+        self._results.clear()
+
+
+result_cache = ExecutionResultCache(
+    max_entries=config.CODERPAD_RESULT_CACHE_MAX_ENTRIES,
+    ttl_seconds=config.CODERPAD_RESULT_CACHE_TTL_SECONDS,
+)
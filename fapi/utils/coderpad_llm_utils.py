@@ -1,16 +1,22 @@
 """
 CoderPad: builds validation prompts and maps model output to API fields.
 
-Core HTTP + prompts live in :mod:`fapi.utils.openai_llm`.
+Core HTTP + prompts live in :mod:`fapi.utils.openai_llm`. The ``stream_*`` variants yield
+``(event, data)`` pairs while the model is still writing: ``token`` (raw text delta),
+``text`` (growing value of a top-level string field), ``field`` (a completed top-level
+field) and finally ``result`` (the same dict the non-streaming function returns).
 """
 from __future__ import annotations
 
 import json
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from fapi.db.schemas import TestCase
-from fapi.utils.openai_llm import DEFAULT_MODEL, openai_chat_with_prompts
+from fapi.utils.incremental_json import IncrementalJsonObject
+from fapi.utils.openai_llm import DEFAULT_MODEL, OpenAiStreamError, openai_chat_stream, openai_chat_with_prompts
+
+StreamEvent = Tuple[str, Dict[str, Any]]
 
 CODERPAD_VALIDATE_SYSTEM_PROMPT = (
     "You are an expert programming tutor. Output only valid JSON as specified by the user."
@@ -97,6 +103,61 @@ def _parse_json_from_text(text: str) -> Optional[Dict[str, Any]]:
     return None
 
 
+def _validation_error(error: str) -> Dict[str, Any]:
+    return {
+        "passed": None,
+        "summary": "",
+        "feedback": "",
+        "confidence": None,
+        "raw_model_text": None,
+        "error": error,
+    }
+
+
+def _validation_result(content: str) -> Dict[str, Any]:
+    parsed = _parse_json_from_text(content)
+    if not parsed:
+        return {
+            "passed": None,
+            "summary": "Could not parse model output",
+            "feedback": content[:8000],
+            "confidence": None,
+            "raw_model_text": content,
+            "error": None,
+        }
+
+    return {
+        "passed": parsed.get("passed"),
+        "summary": str(parsed.get("summary", "") or ""),
+        "feedback": str(parsed.get("feedback", "") or ""),
+        "confidence": parsed.get("confidence"),
+        "raw_model_text": content,
+        "error": None,
+    }
+
+
+def _stream_json_completion(**chat_kwargs: Any) -> Iterator[Tuple[str, Any]]:
+    """
+    Run :func:`openai_chat_stream` and surface tokens plus incrementally parsed top-level
+    fields. Ends with ("content", full_text) or ("error", message).
+    """
+    parser = IncrementalJsonObject()
+    parts: List[str] = []
+    try:
+        for delta in openai_chat_stream(**chat_kwargs):
+            parts.append(delta)
+            yield "token", {"text": delta}
+            for kind, name, value in parser.feed(delta):
+                if kind == "text":
+                    yield "text", {"field": name, "text": value}
+                else:
+                    yield "field", {"field": name, "value": value}
+    except OpenAiStreamError as e:
+        yield "error", str(e)
+        return
+    yield "content", "".join(parts).strip()
+
+
 def llm_validate_code_submission(
     *,
     problem_statement: str,
@@ -113,15 +174,7 @@ def llm_validate_code_submission(
     """
     key = (openai_api_key or "").strip()
     if not key:
-        return {
-            "passed": None,
-            "summary": "",
-            "feedback": "",
-            "confidence": None,
-            "raw_model_text": None,
-            "error": "OpenAI API key is required",
-        }
-
+        return _validation_error("OpenAI API key is required")
 
     user_prompt = _build_validation_user_prompt(problem_statement, code, language, test_cases)
     result = openai_chat_with_prompts(
@@ -135,35 +188,42 @@ def llm_validate_code_submission(
     )
 
     if result.error:
-        return {
-            "passed": None,
-            "summary": "",
-            "feedback": "",
-            "confidence": None,
-            "raw_model_text": None,
-            "error": result.error,
-        }
+        return _validation_error(result.error)
 
-    content = result.content or ""
-    parsed = _parse_json_from_text(content)
-    if not parsed:
-        return {
-            "passed": None,
-            "summary": "Could not parse model output",
-            "feedback": content[:8000],
-            "confidence": None,
-            "raw_model_text": content,
-            "error": None,
-        }
+    return _validation_result(result.content or "")
 
-    return {
-        "passed": parsed.get("passed"),
-        "summary": str(parsed.get("summary", "") or ""),
-        "feedback": str(parsed.get("feedback", "") or ""),
-        "confidence": parsed.get("confidence"),
-        "raw_model_text": content,
-        "error": None,
-    }
+
+def stream_llm_validate_code_submission(
+    *,
+    problem_statement: str,
+    code: str,
+    language: str,
+    test_cases: Optional[List[TestCase]],
+    openai_api_key: str,
+    model: str = DEFAULT_MODEL,
+) -> Iterator[StreamEvent]:
+    """Streaming :func:`llm_validate_code_submission`; the final ``result`` event has the same dict."""
+    key = (openai_api_key or "").strip()
+    if not key:
+        yield "result", _validation_error("OpenAI API key is required")
+        return
+
+    user_prompt = _build_validation_user_prompt(problem_statement, code, language, test_cases)
+    for event, data in _stream_json_completion(
+        system_prompt=CODERPAD_VALIDATE_SYSTEM_PROMPT,
+        user_prompt=user_prompt,
+        api_key=key,
+        model=model,
+        temperature=0.2,
+        max_tokens=2000,
+        timeout=90.0,
+    ):
+        if event == "error":
+            yield "result", _validation_error(data)
+        elif event == "content":
+            yield "result", _validation_result(data)
+        else:
+            yield event, data
 
 
 CODERPAD_GENERATE_SYSTEM_PROMPT = (
@@ -172,18 +232,8 @@ CODERPAD_GENERATE_SYSTEM_PROMPT = (
     "Output MUST be pure JSON with no markdown fences, matching the requested schema."
 )
 
-def llm_generate_question_from_topic(
-    *,
-    topic: str,
-    language: str = "python",
-    openai_api_key: str,
-    model: str = DEFAULT_MODEL,
-) -> Dict[str, Any]:
-    key = (openai_api_key or "").strip()
-    if not key:
-        return {"error": "OpenAI API key is required"}
-    
-    user_prompt = f"""Generate a coding problem based on the following topic: "{topic}".
+def _build_generate_user_prompt(topic: str, language: str) -> str:
+    return f"""Generate a coding problem based on the following topic: "{topic}".
 The target programming language is {language}.
 
 Format requirements for `problem_statement`:
@@ -211,20 +261,8 @@ Output EXACTLY this JSON format and no accompanying text:
 Ensure you generate 3 to 5 test cases. Ensure starter_code has necessary imports and a working function signature.
 """
 
-    result = openai_chat_with_prompts(
-        system_prompt=CODERPAD_GENERATE_SYSTEM_PROMPT,
-        user_prompt=user_prompt,
-        api_key=key,
-        model=model,
-        temperature=0.3,
-        max_tokens=3000,
-        timeout=90.0,
-    )
 
-    if result.error:
-        return {"error": result.error}
-
-    content = result.content or ""
+def _generation_result(content: str, language: str) -> Dict[str, Any]:
     parsed = _parse_json_from_text(content)
     if not parsed:
         return {"error": "Could not parse model output as JSON. Output was: " + content[:200]}
@@ -238,3 +276,59 @@ Ensure you generate 3 to 5 test cases. Ensure starter_code has necessary imports
         "error": None,
     }
 
+
+def llm_generate_question_from_topic(
+    *,
+    topic: str,
+    language: str = "python",
+    openai_api_key: str,
+    model: str = DEFAULT_MODEL,
+) -> Dict[str, Any]:
+    key = (openai_api_key or "").strip()
+    if not key:
+        return {"error": "OpenAI API key is required"}
+
+    result = openai_chat_with_prompts(
+        system_prompt=CODERPAD_GENERATE_SYSTEM_PROMPT,
+        user_prompt=_build_generate_user_prompt(topic, language),
+        api_key=key,
+        model=model,
+        temperature=0.3,
+        max_tokens=3000,
+        timeout=90.0,
+    )
+
+    if result.error:
+        return {"error": result.error}
+
+    return _generation_result(result.content or "", language)
+
+
+def stream_llm_generate_question_from_topic(
+    *,
+    topic: str,
+    language: str = "python",
+    openai_api_key: str,
+    model: str = DEFAULT_MODEL,
+) -> Iterator[StreamEvent]:
+    """Streaming :func:`llm_generate_question_from_topic`; the final ``result`` event has the same dict."""
+    key = (openai_api_key or "").strip()
+    if not key:
+        yield "result", {"error": "OpenAI API key is required"}
+        return
+
+    for event, data in _stream_json_completion(
+        system_prompt=CODERPAD_GENERATE_SYSTEM_PROMPT,
+        user_prompt=_build_generate_user_prompt(topic, language),
+        api_key=key,
+        model=model,
+        temperature=0.3,
+        max_tokens=3000,
+        timeout=90.0,
+    ):
+        if event == "error":
+            yield "result", {"error": data}
+        elif event == "content":
+            yield "result", _generation_result(data, language)
+        else:
+            yield event, data
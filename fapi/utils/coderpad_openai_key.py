@@ -843,41 +843,28 @@ def validate_llm_key_batch_for_user(
 
     del session_id  # unused; validation reads from DB
     candidate_id = _candidate_id_for_user(db, current_user)
-    results: List[Dict[str, Any]] = []
+    requested = []
     for item in keys:
         key_id = int(item.get("id", 0))
         provider = str(item.get("provider_name") or "")
         source = str(item.get("source") or "wbl").lower()
         raw = get_stored_key_for_validation(db, candidate_id, key_id, provider)
+        requested.append((key_id, provider, source, raw))
+
+    # Provider probes run concurrently; the DB is only touched before and after them
+    detections = iter(
+        provider_registry.detect_and_validate_many(
+            [(raw, provider) for _, provider, _, raw in requested if raw]
+        )
+    )
+    results: List[Dict[str, Any]] = []
+    for key_id, _, source, raw in requested:
         if not raw:
             status, message = "inactive", "Key not found"
         else:
-            detection = provider_registry.detect_and_validate(raw, override_provider_id=provider)
+            detection = next(detections)
             status = detection.get("status") or "inactive"
             message = detection.get("message") or ""
-
-        # Persist result back to DB — eliminates the need for localStorage cache
-        row = None
-        try:
-            row = (
-                db.query(CandidateLlmApiKeyORM)
-                .filter(
-                    CandidateLlmApiKeyORM.id == key_id,
-                    CandidateLlmApiKeyORM.candidate_id == candidate_id,
-                )
-                .first()
-            )
-            if row:
-                row.status = status
-                row.failure_reason = message if status != "active" else None
-                row.failure_code = None
-                row.last_validated_at = datetime.now(timezone.utc)
-                db.commit()
-        except Exception:
-            db.rollback()
-            if row:
-                db.expire(row)
-
         results.append(
             {
                 "id": key_id,
@@ -887,11 +874,30 @@ def validate_llm_key_batch_for_user(
             }
         )
 
-    # Automatically shift default to first active key if current default became invalid/inactive
+    # Persist results back to DB in one commit — eliminates the need for localStorage cache
     try:
-        ensure_default_llm_key_for_candidate(db, candidate_id, commit=True)
+        rows = {
+            int(r.id): r
+            for r in db.query(CandidateLlmApiKeyORM)
+            .filter(
+                CandidateLlmApiKeyORM.id.in_([r["id"] for r in results]),
+                CandidateLlmApiKeyORM.candidate_id == candidate_id,
+            )
+            .all()
+        }
+        validated_at = datetime.now(timezone.utc)
+        for result in results:
+            row = rows.get(result["id"])
+            if row:
+                row.status = result["status"]
+                row.failure_reason = result["message"] if result["status"] != "active" else None
+                row.failure_code = None
+                row.last_validated_at = validated_at
+        # Automatically shift default to first active key if current default became invalid/inactive
+        ensure_default_llm_key_for_candidate(db, candidate_id)
+        db.commit()
     except Exception:
-        pass
+        db.rollback()
 
     return results
 
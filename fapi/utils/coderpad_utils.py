@@ -8,7 +8,7 @@ or ``text()`` raw fragments here, so user input is not interpolated into query t
 """
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, func as sa_func
-from typing import List, Optional, Dict, Any
+from typing import Callable, List, Optional, Dict, Any
 from fastapi import HTTPException, status
 from fapi.db.models import CodeSnippetORM, CodeExecutionLogORM, CoderpadQuestionORM, AuthUserORM, CandidateORM
 from fapi.db.schemas import (
@@ -22,9 +22,14 @@ from fapi.db.schemas import (
     CoderpadQuestionUpdate,
 )
 from fapi.utils.code_execution_utils import CodeExecutor
+from fapi.utils.code_execution_queue import ExecutionJob, execution_queue
+from fapi.db import database
+from fapi.core import config
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime
 import json
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -132,46 +137,137 @@ def delete_snippet(db: Session, snippet: CodeSnippetORM) -> None:
 
 # ==================== Code Execution ====================
 
+# Test cases run on a shared pool (the per-worker cap); each user is further limited to
+# CODERPAD_TEST_WORKERS_PER_USER cases in flight across all of their requests.
+_test_case_pool = ThreadPoolExecutor(
+    max_workers=config.CODERPAD_TEST_WORKERS, thread_name_prefix="coderpad-tests"
+)
+_user_slots: Dict[Any, threading.BoundedSemaphore] = {}
+_user_slots_lock = threading.Lock()
+
+
+def _user_slot(user_id: Any) -> threading.BoundedSemaphore:
+    with _user_slots_lock:
+        slot = _user_slots.get(user_id)
+        if slot is None:
+            slot = _user_slots[user_id] = threading.BoundedSemaphore(
+                max(1, config.CODERPAD_TEST_WORKERS_PER_USER)
+            )
+        return slot
+
+
+def _run_test_case(
+    code: str, language: str, timeout: int, idx: int, test_case: TestCase
+) -> TestCaseExecutionResult:
+    test_result = CodeExecutor.execute_for_test_case(
+        code=code,
+        language=language,
+        input_data=test_case.input,
+        timeout=timeout,
+    )
+    actual_output = test_result.get("output", "").strip() if test_result.get("output") else None
+    expected_output = test_case.expected_output.strip()
+    passed = actual_output == expected_output if actual_output is not None else False
+    return TestCaseExecutionResult(
+        test_case_index=idx,
+        input=test_case.input,
+        expected=expected_output,
+        actual=actual_output,
+        error=test_result.get("error"),
+        passed=passed,
+        cached=test_result.get("cached", False),
+    )
+
+
 def run_test_cases_against_code(
     code: str,
     language: str,
     timeout: int,
     test_cases_data: Any,
+    user_id: Optional[int] = None,
+    fail_fast: bool = False,
+    on_result: Optional[Callable[[TestCaseExecutionResult], None]] = None,
 ) -> Optional[List[TestCaseExecutionResult]]:
-    """Run optional stdin tests against code (same logic as saved snippets)."""
+    """
+    Run optional stdin tests against code (same logic as saved snippets).
+    Cases run concurrently and are returned in index order; with fail_fast, cases after
+    the first failing one are cancelled and left out of the results.
+    on_result is called with each case as it finishes (completion order).
+    """
     if not test_cases_data:
         return None
     if isinstance(test_cases_data, str):
         test_cases_data = json.loads(test_cases_data)
-    test_results: List[TestCaseExecutionResult] = []
-    for idx, test_case_data in enumerate(test_cases_data):
-        test_case = TestCase(**test_case_data)
-        test_result = CodeExecutor.execute_for_test_case(
-            code=code,
-            language=language,
-            input_data=test_case.input,
-            timeout=timeout,
-        )
-        actual_output = test_result.get("output", "").strip() if test_result.get("output") else None
-        expected_output = test_case.expected_output.strip()
-        passed = actual_output == expected_output if actual_output is not None else False
-        test_results.append(
-            TestCaseExecutionResult(
-                test_case_index=idx,
-                input=test_case.input,
-                expected=expected_output,
-                actual=actual_output,
-                error=test_result.get("error"),
-                passed=passed,
+    test_cases = [TestCase(**test_case_data) for test_case_data in test_cases_data]
+
+    slot = _user_slot(user_id)
+    results: Dict[int, TestCaseExecutionResult] = {}
+    pending: Dict[Future, int] = {}
+    first_failure: Optional[int] = None
+    next_idx = 0
+
+    while pending or (next_idx < len(test_cases) and first_failure is None):
+        # Submit while this user has free slots; block for one only when nothing is in flight
+        while (
+            next_idx < len(test_cases)
+            and first_failure is None
+            and slot.acquire(blocking=not pending)
+        ):
+            future = _test_case_pool.submit(
+                _run_test_case, code, language, timeout, next_idx, test_cases[next_idx]
             )
-        )
-    return test_results
+            future.add_done_callback(lambda _: slot.release())
+            pending[future] = next_idx
+            next_idx += 1
+
+        done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+        for future in done:
+            pending.pop(future)
+            if future.cancelled():
+                continue
+            result = future.result()
+            results[result.test_case_index] = result
+            if on_result is not None:
+                on_result(result)
+            if fail_fast and not result.passed:
+                if first_failure is None or result.test_case_index < first_failure:
+                    first_failure = result.test_case_index
+
+        if first_failure is not None:
+            for future, idx in list(pending.items()):
+                if idx > first_failure and future.cancel():
+                    pending.pop(future)
+
+    return [
+        results[idx] for idx in sorted(results)
+        if first_failure is None or idx <= first_failure
+    ]
+
+
+def _emit_output(on_event: Optional[Callable[[str, Dict[str, Any]], None]], result: Dict[str, Any]) -> None:
+    if on_event is not None:
+        on_event("output", {
+            "output": result.get("output"),
+            "error": result.get("error"),
+            "status": result.get("status", "error"),
+            "execution_time_ms": result.get("execution_time_ms", 0),
+            "cached": result.get("cached", False),
+        })
+
+
+def _test_result_hook(
+    on_event: Optional[Callable[[str, Dict[str, Any]], None]],
+) -> Optional[Callable[[TestCaseExecutionResult], None]]:
+    if on_event is None:
+        return None
+    return lambda test_result: on_event("test_result", test_result.model_dump())
 
 
 def execute_code_direct(
     db: Session,
     user_id: int,
-    request: CodeExecutionRequest
+    request: CodeExecutionRequest,
+    on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None,
 ) -> CodeExecutionWithTestsResponse:
     """Execute code directly without saving; optional test_cases run like snippet execute."""
     result = CodeExecutor.execute(
@@ -180,6 +276,7 @@ def execute_code_direct(
         input_data=request.input_data,
         timeout=request.timeout,
     )
+    _emit_output(on_event, result)
 
     test_results = None
     tc_payload = request.test_cases
@@ -190,6 +287,9 @@ def execute_code_direct(
             request.language,
             request.timeout,
             tc_json,
+            user_id=user_id,
+            fail_fast=request.fail_fast,
+            on_result=_test_result_hook(on_event),
         )
 
     log_entry = CodeExecutionLogORM(
@@ -212,6 +312,7 @@ def execute_code_direct(
         status=result.get("status", "error"),
         execution_time_ms=result.get("execution_time_ms", 0),
         test_results=test_results,
+        cached=result.get("cached", False),
     )
 
 
@@ -221,6 +322,8 @@ def execute_snippet(
     snippet: CodeSnippetORM,
     input_data: Optional[str] = None,
     run_tests: bool = True,
+    fail_fast: bool = False,
+    on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None,
 ) -> CodeExecutionWithTestsResponse:
     """Execute a saved code snippet with optional test cases"""
     
@@ -231,6 +334,7 @@ def execute_snippet(
         input_data=input_data,
         timeout=snippet.execution_timeout,
     )
+    _emit_output(on_event, result)
     
     test_results = None
     if run_tests and snippet.test_cases:
@@ -239,6 +343,9 @@ def execute_snippet(
             snippet.language,
             snippet.execution_timeout,
             snippet.test_cases,
+            user_id=user_id,
+            fail_fast=fail_fast,
+            on_result=_test_result_hook(on_event),
         )
     
     # Log the execution
@@ -266,6 +373,52 @@ def execute_snippet(
         status=result.get("status", "error"),
         execution_time_ms=result.get("execution_time_ms", 0),
         test_results=test_results,
+        cached=result.get("cached", False),
+    )
+
+
+def _execute_code_direct_job(job: ExecutionJob, request: CodeExecutionRequest) -> Dict[str, Any]:
+    db = database.SessionLocal()
+    try:
+        return execute_code_direct(db, job.user_id, request, on_event=job.emit).model_dump()
+    finally:
+        db.close()
+
+
+def _execute_snippet_job(
+    job: ExecutionJob,
+    snippet_id: int,
+    input_data: Optional[str],
+    run_tests: bool,
+    fail_fast: bool,
+) -> Dict[str, Any]:
+    db = database.SessionLocal()
+    try:
+        snippet = get_snippet_by_id(db, snippet_id, job.user_id)
+        if not snippet:
+            raise ValueError(f"Snippet {snippet_id} is no longer accessible")
+        return execute_snippet(
+            db, job.user_id, snippet, input_data, run_tests, fail_fast, on_event=job.emit
+        ).model_dump()
+    finally:
+        db.close()
+
+
+def submit_code_execution(user_id: int, request: CodeExecutionRequest) -> ExecutionJob:
+    """Queue a direct execution; runs in its own DB session. Raises QueueFullError."""
+    return execution_queue.submit(user_id, _execute_code_direct_job, request)
+
+
+def submit_snippet_execution(
+    user_id: int,
+    snippet_id: int,
+    input_data: Optional[str] = None,
+    run_tests: bool = True,
+    fail_fast: bool = False,
+) -> ExecutionJob:
+    """Queue a saved-snippet execution (access is re-checked in the job). Raises QueueFullError."""
+    return execution_queue.submit(
+        user_id, _execute_snippet_job, snippet_id, input_data, run_tests, fail_fast
     )
 
 
@@ -0,0 +1,417 @@
+"""
+Pre-aggregated rollups behind the avatar dashboard metrics.
+
+dashboard_daily_rollup holds one row per (metric, day, dimension) with a row count and an
+optional amount sum; dashboard_batch_rollup holds candidate count and fees per batch. Reads
+touch a handful of these rows instead of scanning the fact tables.
+
+Freshness:
+- An ORM flush that touches a source table records the affected days / batches (old and new
+  values, so moved rows leave their previous bucket). After the writer commits they are
+  recomputed and upserted in a separate short transaction; the writer's own transaction never
+  touches the shared rollup rows.
+- dashboard_rollup_state records the table_versions version each source was last rebuilt
+  at. The scheduled job (refresh_stale_rollups) rebuilds any source whose version moved
+  since, which covers bulk statements, manual SQL and after-commit refreshes that failed or
+  raced. Readers only use the rollups once every source has been built.
+"""
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from itertools import chain
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import DateTime, TIMESTAMP, and_, event, func, inspect, or_, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from fapi.core import config
+from fapi.db.models import (
+    CandidateInterview,
+    CandidateORM,
+    CandidatePlacementORM,
+    DashboardBatchRollupORM,
+    DashboardDailyRollupORM,
+    DashboardRollupStateORM,
+    LeadORM,
+    PlacementFeeCollection,
+    TableVersionORM,
+    Vendor,
+)
+from fapi.utils.table_fingerprint import get_table_version
+
+logger = logging.getLogger(__name__)
+
+_daily = DashboardDailyRollupORM.__table__
+_batches = DashboardBatchRollupORM.__table__
+_state = DashboardRollupStateORM.__table__
+_versions = TableVersionORM.__table__
+
+# Rows whose day column is NULL are counted under this day (so totals still include them)
+UNDATED = date(1970, 1, 1)
+# A flush touching more distinct days than this rebuilds the whole metric instead
+MAX_INCREMENTAL_DAYS = 200
+
+_rebuild_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class DailyRollup:
+    metric: str
+    model: Any
+    day_attr: str
+    dimension_attr: Optional[str] = None
+    amount_attr: Optional[str] = None
+
+    @property
+    def table_name(self) -> str:
+        return self.model.__table__.name
+
+    @property
+    def day_column(self):
+        return getattr(self.model, self.day_attr)
+
+    @property
+    def timestamped(self) -> bool:
+        return isinstance(self.day_column.type, (DateTime, TIMESTAMP))
+
+
+DAILY_ROLLUPS = (
+    DailyRollup("candidates", CandidateORM, "enrolled_date", "status"),
+    DailyRollup("placements", CandidatePlacementORM, "placement_date", "status"),
+    DailyRollup("placement_fees", PlacementFeeCollection, "deposit_date", "amount_collected", "deposit_amount"),
+    DailyRollup("interviews", CandidateInterview, "interview_date", "feedback"),
+    DailyRollup("leads", LeadORM, "entry_date", "status"),
+    DailyRollup("vendors", Vendor, "created_at", "status"),
+)
+# Batch rollups are derived from candidate rows
+BATCH_SOURCE = CandidateORM.__table__.name
+
+SOURCE_MODELS = {spec.table_name: spec.model for spec in DAILY_ROLLUPS}
+_SPECS_BY_TABLE: Dict[str, Tuple[DailyRollup, ...]] = {
+    name: tuple(spec for spec in DAILY_ROLLUPS if spec.table_name == name) for name in SOURCE_MODELS
+}
+
+
+def _day_value(value: Any) -> date:
+    if value is None:
+        return UNDATED
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):  # SQLite returns DATE() as text
+        return date.fromisoformat(value[:10])
+    return value
+
+
+def _dimension_value(value: Any) -> str:
+    if value is None:
+        return ""
+    return str(getattr(value, "value", value))[:64]
+
+
+# --------------- Recompute ---------------
+
+
+def _aggregate(spec: DailyRollup, days: Optional[Set[date]] = None):
+    column = spec.day_column
+    day_expr = func.date(column) if spec.timestamped else column
+    columns = [day_expr, func.count()]
+    group_by = [day_expr]
+    if spec.dimension_attr:
+        dimension = getattr(spec.model, spec.dimension_attr)
+        columns.append(dimension)
+        group_by.append(dimension)
+    if spec.amount_attr:
+        columns.append(func.sum(getattr(spec.model, spec.amount_attr)))
+    stmt = select(*columns).select_from(spec.model.__table__).group_by(*group_by)
+    if days is None:
+        return stmt
+
+    clauses = []
+    if UNDATED in days:
+        clauses.append(column.is_(None))
+    dated = sorted(day for day in days if day != UNDATED)
+    if dated and spec.timestamped:
+        clauses.extend(
+            and_(
+                column >= datetime.combine(day, time.min),
+                column < datetime.combine(day + timedelta(days=1), time.min),
+            )
+            for day in dated
+        )
+    elif dated:
+        clauses.append(column.in_(dated))
+    return stmt.where(or_(*clauses))
+
+
+def _rollup_rows(connection, spec: DailyRollup, days: Optional[Set[date]] = None) -> list:
+    merged: Dict[Tuple[date, str], list] = {}
+    for row in connection.execute(_aggregate(spec, days)):
+        day = _day_value(row[0])
+        dimension = _dimension_value(row[2]) if spec.dimension_attr else ""
+        amount = row[-1] if spec.amount_attr else None
+        entry = merged.setdefault((day, dimension), [0, None])
+        entry[0] += row[1]
+        if amount is not None:
+            entry[1] = (entry[1] or Decimal(0)) + Decimal(amount)
+    return [
+        {"metric": spec.metric, "day": day, "dimension": dimension, "row_count": count, "amount": amount}
+        for (day, dimension), (count, amount) in merged.items()
+    ]
+
+
+def _upsert(connection, table, rows: list, keys: Tuple[str, ...]) -> None:
+    """Insert rows, or overwrite the non-key columns of rows that already exist."""
+    if not rows:
+        return
+    values = [c for c in rows[0] if c not in keys]
+    dialect = connection.dialect.name
+    if dialect == "mysql":
+        stmt = mysql_insert(table)
+        connection.execute(stmt.on_duplicate_key_update({c: stmt.inserted[c] for c in values}), rows)
+    elif dialect == "sqlite":
+        stmt = sqlite_insert(table)
+        connection.execute(
+            stmt.on_conflict_do_update(index_elements=list(keys), set_={c: stmt.excluded[c] for c in values}), rows
+        )
+    else:
+        for row in rows:
+            where = [table.c[k] == row[k] for k in keys]
+            result = connection.execute(update(table).where(*where).values({c: row[c] for c in values}))
+            if result.rowcount == 0:
+                connection.execute(table.insert().values(**row))
+
+
+def _refresh_days(connection, spec: DailyRollup, days: Optional[Set[date]]) -> None:
+    """Recompute a metric for the given days (None: every day). Emptied buckets are zeroed."""
+    rows = _rollup_rows(connection, spec, days)
+    existing = select(_daily.c.day, _daily.c.dimension).where(_daily.c.metric == spec.metric, _daily.c.row_count > 0)
+    if days is not None:
+        existing = existing.where(_daily.c.day.in_(days))
+    fresh = {(row["day"], row["dimension"]) for row in rows}
+    rows.extend(
+        {"metric": spec.metric, "day": _day_value(day), "dimension": dimension, "row_count": 0, "amount": None}
+        for day, dimension in connection.execute(existing)
+        if (_day_value(day), dimension) not in fresh
+    )
+    _upsert(connection, _daily, rows, ("metric", "day", "dimension"))
+
+
+def _refresh_batches(connection, batchids: Optional[Set[int]]) -> None:
+    """Recompute candidate count and fees for the given batches (None: every batch)."""
+    stmt = (
+        select(CandidateORM.batchid, func.count(), func.sum(CandidateORM.fee_paid))
+        .where(CandidateORM.batchid.isnot(None))
+        .group_by(CandidateORM.batchid)
+    )
+    existing = select(_batches.c.batchid).where(_batches.c.candidate_count > 0)
+    if batchids is not None:
+        stmt = stmt.where(CandidateORM.batchid.in_(batchids))
+        existing = existing.where(_batches.c.batchid.in_(batchids))
+    rows = [
+        {"batchid": batchid, "candidate_count": count, "fee_paid_total": fees}
+        for batchid, count, fees in connection.execute(stmt)
+    ]
+    fresh = {row["batchid"] for row in rows}
+    rows.extend(
+        {"batchid": batchid, "candidate_count": 0, "fee_paid_total": None}
+        for batchid in connection.execute(existing).scalars()
+        if batchid not in fresh
+    )
+    _upsert(connection, _batches, rows, ("batchid",))
+
+
+def _stamp(connection, table_name: str, version: Optional[int]) -> None:
+    _upsert(connection, _state, [{"source_table": table_name, "source_version": version,
+                                  "refreshed_at": datetime.utcnow()}], ("source_table",))
+
+
+def rebuild_source(connection, table_name: str, version: Optional[int]) -> None:
+    """Recompute every rollup fed by a source table and mark it aligned with version."""
+    for spec in _SPECS_BY_TABLE[table_name]:
+        _refresh_days(connection, spec, None)
+    if table_name == BATCH_SOURCE:
+        _refresh_batches(connection, None)
+    _stamp(connection, table_name, version)
+
+
+def refresh_stale_rollups(db: Session) -> int:
+    """
+    Rebuild every source whose table version moved past the version its rollups reflect
+    (first use, and any write since the last rebuild: ORM writes are normally already
+    applied after commit, this also covers bulk statements, raw SQL and refreshes that
+    failed). Runs from the scheduled job only. Returns the number rebuilt.
+    """
+    with _rebuild_lock:
+        stamped = dict(db.execute(select(_state.c.source_table, _state.c.source_version)).all())
+        current = dict(db.execute(
+            select(_versions.c.table_name, _versions.c.version).where(_versions.c.table_name.in_(SOURCE_MODELS))
+        ).all())
+        rebuilt = 0
+        for table_name, model in SOURCE_MODELS.items():
+            version = current.get(table_name)
+            if version is None:
+                seeded = get_table_version(db, model)
+                version = seeded[0] if seeded else None
+            if table_name in stamped and stamped[table_name] == version and version is not None:
+                continue
+            rebuild_source(db.connection(), table_name, version)
+            db.commit()
+            rebuilt += 1
+            logger.info(f"Rebuilt dashboard rollups for {table_name}")
+        return rebuilt
+
+
+def run_dashboard_rollup_reconcile_job():
+    """Scheduler entry point for refresh_stale_rollups."""
+    from fapi.db.database import SessionLocal
+    db = SessionLocal()
+    try:
+        refresh_stale_rollups(db)
+    except Exception as e:
+        logger.error(f"Error refreshing dashboard rollups: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+# --------------- Incremental refresh on ORM writes ---------------
+
+
+def _touched_values(obj, attr: str) -> Optional[list]:
+    """Current and pre-flush values of attr, or None when they are not known here."""
+    state = inspect(obj)
+    values = list(state.attrs[attr].history.sum())
+    if values or attr in state.dict:
+        return values
+    if state.pending and state.mapper.columns[attr].server_default is None:
+        return [None]  # never set on a new row and no database default: stored as NULL
+    return None
+
+
+_PENDING_KEY = "dashboard_rollups_pending"
+
+
+@event.listens_for(Session, "after_flush")
+def _record_touched_rollups(session, flush_context):
+    """Remember the days / batches this flush touched; they are recomputed once it commits."""
+    pending = session.info.setdefault(_PENDING_KEY, {"days": {}, "batches": set(), "tables": set()})
+    days: Dict[DailyRollup, Optional[Set[date]]] = pending["days"]
+    for obj in chain(session.new, session.dirty, session.deleted):
+        table = getattr(getattr(obj, "__table__", None), "name", None)
+        specs = _SPECS_BY_TABLE.get(table)
+        if not specs:
+            continue
+        if obj in session.dirty and not session.is_modified(obj, include_collections=False):
+            continue
+        pending["tables"].add(table)
+        for spec in specs:
+            values = _touched_values(obj, spec.day_attr)
+            if values is None:
+                days[spec] = None
+            elif days.get(spec, set()) is not None:
+                days.setdefault(spec, set()).update(_day_value(value) for value in values)
+        if table == BATCH_SOURCE and pending["batches"] is not None:
+            values = _touched_values(obj, "batchid")
+            pending["batches"] = None if values is None else pending["batches"] | {v for v in values if v is not None}
+    if not pending["tables"]:
+        session.info.pop(_PENDING_KEY, None)
+
+
+def apply_touched_rollups(connection, pending: Dict[str, Any]) -> None:
+    """Recompute and upsert the buckets recorded by _record_touched_rollups."""
+    for spec, touched in pending["days"].items():
+        if touched is not None and len(touched) > MAX_INCREMENTAL_DAYS:
+            touched = None
+        _refresh_days(connection, spec, touched)
+    batchids = pending["batches"]
+    if BATCH_SOURCE in pending["tables"] and (batchids is None or batchids):
+        _refresh_batches(connection, batchids)
+
+
+@event.listens_for(Session, "after_commit")
+def _refresh_rollups_after_commit(session):
+    """
+    Apply the touched buckets in a transaction of their own, after the writer committed, so
+    the writer never locks shared rollup rows. A failure here leaves the rollups behind until
+    the reconcile job rebuilds the source; the writer's data is already committed.
+    """
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    bind = session.get_bind()
+    try:
+        with getattr(bind, "engine", bind).begin() as connection:
+            apply_touched_rollups(connection, pending)
+    except Exception as e:
+        logger.warning(f"Could not refresh dashboard rollups for {sorted(pending['tables'])}: {e}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_touched_rollups(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+# --------------- Reads ---------------
+
+
+def _daily_filter(stmt, metric: str, start: Optional[date], end: Optional[date], dimensions: Optional[Iterable[str]]):
+    stmt = stmt.where(_daily.c.metric == metric)
+    if start is not None:
+        stmt = stmt.where(_daily.c.day >= start)
+    if end is not None:
+        stmt = stmt.where(_daily.c.day <= end)
+    if dimensions is not None:
+        stmt = stmt.where(_daily.c.dimension.in_(list(dimensions)))
+    return stmt
+
+
+def daily_totals(db: Session, metric: str, start: Optional[date] = None, end: Optional[date] = None,
+                 dimensions: Optional[Iterable[str]] = None) -> Tuple[int, float]:
+    """(row count, amount sum) for a metric over [start, end] days, optionally for some dimensions."""
+    stmt = _daily_filter(
+        select(func.coalesce(func.sum(_daily.c.row_count), 0), func.coalesce(func.sum(_daily.c.amount), 0)),
+        metric, start, end, dimensions,
+    )
+    count, amount = db.execute(stmt).one()
+    return int(count), float(amount)
+
+
+def daily_breakdown(db: Session, metric: str, start: Optional[date] = None,
+                    end: Optional[date] = None) -> Dict[str, int]:
+    """Row count per dimension value ("" for NULL) over [start, end] days."""
+    stmt = _daily_filter(
+        select(_daily.c.dimension, func.sum(_daily.c.row_count)), metric, start, end, None
+    ).group_by(_daily.c.dimension).having(func.sum(_daily.c.row_count) > 0)
+    return {dimension: int(count) for dimension, count in db.execute(stmt)}
+
+
+def batch_totals(db: Session, batchids: Iterable[int]) -> Dict[int, Tuple[int, float]]:
+    """batchid -> (candidate count, fees paid) for the given batches (absent: no candidates)."""
+    ids = [batchid for batchid in batchids if batchid is not None]
+    if not ids:
+        return {}
+    stmt = select(_batches.c.batchid, _batches.c.candidate_count, _batches.c.fee_paid_total).where(
+        _batches.c.batchid.in_(ids), _batches.c.candidate_count > 0
+    )
+    return {batchid: (int(count), float(fees or 0)) for batchid, count, fees in db.execute(stmt)}
+
+
+def rollups_ready(db: Session) -> bool:
+    """
+    True when rollups are enabled and every source has been built at least once. Stale
+    sources are rebuilt by the scheduled job, never on the request path.
+    """
+    if not config.DASHBOARD_ROLLUPS_ENABLED:
+        return False
+    try:
+        built = db.execute(
+            select(func.count()).select_from(_state).where(_state.c.source_table.in_(list(SOURCE_MODELS)))
+        ).scalar()
+        return built == len(SOURCE_MODELS)
+    except Exception as e:
+        logger.warning(f"Dashboard rollups unavailable, falling back to live queries: {e}")
+        return False
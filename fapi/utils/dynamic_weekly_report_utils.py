@@ -24,6 +24,7 @@ from fapi.db.models import (
     JobTypeORM,
     JobActivityLogORM
 )
+from fapi.utils.marketing_report_snapshots import get_marketing_report
 
 logger = logging.getLogger(__name__)
 
@@ -211,13 +212,15 @@ def send_weekly_marketing_report(db: Session) -> Dict[str, Any]:
     try:
         # Note: In the standalone architecture, we use the API to serve this data.
         # But this function remains for the internal WBL Scheduler trigger.
-        # We explicitly DO NOT send the email here. We just return a mock success
-        # to properly close out the backend scheduler loop, while the external 
-        # python script on the Windows machine does the actual email sending.
+        # We explicitly DO NOT send the email here. The external python script on the
+        # Windows machine does the actual email sending from /report-data and /report-pdf;
+        # materializing the week's report snapshot here means those requests are served
+        # from the stored copy instead of recomputing it.
+        report = get_marketing_report(db)
         return {
             "status": "success",
-            "records_processed": 0,
-            "message": "Report dispatch is handled by standalone external worker."
+            "records_processed": report["summary"]["total_candidates"],
+            "message": "Report snapshot ready; dispatch is handled by standalone external worker."
         }
     except Exception as e:
         logger.error(f"Failed to send marketing report from Backend: {e}")
@@ -52,8 +52,6 @@ def get_employee_by_email(email: str):
         return None
     
 def create_employee_db(employee_data: dict) -> EmployeeORM:
-    invalidate_cache("employees")
-    
     if not employee_data.get("startdate"):
         employee_data["startdate"] = date.today()
 
@@ -67,12 +65,13 @@ def create_employee_db(employee_data: dict) -> EmployeeORM:
                 auth_user.status = "active" if int(employee.status) == 1 else "inactive"
 
         session.commit()
+        # After the commit, so a concurrent read cannot re-cache the pre-commit rows
+        invalidate_cache("employees")
         session.refresh(employee)
         return employee
 
 
 def update_employee_db(employee_id: int, fields: dict) -> EmployeeORM:
-    invalidate_cache("employees")
     with SessionLocal() as session:
         employee = session.query(EmployeeORM).filter(
             EmployeeORM.id == employee_id
@@ -95,12 +94,12 @@ def update_employee_db(employee_id: int, fields: dict) -> EmployeeORM:
                         auth_user.refresh_token_expiry = None
 
         session.commit()
+        invalidate_cache("employees")
         session.refresh(employee)
         return employee
 
 
 def delete_employee_db(employee_id: int) -> None:
-    invalidate_cache("employees")
     with SessionLocal() as session:
         employee = session.query(EmployeeORM).filter(
             EmployeeORM.id == employee_id
@@ -111,6 +110,7 @@ def delete_employee_db(employee_id: int) -> None:
 
         session.delete(employee)
         session.commit()
+        invalidate_cache("employees")
 
 def get_employees_version(db: Session) -> Response:
     return generate_version_for_model(db, EmployeeORM)
@@ -0,0 +1,91 @@
+"""
+Streaming exports for the big analytics tables.
+
+Rows come off a server-side cursor (stream_results + yield_per) and are written as NDJSON
+or CSV in chunks of EXPORT_YIELD_PER rows, so memory stays flat regardless of table size.
+"""
+import csv
+import io
+import json
+import logging
+from datetime import date, datetime
+from typing import Any, Iterator, List, Sequence
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Query
+
+from fapi.core import config
+from fapi.core.cache_codec import alchemy_encoder
+
+logger = logging.getLogger(__name__)
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=alchemy_encoder)
+    return value
+
+
+def _iter_batches(query: Query) -> Iterator[List[Any]]:
+    batch_size = max(1, config.EXPORT_YIELD_PER)
+    result = query.execution_options(stream_results=True, yield_per=batch_size)
+    batch = []
+    for row in result:
+        batch.append(row._mapping)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_ndjson(query: Query) -> Iterator[bytes]:
+    """One JSON object per line, flushed once per fetched batch."""
+    for batch in _iter_batches(query):
+        yield "".join(
+            json.dumps(dict(row), default=alchemy_encoder) + "\n" for row in batch
+        ).encode()
+
+
+def iter_csv(query: Query, columns: Sequence[str]) -> Iterator[bytes]:
+    """Header row followed by the query rows, flushed once per fetched batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for batch in _iter_batches(query):
+        for row in batch:
+            writer.writerow([_csv_value(row[name]) for name in columns])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def export_response(query: Query, export_format: str, filename: str) -> StreamingResponse:
+    """
+    StreamingResponse for a column query in NDJSON or CSV.
+    The query must select labelled columns (not ORM entities); its labels become the keys/header.
+    """
+    if export_format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format: {export_format}")
+    if export_format == "csv":
+        columns = [c["name"] for c in query.column_descriptions]
+        body = iter_csv(query, columns)
+    else:
+        body = iter_ndjson(query)
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'},
+    )
@@ -0,0 +1,131 @@
+"""
+Process-wide pooled HTTP clients for outbound LLM and provider calls.
+
+One keep-alive httpx.Client per base URL (scheme://host[:port]) so repeated calls reuse
+connections instead of paying DNS and TLS every time. HTTP/2 is used when the h2 package is
+installed (httpx[http2]). request/get/post retry connection failures and 429 responses with
+exponential backoff and full jitter, honouring a short Retry-After. 5xx responses are only
+retried for idempotent methods: a POST that failed server-side (e.g. a chat completion) may
+already have been processed and billed.
+
+The shared clients may be handed to SDKs that treat their http_client as owned (e.g.
+OpenAI.close() or `with OpenAI(...)` closes it); close() is therefore a no-op on them and
+only close_all, at shutdown, really closes the pool.
+"""
+import logging
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from fapi.core import config
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - runtime environment dependent
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# 429 means the request was refused before any work was done; 5xx may follow partial work
+_ALWAYS_RETRY_STATUSES = frozenset({429})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# Failures where the request never reached the server, so even a POST is safe to resend
+_RETRY_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class _SharedClient(httpx.Client):
+    """A pooled client that borrowers cannot close."""
+
+    def close(self) -> None:
+        pass
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+
+_clients: Dict[str, httpx.Client] = {}
+_clients_lock = threading.Lock()
+
+
+def base_url(url: str) -> str:
+    parsed = httpx.URL(url)
+    return f"{parsed.scheme}://{parsed.netloc.decode('ascii')}"
+
+
+def get_http_client(url: str) -> httpx.Client:
+    """The shared client for url's scheme and host (created on first use)."""
+    key = base_url(url)
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = _clients[key] = _SharedClient(
+                    http2=HTTP2_AVAILABLE,
+                    timeout=config.LLM_HTTP_TIMEOUT_SECONDS,
+                    limits=httpx.Limits(
+                        max_connections=config.LLM_HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=config.LLM_HTTP_MAX_KEEPALIVE,
+                        keepalive_expiry=config.LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+                    ),
+                )
+    return client
+
+
+def _backoff(attempt: int, response: Optional[httpx.Response]) -> float:
+    cap = config.LLM_HTTP_RETRY_MAX_DELAY_SECONDS
+    if response is not None:
+        try:
+            retry_after = float(response.headers.get("Retry-After", ""))
+            if 0 <= retry_after <= cap:
+                return retry_after
+        except ValueError:
+            pass
+    return random.uniform(0, min(cap, config.LLM_HTTP_RETRY_BASE_DELAY_SECONDS * 2 ** attempt))
+
+
+def request(method: str, url: str, *, retries: Optional[int] = None, **kwargs: Any) -> httpx.Response:
+    """
+    client.request on the pooled client for url, with retry on connect errors, 429 and (for
+    idempotent methods) 5xx. retries=0 disables retrying.
+    """
+    client = get_http_client(url)
+    attempts = config.LLM_HTTP_RETRIES if retries is None else retries
+    statuses = RETRY_STATUSES if method.upper() in IDEMPOTENT_METHODS else _ALWAYS_RETRY_STATUSES
+    attempt = 0
+    while True:
+        response = None
+        try:
+            response = client.request(method, url, **kwargs)
+        except _RETRY_ERRORS as e:
+            if attempt >= attempts:
+                raise
+            logger.debug(f"{method} {base_url(url)} failed ({e!s}), retrying")
+        else:
+            if response.status_code not in statuses or attempt >= attempts:
+                return response
+            response.close()
+            logger.debug(f"{method} {base_url(url)} returned {response.status_code}, retrying")
+        time.sleep(_backoff(attempt, response))
+        attempt += 1
+
+
+def get(url: str, **kwargs: Any) -> httpx.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs: Any) -> httpx.Response:
+    return request("POST", url, **kwargs)
+
+
+def close_all() -> None:
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        httpx.Client.close(client)
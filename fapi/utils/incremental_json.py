@@ -0,0 +1,190 @@
+"""
+Incremental parser for a streamed JSON object (e.g. LLM output arriving token by token).
+
+Feed text chunks; get back events for the object's top-level members as soon as they can be
+known: ("text", key, delta) while a string value is still arriving, and ("field", key, value)
+once a member's value is complete. Leading prose or a ```json fence before the opening brace
+is skipped. Nested values are reported whole once they close. Text that turns out not to be
+valid JSON (a raw control character or an invalid escape such as \\d inside a string) stops
+the parser: no further events are produced, and the caller's full-text parse decides.
+"""
+import json
+from typing import Any, List, Optional, Tuple
+
+Event = Tuple[str, str, Any]
+
+_WHITESPACE = " \t\r\n"
+
+
+class IncrementalJsonObject:
+    def __init__(self):
+        self._buf = ""
+        self._pos = 0
+        self._state = "object"  # object, key, colon, value, string, other, after, done, failed
+        self._key: Optional[str] = None
+        self._value_start = 0
+        self._emitted = 0  # chars of the current string value already sent as text
+        self._depth = 0
+        self._in_string = False
+
+    @property
+    def done(self) -> bool:
+        return self._state == "done"
+
+    @property
+    def failed(self) -> bool:
+        return self._state == "failed"
+
+    def feed(self, chunk: str) -> List[Event]:
+        if self._state == "failed":
+            return []
+        self._buf += chunk
+        events: List[Event] = []
+        try:
+            while self._pos < len(self._buf) and self._state != "done":
+                if not self._step(events):
+                    break
+        except json.JSONDecodeError:
+            self._state = "failed"
+        return events
+
+    def _skip_whitespace(self) -> bool:
+        while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+            self._pos += 1
+        return self._pos < len(self._buf)
+
+    def _string_end(self, start: int) -> Optional[int]:
+        """Index of the closing quote of the string whose body starts at start, if it arrived."""
+        i = start
+        while i < len(self._buf):
+            ch = self._buf[i]
+            if ch == "\\":
+                i += 2
+            elif ch == '"':
+                return i
+            else:
+                i += 1
+        return None
+
+    def _safe_prefix(self, start: int) -> str:
+        """Raw string body from start, cut before any incomplete escape sequence."""
+        raw = self._buf[start:]
+        cut = len(raw)
+        backslash = raw.rfind("\\")
+        if backslash >= 0:
+            # Count the run of backslashes ending at that position to see if it is escaped
+            run = len(raw[:backslash + 1]) - len(raw[:backslash + 1].rstrip("\\"))
+            if run % 2 == 1:
+                needed = 6 if raw[backslash + 1:backslash + 2] == "u" else 2
+                if len(raw) - backslash < needed:
+                    cut = backslash
+        return raw[:cut]
+
+    def _step(self, events: List[Event]) -> bool:
+        state = self._state
+        if state == "object":
+            start = self._buf.find("{", self._pos)
+            if start < 0:
+                self._pos = len(self._buf)
+                return False
+            self._pos = start + 1
+            self._state = "key"
+            return True
+
+        if not self._skip_whitespace():
+            return False
+        ch = self._buf[self._pos]
+
+        if state == "key":
+            if ch == "}":
+                self._state = "done"
+                return False
+            if ch == ",":
+                self._pos += 1
+                return True
+            if ch != '"':
+                self._pos += 1  # tolerate stray characters between members
+                return True
+            end = self._string_end(self._pos + 1)
+            if end is None:
+                return False
+            self._key = json.loads(self._buf[self._pos:end + 1])
+            self._pos = end + 1
+            self._state = "colon"
+            return True
+
+        if state == "colon":
+            self._pos += 1  # ':'
+            self._state = "value"
+            return True
+
+        if state == "value":
+            if ch == '"':
+                self._value_start = self._pos + 1
+                self._pos += 1
+                self._emitted = 0
+                self._state = "string"
+            else:
+                self._value_start = self._pos
+                self._depth = 0
+                self._in_string = False
+                self._state = "other"
+            return True
+
+        if state == "string":
+            end = self._string_end(self._value_start)
+            if end is None:
+                decoded = json.loads('"' + self._safe_prefix(self._value_start) + '"')
+                if len(decoded) > self._emitted:
+                    events.append(("text", self._key, decoded[self._emitted:]))
+                    self._emitted = len(decoded)
+                self._pos = len(self._buf)
+                return False
+            value = json.loads(self._buf[self._value_start - 1:end + 1])
+            if len(value) > self._emitted:
+                events.append(("text", self._key, value[self._emitted:]))
+            events.append(("field", self._key, value))
+            self._pos = end + 1
+            self._state = "after"
+            return True
+
+        if state == "other":
+            i = self._pos
+            while i < len(self._buf):
+                c = self._buf[i]
+                if self._in_string:
+                    if c == "\\":
+                        i += 1
+                    elif c == '"':
+                        self._in_string = False
+                elif c == '"':
+                    self._in_string = True
+                elif c in "[{":
+                    self._depth += 1
+                elif c in "]}":
+                    if self._depth == 0:
+                        break
+                    self._depth -= 1
+                elif c == "," and self._depth == 0:
+                    break
+                i += 1
+            if i >= len(self._buf):
+                self._pos = i
+                return False
+            try:
+                events.append(("field", self._key, json.loads(self._buf[self._value_start:i])))
+            except json.JSONDecodeError:
+                pass  # malformed member; the caller's full-text parse decides the result
+            self._pos = i
+            self._state = "after"
+            return True
+
+        if state == "after":
+            if ch == "}":
+                self._state = "done"
+                return False
+            self._pos += 1  # ','
+            self._state = "key"
+            return True
+
+        return False
@@ -1,11 +1,15 @@
 import logging
 from sqlalchemy.orm import Session
-from sqlalchemy import func, text
+from sqlalchemy import func
 from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.exc import SQLAlchemyError
 from fapi.db.models import JobLinkClicksORM, AuthUserORM, CandidateORM, JobListingORM
 from fapi.utils.table_fingerprint import generate_version_for_model
+from fapi.utils.pagination_utils import apply_keyset, decode_cursor, encode_cursor, estimated_total, fetch_page
+from fapi.utils.export_utils import export_response
 from fastapi import Response
-from typing import List, Dict, Any
+from fastapi.responses import StreamingResponse
+from typing import List, Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -20,13 +24,12 @@ def track_clicks_with_cache_invalidation(
         from fastapi import HTTPException
         raise HTTPException(status_code=401, detail="User identity not found in token")
 
-    logger.info(f"[CLICK_DEBUG] POST track-clicks-batch authuser_id={authuser_id}, clicks={clicks}")
-    processed_count = bulk_upsert_job_clicks(
+    logger.debug(f"[CLICK_DEBUG] POST track-clicks-batch authuser_id={authuser_id}, clicks={clicks}")
+    result = upsert_job_clicks_batch(
         db=db,
         authuser_id=authuser_id,
         clicks=clicks,
     )
-    logger.info(f"[CLICK_DEBUG] processed: {processed_count}")
 
     try:
         from fapi.core.cache import invalidate_cache
@@ -34,7 +37,7 @@ def track_clicks_with_cache_invalidation(
     except Exception as cache_err:
         logger.warning(f"Cache invalidation failed after click tracking: {cache_err}")
 
-    return {"status": "success", "processed": processed_count}
+    return {"status": "success", "processed": result["processed"], "failed": result["failed"]}
 
 def _validate_authuser_id(db: Session, authuser_id: int) -> int:
     """
@@ -69,18 +72,101 @@ def _resolve_candidate_to_authuser_id(db: Session, candidate_id: int) -> int:
 
     raise ValueError("Invalid candidate_id")
 
-def bulk_upsert_job_clicks(
+def _aggregate_clicks(clicks: List[Dict[str, Any]], failed: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+    """
+    Dedupe a flush by job_listing_id, summing counts and remembering which items fed each row.
+    Malformed items are appended to `failed`.
+    """
+    totals: Dict[int, Dict[str, Any]] = {}
+    for index, click in enumerate(clicks):
+        raw_id = click.get("job_listing_id")
+        if not raw_id:
+            continue
+        try:
+            job_id = int(raw_id)
+            count = int(click.get("count", 1))
+        except (TypeError, ValueError):
+            failed.append({"index": index, "job_listing_id": raw_id, "error": "Invalid job_listing_id or count"})
+            continue
+        entry = totals.setdefault(job_id, {"count": 0, "indexes": []})
+        entry["count"] += count
+        entry["indexes"].append(index)
+    return totals
+
+
+def _ensure_job_listings(db: Session, job_ids: List[int]) -> None:
+    """Insert placeholder job_listing rows for unknown ids in one multi-row statement."""
+    existing = {r.id for r in db.query(JobListingORM.id).filter(JobListingORM.id.in_(job_ids))}
+    missing = [job_id for job_id in job_ids if job_id not in existing]
+    if not missing:
+        return
+    stmt = insert(JobListingORM).values(
+        [{"id": job_id, "title": "Job Listing", "company_name": "Company"} for job_id in missing]
+    )
+    db.execute(stmt.on_duplicate_key_update(id=stmt.inserted.id))
+
+
+def _upsert_click_rows(db: Session, authuser_id: int, totals: Dict[int, int]) -> None:
+    """
+    Apply pre-aggregated counts to job_link_clicks in one multi-row upsert. ORM-enabled so
+    the session's write tracking (table versions, click analytics ETags) sees it.
+    """
+    rows = [
+        {"authuser_id": authuser_id, "job_listing_id": job_id, "click_count": count}
+        for job_id, count in totals.items()
+    ]
+    stmt = insert(JobLinkClicksORM).values(rows)
+    db.execute(stmt.on_duplicate_key_update(
+        click_count=JobLinkClicksORM.click_count + stmt.inserted.click_count,
+        last_clicked_at=func.now(),
+    ))
+
+
+def _apply_click_batch(
+    db: Session,
+    authuser_id: int,
+    batch: List[tuple],
+    failed: List[Dict[str, Any]],
+) -> int:
+    """
+    Write (job_id, entry) pairs under one SAVEPOINT. If the batch fails it is split in
+    half and retried, so a bad row costs O(log n) savepoints instead of one per row.
+    """
+    try:
+        with db.begin_nested():
+            _ensure_job_listings(db, [job_id for job_id, _ in batch])
+            _upsert_click_rows(db, authuser_id, {job_id: entry["count"] for job_id, entry in batch})
+        return sum(len(entry["indexes"]) for _, entry in batch)
+    except SQLAlchemyError as e:
+        if len(batch) == 1:
+            job_id, entry = batch[0]
+            logger.warning(f"[CLICK_TRACKING] Skipping job click error for job_id {job_id}: {str(e)}")
+            failed.extend(
+                {"index": index, "job_listing_id": job_id, "error": "Could not record click"}
+                for index in entry["indexes"]
+            )
+            return 0
+        mid = len(batch) // 2
+        return (
+            _apply_click_batch(db, authuser_id, batch[:mid], failed)
+            + _apply_click_batch(db, authuser_id, batch[mid:], failed)
+        )
+
+
+def upsert_job_clicks_batch(
     db: Session,
     authuser_id: int = None,
     clicks: List[Dict[str, Any]] = None,
     candidate_id: int = None
-) -> int:
+) -> Dict[str, Any]:
     """
-    Perform a single bulk UPSERT to MySQL for a batch of clicks.
-    Optimized for Service Worker flushes.
+    Set-based ingestion of a Service Worker flush: clicks are deduped and summed per
+    job_listing_id, missing listings are ensured and all counts applied with one
+    multi-row statement each. Returns {"processed": n, "failed": [{index, job_listing_id, error}]}.
     """
+    failed: List[Dict[str, Any]] = []
     if not clicks:
-        return 0
+        return {"processed": 0, "failed": failed}
 
     try:
         if candidate_id is not None:
@@ -91,70 +177,44 @@ def bulk_upsert_job_clicks(
             raise ValueError("Must provide either authuser_id or candidate_id")
     except ValueError:
         logger.error(f"[CLICK_TRACKING] Invalid user ID in bulk upsert")
-        return 0
+        return {"processed": 0, "failed": failed}
 
-    logger.info(f"[CLICK_TRACKING] Starting bulk_upsert_job_clicks for user_id={authuser_id} (target={target_authuser_id}), clicks_count={len(clicks)}")
+    totals = _aggregate_clicks(clicks, failed)
+    if not totals:
+        return {"processed": 0, "failed": failed}
 
     try:
-        processed_count = 0
-        for click in clicks:
-            try:
-                with db.begin_nested():
-                    job_id = click.get("job_listing_id")
-                    count = click.get("count", 1)
-
-                    if not job_id:
-                        continue
-
-                    # Ensure job_listing_id exists in job_listing table before inserting into job_link_clicks
-                    existing_job = db.query(JobListingORM.id).filter(JobListingORM.id == job_id).first()
-                    if not existing_job:
-                        try:
-                            with db.begin_nested():
-                                db.execute(
-                                    text(
-                                        "INSERT INTO job_listing (id, title, company_name) "
-                                        "VALUES (:id, 'Job Listing', 'Company') "
-                                        "ON DUPLICATE KEY UPDATE id = VALUES(id)"
-                                    ),
-                                    {"id": job_id}
-                                )
-                                db.flush()
-                        except Exception as job_err:
-                            logger.warning(f"[CLICK_TRACKING] Failed to auto-ensure JobListing {job_id}: {job_err}")
-
-                    db.execute(
-                        text(
-                            "INSERT INTO job_link_clicks (authuser_id, job_listing_id, click_count, first_clicked_at, last_clicked_at) "
-                            "VALUES (:authuser_id, :job_listing_id, :count, NOW(), NOW()) "
-                            "ON DUPLICATE KEY UPDATE click_count = click_count + VALUES(click_count), last_clicked_at = NOW()"
-                        ),
-                        {
-                            "authuser_id": target_authuser_id,
-                            "job_listing_id": job_id,
-                            "count": count
-                        }
-                    )
-                    processed_count += 1
-                    logger.info(f"[CLICK_TRACKING] Successfully recorded click for user_id={authuser_id}, job_listing_id={job_id}, count={count}")
-            except Exception as inner_e:
-                logger.warning(f"[CLICK_TRACKING] Skipping job click error for job_id {click.get('job_listing_id')}: {str(inner_e)}")
-                continue
-        
+        processed_count = _apply_click_batch(db, target_authuser_id, sorted(totals.items()), failed)
         db.commit()
-        logger.info(f"[CLICK_TRACKING] Committed {processed_count} click upserts for user_id={authuser_id}")
-        return processed_count
+        logger.info(
+            f"[CLICK_TRACKING] Committed {processed_count} clicks across {len(totals)} listings "
+            f"for user_id={target_authuser_id} ({len(failed)} failed)"
+        )
+        return {"processed": processed_count, "failed": failed}
     except Exception as e:
         db.rollback()
         logger.error(f"[CLICK_TRACKING] Bulk upsert failed for user_id={authuser_id}: {str(e)}")
         raise e
 
 
-def get_job_click_analytics(db: Session) -> List[Dict[str, Any]]:
+def bulk_upsert_job_clicks(
+    db: Session,
+    authuser_id: int = None,
+    clicks: List[Dict[str, Any]] = None,
+    candidate_id: int = None
+) -> int:
     """
-    Get full click analytics with 3-table join.
+    Perform a single bulk UPSERT to MySQL for a batch of clicks.
+    Optimized for Service Worker flushes.
     """
-    results = (
+    return upsert_job_clicks_batch(db, authuser_id, clicks, candidate_id)["processed"]
+
+
+def _job_click_analytics_query(db: Session):
+    """
+    Column query for the full click analytics 3-table join (unordered).
+    """
+    return (
         db.query(
             JobLinkClicksORM.id,
             JobLinkClicksORM.authuser_id,
@@ -170,6 +230,15 @@ def get_job_click_analytics(db: Session) -> List[Dict[str, Any]]:
         .join(AuthUserORM, JobLinkClicksORM.authuser_id == AuthUserORM.id)
         .join(JobListingORM, JobLinkClicksORM.job_listing_id == JobListingORM.id)
         .outerjoin(CandidateORM, func.lower(AuthUserORM.uname) == func.lower(CandidateORM.email))
+    )
+
+
+def get_job_click_analytics(db: Session) -> List[Dict[str, Any]]:
+    """
+    Get full click analytics with 3-table join.
+    """
+    results = (
+        _job_click_analytics_query(db)
         .order_by(JobLinkClicksORM.last_clicked_at.desc())
         .all()
     )
@@ -223,32 +292,36 @@ def get_my_job_click_analytics(db: Session, authuser_id: int) -> List[Dict[str,
         for r in results
     ]
 
-def get_paginated_job_click_analytics(db: Session, page: int = 1, page_size: int = 5000) -> Dict[str, Any]:
+def get_paginated_job_click_analytics(
+    db: Session,
+    page: int = 1,
+    page_size: int = 5000,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+) -> Dict[str, Any]:
     """
     Get paginated full click analytics with 3-table join.
+    Passing a cursor (empty for the first page) switches to keyset pagination on
+    (last_clicked_at, id); the total is then the registry estimate and only on request.
     """
-    query = (
-        db.query(
-            JobLinkClicksORM.id,
-            JobLinkClicksORM.authuser_id,
-            JobLinkClicksORM.job_listing_id,
-            func.coalesce(CandidateORM.full_name, AuthUserORM.fullname).label("full_name"),
-            AuthUserORM.uname.label("email"),
-            JobListingORM.title.label("job_title"),
-            JobListingORM.company_name,
-            JobLinkClicksORM.click_count,
-            JobLinkClicksORM.first_clicked_at,
-            JobLinkClicksORM.last_clicked_at
+    query = _job_click_analytics_query(db)
+
+    next_cursor = None
+    if cursor is not None:
+        total_count = estimated_total(db, JobLinkClicksORM, query, filtered=False) if include_total else None
+        query = apply_keyset(
+            query, JobLinkClicksORM.last_clicked_at, JobLinkClicksORM.id, True,
+            decode_cursor(cursor, "last_clicked_at:desc"),
         )
-        .join(AuthUserORM, JobLinkClicksORM.authuser_id == AuthUserORM.id)
-        .join(JobListingORM, JobLinkClicksORM.job_listing_id == JobListingORM.id)
-        .outerjoin(CandidateORM, func.lower(AuthUserORM.uname) == func.lower(CandidateORM.email))
-    )
-
-    total_count = query.count()
-    offset = (page - 1) * page_size
-    results = query.order_by(JobLinkClicksORM.last_clicked_at.desc()).offset(offset).limit(page_size).all()
-    has_next = (offset + page_size) < total_count
+        results, has_next = fetch_page(query, page_size)
+        if has_next:
+            next_cursor = encode_cursor("last_clicked_at:desc", results[-1].last_clicked_at, results[-1].id)
+        page = None
+    else:
+        total_count = query.count()
+        offset = (page - 1) * page_size
+        results = query.order_by(JobLinkClicksORM.last_clicked_at.desc()).offset(offset).limit(page_size).all()
+        has_next = (offset + page_size) < total_count
     
     data = [
         {
@@ -271,9 +344,19 @@ def get_paginated_job_click_analytics(db: Session, page: int = 1, page_size: int
         "page": page,
         "page_size": page_size,
         "total": total_count,
-        "has_next": has_next
+        "has_next": has_next,
+        "next_cursor": next_cursor,
     }
 
+def export_job_click_analytics(db: Session, export_format: str = "ndjson") -> StreamingResponse:
+    """
+    Stream the full click analytics join as NDJSON or CSV, newest clicks first.
+    """
+    query = _job_click_analytics_query(db).order_by(
+        JobLinkClicksORM.last_clicked_at.desc(), JobLinkClicksORM.id.desc()
+    )
+    return export_response(query, export_format, "job_click_analytics")
+
 def get_job_clicks_version(db: Session) -> Response:
     """
     Returns the table version for caching.
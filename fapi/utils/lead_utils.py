@@ -110,6 +110,11 @@ def fetch_all_leads(db: Session, search: str = None, search_by: str = "name", so
 
 @cache_result(ttl=300, prefix="leads")
 def get_lead_by_id(db: Session, lead_id: int):
+    return _get_lead_orm(db, lead_id)
+
+
+def _get_lead_orm(db: Session, lead_id: int):
+    # Write paths need the live ORM row, not a cached dict (and must not re-cache stale data)
     return db.query(LeadORM).filter(LeadORM.id == lead_id).first()
 
 
@@ -126,7 +131,7 @@ def create_lead(db: Session, lead: LeadCreate):
 def update_lead(db: Session, lead_id: int, lead: LeadUpdate):
     invalidate_cache("leads")
     invalidate_cache("metrics")
-    db_lead = get_lead_by_id(db, lead_id)
+    db_lead = _get_lead_orm(db, lead_id)
     if not db_lead:
         raise HTTPException(status_code=404, detail="Lead not found")
     for key, value in lead.dict(exclude_unset=True).items():
@@ -139,7 +144,7 @@ def update_lead(db: Session, lead_id: int, lead: LeadUpdate):
 def delete_lead(db: Session, lead_id: int):
     invalidate_cache("leads")
     invalidate_cache("metrics")
-    db_lead = get_lead_by_id(db, lead_id)
+    db_lead = _get_lead_orm(db, lead_id)
     if not db_lead:
         raise HTTPException(status_code=404, detail="Lead not found")
     db.delete(db_lead)
@@ -163,7 +168,7 @@ def create_candidate_from_lead(db: Session, lead_id: int):
     invalidate_cache("leads")
     invalidate_cache("candidates")
     invalidate_cache("metrics")
-    lead = get_lead_by_id(db, lead_id)
+    lead = _get_lead_orm(db, lead_id)
     if not lead:
         raise HTTPException(status_code=404, detail="Lead not found")
 
@@ -173,7 +178,7 @@ def create_candidate_from_lead(db: Session, lead_id: int):
 
 
 def get_lead_info_mark_move_to_candidate_true(db: Session, lead_id: int):
-    lead = get_lead_by_id(db, lead_id)
+    lead = _get_lead_orm(db, lead_id)
     if not lead:
         raise HTTPException(status_code=404, detail="Lead not found")
 
@@ -6,6 +6,8 @@ from typing import Optional, Tuple
 
 import httpx
 
+from fapi.utils import http_client_pool
+
 logger = logging.getLogger(__name__)
 
 ValidationStatus = str  # active | inactive | invalid
@@ -39,11 +41,12 @@ def validate_openai_api_key(api_key: str) -> Tuple[ValidationStatus, str]:
     if not key:
         return "invalid", "No key stored"
     try:
-        with httpx.Client(timeout=20.0) as client:
-            r = client.get(
-                "https://api.openai.com/v1/models",
-                headers={"Authorization": f"Bearer {key}"},
-            )
+        r = http_client_pool.get(
+            "https://api.openai.com/v1/models",
+            headers={"Authorization": f"Bearer {key}"},
+            timeout=20.0,
+            retries=0,
+        )
         if r.status_code == 200:
             return finalize_validation(True, "Key is active")
         detail = r.text[:500]
@@ -62,14 +65,15 @@ def validate_claude_api_key(api_key: str) -> Tuple[ValidationStatus, str]:
     if not key:
         return "invalid", "No key stored"
     try:
-        with httpx.Client(timeout=20.0) as client:
-            r = client.get(
-                "https://api.anthropic.com/v1/models",
-                headers={
-                    "x-api-key": key,
-                    "anthropic-version": "2023-06-01",
-                },
-            )
+        r = http_client_pool.get(
+            "https://api.anthropic.com/v1/models",
+            headers={
+                "x-api-key": key,
+                "anthropic-version": "2023-06-01",
+            },
+            timeout=20.0,
+            retries=0,
+        )
         if r.status_code == 200:
             return finalize_validation(True, "Key is active")
         detail = r.text[:500]
@@ -87,10 +91,11 @@ def validate_gemini_api_key(api_key: str) -> Tuple[ValidationStatus, str]:
     if not key:
         return "invalid", "No key stored"
     try:
-        with httpx.Client(timeout=20.0) as client:
-            r = client.get(
-                f"https://generativelanguage.googleapis.com/v1beta/models?key={key}",
-            )
+        r = http_client_pool.get(
+            f"https://generativelanguage.googleapis.com/v1beta/models?key={key}",
+            timeout=20.0,
+            retries=0,
+        )
         if r.status_code == 200:
             return finalize_validation(True, "Key is active")
         detail = r.text[:500]
@@ -108,11 +113,12 @@ def validate_mistral_api_key(api_key: str) -> Tuple[ValidationStatus, str]:
     if not key:
         return "invalid", "No key stored"
     try:
-        with httpx.Client(timeout=20.0) as client:
-            r = client.get(
-                "https://api.mistral.ai/v1/models",
-                headers={"Authorization": f"Bearer {key}"},
-            )
+        r = http_client_pool.get(
+            "https://api.mistral.ai/v1/models",
+            headers={"Authorization": f"Bearer {key}"},
+            timeout=20.0,
+            retries=0,
+        )
         if r.status_code == 200:
             return finalize_validation(True, "Key is active")
         detail = r.text[:500]
@@ -0,0 +1,102 @@
+"""
+Shared, in-memory catalog of LLM model lists per (provider, key tier).
+
+Entries are written whenever a key validates (the public models of the provider's /models
+answer; fine-tuned and account-scoped IDs are left out) and read by the provider metadata
+endpoints, one tier per provider, through get_or_refresh. Key-independent catalogs (e.g.
+OpenRouter's public model list) come with a fetch: stale entries are served immediately while
+one background thread re-fetches them. Catalogs only learned from validated keys have no fetch
+and are served while within LLM_MODEL_CATALOG_TTL_SECONDS; after that the caller falls back
+to the provider's static list until another key validates. Raw keys are never stored; a tier
+is a coarse key class such as the matched key prefix.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from fapi.core import config
+
+logger = logging.getLogger(__name__)
+
+CatalogFetch = Callable[[], Optional[Tuple[List[str], str]]]
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    models: Tuple[str, ...]
+    default_model: str
+    fetched_at: float
+
+    def fresh(self) -> bool:
+        return time.monotonic() - self.fetched_at < config.LLM_MODEL_CATALOG_TTL_SECONDS
+
+
+class ModelCatalog:
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str], CatalogEntry] = {}
+        self._refreshing: Set[Tuple[str, str]] = set()
+        self._lock = threading.Lock()
+
+    def get(self, provider_id: str, tier: str) -> Optional[CatalogEntry]:
+        return self._entries.get((provider_id, tier))
+
+    def put(self, provider_id: str, tier: str, models: List[str], default_model: str) -> CatalogEntry:
+        entry = CatalogEntry(tuple(models), default_model, time.monotonic())
+        self._entries[(provider_id, tier)] = entry
+        return entry
+
+    def latest(self, provider_id: str, tier: str) -> Optional[CatalogEntry]:
+        """The tier's entry while it is within the TTL, else None."""
+        entry = self.get(provider_id, tier)
+        return entry if entry is not None and entry.fresh() else None
+
+    def get_or_refresh(
+        self, provider_id: str, tier: str, fetch: Optional[CatalogFetch]
+    ) -> Optional[CatalogEntry]:
+        """
+        Fresh entry as-is; stale entry as-is plus a background refresh; no entry: fetch inline.
+        fetch returns (models, default_model) or None when the catalog could not be loaded.
+        Without a fetch (the tier is only filled by key validation) only a fresh entry is returned.
+        """
+        if fetch is None:
+            return self.latest(provider_id, tier)
+        entry = self.get(provider_id, tier)
+        if entry is None:
+            return self._refresh(provider_id, tier, fetch)
+        if not entry.fresh():
+            key = (provider_id, tier)
+            with self._lock:
+                if key in self._refreshing:
+                    return entry
+                self._refreshing.add(key)
+            threading.Thread(
+                target=self._refresh_in_background, args=(provider_id, tier, fetch),
+                daemon=True, name="llm-model-catalog",
+            ).start()
+        return entry
+
+    def _refresh(self, provider_id: str, tier: str, fetch: CatalogFetch) -> Optional[CatalogEntry]:
+        try:
+            fetched = fetch()
+        except Exception as e:
+            logger.warning(f"Could not refresh {provider_id} model catalog: {e}")
+            fetched = None
+        if not fetched:
+            return self.get(provider_id, tier)
+        models, default_model = fetched
+        return self.put(provider_id, tier, models, default_model)
+
+    def _refresh_in_background(self, provider_id: str, tier: str, fetch: CatalogFetch) -> None:
+        try:
+            self._refresh(provider_id, tier, fetch)
+        finally:
+            with self._lock:
+                self._refreshing.discard((provider_id, tier))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+model_catalog = ModelCatalog()
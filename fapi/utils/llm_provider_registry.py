@@ -6,14 +6,46 @@ dynamic model fetching via provider APIs (GET /v1/models), and default model sel
 """
 from __future__ import annotations
 
+import hashlib
 import logging
 import re
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import Any, Dict, List, Optional, Tuple
 
-import httpx
+from fapi.core import config
+from fapi.core.local_cache import LRUCache
+from fapi.utils import http_client_pool
+from fapi.utils.llm_model_catalog import CatalogFetch, model_catalog
 
 logger = logging.getLogger(__name__)
 
+# Batch validation fan-out, and the cap on concurrent probes against any one provider
+_validation_pool = ThreadPoolExecutor(
+    max_workers=config.LLM_KEY_VALIDATION_WORKERS, thread_name_prefix="llm-key-validate"
+)
+# Probes raced against every provider when a key matches no known prefix (kept separate from
+# the batch pool, whose workers may be the ones waiting on a race)
+_probe_pool = ThreadPoolExecutor(
+    max_workers=config.LLM_PROVIDER_PROBE_WORKERS, thread_name_prefix="llm-provider-probe"
+)
+# Definitive outcomes (active / invalid) by key hash, so repeated validate and finish-setup
+# calls don't re-hit provider /models endpoints; "inactive" (network, quota) is always re-probed
+_CACHEABLE_STATUSES = ("active", "invalid")
+_validation_cache = LRUCache(max_entries=1000)
+_provider_slots: Dict[str, threading.BoundedSemaphore] = {}
+_provider_slots_lock = threading.Lock()
+
+
+def _provider_slot(provider_id: str) -> threading.BoundedSemaphore:
+    with _provider_slots_lock:
+        slot = _provider_slots.get(provider_id)
+        if slot is None:
+            slot = _provider_slots[provider_id] = threading.BoundedSemaphore(
+                max(1, config.LLM_KEY_VALIDATION_PER_PROVIDER)
+            )
+        return slot
+
 ValidationStatus = str  # "active" | "inactive" | "invalid"
 
 _INVALID_KEY_PHRASES = (
@@ -54,6 +86,27 @@ class BaseLLMProvider:
             return True
         return False
 
+    def key_tier(self, api_key: str) -> str:
+        """Coarse key class for the shared model catalog (longest matching prefix), never the key itself."""
+        k = (api_key or "").strip()
+        matches = [prefix for prefix in self.key_prefixes if k.startswith(prefix)]
+        return max(matches, key=len) if matches else "default"
+
+    def catalog_tier(self) -> str:
+        """Tier whose models the provider metadata lists: the provider's primary key class."""
+        return self.key_tier(self.key_prefixes[0]) if self.key_prefixes else "default"
+
+    def catalog_fetch(self) -> Optional[CatalogFetch]:
+        """Key-independent loader for the catalog_tier list; None when only validated keys fill it."""
+        return None
+
+    def is_public_model(self, model_id: str) -> bool:
+        """
+        Whether model_id is offered to every customer. A /models answer also lists the key
+        owner's fine-tuned and account-scoped models; only public IDs enter the shared catalog.
+        """
+        return not model_id.startswith(("ft:", "tunedModels/", "accounts/"))
+
     def validate_and_fetch_models(self, api_key: str) -> Tuple[ValidationStatus, str, List[str], Optional[str]]:
         raise NotImplementedError
 
@@ -74,8 +127,7 @@ class OpenAIProvider(BaseLLMProvider):
     def validate_and_fetch_models(self, api_key: str) -> Tuple[ValidationStatus, str, List[str], Optional[str]]:
         key = api_key.strip()
         try:
-            with httpx.Client(timeout=15.0) as client:
-                r = client.get("https://api.openai.com/v1/models", headers={"Authorization": f"Bearer {key}"})
+            r = http_client_pool.get("https://api.openai.com/v1/models", headers={"Authorization": f"Bearer {key}"}, retries=0)
             if r.status_code == 200:
                 data = r.json().get("data", [])
                 raw_ids = [m.get("id") for m in data if isinstance(m, dict) and m.get("id")]
@@ -116,11 +168,11 @@ class AnthropicProvider(BaseLLMProvider):
     def validate_and_fetch_models(self, api_key: str) -> Tuple[ValidationStatus, str, List[str], Optional[str]]:
         key = api_key.strip()
         try:
-            with httpx.Client(timeout=15.0) as client:
-                r = client.get(
-                    "https://api.anthropic.com/v1/models",
-                    headers={"x-api-key": key, "anthropic-version": "2023-06-01"},
-                )
+            r = http_client_pool.get(
+                "https://api.anthropic.com/v1/models",
+                headers={"x-api-key": key, "anthropic-version": "2023-06-01"},
+                retries=0,
+            )
             fallback_models = [
                 "claude-3-7-sonnet-20250219",
                 "claude-3-5-sonnet-20241022",
@@ -155,8 +207,7 @@ class GeminiProvider(BaseLLMProvider):
         key = api_key.strip()
         fallback_models = ["gemini-2.0-flash", "gemini-1.5-pro", "gemini-1.5-flash"]
         try:
-            with httpx.Client(timeout=15.0) as client:
-                r = client.get(f"https://generativelanguage.googleapis.com/v1beta/models?key={key}")
+            r = http_client_pool.get(f"https://generativelanguage.googleapis.com/v1beta/models?key={key}", retries=0)
             if r.status_code == 200:
                 data = r.json().get("models", [])
                 raw_names = []
@@ -190,8 +241,7 @@ class GroqProvider(BaseLLMProvider):
         key = api_key.strip()
         fallback_models = ["llama-3.3-70b-versatile", "llama-3.1-8b-instant", "mixtral-8x7b-32768", "deepseek-r1-distill-llama-70b"]
         try:
-            with httpx.Client(timeout=15.0) as client:
-                r = client.get("https://api.groq.com/openai/v1/models", headers={"Authorization": f"Bearer {key}"})
+            r = http_client_pool.get("https://api.groq.com/openai/v1/models", headers={"Authorization": f"Bearer {key}"}, retries=0)
             if r.status_code == 200:
                 data = r.json().get("data", [])
                 raw_ids = [m.get("id") for m in data if isinstance(m, dict) and m.get("id") and m.get("active", True)]
@@ -220,8 +270,7 @@ class MistralProvider(BaseLLMProvider):
         key = api_key.strip()
         fallback_models = ["mistral-large-latest", "codestral-latest", "mistral-small-latest"]
         try:
-            with httpx.Client(timeout=15.0) as client:
-                r = client.get("https://api.mistral.ai/v1/models", headers={"Authorization": f"Bearer {key}"})
+            r = http_client_pool.get("https://api.mistral.ai/v1/models", headers={"Authorization": f"Bearer {key}"}, retries=0)
             if r.status_code == 200:
                 data = r.json().get("data", [])
                 raw_ids = [m.get("id") for m in data if isinstance(m, dict) and m.get("id")]
@@ -250,8 +299,7 @@ class DeepSeekProvider(BaseLLMProvider):
         key = api_key.strip()
         fallback_models = ["deepseek-chat", "deepseek-reasoner"]
         try:
-            with httpx.Client(timeout=15.0) as client:
-                r = client.get("https://api.deepseek.com/v1/models", headers={"Authorization": f"Bearer {key}"})
+            r = http_client_pool.get("https://api.deepseek.com/v1/models", headers={"Authorization": f"Bearer {key}"}, retries=0)
             if r.status_code == 200:
                 data = r.json().get("data", [])
                 raw_ids = [m.get("id") for m in data if isinstance(m, dict) and m.get("id")]
@@ -275,20 +323,13 @@ class OpenRouterProvider(BaseLLMProvider):
         key = api_key.strip()
         fallback_models = ["openai/gpt-4o", "anthropic/claude-3.5-sonnet", "google/gemini-2.0-flash-001", "deepseek/deepseek-r1"]
         try:
-            with httpx.Client(timeout=15.0) as client:
-                # OpenRouter /api/v1/models is public; MUST use /api/v1/auth/key to verify authentication
-                r_auth = client.get("https://openrouter.ai/api/v1/auth/key", headers={"Authorization": f"Bearer {key}"})
+            # OpenRouter /api/v1/models is public; MUST use /api/v1/auth/key to verify authentication
+            r_auth = http_client_pool.get("https://openrouter.ai/api/v1/auth/key", headers={"Authorization": f"Bearer {key}"}, retries=0)
             if r_auth.status_code == 200:
-                try:
-                    with httpx.Client(timeout=15.0) as client:
-                        r_models = client.get("https://openrouter.ai/api/v1/models")
-                    if r_models.status_code == 200:
-                        data = r_models.json().get("data", [])
-                        raw_ids = [m.get("id") for m in data if isinstance(m, dict) and m.get("id")]
-                        models = raw_ids[:30] if raw_ids else fallback_models
-                        return "active", "Key is active", models, models[0]
-                except Exception:
-                    pass
+                # The catalog is public and very large: share one copy, refreshed in the background
+                entry = model_catalog.get_or_refresh(self.provider_id, self.catalog_tier(), self.catalog_fetch())
+                if entry:
+                    return "active", "Key is active", list(entry.models), entry.default_model
                 return "active", "Key is active", fallback_models, fallback_models[0]
 
             detail = r_auth.text[:500]
@@ -301,6 +342,21 @@ class OpenRouterProvider(BaseLLMProvider):
         except Exception as e:
             return "inactive", f"Could not reach OpenRouter: {e!s}", fallback_models, fallback_models[0]
 
+    def catalog_tier(self) -> str:
+        return "public"
+
+    def catalog_fetch(self) -> Optional[CatalogFetch]:
+        return self._fetch_public_models
+
+    @staticmethod
+    def _fetch_public_models() -> Optional[Tuple[List[str], str]]:
+        r_models = http_client_pool.get("https://openrouter.ai/api/v1/models", retries=0)
+        if r_models.status_code != 200:
+            return None
+        data = r_models.json().get("data", [])
+        raw_ids = [m.get("id") for m in data if isinstance(m, dict) and m.get("id")]
+        return (raw_ids[:30], raw_ids[0]) if raw_ids else None
+
 
 class GrokProvider(BaseLLMProvider):
     provider_id = "Grok"
@@ -312,8 +368,7 @@ class GrokProvider(BaseLLMProvider):
         key = api_key.strip()
         fallback_models = ["grok-2-latest", "grok-2-vision-latest", "grok-beta"]
         try:
-            with httpx.Client(timeout=15.0) as client:
-                r = client.get("https://api.x.ai/v1/models", headers={"Authorization": f"Bearer {key}"})
+            r = http_client_pool.get("https://api.x.ai/v1/models", headers={"Authorization": f"Bearer {key}"}, retries=0)
             if r.status_code == 200:
                 data = r.json().get("data", [])
                 raw_ids = [m.get("id") for m in data if isinstance(m, dict) and m.get("id")]
@@ -336,8 +391,7 @@ class PerplexityProvider(BaseLLMProvider):
         key = api_key.strip()
         fallback_models = ["sonar-pro", "sonar", "sonar-reasoning"]
         try:
-            with httpx.Client(timeout=15.0) as client:
-                r = client.get("https://api.perplexity.ai/models", headers={"Authorization": f"Bearer {key}"})
+            r = http_client_pool.get("https://api.perplexity.ai/models", headers={"Authorization": f"Bearer {key}"}, retries=0)
             if r.status_code == 200:
                 data = r.json().get("data", [])
                 raw_ids = [m.get("id") for m in data if isinstance(m, dict) and m.get("id")]
@@ -360,8 +414,7 @@ class CohereProvider(BaseLLMProvider):
         key = api_key.strip()
         fallback_models = ["command-r-plus", "command-r", "command-light"]
         try:
-            with httpx.Client(timeout=15.0) as client:
-                r = client.get("https://api.cohere.com/v1/models", headers={"Authorization": f"Bearer {key}"})
+            r = http_client_pool.get("https://api.cohere.com/v1/models", headers={"Authorization": f"Bearer {key}"}, retries=0)
             if r.status_code == 200:
                 data = r.json().get("models", [])
                 raw_ids = [m.get("name") for m in data if isinstance(m, dict) and m.get("name")]
@@ -373,6 +426,10 @@ class CohereProvider(BaseLLMProvider):
         except Exception as e:
             return "inactive", f"Could not reach Cohere: {e!s}", fallback_models, fallback_models[0]
 
+    def is_public_model(self, model_id: str) -> bool:
+        # Fine-tuned Cohere models are named <name>-ft
+        return super().is_public_model(model_id) and not model_id.endswith("-ft")
+
 
 class HuggingFaceProvider(BaseLLMProvider):
     provider_id = "HuggingFace"
@@ -384,8 +441,7 @@ class HuggingFaceProvider(BaseLLMProvider):
         key = api_key.strip()
         fallback_models = ["meta-llama/Llama-3.3-70B-Instruct", "deepseek-ai/DeepSeek-R1", "mistralai/Mistral-7B-Instruct-v0.3"]
         try:
-            with httpx.Client(timeout=15.0) as client:
-                r = client.get("https://huggingface.co/api/whoami-v2", headers={"Authorization": f"Bearer {key}"})
+            r = http_client_pool.get("https://huggingface.co/api/whoami-v2", headers={"Authorization": f"Bearer {key}"}, retries=0)
             if r.status_code == 200:
                 return "active", "Key is active", fallback_models, fallback_models[0]
             detail = r.text[:500]
@@ -405,8 +461,7 @@ class FireworksProvider(BaseLLMProvider):
         key = api_key.strip()
         fallback_models = ["accounts/fireworks/models/llama-v3p3-70b-instruct", "accounts/fireworks/models/deepseek-r1"]
         try:
-            with httpx.Client(timeout=15.0) as client:
-                r = client.get("https://api.fireworks.ai/inference/v1/models", headers={"Authorization": f"Bearer {key}"})
+            r = http_client_pool.get("https://api.fireworks.ai/inference/v1/models", headers={"Authorization": f"Bearer {key}"}, retries=0)
             if r.status_code == 200:
                 data = r.json().get("data", [])
                 raw_ids = [m.get("id") for m in data if isinstance(m, dict) and m.get("id")]
@@ -418,6 +473,10 @@ class FireworksProvider(BaseLLMProvider):
         except Exception as e:
             return "inactive", f"Could not reach Fireworks: {e!s}", fallback_models, fallback_models[0]
 
+    def is_public_model(self, model_id: str) -> bool:
+        # Serverless models live under accounts/fireworks/; other accounts/<id>/ are private
+        return model_id.startswith("accounts/fireworks/")
+
 
 class GenericOpenAICompatibleProvider(BaseLLMProvider):
     provider_id = "OpenAICompatible"
@@ -438,8 +497,7 @@ class GenericOpenAICompatibleProvider(BaseLLMProvider):
         key = api_key.strip()
         for prov_id, url in self.OPENAI_ENDPOINTS:
             try:
-                with httpx.Client(timeout=10.0) as client:
-                    r = client.get(url, headers={"Authorization": f"Bearer {key}"})
+                r = http_client_pool.get(url, headers={"Authorization": f"Bearer {key}"}, timeout=10.0, retries=0)
                 if r.status_code == 200:
                     data = r.json().get("data", [])
                     raw_ids = [m.get("id") for m in data if isinstance(m, dict) and m.get("id")]
@@ -449,6 +507,10 @@ class GenericOpenAICompatibleProvider(BaseLLMProvider):
                 continue
         return "inactive", "Could not authenticate with any OpenAI-compatible provider", ["default"], "default"
 
+    def is_public_model(self, model_id: str) -> bool:
+        # The list comes from whichever host accepted the key, so it is never shared
+        return False
+
 
 class LLMProviderRegistry:
     """Central registry of LLM providers."""
@@ -506,8 +568,31 @@ class LLMProviderRegistry:
                 return p
         return None
 
+    @staticmethod
+    def _cache_key(api_key: str, override_provider_id: Optional[str]) -> str:
+        digest = hashlib.sha256(api_key.encode("utf-8"))
+        digest.update(b"\0" + (override_provider_id or "").strip().lower().encode("utf-8"))
+        return digest.hexdigest()
+
     def detect_and_validate(self, api_key: str, override_provider_id: Optional[str] = None) -> Dict[str, Any]:
         key = (api_key or "").strip()
+        if not key or config.LLM_KEY_VALIDATION_CACHE_TTL_SECONDS <= 0:
+            return self._detect_and_validate(key, override_provider_id)
+
+        cache_key = self._cache_key(key, override_provider_id)
+        cached = _validation_cache.get(cache_key)
+        if cached is not None:
+            return {**cached, "available_models": list(cached.get("available_models") or [])}
+        result = self._detect_and_validate(key, override_provider_id)
+        if result.get("status") in _CACHEABLE_STATUSES:
+            _validation_cache.set(
+                cache_key,
+                {**result, "available_models": list(result.get("available_models") or [])},
+                config.LLM_KEY_VALIDATION_CACHE_TTL_SECONDS,
+            )
+        return result
+
+    def _detect_and_validate(self, key: str, override_provider_id: Optional[str]) -> Dict[str, Any]:
         if not key:
             return {
                 "detected_provider": None,
@@ -521,29 +606,13 @@ class LLMProviderRegistry:
         if override_provider_id:
             p_override = self.get_provider_by_id(override_provider_id)
             if p_override:
-                st, msg, models, default_m = p_override.validate_and_fetch_models(key)
-                return {
-                    "detected_provider": p_override.provider_id,
-                    "display_name": p_override.display_name,
-                    "status": st,
-                    "message": msg,
-                    "available_models": models if models else ["default"],
-                    "default_model": default_m or (models[0] if models else "default"),
-                }
+                return self._validate_with(p_override, key)
 
         # 2. Otherwise auto-detect provider for a new key
         p_hint = self.detect_provider(key)
         if p_hint:
             try:
-                st, msg, models, default_m = p_hint.validate_and_fetch_models(key)
-                return {
-                    "detected_provider": p_hint.provider_id,
-                    "display_name": p_hint.display_name,
-                    "status": st,
-                    "message": msg,
-                    "available_models": models if models else ["default"],
-                    "default_model": default_m or (models[0] if models else "default"),
-                }
+                return self._validate_with(p_hint, key)
             except Exception as e:
                 return {
                     "detected_provider": p_hint.provider_id,
@@ -554,27 +623,8 @@ class LLMProviderRegistry:
                     "default_model": None,
                 }
 
-        # Fallback to checking all providers if no specific provider was detected by prefix
-        best_result = None
-        for p in self._providers.values():
-            try:
-                st, msg, models, default_m = p.validate_and_fetch_models(key)
-                res = {
-                    "detected_provider": p.provider_id,
-                    "display_name": p.display_name,
-                    "status": st,
-                    "message": msg,
-                    "available_models": models if models else ["default"],
-                    "default_model": default_m or (models[0] if models else "default"),
-                }
-                if st == "active":
-                    return res
-                if best_result is None:
-                    best_result = res
-            except Exception:
-                continue
-
-        return best_result or {
+        # Fallback to racing all providers if no specific provider was detected by prefix
+        return self._probe_all(key) or {
             "detected_provider": "Unknown",
             "status": "invalid",
             "message": "Could not validate API key with any provider",
@@ -582,15 +632,94 @@ class LLMProviderRegistry:
             "default_model": None,
         }
 
+    @staticmethod
+    def _validate_with(p: BaseLLMProvider, key: str) -> Dict[str, Any]:
+        """
+        Validate against one provider; an active key's public models refresh the shared
+        catalog (the caller still gets the key's full list).
+        """
+        st, msg, models, default_m = p.validate_and_fetch_models(key)
+        result = {
+            "detected_provider": p.provider_id,
+            "display_name": p.display_name,
+            "status": st,
+            "message": msg,
+            "available_models": models if models else ["default"],
+            "default_model": default_m or (models[0] if models else "default"),
+        }
+        shared = [m for m in models or [] if p.is_public_model(m)]
+        if st == "active" and shared:
+            default_shared = result["default_model"] if result["default_model"] in shared else shared[0]
+            model_catalog.put(p.provider_id, p.key_tier(key), shared, default_shared)
+        return result
+
+    def _probe_all(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Probe every provider concurrently. Returns the first active result (queued probes are
+        cancelled; in-flight ones finish in the background), else the result of the first
+        provider in registration order that answered, else None.
+        """
+        order = {p.provider_id: i for i, p in enumerate(self._providers.values())}
+        pending = {_probe_pool.submit(self._validate_with, p, key) for p in self._providers.values()}
+        answered: List[Dict[str, Any]] = []
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    res = future.result()
+                except Exception:
+                    continue
+                if res["status"] == "active":
+                    for other in pending:
+                        other.cancel()
+                    return res
+                answered.append(res)
+        return min(answered, key=lambda r: order[r["detected_provider"]]) if answered else None
+
+    def detect_and_validate_many(
+        self, items: List[Tuple[str, Optional[str]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        detect_and_validate for several (api_key, override_provider_id) pairs concurrently,
+        with at most LLM_KEY_VALIDATION_PER_PROVIDER probes in flight per provider.
+        Results are returned in input order.
+        """
+        def validate(api_key: str, override_provider_id: Optional[str]) -> Dict[str, Any]:
+            provider = (
+                self.get_provider_by_id(override_provider_id) if override_provider_id else None
+            ) or self.detect_provider(api_key)
+            with _provider_slot(provider.provider_id if provider else "*"):
+                return self.detect_and_validate(api_key, override_provider_id=override_provider_id)
+
+        futures = [_validation_pool.submit(validate, key, override) for key, override in items]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                logger.warning(f"LLM key validation failed: {e}")
+                results.append({"status": "inactive", "message": f"Validation failed: {e}"})
+        return results
+
     def list_providers_metadata(self) -> List[Dict[str, Any]]:
-        return [
-            {
-                "id": p.provider_id,
-                "label": p.display_name,
-                "key_prefixes": p.key_prefixes,
-            }
-            for p in self._providers.values()
-        ]
+        """
+        Provider list with known models: the shared catalog's entry for each provider's
+        catalog_tier when warm (expired validation-only entries are dropped), else the fallback list.
+        """
+        providers = []
+        for p in self._providers.values():
+            entry = model_catalog.get_or_refresh(p.provider_id, p.catalog_tier(), p.catalog_fetch())
+            models = list(entry.models) if entry else list(p.fallback_models)
+            providers.append(
+                {
+                    "id": p.provider_id,
+                    "label": p.display_name,
+                    "key_prefixes": p.key_prefixes,
+                    "models": models,
+                    "default_model": entry.default_model if entry else models[0],
+                }
+            )
+        return providers
 
 
 # Singleton instance
@@ -3,11 +3,19 @@ import json
 import logging
 from typing import Optional, Dict, Any
 
+from fapi.utils.http_client_pool import get_http_client
+
 logger = logging.getLogger(__name__)
 
 def get_openai_client(api_key: str):
     from openai import OpenAI
-    return OpenAI(api_key=api_key)
+    # Per-key SDK wrapper over the shared keep-alive pool (which it cannot close). SDK retries
+    # are off: it would resend a chat completion after a 5xx that may already have been billed
+    return OpenAI(
+        api_key=api_key,
+        http_client=get_http_client("https://api.openai.com"),
+        max_retries=0,
+    )
 
 def get_gemini_client(api_key: str):
     try:
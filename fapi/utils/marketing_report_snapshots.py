@@ -0,0 +1,318 @@
+"""
+Materialized weekly marketing report shared by /report-data, /report-pdf and the weekly
+report job.
+
+The report covers the seven days before today (UTC). It is computed once per window and
+stored in marketing_report_snapshot together with the data version it was built from:
+"<core>-<activity>", hashes of the table_versions entries of the tables the report reads.
+A stored report is served as long as the window and the data version both match, so writes
+to a source table (or out-of-band edits caught by the table version reconcile) make the
+next read rebuild it. The activity tables (workflow logs, job activity, job clicks) are
+written all day, so a change to them alone only rebuilds a snapshot older than
+MARKETING_REPORT_ACTIVITY_MIN_AGE_SECONDS. regenerate=True rebuilds unconditionally. Each
+newly stored report also schedules its PDF render (utils/report_pdf_utils.py).
+"""
+import hashlib
+import logging
+import threading
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import and_, case, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from fapi.core import config
+from fapi.db.models import (
+    AuthUserORM,
+    AutomationWorkflowLogORM,
+    CandidateInterview,
+    CandidateMarketingORM,
+    CandidateORM,
+    JobActivityLogORM,
+    JobLinkClicksORM,
+    JobTypeORM,
+    MarketingReportSnapshotORM,
+)
+from fapi.utils.report_pdf_utils import report_pdf_cache
+from fapi.utils.table_fingerprint import get_table_versions
+
+logger = logging.getLogger(__name__)
+
+# Tables build_marketing_report reads; a write to any of them changes the data version.
+# authuser is read too (click owner emails) but is left out: every login bumps it, and a
+# changed uname only affects the click mapping until the next rebuild.
+CORE_MODELS = (
+    CandidateInterview,
+    CandidateMarketingORM,
+    CandidateORM,
+    JobTypeORM,
+)
+# High-churn logs: a change to these alone is picked up once the snapshot is old enough
+ACTIVITY_MODELS = (
+    AutomationWorkflowLogORM,
+    JobActivityLogORM,
+    JobLinkClicksORM,
+)
+SOURCE_MODELS = CORE_MODELS + ACTIVITY_MODELS
+
+# Workflow IDs: 1,3,6,10 = Outreach | 7,9 = Job Portal Automations
+OUTREACH_WORKFLOW_IDS = (1, 3, 6, 10)
+PORTAL_WORKFLOW_IDS = (7, 9)
+
+# Serializes rebuilds in this worker so concurrent cache misses compute the report once
+_build_lock = threading.Lock()
+
+
+def report_window(now: Optional[datetime] = None) -> Tuple[date, date]:
+    """(first day, last day) of the report: the seven days before today, through today."""
+    today = (now or datetime.now(timezone.utc)).date()
+    return today - timedelta(days=7), today
+
+
+def _versions_hash(versions: Dict[str, Tuple[int, int]], models) -> str:
+    parts = [f"{model.__tablename__}:{versions[model.__table__.name][0]}" for model in models]
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()[:20]
+
+
+def data_version(db: Session) -> Optional[str]:
+    """
+    "<core hash>-<activity hash>" of the source tables' versions (one registry read), or
+    None when the version registry is unavailable.
+    """
+    versions = get_table_versions(db, SOURCE_MODELS)
+    if versions is None:
+        return None
+    return f"{_versions_hash(versions, CORE_MODELS)}-{_versions_hash(versions, ACTIVITY_MODELS)}"
+
+
+def _reusable(snapshot: Optional[MarketingReportSnapshotORM], version: str) -> bool:
+    """Same data version, or only the activity tables changed and the snapshot is still young."""
+    if snapshot is None:
+        return False
+    if snapshot.data_version == version:
+        return True
+    same_core = snapshot.data_version.split("-")[0] == version.split("-")[0]
+    age = datetime.utcnow() - snapshot.generated_at
+    return same_core and age < timedelta(seconds=config.MARKETING_REPORT_ACTIVITY_MIN_AGE_SECONDS)
+
+
+def build_marketing_report(db: Session, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Compute the report for the window ending now from the source tables."""
+    end_date = now or datetime.now(timezone.utc)
+    window_start, _ = report_window(end_date)
+    weekly_start_date = datetime.combine(window_start, datetime.min.time(), tzinfo=timezone.utc)
+
+    # Labels for the report header (e.g. "April 17 - April 24, 2026")
+    start_date_str = weekly_start_date.strftime('%B %d')
+    end_date_str = end_date.strftime('%B %d, %Y')
+
+    # 1. Interviews & Candidates
+    interviews_query = db.query(
+        CandidateORM.id,
+        CandidateORM.full_name,
+        CandidateORM.email,
+        func.sum(case((CandidateInterview.mode_of_interview == 'Assessment', 1), else_=0)).label('assessment_count'),
+        func.sum(
+            case((CandidateInterview.type_of_interview == 'Recruiter Call', 1), else_=0)
+        ).label('recruiter_call_count'),
+        func.sum(case((CandidateInterview.type_of_interview == 'Technical', 1), else_=0)).label('technical_count'),
+        func.sum(case((CandidateInterview.mode_of_interview == 'In Person', 1), else_=0)).label('onsite_count'),
+        func.sum(case((CandidateInterview.feedback == 'Positive', 1), else_=0)).label('feedback_positive'),
+        func.sum(case((CandidateInterview.feedback == 'Negative', 1), else_=0)).label('feedback_negative'),
+    ).join(
+        CandidateMarketingORM, CandidateORM.id == CandidateMarketingORM.candidate_id
+    ).outerjoin(
+        CandidateInterview, and_(
+            CandidateInterview.candidate_id == CandidateORM.id,
+            CandidateInterview.interview_date >= weekly_start_date.date(),
+            CandidateInterview.interview_date <= end_date.date()
+        )
+    ).filter(
+        CandidateMarketingORM.status == 'active'
+    ).group_by(
+        CandidateORM.id, CandidateORM.full_name, CandidateORM.email
+    ).all()
+
+    # 2. Job Clicks (Mapping email to count)
+    job_clicks_raw = db.query(
+        AuthUserORM.uname,
+        func.sum(JobLinkClicksORM.click_count).label('total_clicks')
+    ).join(
+        JobLinkClicksORM, JobLinkClicksORM.authuser_id == AuthUserORM.id
+    ).filter(
+        JobLinkClicksORM.last_clicked_at >= weekly_start_date,
+        JobLinkClicksORM.last_clicked_at <= end_date
+    ).group_by(
+        AuthUserORM.uname
+    ).all()
+    click_mapping = {
+        email.lower().strip(): int(count) for email, count in job_clicks_raw if email and count is not None
+    }
+
+    # 3. Outreach & Automations
+    outreach_logs = db.query(
+        AutomationWorkflowLogORM.workflow_id,
+        AutomationWorkflowLogORM.parameters_used,
+        AutomationWorkflowLogORM.records_processed,
+    ).filter(
+        AutomationWorkflowLogORM.workflow_id.in_(OUTREACH_WORKFLOW_IDS + PORTAL_WORKFLOW_IDS),
+        AutomationWorkflowLogORM.created_at >= weekly_start_date,
+        AutomationWorkflowLogORM.created_at <= end_date
+    ).all()
+
+    # Email Mapping for Robust Lookup (the active candidates are the rows of the interview query)
+    email_map = {row.email.lower().strip(): row.id for row in interviews_query if row.email}
+
+    outreach_dict = {}
+    portal_dict = {}
+    for log in outreach_logs:
+        params = log.parameters_used or {}
+        cand_id = params.get('candidate_id')
+        if not cand_id:
+            ekey = params.get('email') or params.get('username')
+            cand_id = email_map.get(str(ekey).strip().lower()) if ekey else None
+
+        if cand_id:
+            c_id = int(cand_id)
+            records = log.records_processed or 0
+            if log.workflow_id in OUTREACH_WORKFLOW_IDS:
+                outreach_dict[c_id] = outreach_dict.get(c_id, 0) + records
+            elif log.workflow_id in PORTAL_WORKFLOW_IDS:
+                portal_dict[c_id] = portal_dict.get(c_id, 0) + records
+
+    # 4. LinkedIn Easy Apply (Activity Logs)
+    linkedin_activity = db.query(
+        JobActivityLogORM.candidate_id,
+        func.sum(func.coalesce(JobActivityLogORM.activity_count, 1)).label('total')
+    ).join(
+        JobTypeORM, JobActivityLogORM.job_type_id == JobTypeORM.id
+    ).filter(
+        JobTypeORM.name.ilike('%Linkedin%'),
+        JobActivityLogORM.activity_date >= weekly_start_date.date(),
+        JobActivityLogORM.activity_date <= end_date.date()
+    ).group_by(JobActivityLogORM.candidate_id).all()
+    linkedin_dict = {int(row[0]): int(row[1]) for row in linkedin_activity if row[0]}
+
+    # --- Assemble Results ---
+    results = []
+    for row in interviews_query:
+        # Calculated Pending logic
+        pos = int(row.feedback_positive or 0)
+        neg = int(row.feedback_negative or 0)
+        visible_total = (
+            int(row.assessment_count or 0)
+            + int(row.recruiter_call_count or 0)
+            + int(row.technical_count or 0)
+            + int(row.onsite_count or 0)
+        )
+        pending = max(0, visible_total - pos - neg)
+
+        c_email = (row.email or "").lower().strip()
+
+        results.append({
+            "id": row.id,
+            "full_name": row.full_name,
+            "email": row.email,
+            "outreach_count": outreach_dict.get(row.id, 0),
+            "linkedin_easy_apply_count": linkedin_dict.get(row.id, 0),
+            "job_portal_automation_count": portal_dict.get(row.id, 0),
+            "job_clicks": click_mapping.get(c_email, 0),
+            "assessment_count": int(row.assessment_count or 0),
+            "recruiter_call_count": int(row.recruiter_call_count or 0),
+            "technical_count": int(row.technical_count or 0),
+            "onsite_count": int(row.onsite_count or 0),
+            "total_interviews": visible_total,
+            "feedback_positive": pos,
+            "feedback_negative": neg,
+            "feedback_pending": pending
+        })
+
+    # Global Summary Stats
+    global_total_clicks = db.query(func.sum(JobLinkClicksORM.click_count)).filter(
+        JobLinkClicksORM.last_clicked_at >= weekly_start_date,
+        JobLinkClicksORM.last_clicked_at <= end_date
+    ).scalar() or 0
+
+    # Sort candidates alphabetically by name
+    results.sort(key=lambda x: (x['full_name'] or "").lower())
+
+    return {
+        "status": "success",
+        "summary": {
+            "total_candidates": len(results),
+            "total_interviews": sum(r["total_interviews"] for r in results),
+            "total_clicks": int(global_total_clicks),
+            "start_date": start_date_str,
+            "end_date": end_date_str
+        },
+        "candidates": results
+    }
+
+
+def _with_snapshot_info(snapshot: MarketingReportSnapshotORM) -> Dict[str, Any]:
+    return {
+        **snapshot.payload,
+        "snapshot": {
+            "window_start": snapshot.window_start.isoformat(),
+            "window_end": snapshot.window_end.isoformat(),
+            "data_version": snapshot.data_version,
+            "generated_at": snapshot.generated_at.isoformat(),
+        },
+    }
+
+
+def _stored(db: Session, window: Tuple[date, date]) -> Optional[MarketingReportSnapshotORM]:
+    return db.get(MarketingReportSnapshotORM, window)
+
+
+def _store(
+    db: Session, window: Tuple[date, date], version: str, payload: Dict[str, Any]
+) -> MarketingReportSnapshotORM:
+    snapshot = MarketingReportSnapshotORM(
+        window_start=window[0], window_end=window[1], data_version=version,
+        payload=payload, generated_at=datetime.utcnow(),
+    )
+    try:
+        snapshot = db.merge(snapshot)
+        cutoff = window[1] - timedelta(days=config.MARKETING_REPORT_SNAPSHOT_RETENTION_DAYS)
+        db.query(MarketingReportSnapshotORM).filter(
+            MarketingReportSnapshotORM.window_end < cutoff
+        ).delete(synchronize_session=False)
+        db.commit()
+    except IntegrityError:
+        # Another worker stored this window first; its copy is as good as ours
+        db.rollback()
+        snapshot = db.get(MarketingReportSnapshotORM, window) or snapshot
+    return snapshot
+
+
+def get_marketing_report(db: Session, regenerate: bool = False) -> Dict[str, Any]:
+    """
+    The current window's report: the stored snapshot when it is still current for the source
+    tables' data version, otherwise a freshly built one (which is then stored).
+    """
+    window = report_window()
+    version = data_version(db)
+    if version is None:
+        logger.warning("Table version registry unavailable; building the marketing report without a snapshot")
+        return build_marketing_report(db)
+
+    if not regenerate:
+        snapshot = _stored(db, window)
+        if _reusable(snapshot, version):
+            return _with_snapshot_info(snapshot)
+
+    with _build_lock:
+        if not regenerate:
+            # A concurrent request may have stored it while this one waited
+            db.expire_all()
+            snapshot = _stored(db, window)
+            if _reusable(snapshot, version):
+                return _with_snapshot_info(snapshot)
+        payload = build_marketing_report(db)
+        logger.info(f"Built marketing report snapshot for {window[0]}..{window[1]} (version {version[:12]})")
+        report = _with_snapshot_info(_store(db, window, version, payload))
+    # New data: render its PDF in the background so /report-pdf downloads find it ready
+    report_pdf_cache.render_async(report)
+    return report
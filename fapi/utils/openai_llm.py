@@ -2,18 +2,22 @@
 Reusable OpenAI Chat Completions client.
 
 Call :func:`openai_chat_with_prompts` with system + user strings, or
-:func:`openai_chat_completions` with a full ``messages`` list.
+:func:`openai_chat_completions` with a full ``messages`` list. :func:`openai_chat_stream`
+yields the assistant text incrementally as OpenAI streams it.
 
 API key must be supplied by the caller (env resolution happens in routes / services).
 """
 from __future__ import annotations
 
+import json
 import logging
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 import httpx
 
+from fapi.utils import http_client_pool
+
 logger = logging.getLogger(__name__)
 
 OPENAI_CHAT_URL = "https://api.openai.com/v1/chat/completions"
@@ -34,6 +38,29 @@ class OpenAiLlmResult:
     """Truncated response body on non-200 for debugging (not logged by default)."""
 
 
+class OpenAiStreamError(Exception):
+    """A streamed chat completion failed; str(e) is the human-readable error."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _build_messages(user_prompt: str, system_prompt: Optional[str]) -> List[Dict[str, str]]:
+    messages: List[Dict[str, str]] = []
+    if system_prompt is not None and str(system_prompt).strip():
+        messages.append({"role": "system", "content": str(system_prompt).strip()})
+    messages.append({"role": "user", "content": (user_prompt or "").strip()})
+    return messages
+
+
+def _error_detail(resp: httpx.Response, preview: str) -> str:
+    try:
+        return resp.json().get("error", {}).get("message") or preview
+    except Exception:
+        return preview
+
+
 def openai_chat_completions(
     *,
     messages: List[Dict[str, str]],
@@ -64,22 +91,15 @@ def openai_chat_completions(
     }
 
     try:
-        with httpx.Client(timeout=timeout) as client:
-            resp = client.post(OPENAI_CHAT_URL, headers=headers, json=payload)
+        resp = http_client_pool.post(OPENAI_CHAT_URL, headers=headers, json=payload, timeout=timeout)
     except httpx.RequestError as e:
         logger.warning("OpenAI request failed: %s", e)
         return OpenAiLlmResult(error=f"Network error calling OpenAI: {e!s}")
 
     preview = (resp.text or "")[:2000]
     if resp.status_code != 200:
-        detail = preview
-        try:
-            err_json = resp.json()
-            detail = err_json.get("error", {}).get("message") or detail
-        except Exception:
-            pass
         return OpenAiLlmResult(
-            error=f"OpenAI error ({resp.status_code}): {detail}",
+            error=f"OpenAI error ({resp.status_code}): {_error_detail(resp, preview)}",
             status_code=resp.status_code,
             raw_body_preview=preview,
         )
@@ -130,16 +150,72 @@ def openai_chat_with_prompts(
             ...
         text = r.content
     """
-    messages: List[Dict[str, str]] = []
-    if system_prompt is not None and str(system_prompt).strip():
-        messages.append({"role": "system", "content": str(system_prompt).strip()})
-    messages.append({"role": "user", "content": (user_prompt or "").strip()})
-
     return openai_chat_completions(
-        messages=messages,
+        messages=_build_messages(user_prompt, system_prompt),
         api_key=api_key,
         model=model,
         temperature=temperature,
         max_tokens=max_tokens,
         timeout=timeout,
     )
+
+
+def openai_chat_stream(
+    *,
+    user_prompt: str,
+    system_prompt: Optional[str] = None,
+    api_key: str,
+    model: str = DEFAULT_MODEL,
+    temperature: float = 0.2,
+    max_tokens: int = 2000,
+    timeout: float = 90.0,
+) -> Iterator[str]:
+    """
+    Streaming variant of :func:`openai_chat_with_prompts`: yields assistant text deltas as
+    they arrive (``"stream": true`` server-sent events). Raises :class:`OpenAiStreamError`
+    when the call fails; text already yielded stays valid.
+    """
+    key = (api_key or "").strip()
+    if not key:
+        raise OpenAiStreamError("OpenAI API key is required")
+
+    payload: Dict[str, Any] = {
+        "model": model,
+        "messages": _build_messages(user_prompt, system_prompt),
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "stream": True,
+    }
+    headers = {
+        "Authorization": f"Bearer {key}",
+        "Content-Type": "application/json",
+    }
+
+    client = http_client_pool.get_http_client(OPENAI_CHAT_URL)
+    try:
+        with client.stream("POST", OPENAI_CHAT_URL, headers=headers, json=payload, timeout=timeout) as resp:
+            if resp.status_code != 200:
+                preview = resp.read().decode("utf-8", "replace")[:2000]
+                raise OpenAiStreamError(
+                    f"OpenAI error ({resp.status_code}): {_error_detail(resp, preview)}",
+                    status_code=resp.status_code,
+                )
+            for line in resp.iter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    return
+                try:
+                    chunk = json.loads(data)
+                except json.JSONDecodeError:
+                    continue
+                if chunk.get("error"):
+                    raise OpenAiStreamError(f"OpenAI error: {chunk['error'].get('message') or chunk['error']}")
+                for choice in chunk.get("choices") or []:
+                    delta = (choice.get("delta") or {}).get("content")
+                    if delta:
+                        yield delta
+    except httpx.RequestError as e:
+        logger.warning("OpenAI stream failed: %s", e)
+        raise OpenAiStreamError(f"Network error calling OpenAI: {e!s}") from e
@@ -0,0 +1,115 @@
+"""
+Keyset (cursor) pagination for the large admin grids.
+
+Instead of OFFSET, a page is the next `limit` rows after the last row the client saw,
+ordered by (sort column, primary key). The position is handed back as an opaque
+`next_cursor` token. Pass `cursor=` (empty) to start from the first page.
+"""
+import base64
+import json
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query, Session
+
+from fapi.utils.table_fingerprint import get_table_version
+
+logger = logging.getLogger(__name__)
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"n": str(value)}
+    return value
+
+
+def _load_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "n" in value:
+            return Decimal(value["n"])
+        raise ValueError("Unknown cursor value type")
+    return value
+
+
+def encode_cursor(sort_key: str, sort_value: Any, pk: Any) -> str:
+    """Opaque token for the row at (sort_value, pk) under the given sort."""
+    raw = json.dumps({"s": sort_key, "v": _dump_value(sort_value), "k": pk}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: Optional[str], sort_key: str) -> Optional[Tuple[Any, Any]]:
+    """
+    (sort_value, pk) for a cursor token, or None for the first page.
+    Tokens issued for a different sort are rejected with a 400.
+    """
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if data["s"] != sort_key:
+            raise ValueError("Cursor was issued for a different sort")
+        return _load_value(data["v"]), data["k"]
+    except (ValueError, KeyError, TypeError) as e:
+        logger.debug(f"Rejected cursor {token!r}: {e}")
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def apply_keyset(query: Query, sort_column, pk_column, descending: bool, cursor: Optional[Tuple[Any, Any]]) -> Query:
+    """
+    Order by (sort_column, pk_column) and seek past the cursor position.
+    NULL sort values order lowest, matching MySQL and SQLite.
+    """
+    if descending:
+        query = query.order_by(sort_column.desc(), pk_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), pk_column.asc())
+    if cursor is None:
+        return query
+
+    value, pk = cursor
+    if descending:
+        if value is None:
+            condition = and_(sort_column.is_(None), pk_column < pk)
+        else:
+            condition = or_(
+                sort_column < value,
+                and_(sort_column == value, pk_column < pk),
+                sort_column.is_(None),
+            )
+    else:
+        if value is None:
+            condition = or_(sort_column.isnot(None), and_(sort_column.is_(None), pk_column > pk))
+        else:
+            condition = or_(sort_column > value, and_(sort_column == value, pk_column > pk))
+    return query.filter(condition)
+
+
+def fetch_page(query: Query, limit: int) -> Tuple[List[Any], bool]:
+    """Rows for one page plus whether another page follows, without a COUNT."""
+    rows = query.limit(limit + 1).all()
+    return rows[:limit], len(rows) > limit
+
+
+def estimated_total(db: Session, model_class, query: Query, filtered: bool) -> Optional[int]:
+    """
+    Total for cursor-mode responses. Unfiltered grids read the row count kept in the
+    table-version registry; filtered ones fall back to counting the query.
+    """
+    if not filtered:
+        version = get_table_version(db, model_class)
+        if version is not None:
+            return version[1]
+    return query.order_by(None).count()
@@ -0,0 +1,221 @@
+"""
+Warm Python worker for CoderPad, started as a standalone script by python_worker_pool.
+
+Reads length-prefixed JSON jobs {"code", "stdin", "timeout", "memory_mb"} from its stdin and
+forks one child per job, so every run still gets its own process (same isolation as a cold
+`python file.py`) without paying interpreter startup or the harness imports.
+Replies {"returncode", "stdout", "stderr", "timed_out"}.
+
+The child sees what the cold runner's `python /tmp/<file>.py` sees: the code is written to a
+temp file that becomes __file__ and argv[0], and sys.path starts with that file's directory
+rather than this one (which would make the backend's modules importable). apply_limits is
+shared with the cold runner so both paths enforce the same rlimits.
+"""
+import builtins
+import contextlib  # noqa: F401  (pre-imported for user code and the test harness)
+import inspect  # noqa: F401
+import io  # noqa: F401
+import json
+import os
+import selectors
+import signal
+import struct
+import sys
+import tempfile
+import threading
+import time
+import traceback
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - POSIX only
+    resource = None
+
+_HEADER = struct.Struct(">I")
+# The interpreter's own path, minus this script's directory that `python <script>` put first
+_BASE_PATH = sys.path[1:]
+
+
+def apply_limits(timeout, memory_mb):
+    """CPU and address-space rlimits for one run (called in the child, before the user's code)."""
+    if resource is None:
+        return
+    cpu = int(timeout) + 1
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu))
+    if memory_mb:
+        limit = int(memory_mb) * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _read_exact(fd, n):
+    buf = b""
+    while len(buf) < n:
+        chunk = os.read(fd, n - len(buf))
+        if not chunk:
+            return None
+        buf += chunk
+    return buf
+
+
+def _read_frame(fd):
+    header = _read_exact(fd, _HEADER.size)
+    if header is None:
+        return None
+    (length,) = _HEADER.unpack(header)
+    body = _read_exact(fd, length)
+    return None if body is None else json.loads(body)
+
+
+def _write_frame(fd, obj):
+    body = json.dumps(obj).encode()
+    data = _HEADER.pack(len(body)) + body
+    while data:
+        data = data[os.write(fd, data):]
+
+
+def _run_child(job, script, stdin_r, out_w, err_w, inherited_fds):
+    os.setsid()  # own process group, so a timeout kills anything the code spawned
+    for fd in inherited_fds:
+        os.close(fd)
+    os.dup2(stdin_r, 0)
+    os.dup2(out_w, 1)
+    os.dup2(err_w, 2)
+    for fd in (stdin_r, out_w, err_w):
+        os.close(fd)
+    sys.stdin = open(0, "r", closefd=False)
+    sys.stdout = open(1, "w", closefd=False)
+    sys.stderr = open(2, "w", closefd=False)
+
+    apply_limits(job["timeout"], job.get("memory_mb"))
+
+    sys.argv = [script]
+    sys.path[:] = [os.path.dirname(script)] + _BASE_PATH
+    namespace = {"__name__": "__main__", "__file__": script, "__cached__": None, "__builtins__": builtins}
+    status = 0
+    try:
+        exec(compile(job["code"], script, "exec"), namespace)
+    except SystemExit as e:
+        if e.code is None:
+            status = 0
+        elif isinstance(e.code, int):
+            status = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            status = 1
+    except BaseException as e:
+        # Drop this module's frame so the traceback starts at the user's code, as with `python <script>`
+        traceback.print_exception(type(e), e, e.__traceback__.tb_next)
+        status = 1
+    finally:
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except Exception:
+                pass
+    os._exit(status)
+
+
+def _feed_stdin(fd, data):
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    except OSError:
+        pass  # the program exited without reading all of stdin
+    finally:
+        os.close(fd)
+
+
+def _kill_group(pid):
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except OSError:
+        pass
+
+
+def _run_job(job, protocol_fds):
+    fd, script = tempfile.mkstemp(suffix=".py")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(job["code"])
+    try:
+        return _run_script(job, script, protocol_fds)
+    finally:
+        os.unlink(script)
+
+
+def _run_script(job, script, protocol_fds):
+    stdin_r, stdin_w = os.pipe()
+    out_r, out_w = os.pipe()
+    err_r, err_w = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            # The parent's pipe ends must go too, or stdin would never reach EOF
+            _run_child(job, script, stdin_r, out_w, err_w, (*protocol_fds, stdin_w, out_r, err_r))
+        finally:
+            os._exit(1)
+
+    for fd in (stdin_r, out_w, err_w):
+        os.close(fd)
+    writer = threading.Thread(target=_feed_stdin, args=(stdin_w, (job.get("stdin") or "").encode()))
+    writer.start()
+
+    deadline = time.monotonic() + float(job["timeout"])
+    chunks = {out_r: [], err_r: []}
+    timed_out = False
+    with selectors.DefaultSelector() as selector:
+        for fd in chunks:
+            selector.register(fd, selectors.EVENT_READ)
+        while selector.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                timed_out = True
+                break
+            for key, _ in selector.select(remaining):
+                data = os.read(key.fd, 65536)
+                if data:
+                    chunks[key.fd].append(data)
+                else:
+                    selector.unregister(key.fd)
+
+    while not timed_out:
+        done, status = os.waitpid(pid, os.WNOHANG)
+        if done:
+            break
+        if time.monotonic() >= deadline:
+            timed_out = True
+            break
+        time.sleep(0.005)
+    if timed_out:
+        _kill_group(pid)
+        _, status = os.waitpid(pid, 0)
+    _kill_group(pid)  # stray background processes left in the group
+
+    writer.join()
+    os.close(out_r)
+    os.close(err_r)
+    return {
+        "returncode": os.waitstatus_to_exitcode(status),
+        "stdout": b"".join(chunks[out_r]).decode(errors="replace"),
+        "stderr": b"".join(chunks[err_r]).decode(errors="replace"),
+        "timed_out": timed_out,
+    }
+
+
+def main():
+    # Keep the protocol pipes off fds 0/1 so forked programs never inherit them there
+    protocol_in = os.dup(0)
+    protocol_out = os.dup(1)
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    os.close(devnull)
+
+    while True:
+        job = _read_frame(protocol_in)
+        if job is None:
+            return
+        _write_frame(protocol_out, _run_job(job, (protocol_in, protocol_out)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Pool of warm Python workers for CoderPad runs (see python_sandbox_worker.py).
+
+Workers are started in the background on first use and reused for many jobs. Each job still
+runs in its own forked, resource-limited child. A worker is recycled after
+CODERPAD_PY_WORKER_MAX_RUNS jobs or when it misbehaves. When no warm worker is idle (or the
+platform has no fork), `run` returns None and the caller uses the cold subprocess path.
+"""
+import json
+import logging
+import os
+import queue
+import selectors
+import struct
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from fapi.core import config
+
+logger = logging.getLogger(__name__)
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "python_sandbox_worker.py")
+_HEADER = struct.Struct(">I")
+# Extra time allowed for the worker's own reply after the job's timeout
+_REPLY_GRACE_SECONDS = 5
+
+
+class WorkerError(Exception):
+    """The worker process died or broke protocol; it must be discarded."""
+
+
+class WorkerTimeout(WorkerError):
+    """The worker did not reply within the job timeout plus grace."""
+
+
+class _Worker:
+    def __init__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self.runs = 0
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def run(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        body = json.dumps(job).encode()
+        try:
+            self.process.stdin.write(_HEADER.pack(len(body)) + body)
+            self.process.stdin.flush()
+        except OSError as e:
+            raise WorkerError(f"write failed: {e}")
+        self.runs += 1
+
+        deadline = time.monotonic() + float(job["timeout"]) + _REPLY_GRACE_SECONDS
+        header = self._read(_HEADER.size, deadline)
+        (length,) = _HEADER.unpack(header)
+        return json.loads(self._read(length, deadline))
+
+    def _read(self, n: int, deadline: float) -> bytes:
+        fd = self.process.stdout.fileno()
+        buf = b""
+        with selectors.DefaultSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
+            while len(buf) < n:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not selector.select(remaining):
+                    raise WorkerTimeout("no reply before deadline")
+                chunk = os.read(fd, n - len(buf))
+                if not chunk:
+                    raise WorkerError("worker exited")
+                buf += chunk
+        return buf
+
+    def close(self) -> None:
+        try:
+            self.process.kill()
+            self.process.wait(timeout=5)
+        except Exception:
+            pass
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+
+class PythonWorkerPool:
+    def __init__(self, size: int, max_runs: int, memory_mb: int):
+        self.size = size
+        self.max_runs = max_runs
+        self.memory_mb = memory_mb
+        self._idle: "queue.LifoQueue[_Worker]" = queue.LifoQueue()
+        self._total = 0  # idle + busy + starting
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0 and hasattr(os, "fork") and not self._closed
+
+    def start(self, block: bool = False) -> None:
+        """Bring the pool up to size; in the background unless block is set."""
+        if not self.enabled:
+            return
+        with self._lock:
+            missing = self.size - self._total
+            self._total += max(0, missing)
+        for _ in range(missing):
+            if block:
+                self._spawn()
+            else:
+                threading.Thread(target=self._spawn, daemon=True, name="py-worker-spawn").start()
+
+    def _spawn(self) -> None:
+        try:
+            worker = _Worker()
+        except Exception as e:
+            logger.warning(f"Could not start warm Python worker: {e}")
+            with self._lock:
+                self._total -= 1
+            return
+        if self._closed:
+            worker.close()
+            with self._lock:
+                self._total -= 1
+            return
+        self._idle.put(worker)
+
+    def _retire(self, worker: _Worker) -> None:
+        worker.close()
+        with self._lock:
+            self._total -= 1
+        self.start()
+
+    def _acquire(self) -> Optional[_Worker]:
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                self.start()
+                return None
+            if worker.alive():
+                return worker
+            self._retire(worker)
+
+    def run(self, code: str, input_data: Optional[str], timeout: int) -> Optional[Dict[str, Any]]:
+        """
+        Run code on a warm worker. Returns {"returncode", "stdout", "stderr", "timed_out"},
+        or None when no worker was available and the caller should run it cold.
+        """
+        if not self.enabled:
+            return None
+        worker = self._acquire()
+        if worker is None:
+            return None
+
+        job = {"code": code, "stdin": input_data or "", "timeout": timeout, "memory_mb": self.memory_mb}
+        try:
+            reply = worker.run(job)
+        except (WorkerError, ValueError, struct.error) as e:
+            logger.warning(f"Warm Python worker failed, recycling it: {e}")
+            self._retire(worker)
+            if isinstance(e, WorkerTimeout):
+                return {"returncode": -9, "stdout": "", "stderr": "", "timed_out": True}
+            return None
+
+        if self._closed or worker.runs >= self.max_runs:
+            self._retire(worker)
+        else:
+            self._idle.put(worker)
+        return reply
+
+    def shutdown(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            worker.close()
+            with self._lock:
+                self._total -= 1
+
+
+python_worker_pool = PythonWorkerPool(
+    size=config.CODERPAD_PY_WORKERS,
+    max_runs=config.CODERPAD_PY_WORKER_MAX_RUNS,
+    memory_mb=config.CODERPAD_PY_MEMORY_LIMIT_MB,
+)
@@ -1,8 +1,27 @@
 import hashlib
-from sqlalchemy import func, String, Text, Integer, Float, Boolean, Date, DateTime, TIMESTAMP
+import logging
+import re
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+from sqlalchemy import event, func, select, update, String, Text, Integer, Float, Boolean, Date, DateTime, TIMESTAMP
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
-from fastapi import Response
+import anyio
+from fastapi import Depends, HTTPException, Request, Response
 from sqlalchemy.types import JSON, LargeBinary
+from fapi.core.cache import bind_data_version
+from fapi.db.database import get_db
+from fapi.db.models import Base, TableVersionORM
+
+logger = logging.getLogger(__name__)
+
+_versions_table = TableVersionORM.__table__
+
+# Tables whose version this worker has served; reconciled even before they have a registry row
+_polled_tables: set = set()
 
 def get_model_fingerprint(db: Session, model_class) -> str:
     """
@@ -89,11 +108,236 @@ def get_model_fingerprint(db: Session, model_class) -> str:
         print(f"[ERROR] get_model_fingerprint failed for {model_class.__tablename__}: {e}")
         return "error"
 
+# --------------- Table Version Registry ---------------
+#
+# Every INSERT / UPDATE / DELETE executed through a SQLAlchemy engine (ORM flushes,
+# bulk statements, Core and text() statements alike) is noted per connection, and the
+# written tables' counters in `table_versions` are bumped once, just before the
+# transaction commits. Version endpoints then read a single row instead of
+# checksumming the whole table. Writes that bypass this application (manual SQL, other
+# services) are caught by reconcile_table_versions(), which compares the full CRC32
+# fingerprint periodically.
+
+_PENDING_KEY = "table_version_deltas"
+
+# Target table of a DML statement: INSERT [IGNORE] INTO t, REPLACE INTO t, UPDATE t, DELETE [t] FROM t
+_DML_TARGET = re.compile(
+    r"^\s*(INSERT|REPLACE|UPDATE|DELETE)\b(?:\s+(?:LOW_PRIORITY|DELAYED|HIGH_PRIORITY|IGNORE|QUICK|OR\s+\w+))*"
+    r"\s+(?:INTO\s+|FROM\s+)?[`\"\[]?(?:\w+[`\"\]]?\.[`\"\[]?)?(\w+)",
+    re.IGNORECASE,
+)
+_UPSERT_MARKERS = re.compile(r"\bON\s+(?:DUPLICATE\s+KEY|CONFLICT)\b|\bOR\s+REPLACE\b|\bRETURNING\b", re.IGNORECASE)
+
+
+def _version_seed() -> int:
+    # New registry rows start at the current epoch-ms so a re-created row never reuses an old version
+    return int(time.time() * 1000)
+
+
+def _upsert_version(connection, table_name: str, row_delta: Optional[int], row_count: Optional[int] = None,
+                    bump: bool = True) -> None:
+    """
+    Insert or update a registry row.
+    bump increments the version and clears the stored checksum (the next reconcile records
+    the new one without bumping again); row_delta adjusts a known row_count (None marks it
+    unknown); row_count, when given, overwrites the stored count instead.
+    """
+    table = _versions_table
+    now = datetime.utcnow()
+    if row_count is not None:
+        count_expr = row_count
+    elif row_delta is None:
+        count_expr = None
+    else:
+        count_expr = table.c.row_count + row_delta
+    changes = {"updated_at": now, "row_count": count_expr}
+    if bump:
+        changes["version"] = table.c.version + 1
+        changes["checksum"] = None
+
+    values = {"table_name": table_name, "version": _version_seed(), "row_count": row_count, "updated_at": now}
+    dialect = connection.dialect.name
+    if dialect == "mysql":
+        connection.execute(mysql_insert(table).values(**values).on_duplicate_key_update(**changes))
+    elif dialect == "sqlite":
+        connection.execute(
+            sqlite_insert(table).values(**values).on_conflict_do_update(index_elements=["table_name"], set_=changes)
+        )
+    else:
+        result = connection.execute(update(table).where(table.c.table_name == table_name).values(**changes))
+        if result.rowcount == 0:
+            connection.execute(table.insert().values(**values))
+
+
+def _row_delta(verb: str, statement: str, rowcount: int) -> Optional[int]:
+    """Change in row count caused by a DML statement, or None when it can't be told from rowcount."""
+    if verb == "UPDATE":
+        return 0
+    if verb == "REPLACE" or rowcount < 0 or _UPSERT_MARKERS.search(statement):
+        return None  # upserts count updated rows differently; RETURNING rowcount is unset before fetch
+    return rowcount if verb == "INSERT" else -rowcount
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_written_table(conn, cursor, statement, parameters, context, executemany):
+    """Note the table a DML statement wrote to; the version is bumped when the transaction commits."""
+    match = _DML_TARGET.match(statement)
+    if match is None:
+        return
+    verb, table_name = match.group(1).upper(), match.group(2)
+    if table_name == _versions_table.name:
+        return
+    rowcount = cursor.rowcount
+    if rowcount == 0 and not _UPSERT_MARKERS.search(statement):
+        return  # nothing changed
+    delta = _row_delta(verb, statement, rowcount)
+    pending: Dict[str, Optional[int]] = conn.info.setdefault(_PENDING_KEY, {})
+    if table_name in pending:
+        previous = pending[table_name]
+        delta = None if previous is None or delta is None else previous + delta
+    pending[table_name] = delta
+
+
+@event.listens_for(Engine, "commit")
+def _bump_versions_on_commit(conn):
+    """
+    Bump every table written in this transaction, right before it commits. Tables are
+    bumped in name order so concurrent committers lock registry rows in the same order.
+    Errors propagate: the commit fails rather than leaving a write without its bump.
+    """
+    pending = conn.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    for table_name in sorted(pending):
+        _upsert_version(conn, table_name, pending[table_name])
+
+
+@event.listens_for(Engine, "rollback")
+def _discard_written_tables(conn):
+    conn.info.pop(_PENDING_KEY, None)
+
+
+def _seed_version(engine, model_class) -> Optional[Tuple[int, int]]:
+    """Count a table and store it, on a connection of its own so the caller's transaction is untouched."""
+    table_name = model_class.__table__.name
+    table = _versions_table
+    try:
+        with engine.begin() as connection:
+            count = connection.execute(select(func.count()).select_from(model_class.__table__)).scalar() or 0
+            _upsert_version(connection, table_name, None, row_count=count, bump=False)
+            row = connection.execute(
+                select(table.c.version, table.c.row_count).where(table.c.table_name == table_name)
+            ).first()
+        return row.version, row.row_count
+    except Exception as e:
+        logger.warning(f"Could not seed table version for {table_name}: {e}")
+        return None
+
+
+def get_table_versions(db: Session, model_classes) -> Optional[Dict[str, Tuple[int, int]]]:
+    """
+    table name -> (version, row_count) for several models in one registry read.
+    Missing or uncounted rows are seeded on a separate connection. Never commits or rolls
+    back the caller's session. Returns None when the registry is unavailable.
+    """
+    names = {model.__table__.name: model for model in model_classes}
+    _polled_tables.update(names)
+    table = _versions_table
+    try:
+        rows = db.execute(
+            select(table.c.table_name, table.c.version, table.c.row_count).where(table.c.table_name.in_(list(names)))
+        ).all()
+    except Exception as e:
+        logger.warning(f"Table version registry unavailable for {sorted(names)}: {e}")
+        return None
+    versions = {row.table_name: (row.version, row.row_count) for row in rows if row.row_count is not None}
+    bind = db.get_bind()
+    for table_name, model in names.items():
+        if table_name not in versions:
+            # Unknown count (new table or after an upsert): count once and store it
+            seeded = _seed_version(getattr(bind, "engine", bind), model)
+            if seeded is None:
+                return None
+            versions[table_name] = seeded
+    return versions
+
+
+def get_table_version(db: Session, model_class) -> Optional[Tuple[int, int]]:
+    """
+    Return (version, row_count) for a model's table from the registry.
+    Seeds the row on first use. Returns None when the registry is unavailable.
+    """
+    versions = get_table_versions(db, [model_class])
+    return None if versions is None else versions[model_class.__table__.name]
+
+
+def get_model_version_fingerprint(db: Session, model_class) -> str:
+    """
+    "<row count>|v<version>" from the registry, falling back to the full-table
+    fingerprint when the registry can't be read.
+    """
+    version = get_table_version(db, model_class)
+    if version is None:
+        return get_model_fingerprint(db, model_class)
+    return f"{version[1]}|v{version[0]}"
+
+
+def reconcile_table_versions(db: Session) -> int:
+    """
+    Re-checksum every table in the registry (and any this worker polled) and bump those
+    whose data changed outside this application. A checksum cleared by a tracked write is
+    re-recorded without a bump. Returns the number of tables bumped.
+    """
+    models = {mapper.local_table.name: mapper.class_ for mapper in Base.registry.mappers}
+    table = _versions_table
+    bumped = 0
+    try:
+        registered = set(db.execute(select(table.c.table_name)).scalars())
+    except Exception as e:
+        logger.error(f"Failed to read the table version registry: {e}")
+        db.rollback()
+        registered = set()
+    for table_name in sorted(_polled_tables | registered):
+        model_class = models.get(table_name)
+        if model_class is None:
+            continue
+        fingerprint = get_model_fingerprint(db, model_class)
+        if fingerprint == "error":
+            continue
+        checksum = hashlib.md5(fingerprint.encode()).hexdigest()
+        row_count = int(fingerprint.split("|")[0]) if "|" in fingerprint else 0
+        try:
+            stored = db.execute(select(table.c.checksum).where(table.c.table_name == table_name)).scalar()
+            changes = {"checksum": checksum, "row_count": row_count, "updated_at": datetime.utcnow()}
+            if stored is not None and stored != checksum:
+                changes["version"] = table.c.version + 1
+                bumped += 1
+                logger.info(f"Table {table_name} changed outside the ORM; bumping its version")
+            db.execute(update(table).where(table.c.table_name == table_name).values(**changes))
+            db.commit()
+        except Exception as e:
+            logger.error(f"Failed to reconcile table version for {table_name}: {e}")
+            db.rollback()
+    return bumped
+
+
+def run_table_version_reconcile_job():
+    """Scheduler entry point for reconcile_table_versions."""
+    from fapi.db.database import SessionLocal
+    db = SessionLocal()
+    try:
+        reconcile_table_versions(db)
+    except Exception as e:
+        logger.error(f"Error in table version reconciliation: {e}")
+    finally:
+        db.close()
+
+
 def generate_version_for_model(db: Session, model_class) -> Response:
     """
     Dynamically generates a caching fingerprint (version hash) for a given SQLAlchemy model.
     """
-    fingerprint = get_model_fingerprint(db, model_class)
+    fingerprint = get_model_version_fingerprint(db, model_class)
     version_hash = hashlib.md5(fingerprint.encode()).hexdigest()
     
     response = Response(status_code=200)
@@ -106,3 +350,34 @@ def generate_version_for_model(db: Session, model_class) -> Response:
         response.headers["X-Total-Count"] = "0"
         
     return response
+
+
+def _etag_matches(if_none_match: str, version: str) -> bool:
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/").strip('"') == version:
+            return True
+    return False
+
+
+def conditional_get(version_func: Callable[[Session], Response]):
+    """
+    Dependency factory for list endpoints.
+    Tags the response with the same version hash the matching HEAD endpoint
+    serves (as ETag and X-Data-Version), and answers 304 before the handler
+    queries anything when the client's If-None-Match already carries it.
+    The version is also bound to the request's cache_result keys, so the body
+    sent under that ETag is never one cached from an earlier version.
+    """
+    # async so bind_data_version runs in the request's context, which the handler inherits
+    async def dependency(request: Request, response: Response, db: Session = Depends(get_db)):
+        version = (await anyio.to_thread.run_sync(version_func, db)).headers.get("X-Data-Version")
+        if not version:
+            return
+        bind_data_version(version)
+        headers = {"ETag": f'"{version}"', "X-Data-Version": version, "Cache-Control": "private, no-cache"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, version):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+    return dependency
@@ -21,6 +21,9 @@ from fapi.db.models import (
     AutomationWorkflowORM
 )
 from fapi.utils.dynamic_weekly_report_utils import send_weekly_marketing_report
+from fapi.utils.table_fingerprint import run_table_version_reconcile_job
+from fapi.utils.dashboard_rollups import run_dashboard_rollup_reconcile_job
+from fapi.core import config
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +49,16 @@ _scheduler_started = False
 try:
     _scheduler = BackgroundScheduler()
     _scheduler.add_job(_run_scheduler_job, IntervalTrigger(minutes=5))
+    # Catch table edits made outside the ORM so version endpoints stay truthful
+    _scheduler.add_job(
+        run_table_version_reconcile_job,
+        IntervalTrigger(minutes=config.TABLE_VERSION_RECONCILE_MINUTES),
+    )
+    # Build dashboard rollups, then rebuild sources written since their last build (non-ORM writes included)
+    _scheduler.add_job(
+        run_dashboard_rollup_reconcile_job,
+        IntervalTrigger(minutes=config.DASHBOARD_ROLLUP_RECONCILE_MINUTES),
+    )
     _scheduler.start()
     _scheduler_started = True
     logger.info("Automation Workflow Scheduler started (polling every 5 minutes)")
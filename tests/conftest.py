@@ -3,7 +3,7 @@ import uuid
 import pytest
 import logging
 from datetime import date, datetime, timedelta, timezone
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 # Suppress all post-exit closed-stream logging tracebacks during test runs
 logging.raiseExceptions = False
@@ -49,6 +49,7 @@ from fapi.main import app
 from fapi.db.database import get_db
 from fapi.db.models import Base, AuthUserORM, CandidateORM
 from fapi.core.redis_client import redis_client, RedisClient
+from fapi.core.local_cache import local_cache
 
 
 # ── 4. Helpers ───────────────────────────────────────────────────────────────
@@ -110,11 +111,29 @@ def mock_redis():
     # Stub common redis operations — ping() succeeds by default on MagicMock
     mock_client.get.return_value = None
     mock_client.set.return_value = True
+    mock_client.spop.return_value = []
     # Patch the CLASS attribute so get_client() (a classmethod) returns our mock
     original_client = RedisClient._client
     RedisClient._client = mock_client
+    # Async client used by cache_response: awaitable commands, sync pipeline() with awaitable exec()
+    mock_async_client = MagicMock()
+    mock_async_client.get = AsyncMock(return_value=None)
+    mock_async_client.mget = AsyncMock(side_effect=lambda *keys: [None] * len(keys))
+    mock_async_client.pipeline.return_value.exec = AsyncMock(return_value=[])
+    mock_async_client.close = AsyncMock()
+    original_async_client, original_batcher = RedisClient._async_client, RedisClient._batcher
+    RedisClient._async_client, RedisClient._batcher = mock_async_client, None
+    # The in-process cache tier would otherwise leak results between tests
+    local_cache.clear()
     yield mock_client
     RedisClient._client = original_client
+    RedisClient._async_client, RedisClient._batcher = original_async_client, original_batcher
+    local_cache.clear()
+
+@pytest.fixture
+def mock_async_redis(mock_redis):
+    """The async Upstash client mock installed by mock_redis."""
+    return RedisClient._async_client
 
 # 6. Create a Reusable API Client for our Tests
 @pytest.fixture
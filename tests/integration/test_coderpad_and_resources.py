@@ -65,3 +65,48 @@ def test_resources_batches(client, admin_headers):
 def test_resources_recordings(client, admin_headers):
     response = client.get("/api/recording", headers=admin_headers)
     assert response.status_code in [200, 401, 404, 422]
+
+def test_coderpad_execute_runs_on_the_queue(client, admin_headers):
+    payload = {
+        "code": "print(input()[::-1])",
+        "language": "python",
+        "input_data": "abc",
+        "test_cases": [{"input": "xy", "expected_output": "yx"}],
+    }
+    response = client.post("/api/coderpad/execute", json=payload, headers=admin_headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["output"].strip() == "cba"
+    assert body["test_results"][0]["passed"] is True
+
+
+def test_coderpad_execute_job_poll_and_events(client, admin_headers):
+    payload = {"code": "print('hi')", "language": "python", "test_cases": [{"input": "", "expected_output": "hi"}]}
+    response = client.post("/api/coderpad/execute/jobs", json=payload, headers=admin_headers)
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    with client.stream("GET", f"/api/coderpad/execute/jobs/{job_id}/events", headers=admin_headers) as stream:
+        assert stream.headers["content-type"].startswith("text/event-stream")
+        events = [line.split(": ", 1)[1] for line in stream.iter_lines() if line.startswith("event: ")]
+    assert events[0] == "queued"
+    assert events[-3:] == ["output", "test_result", "result"]
+
+    job = client.get(f"/api/coderpad/execute/jobs/{job_id}", headers=admin_headers).json()
+    assert job["status"] == "done"
+    assert job["result"]["output"].strip() == "hi"
+
+    assert client.get("/api/coderpad/execute/jobs/missing", headers=admin_headers).status_code == 404
+
+
+def test_coderpad_execute_is_refused_when_queue_is_full(client, admin_headers):
+    from unittest.mock import patch
+    from fapi.utils.code_execution_queue import execution_queue
+
+    with patch.object(execution_queue, "max_queued", 0):
+        response = client.post(
+            "/api/coderpad/execute", json={"code": "print(1)", "language": "python"}, headers=admin_headers
+        )
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "5"
+    assert response.json()["detail"]["queue_position"] == 1
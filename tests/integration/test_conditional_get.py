@@ -0,0 +1,55 @@
+"""
+test_conditional_get.py
+=======================
+ETag / If-None-Match handling on list endpoints, exercised through /api/leads.
+"""
+import uuid
+
+from fapi.db.models import EmployeeORM
+
+
+def test_list_endpoint_returns_etag(client, admin_headers):
+    response = client.get("/api/leads", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.headers["ETag"] == f'"{response.headers["X-Data-Version"]}"'
+
+
+def test_matching_if_none_match_returns_304(client, admin_headers):
+    etag = client.get("/api/leads", headers=admin_headers).headers["ETag"]
+
+    response = client.get("/api/leads", headers={**admin_headers, "If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+
+def test_head_version_can_be_used_as_etag(client, admin_headers):
+    version = client.head("/api/leads", headers=admin_headers).headers["X-Data-Version"]
+
+    response = client.get("/api/leads", headers={**admin_headers, "If-None-Match": f'"{version}"'})
+
+    assert response.status_code == 304
+
+
+def test_write_invalidates_etag(client, admin_headers):
+    etag = client.get("/api/leads", headers=admin_headers).headers["ETag"]
+    client.post("/api/leads", json={"full_name": "ETag Lead", "email": "etag_lead@test.com"}, headers=admin_headers)
+
+    response = client.get("/api/leads", headers={**admin_headers, "If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_cached_body_is_never_served_under_a_newer_etag(client, admin_headers, db_session):
+    # /api/employees serves its rows through cache_result; this write skips invalidate_cache
+    first = client.get("/api/employees", headers=admin_headers)
+    name = f"ETag Employee {uuid.uuid4().hex[:8]}"
+    db_session.add(EmployeeORM(name=name, email=f"{uuid.uuid4().hex[:8]}@etag.test", status=1))
+    db_session.commit()
+
+    response = client.get("/api/employees", headers=admin_headers)
+
+    assert response.headers["ETag"] != first.headers["ETag"]
+    assert any(row["name"] == name for row in response.json())
@@ -0,0 +1,91 @@
+"""
+test_exports.py
+===============
+Streaming NDJSON/CSV export endpoints:
+  - /api/candidates/export
+  - /api/candidates/click-analytics/export
+  - /api/campaign-emails/export
+  - /api/analytics/usage_events/export
+"""
+
+import csv
+import io
+import json
+import uuid
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from fapi.core import config
+from fapi.db.models import CandidateORM, CliUsageEventORM
+
+
+@pytest.fixture
+def seeded_candidates(db_session):
+    tag = f"Export{uuid.uuid4().hex[:6]}"
+    for i in range(5):
+        db_session.add(CandidateORM(
+            full_name=f"{tag} {i}", email=f"{tag.lower()}_{i}@test.com", status="active", batchid=1,
+        ))
+    db_session.commit()
+    return tag
+
+
+def test_candidate_csv_export_streams_in_batches(client, admin_headers, seeded_candidates):
+    with patch.object(config, "EXPORT_YIELD_PER", 2):
+        r = client.get(
+            f"/api/candidates/export?format=csv&search={seeded_candidates}&search_by=full_name",
+            headers=admin_headers,
+        )
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/csv")
+    assert 'filename="candidates.csv"' in r.headers["content-disposition"]
+
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert len(rows) == 5
+    assert {"id", "full_name", "batchname", "is_in_prep", "is_in_marketing"} <= set(rows[0])
+    assert all(row["full_name"].startswith(seeded_candidates) for row in rows)
+
+
+def test_candidate_ndjson_export(client, admin_headers, seeded_candidates):
+    r = client.get(
+        f"/api/candidates/export?search={seeded_candidates}&search_by=full_name", headers=admin_headers
+    )
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert len(lines) == 5
+    assert lines[0]["is_in_prep"] == "No"
+
+
+def test_usage_event_export_filters_by_user(client, admin_headers, db_session):
+    user = f"cli_{uuid.uuid4().hex[:6]}@test.com"
+    db_session.add_all([
+        CliUsageEventORM(
+            user_id=user, event_name="apply", event_ts=datetime(2026, 1, day),
+            event_metadata={"source": "test"},
+        )
+        for day in (1, 2, 3)
+    ])
+    db_session.commit()
+
+    r = client.get(f"/api/analytics/usage_events/export?format=csv&user_id={user}", headers=admin_headers)
+    assert r.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert [row["event_ts"][:10] for row in rows] == ["2026-01-03", "2026-01-02", "2026-01-01"]
+    assert json.loads(rows[0]["event_metadata"]) == {"source": "test"}
+
+
+@pytest.mark.parametrize("url", [
+    "/api/candidates/click-analytics/export",
+    "/api/campaign-emails/export?format=csv",
+])
+def test_empty_exports_still_stream(client, admin_headers, url):
+    r = client.get(url, headers=admin_headers)
+    assert r.status_code == 200
+
+
+def test_unknown_export_format_is_rejected(client, admin_headers):
+    r = client.get("/api/candidates/export?format=xml", headers=admin_headers)
+    assert r.status_code == 422
@@ -0,0 +1,61 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+from fapi.core import cache_codec, config
+from fapi.core.cache import cache_result
+
+
+class _Row:
+    def __init__(self):
+        self.id = 7
+        self.created = date(2024, 1, 2)
+
+    @property
+    def label(self):
+        return f"row-{self.id}"
+
+
+def test_round_trip_matches_legacy_json_encoding():
+    value = {"rows": [_Row()], "amount": Decimal("1.50"), "at": datetime(2024, 1, 2, 3, 4, 5), "tags": {"a"}}
+    legacy = json.loads(json.dumps(value, default=cache_codec.alchemy_encoder))
+
+    assert cache_codec.decode(cache_codec.encode(value)) == legacy
+    assert legacy["rows"][0] == {"id": 7, "created": "2024-01-02", "label": "row-7"}
+
+
+def test_large_payloads_are_compressed():
+    value = {"data": ["x" * 50] * 1000}
+    with patch.object(config, "CACHE_COMPRESS_MIN_BYTES", 1024):
+        payload = cache_codec.encode(value)
+
+    assert payload.split(":", 4)[3] == "zlib"
+    assert len(payload) < len(json.dumps(value))
+    assert cache_codec.decode(payload) == value
+
+
+def test_small_payloads_are_stored_uncompressed():
+    payload = cache_codec.encode({"a": 1})
+    assert payload.split(":", 4)[3] == "none"
+
+
+def test_headerless_entries_are_read_as_legacy_json():
+    assert cache_codec.decode(json.dumps({"a": 1})) == {"a": 1}
+
+
+def test_unknown_format_version_is_rejected():
+    with pytest.raises(cache_codec.CodecError):
+        cache_codec.decode("wbl:99:json:none:{}")
+
+
+def test_undecodable_entry_is_treated_as_miss(mock_redis):
+    mock_redis.get.return_value = "wbl:99:json:none:{}"
+
+    @cache_result(ttl=300, prefix="unit_codec")
+    def load():
+        return {"fresh": True}
+
+    assert load() == {"fresh": True}
@@ -0,0 +1,240 @@
+import json
+from unittest.mock import patch
+
+from fapi.core import config
+from fapi.core.cache import cache_result, invalidate_cache
+from fapi.core.local_cache import LRUCache, local_cache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    cache.get("a")
+    cache.set("c", 3, ttl=60)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_lru_cache_expires_entries():
+    cache = LRUCache(2)
+    with patch("fapi.core.local_cache.time.monotonic", return_value=100.0):
+        cache.set("a", 1, ttl=5)
+    with patch("fapi.core.local_cache.time.monotonic", return_value=106.0):
+        assert cache.get("a") is None
+
+
+def test_cache_result_serves_repeat_reads_from_local_tier(mock_redis):
+    calls = []
+
+    @cache_result(ttl=300, prefix="unit_l1")
+    def load(value):
+        calls.append(value)
+        return {"value": value}
+
+    assert load(1) == {"value": 1}
+    assert load(1) == {"value": 1}
+
+    assert calls == [1]
+    # Only the first call reached Redis
+    assert mock_redis.get.call_count == 1
+    assert mock_redis.pipeline.return_value.set.call_count == 1
+
+
+def test_cache_result_promotes_redis_hits(mock_redis):
+    mock_redis.get.return_value = json.dumps({"value": "from-redis"})
+
+    @cache_result(ttl=300, prefix="unit_l1")
+    def load():
+        raise AssertionError("should be served from cache")
+
+    assert load() == {"value": "from-redis"}
+    assert load() == {"value": "from-redis"}
+    assert mock_redis.get.call_count == 1
+
+
+def test_cache_result_negative_caches_none(mock_redis):
+    calls = []
+
+    @cache_result(ttl=300, prefix="unit_l1")
+    def load():
+        calls.append(1)
+        return None
+
+    assert load() is None
+    assert load() is None
+    assert len(calls) == 1
+    mock_redis.pipeline.assert_not_called()
+
+
+def test_invalidate_cache_clears_local_tier(mock_redis):
+    calls = []
+
+    @cache_result(ttl=300, prefix="unit_l1")
+    def load():
+        calls.append(1)
+        return {"n": len(calls)}
+
+    load()
+    invalidate_cache("unit_l1")
+    assert load() == {"n": 2}
+
+
+def test_local_tier_respects_prefix_sizes(mock_redis):
+    with patch.dict(config.CACHE_L1_PREFIX_SIZES, {"unit_small": 1}):
+        @cache_result(ttl=300, prefix="unit_small")
+        def load(value):
+            return {"value": value}
+
+        load(1)
+        load(2)
+        assert local_cache.stats()["l1_entries"]["unit_small"] == 1
+
+
+def test_cache_write_registers_key_under_prefix_tag(mock_redis):
+    @cache_result(ttl=300, prefix="unit_tags")
+    def load():
+        return {"ok": True}
+
+    load()
+    pipe = mock_redis.pipeline.return_value
+    cache_key = pipe.set.call_args.args[0]
+    pipe.sadd.assert_called_once_with(f"{config.APP_ENV}:cachetag:unit_tags", cache_key)
+    pipe.exec.assert_called_once()
+
+
+def test_invalidate_cache_drains_tag_set_without_keys_scan(mock_redis):
+    keys = [f"k{i}" for i in range(250)]
+    mock_redis.spop.side_effect = [keys[:200], keys[200:]]
+
+    with patch.object(config, "CACHE_INVALIDATE_BATCH", 200), patch.object(config, "CACHE_DELETE_CHUNK", 100):
+        invalidate_cache("unit_tags")
+
+    mock_redis.keys.assert_not_called()
+    unlinked = [
+        key
+        for call in mock_redis.pipeline.return_value.unlink.call_args_list
+        for key in call.args
+    ]
+    assert unlinked == keys
+    assert mock_redis.pipeline.return_value.unlink.call_count == 3
+
+
+def test_concurrent_misses_are_coalesced(mock_redis):
+    import threading
+    import time
+
+    calls = []
+    start = threading.Barrier(5)
+
+    @cache_result(ttl=300, prefix="unit_flight")
+    def load():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"value": 1}
+
+    results = []
+
+    def call():
+        start.wait()
+        results.append(load())
+
+    threads = [threading.Thread(target=call) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [{"value": 1}] * 5
+
+
+def test_miss_waits_for_peer_holding_lock(mock_redis):
+    # Another worker owns the recompute lock and publishes the result while we poll
+    mock_redis.set.return_value = None
+    mock_redis.get.side_effect = [None, json.dumps({"value": "peer"})]
+
+    @cache_result(ttl=300, prefix="unit_flight")
+    def load():
+        raise AssertionError("should use the peer's result")
+
+    with patch.object(config, "CACHE_LOCK_POLL_INTERVAL", 0):
+        assert load() == {"value": "peer"}
+
+
+def test_stale_entry_is_served_while_refreshing(mock_redis):
+    import threading
+    from fapi.core.cache import SWR_MARKER
+
+    refreshed = threading.Event()
+    stale_payload = f"{SWR_MARKER}0:" + json.dumps({"value": "stale"})
+    mock_redis.get.return_value = stale_payload
+
+    @cache_result(ttl=300, prefix="unit_swr", stale_ttl=60)
+    def load():
+        refreshed.set()
+        return {"value": "fresh"}
+
+    assert load() == {"value": "stale"}
+    assert refreshed.wait(2)
+
+
+def test_async_batcher_coalesces_concurrent_gets_into_mget(mock_async_redis):
+    import asyncio
+    from fapi.core.redis_client import redis_client
+
+    mock_async_redis.mget.side_effect = lambda *keys: [f"v:{k}" for k in keys]
+
+    async def run():
+        batcher = redis_client.get_batcher()
+        return await asyncio.gather(batcher.get("a"), batcher.get("b"), batcher.get("a"))
+
+    assert asyncio.run(run()) == ["v:a", "v:b", "v:a"]
+    mock_async_redis.mget.assert_awaited_once_with("a", "b")
+    mock_async_redis.get.assert_not_awaited()
+
+
+def test_async_batcher_shares_one_pipeline_between_writers(mock_async_redis):
+    import asyncio
+    from fapi.core.redis_client import redis_client
+
+    pipe = mock_async_redis.pipeline.return_value
+    pipe.exec.return_value = ["OK", 1, "OK"]
+
+    async def run():
+        batcher = redis_client.get_batcher()
+        return await asyncio.gather(
+            batcher.execute([("set", ("a", "1"), {"ex": 10}), ("sadd", ("tag", "a"), {})]),
+            batcher.execute([("set", ("b", "2"), {"ex": 10})]),
+        )
+
+    assert asyncio.run(run()) == [["OK", 1], ["OK"]]
+    pipe.exec.assert_awaited_once()
+
+
+def test_cache_response_uses_async_client(mock_redis, mock_async_redis):
+    import asyncio
+    from starlette.requests import Request
+    from fapi.core.cache import cache_response
+
+    calls = []
+
+    @cache_response(ttl=300, prefix="unit_async")
+    async def endpoint(request: Request):
+        calls.append(1)
+        return {"ok": True}
+
+    request = Request({"type": "http", "method": "GET", "path": "/api/x", "query_string": b"", "headers": []})
+
+    async def run():
+        first = await endpoint(request=request)
+        second = await endpoint(request=request)
+        return first, second
+
+    assert asyncio.run(run()) == ({"ok": True}, {"ok": True})
+    assert calls == [1]
+    mock_async_redis.get.assert_awaited_once()
+    mock_async_redis.pipeline.return_value.exec.assert_awaited_once()
+    mock_redis.get.assert_not_called()
@@ -0,0 +1,93 @@
+import os
+import shutil
+import subprocess
+import time
+from unittest.mock import patch
+
+import pytest
+
+from fapi.utils import code_execution_utils
+from fapi.utils.code_artifact_cache import ArtifactCache
+from fapi.utils.code_execution_utils import CodeExecutor
+
+C_PROGRAM = '#include <stdio.h>\nint main(){int x; scanf("%d", &x); printf("%d\\n", x * 2); return 0;}'
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ArtifactCache(str(tmp_path / "artifacts"), max_entries=2)
+    with patch.object(code_execution_utils, "artifact_cache", cache):
+        yield cache
+
+
+def _publish(cache, key):
+    build_dir = cache.new_build_dir()
+    return cache.put(key, build_dir)
+
+
+def test_cache_evicts_least_recently_used(cache):
+    _publish(cache, "a")
+    time.sleep(0.01)
+    _publish(cache, "b")
+    time.sleep(0.01)
+    assert cache.get("a")  # refreshes "a"
+    time.sleep(0.01)
+    _publish(cache, "c")
+
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c")
+
+
+def test_key_depends_on_toolchain_and_source():
+    base = ArtifactCache.key("c", "gcc 12", "int main(){}")
+    assert base != ArtifactCache.key("c", "gcc 13", "int main(){}")
+    assert base != ArtifactCache.key("c", "gcc 12", "int main(){return 0;}")
+
+
+@pytest.mark.skipif(shutil.which("gcc") is None, reason="gcc not installed")
+def test_identical_c_code_compiles_once_across_runs(cache):
+    with patch.object(code_execution_utils.subprocess, "run", wraps=subprocess.run) as run:
+        outputs = [CodeExecutor.execute(C_PROGRAM, "c", str(n), timeout=20)["output"] for n in (1, 2, 3)]
+
+    assert outputs == ["2\n", "4\n", "6\n"]
+    compiles = [c for c in run.call_args_list if c.args[0][0] == "gcc" and "-o" in c.args[0]]
+    assert len(compiles) == 1
+
+
+@pytest.mark.skipif(shutil.which("gcc") is None, reason="gcc not installed")
+def test_compile_errors_are_reported_and_not_cached(cache):
+    result = CodeExecutor.execute("int main(){ return missing; }", "c", "", timeout=20)
+
+    assert result["status"] == "error"
+    assert "missing" in result["error"]
+    assert not os.listdir(cache.root)
+
+
+def test_entries_in_use_are_not_evicted(cache):
+    _publish(cache, "a")
+    time.sleep(0.01)
+    with cache.use("a"):
+        _publish(cache, "b")
+        time.sleep(0.01)
+        _publish(cache, "c")
+        assert cache.get("a")
+    assert cache.get("b") is None
+
+
+@pytest.mark.skipif(shutil.which("gcc") is None, reason="gcc not installed")
+def test_build_removed_before_it_runs_is_recompiled_once(cache):
+    assert CodeExecutor.execute(C_PROGRAM, "c", "1", timeout=20)["output"] == "2\n"
+    real_run = subprocess.run
+    vanished = []
+
+    def run(command, *args, **kwargs):
+        if command[0].endswith("program") and not vanished:
+            vanished.append(command[0])
+            shutil.rmtree(os.path.dirname(command[0]))  # another process evicted it
+        return real_run(command, *args, **kwargs)
+
+    with patch.object(code_execution_utils.subprocess, "run", side_effect=run):
+        result = CodeExecutor.execute(C_PROGRAM, "c", "5", timeout=20)
+
+    assert vanished
+    assert result["status"] == "success" and result["output"] == "10\n"
@@ -0,0 +1,191 @@
+import threading
+import time
+
+import pytest
+
+from fapi.core.redis_client import RedisClient
+from fapi.utils import code_execution_queue
+from fapi.utils.code_execution_queue import ExecutionQueue, QueueFullError
+
+
+def _blocking_job(release):
+    def run(job, value):
+        job.emit("output", {"value": value})
+        release.wait(5)
+        return {"value": value}
+    return run
+
+
+def test_jobs_beyond_the_queue_are_refused_with_their_position():
+    release = threading.Event()
+    queue = ExecutionQueue(workers=1, max_queued=2, max_per_user=10, job_ttl_seconds=60)
+    fn = _blocking_job(release)
+
+    running = queue.submit("u1", fn, 0)
+    time.sleep(0.05)
+    queued = [queue.submit(f"u{i}", fn, i) for i in (2, 3)]
+
+    assert queue.position(running) is None
+    assert [queue.position(job) for job in queued] == [1, 2]
+    with pytest.raises(QueueFullError) as exc:
+        queue.submit("u4", fn, 4)
+    assert exc.value.queue_position == 3
+
+    release.set()
+    assert [job.future.result(5) for job in [running, *queued]] == [{"value": i} for i in (0, 2, 3)]
+    assert [e["event"] for e in running.events] == ["queued", "running", "output", "result"]
+
+
+def test_per_user_in_flight_limit():
+    release = threading.Event()
+    queue = ExecutionQueue(workers=4, max_queued=10, max_per_user=2, job_ttl_seconds=60)
+    fn = _blocking_job(release)
+
+    jobs = [queue.submit("u1", fn, i) for i in range(2)]
+    with pytest.raises(QueueFullError):
+        queue.submit("u1", fn, 2)
+    other = queue.submit("u2", fn, 3)
+
+    release.set()
+    for job in [*jobs, other]:
+        job.future.result(5)
+    # Finished runs free the user's slots
+    queue.submit("u1", fn, 4).future.result(5)
+
+
+def test_failed_job_and_owner_only_lookup_and_expiry():
+    queue = ExecutionQueue(workers=1, max_queued=10, max_per_user=10, job_ttl_seconds=0)
+
+    def boom(job):
+        raise RuntimeError("db down")
+
+    job = queue.submit("u1", boom)
+    assert job.future.result(5) is None
+    assert job.status == "error"
+    assert job.events[-1] == {"event": "error", "data": {"detail": "Code execution failed"}}
+    assert queue.get(job.id, "u1") is job
+    assert queue.get(job.id, "u2") is None
+
+    queue.submit("u1", lambda j: {}).future.result(5)
+    assert queue.get(job.id, "u1") is None
+
+
+class _SharedRedis:
+    """Just enough of the Redis client for two queues standing in for two instances."""
+
+    def __init__(self):
+        self.values = {}
+        self.round_trips = 0
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+        return True
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def rpush(self, key, *values):
+        self.values.setdefault(key, []).extend(values)
+        return len(self.values[key])
+
+    def lrange(self, key, start, stop):
+        items = self.values.get(key, [])
+        return items[start:] if stop == -1 else items[start:stop + 1]
+
+    def expire(self, key, seconds):
+        return 1
+
+    def zrem(self, key, member):
+        return int(self.values.get(key, {}).pop(member, None) is not None)
+
+    def eval(self, script, keys, args):
+        assert script == code_execution_queue._ACQUIRE_SLOT_SCRIPT
+        self.round_trips += 1
+        limit, job_id, now, expires_at, _ = args
+        slots = self.values.setdefault(keys[0], {})
+        for member in [m for m, lapses in slots.items() if lapses <= float(now)]:
+            del slots[member]
+        if len(slots) >= int(limit):
+            return 0
+        slots[job_id] = float(expires_at)
+        return 1
+
+    def pipeline(self):
+        redis = self
+
+        class Pipeline:
+            def __init__(self):
+                self.commands = []
+
+            def __getattr__(self, name):
+                return lambda *args, **kwargs: self.commands.append((name, args, kwargs))
+
+            def exec(self):
+                redis.round_trips += 1
+                return [getattr(redis, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+
+        return Pipeline()
+
+
+def test_jobs_and_user_limits_are_shared_across_instances(monkeypatch):
+    monkeypatch.setattr(RedisClient, "_client", _SharedRedis())
+    release = threading.Event()
+    first = ExecutionQueue(workers=2, max_queued=10, max_per_user=2, job_ttl_seconds=60)
+    second = ExecutionQueue(workers=2, max_queued=10, max_per_user=2, job_ttl_seconds=60)
+    fn = _blocking_job(release)
+
+    jobs = [first.submit("u1", fn, 1), second.submit("u1", fn, 2)]
+    with pytest.raises(QueueFullError):
+        first.submit("u1", fn, 3)
+
+    seen = second.get(jobs[0].id, "u1")
+    assert seen.remote and not seen.finished
+    assert second.get(jobs[0].id, "u2") is None
+
+    release.set()
+    for job in jobs:
+        job.future.result(5)
+    seen = second.refresh(seen)
+    assert seen.status == "done" and seen.result == {"value": 1}
+    assert [e["event"] for e in seen.events] == ["queued", "running", "output", "result"]
+    # Finished runs free the user's slots on every instance
+    second.submit("u1", fn, 4).future.result(5)
+
+
+def test_events_are_appended_to_redis_in_batches(monkeypatch):
+    redis = _SharedRedis()
+    monkeypatch.setattr(RedisClient, "_client", redis)
+    queue = ExecutionQueue(
+        workers=1, max_queued=10, max_per_user=10, job_ttl_seconds=60, publish_interval_seconds=60
+    )
+
+    def chatty(job):
+        for i in range(50):
+            job.emit("test_result", {"index": i})
+        return {"passed": 50}
+
+    job = queue.submit("u1", chatty)
+    job.future.result(5)
+
+    # Slot, admission and completion only: the 50 test results went out in the final batch
+    assert redis.round_trips == 3
+    events = redis.values[f"{queue._job_key(job.id)}:events"]
+    assert len(events) == len(job.events) == 53
+    assert "events" not in redis.values[queue._job_key(job.id)]
+
+
+def test_a_slot_leaked_by_a_crashed_instance_lapses(monkeypatch):
+    redis = _SharedRedis()
+    monkeypatch.setattr(RedisClient, "_client", redis)
+    crashed = ExecutionQueue(workers=1, max_queued=10, max_per_user=2, job_ttl_seconds=60)
+    survivor = ExecutionQueue(workers=1, max_queued=10, max_per_user=2, job_ttl_seconds=60)
+
+    assert crashed._acquire_slot("u1", "a") is True
+    assert crashed._acquire_slot("u1", "b") is True
+    assert survivor._acquire_slot("u1", "c") is False
+
+    # The crashed instance never releases its slots; they lapse after the job TTL
+    slots = redis.values[crashed._inflight_key("u1")]
+    slots["a"] = time.time() - 1
+    assert survivor._acquire_slot("u1", "c") is True
+    assert sorted(slots) == ["b", "c"]
@@ -0,0 +1,75 @@
+from unittest.mock import patch
+
+import pytest
+
+from fapi.utils import code_execution_utils
+from fapi.utils.code_execution_utils import CodeExecutor
+from fapi.utils.code_result_cache import ExecutionResultCache
+
+
+class _Runner:
+    def __init__(self, result):
+        self.result = result
+        self.calls = 0
+
+    def __call__(self, code, language, input_data, timeout):
+        self.calls += 1
+        return dict(self.result)
+
+
+@pytest.fixture
+def cache():
+    return ExecutionResultCache(max_entries=10, ttl_seconds=60)
+
+
+def test_repeat_run_is_served_from_cache_and_marked(cache):
+    runner = _Runner({"output": "3\n", "error": None, "status": "success", "execution_time_ms": 40})
+
+    first = cache.run("run", "print(1+2)", "python", None, 5, runner)
+    second = cache.run("run", "print(1+2)", "Python ", "", 4, runner)
+
+    assert runner.calls == 1
+    assert "cached" not in first
+    assert second == {**first, "cached": True}
+
+
+def test_key_covers_input_kind_and_timeout_class(cache):
+    runner = _Runner({"output": "x", "error": None, "status": "success"})
+    cache.run("run", "code", "python", "a", 5, runner)
+    cache.run("run", "code", "python", "b", 5, runner)
+    cache.run("test_case", "code", "python", "a", 5, runner)
+    cache.run("run", "code", "python", "a", 10, runner)
+    assert runner.calls == 4
+
+
+@pytest.mark.parametrize("code, result", [
+    ("while True: pass", {"output": None, "error": "Execution timed out after 5 seconds", "status": "timeout"}),
+    ("x = [0] * 10 ** 10", {"output": None, "error": "MemoryError", "status": "error"}),
+    ("print(1)", {"output": None, "error": "Execution error: [Errno 2] No such file", "status": "error"}),
+    ("import random\nprint(random.random())", {"output": "0.1", "error": None, "status": "success"}),
+    ("import time\nprint(time.time())", {"output": "1.0", "error": None, "status": "success"}),
+])
+def test_nondeterministic_and_transient_results_are_not_cached(cache, code, result):
+    runner = _Runner(result)
+    cache.run("run", code, "python", None, 5, runner)
+    cache.run("run", code, "python", None, 5, runner)
+    assert runner.calls == 2
+
+
+def test_program_errors_are_cached(cache):
+    runner = _Runner({"output": None, "error": "ZeroDivisionError: division by zero", "status": "error"})
+    cache.run("run", "print(1/0)", "python", None, 5, runner)
+    assert cache.run("run", "print(1/0)", "python", None, 5, runner)["cached"] is True
+    assert runner.calls == 1
+
+
+def test_executor_uses_the_cache(cache):
+    with patch.object(code_execution_utils, "result_cache", cache):
+        first = CodeExecutor.execute("print(6*7)", "python", None, 5)
+        second = CodeExecutor.execute("print(6*7)", "python", None, 5)
+        case = CodeExecutor.execute_for_test_case("def solution(x):\n    return x * 2", "python", "21", 5)
+        case_again = CodeExecutor.execute_for_test_case("def solution(x):\n    return x * 2", "python", "21", 5)
+
+    assert first["output"].strip() == "42" and "cached" not in first
+    assert second["cached"] is True
+    assert case["output"].strip() == "42" and case_again["cached"] is True
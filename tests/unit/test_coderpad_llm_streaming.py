@@ -0,0 +1,137 @@
+"""Streaming CoderPad LLM calls: incremental JSON fields and SSE passthrough of OpenAI chunks."""
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from fapi.utils import http_client_pool
+from fapi.utils.coderpad_llm_utils import (
+    stream_llm_generate_question_from_topic,
+    stream_llm_validate_code_submission,
+)
+from fapi.utils.incremental_json import IncrementalJsonObject
+
+MODEL_TEXT = (
+    '```json\n{"passed": true, "summary": "Looks \\"good\\"", '
+    '"feedback": "Line one\\nLine two \\u00e9", "confidence": 0.9, "extra": {"a": [1, "}"]}}\n```'
+)
+
+
+def _feed_in_chunks(text, size):
+    parser = IncrementalJsonObject()
+    events = []
+    for i in range(0, len(text), size):
+        events.extend(parser.feed(text[i:i + size]))
+    return parser, events
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, len(MODEL_TEXT)])
+def test_incremental_parser_matches_full_parse_for_any_chunking(size):
+    parser, events = _feed_in_chunks(MODEL_TEXT, size)
+    fields = {name: value for kind, name, value in events if kind == "field"}
+    assert fields == {
+        "passed": True,
+        "summary": 'Looks "good"',
+        "feedback": "Line one\nLine two é",
+        "confidence": 0.9,
+        "extra": {"a": [1, "}"]},
+    }
+    feedback_text = "".join(value for kind, name, value in events if kind == "text" and name == "feedback")
+    assert feedback_text == fields["feedback"]
+    assert parser.done
+
+
+def test_string_field_text_arrives_before_the_value_closes():
+    parser = IncrementalJsonObject()
+    assert parser.feed('{"summary": "Hel') == [("text", "summary", "Hel")]
+    assert parser.feed('lo\\') == [("text", "summary", "lo")]
+    assert parser.feed('n"') == [("text", "summary", "\n"), ("field", "summary", "Hello\n")]
+
+
+# A raw newline inside a string, and an invalid escape (\d), as models sometimes produce
+@pytest.mark.parametrize("feedback", ['"Line one\nLine two"', '"Use \\d+ to match"'])
+def test_invalid_json_stops_the_parser_instead_of_raising(feedback):
+    parser, events = _feed_in_chunks('{"passed": false, "feedback": ' + feedback + ', "confidence": 0.5}', 4)
+    assert parser.failed and not parser.done
+    assert ("field", "passed", False) in events
+    assert not any(name == "confidence" for kind, name, value in events)
+    assert parser.feed("}") == []
+
+
+def _openai_sse(text, size=5):
+    lines = []
+    for i in range(0, len(text), size):
+        lines.append("data: " + json.dumps({"choices": [{"delta": {"content": text[i:i + size]}}]}))
+    lines.append("data: [DONE]")
+    return "\n\n".join(lines) + "\n\n"
+
+
+@pytest.fixture
+def openai_upstream():
+    state = {"responses": [], "payloads": []}
+
+    def handler(request):
+        state["payloads"].append(json.loads(request.content))
+        return state["responses"].pop(0)
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    with patch.dict(http_client_pool._clients, {"https://api.openai.com": client}):
+        yield state
+    client.close()
+
+
+def test_validate_stream_still_ends_with_a_result_when_the_json_is_invalid(openai_upstream):
+    text = '{"passed": true, "summary": "ok", "feedback": "Use \\d+"}'
+    openai_upstream["responses"] = [httpx.Response(200, text=_openai_sse(text))]
+
+    events = list(stream_llm_validate_code_submission(
+        problem_statement="Digits", code="print(1)", language="python",
+        test_cases=None, openai_api_key="sk-test",
+    ))
+
+    event, result = events[-1]
+    assert event == "result" and result["raw_model_text"] == text
+    assert result["summary"] == "Could not parse model output"
+
+
+def test_validate_stream_emits_tokens_fields_then_the_usual_result(openai_upstream):
+    openai_upstream["responses"] = [httpx.Response(200, text=_openai_sse(MODEL_TEXT))]
+
+    events = list(stream_llm_validate_code_submission(
+        problem_statement="Print 1", code="print(1)", language="python",
+        test_cases=None, openai_api_key="sk-test",
+    ))
+
+    assert openai_upstream["payloads"][0]["stream"] is True
+    assert "".join(data["text"] for event, data in events if event == "token") == MODEL_TEXT
+    assert ("field", {"field": "passed", "value": True}) in events
+    event, result = events[-1]
+    assert event == "result"
+    assert result["passed"] is True and result["summary"] == 'Looks "good"'
+    assert result["raw_model_text"] == MODEL_TEXT and result["error"] is None
+
+
+def test_generate_stream_reports_upstream_errors_in_the_result(openai_upstream):
+    openai_upstream["responses"] = [httpx.Response(401, json={"error": {"message": "Incorrect API key"}})]
+
+    events = list(stream_llm_generate_question_from_topic(topic="sorting", openai_api_key="sk-bad"))
+
+    assert events == [("result", {"error": "OpenAI error (401): Incorrect API key"})]
+
+
+def test_validate_stream_route_sends_server_sent_events(client, admin_headers, openai_upstream):
+    openai_upstream["responses"] = [httpx.Response(200, text=_openai_sse(MODEL_TEXT))]
+
+    res = client.post(
+        "/api/coderpad/llm-validate/stream",
+        json={"code": "print(1)", "problem_statement": "Print 1"},
+        headers={**admin_headers, "X-OpenAI-Api-Key": "sk-test"},
+    )
+
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/event-stream")
+    blocks = [block for block in res.text.split("\n\n") if block]
+    assert blocks[0].startswith("event: token")
+    assert blocks[-1].startswith("event: result")
+    assert json.loads(blocks[-1].split("data: ", 1)[1])["passed"] is True
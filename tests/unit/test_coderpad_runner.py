@@ -0,0 +1,79 @@
+import threading
+import time
+from unittest.mock import patch
+
+from fapi.core import config
+from fapi.utils import coderpad_utils
+from fapi.utils.code_execution_utils import CodeExecutor
+
+
+class _FakeExecutor:
+    """Echoes stdin back after a delay, tracking how many cases run at once."""
+
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.running = 0
+        self.peak = 0
+        self.started = []
+        self.lock = threading.Lock()
+
+    def __call__(self, code, language, input_data, timeout=5):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            self.started.append(input_data)
+        time.sleep(self.delays.get(input_data, 0.05))
+        with self.lock:
+            self.running -= 1
+        return {"output": input_data, "error": None, "status": "success"}
+
+
+def _cases(n, failing=()):
+    return [
+        {"input": str(i), "expected_output": "wrong" if i in failing else str(i)}
+        for i in range(n)
+    ]
+
+
+def test_cases_run_concurrently_and_return_in_index_order():
+    fake = _FakeExecutor(delays={"0": 0.2})
+    with patch.object(CodeExecutor, "execute_for_test_case", side_effect=fake), \
+         patch.object(config, "CODERPAD_TEST_WORKERS_PER_USER", 3):
+        results = coderpad_utils.run_test_cases_against_code("code", "python", 5, _cases(6), user_id="order")
+
+    assert [r.test_case_index for r in results] == list(range(6))
+    assert all(r.passed for r in results)
+    assert fake.peak == 3
+
+
+def test_per_user_cap_spans_concurrent_requests():
+    fake = _FakeExecutor()
+    with patch.object(CodeExecutor, "execute_for_test_case", side_effect=fake), \
+         patch.object(config, "CODERPAD_TEST_WORKERS_PER_USER", 2):
+        threads = [
+            threading.Thread(
+                target=coderpad_utils.run_test_cases_against_code,
+                args=("code", "python", 5, _cases(4)),
+                kwargs={"user_id": "shared"},
+            )
+            for _ in range(2)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    assert len(fake.started) == 8
+    assert fake.peak == 2
+
+
+def test_fail_fast_stops_at_first_failing_case():
+    fake = _FakeExecutor()
+    with patch.object(CodeExecutor, "execute_for_test_case", side_effect=fake), \
+         patch.object(config, "CODERPAD_TEST_WORKERS_PER_USER", 1):
+        results = coderpad_utils.run_test_cases_against_code(
+            "code", "python", 5, _cases(6, failing={2}), user_id="ff", fail_fast=True
+        )
+
+    assert [(r.test_case_index, r.passed) for r in results] == [(0, True), (1, True), (2, False)]
+    assert fake.started == ["0", "1", "2"]
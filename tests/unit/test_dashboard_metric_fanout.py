@@ -0,0 +1,62 @@
+"""/metrics/all fan-out: groups run concurrently, each on its own session, with partial results."""
+import threading
+import time
+from unittest.mock import patch
+
+from fapi.utils import avatar_dashboard_utils
+from fapi.utils.avatar_dashboard_utils import get_dashboard_metric_groups
+
+
+def test_groups_run_concurrently_on_separate_sessions():
+    barrier = threading.Barrier(3, timeout=5)
+    sessions = []
+
+    def group(db):
+        sessions.append(db)
+        barrier.wait()  # only passes if all three groups are running at once
+        return {"ok": True}
+
+    groups = {"a": group, "b": group, "c": group}
+    with patch.dict(avatar_dashboard_utils.DASHBOARD_METRIC_GROUPS, groups, clear=True):
+        results, errors = get_dashboard_metric_groups()
+
+    assert results == {"a": {"ok": True}, "b": {"ok": True}, "c": {"ok": True}}
+    assert errors == {}
+    assert len({id(db) for db in sessions}) == 3
+
+
+def test_slow_and_failing_groups_are_reported_without_blocking_the_rest():
+    release = threading.Event()
+
+    def slow(db):
+        release.wait(5)
+        return {"late": True}
+
+    def broken(db):
+        raise RuntimeError("boom")
+
+    groups = {"fast": lambda db: {"n": 1}, "slow": slow, "broken": broken}
+    with patch.dict(avatar_dashboard_utils.DASHBOARD_METRIC_GROUPS, groups, clear=True), \
+         patch.object(avatar_dashboard_utils.config, "DASHBOARD_METRIC_GROUP_TIMEOUT_SECONDS", 0.2):
+        started = time.monotonic()
+        results, errors = get_dashboard_metric_groups()
+        elapsed = time.monotonic() - started
+    release.set()
+
+    assert results == {"fast": {"n": 1}}
+    assert errors == {"slow": "timeout", "broken": "error"}
+    assert elapsed < 2
+
+
+def test_metrics_all_returns_partial_payload_with_error_markers(client, admin_headers):
+    def broken(db):
+        raise RuntimeError("db down")
+
+    groups = {"batch_metrics": broken}
+    with patch.dict(avatar_dashboard_utils.DASHBOARD_METRIC_GROUPS, groups, clear=True):
+        res = client.get("/api/metrics/all", headers=admin_headers)
+
+    assert res.status_code == 200
+    body = res.json()
+    assert body["batch_metrics"] is None
+    assert body["errors"] == {"batch_metrics": "error"}
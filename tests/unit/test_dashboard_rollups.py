@@ -0,0 +1,119 @@
+"""Dashboard rollups: refresh after ORM commits, rebuild on out-of-band changes."""
+import uuid
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from fapi.db.models import Batch, CandidateORM, CandidatePlacementORM, DashboardRollupStateORM, LeadORM
+from fapi.utils import avatar_dashboard_utils, dashboard_rollups
+from fapi.utils.dashboard_rollups import batch_totals, daily_breakdown, daily_totals, refresh_stale_rollups
+
+
+def _live_and_rollup(func, db):
+    """The uncached metric group computed from the fact tables and from the rollups."""
+    with patch.object(avatar_dashboard_utils.config, "DASHBOARD_ROLLUPS_ENABLED", False):
+        live = func.__wrapped__(db)
+    return live, func.__wrapped__(db)
+
+
+def _candidate(db, batch, status="active", enrolled=None):
+    candidate = CandidateORM(
+        full_name="Rollup Test", email=f"r_{uuid.uuid4().hex[:8]}@test.com", batchid=batch.batchid,
+        status=status, enrolled_date=enrolled or date.today(), fee_paid=100,
+    )
+    db.add(candidate)
+    return candidate
+
+
+def test_writes_update_only_their_buckets_and_match_live_metrics(db_session):
+    today = date.today()
+    old_batch = Batch(batchname="Rollup Old", subject="ML", startdate=today - timedelta(days=90),
+                      enddate=today - timedelta(days=30))
+    new_batch = Batch(batchname="Rollup New", subject="ML", startdate=today - timedelta(days=1),
+                      enddate=today + timedelta(days=60))
+    db_session.add_all([old_batch, new_batch])
+    db_session.commit()
+    refresh_stale_rollups(db_session)
+    before = daily_totals(db_session, "candidates")[0]
+
+    first = _candidate(db_session, new_batch)
+    second = _candidate(db_session, new_batch, status="break")
+    db_session.commit()
+
+    assert daily_totals(db_session, "candidates")[0] == before + 2
+    assert batch_totals(db_session, [new_batch.batchid]) == {new_batch.batchid: (2, 200.0)}
+
+    # Moving a row must also shrink the bucket it left
+    second.batchid = old_batch.batchid
+    second.enrolled_date = today - timedelta(days=400)
+    db_session.delete(first)
+    db_session.commit()
+
+    assert daily_totals(db_session, "candidates")[0] == before + 1
+    assert batch_totals(db_session, [new_batch.batchid, old_batch.batchid]) == {old_batch.batchid: (1, 100.0)}
+    live, rolled = _live_and_rollup(avatar_dashboard_utils.get_batch_metrics, db_session)
+    assert rolled == live
+
+
+def test_bulk_statements_leave_the_source_stale_until_rebuilt(db_session):
+    lead = LeadORM(full_name="Rollup Lead", email=f"l_{uuid.uuid4().hex[:8]}@test.com", status="open")
+    db_session.add(lead)
+    db_session.commit()
+    refresh_stale_rollups(db_session)
+    open_before = daily_breakdown(db_session, "leads").get("open", 0)
+
+    db_session.query(LeadORM).filter(LeadORM.id == lead.id).update({"status": "closed"})
+    db_session.commit()
+
+    assert daily_breakdown(db_session, "leads").get("open", 0) == open_before  # not seen by the hook
+    assert refresh_stale_rollups(db_session) >= 1
+    assert daily_breakdown(db_session, "leads").get("open", 0) == open_before - 1
+
+    live, rolled = _live_and_rollup(avatar_dashboard_utils.get_lead_metrics, db_session)
+    assert rolled == live
+
+
+def test_placement_metrics_from_rollups_match_live(db_session):
+    batch = Batch(batchname="Rollup Placement", subject="ML", startdate=date.today(), enddate=date.today())
+    db_session.add(batch)
+    db_session.commit()
+    candidate = _candidate(db_session, batch)
+    db_session.commit()
+    db_session.add(CandidatePlacementORM(
+        candidate_id=candidate.id, company="Acme", position="Engineer", placement_date=date.today(), status="Active",
+    ))
+    db_session.commit()
+
+    live, rolled = _live_and_rollup(avatar_dashboard_utils.get_placement_metrics, db_session)
+    assert rolled == live
+
+
+def test_missing_state_rebuilds_and_disabled_rollups_fall_back(db_session):
+    db_session.query(DashboardRollupStateORM).delete()
+    db_session.commit()
+    assert refresh_stale_rollups(db_session) == len(dashboard_rollups.SOURCE_MODELS)
+
+    with patch.object(dashboard_rollups.config, "DASHBOARD_ROLLUPS_ENABLED", False), \
+         patch.object(dashboard_rollups, "refresh_stale_rollups") as refresh:
+        assert dashboard_rollups.rollups_ready(db_session) is False
+    refresh.assert_not_called()
+
+
+def test_rollup_failure_never_affects_the_writer_and_reads_never_rebuild(db_session):
+    batch = Batch(batchname="Rollup Failure", subject="ML", startdate=date.today(), enddate=date.today())
+    db_session.add(batch)
+    db_session.commit()
+    refresh_stale_rollups(db_session)
+
+    with patch.object(dashboard_rollups, "_refresh_days", side_effect=RuntimeError("deadlock")):
+        candidate = _candidate(db_session, batch)
+        db_session.commit()
+    db_session.expire_all()
+    assert db_session.get(CandidateORM, candidate.id) is not None
+
+    with patch.object(dashboard_rollups, "refresh_stale_rollups") as refresh:
+        assert dashboard_rollups.rollups_ready(db_session) is True
+    refresh.assert_not_called()
+
+    refresh_stale_rollups(db_session)
+    live, rolled = _live_and_rollup(avatar_dashboard_utils.get_batch_metrics, db_session)
+    assert rolled == live
@@ -0,0 +1,63 @@
+"""Live batch / lead metrics: one conditional-aggregation query per fact table."""
+import uuid
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from sqlalchemy import event, func
+
+from fapi.db.models import Batch, CandidateORM, LeadORM
+from fapi.utils import avatar_dashboard_utils
+
+
+def _live(func_, db):
+    """Run an uncached metric group against the fact tables; return (result, statements issued)."""
+    statements = []
+    engine = db.get_bind()
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        with patch.object(avatar_dashboard_utils.config, "DASHBOARD_ROLLUPS_ENABLED", False):
+            result = func_.__wrapped__(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return result, statements
+
+
+def test_batch_metrics_use_three_statements_and_window_rankings(db_session):
+    today = date.today()
+    older = Batch(batchname="SP Older", subject="ML", startdate=today - timedelta(days=3),
+                  enddate=today + timedelta(days=90))
+    newer = Batch(batchname="SP Newer", subject="ML", startdate=today - timedelta(days=2),
+                  enddate=today + timedelta(days=90))
+    db_session.add_all([older, newer])
+    db_session.commit()
+    for batch, count in ((older, 2), (newer, 3)):
+        for _ in range(count):
+            db_session.add(CandidateORM(full_name="SP", email=f"sp_{uuid.uuid4().hex[:8]}@test.com",
+                                        batchid=batch.batchid, status="active", enrolled_date=today))
+    db_session.commit()
+
+    result, statements = _live(avatar_dashboard_utils.get_batch_metrics, db_session)
+
+    assert len(statements) == 3
+    current = db_session.query(Batch).filter(Batch.batchname == result["current_active_batches"]).one()
+    assert current.startdate >= newer.startdate
+    assert result["enrolled_candidates_current"] == (
+        db_session.query(func.count(CandidateORM.id)).filter(CandidateORM.batchid == current.batchid).scalar()
+    )
+    assert result["total_candidates"] == db_session.query(func.count(CandidateORM.id)).scalar()
+    breakdown = result["candidate_status_breakdown"]
+    assert sum(v for k, v in breakdown.items() if k != "Placements") == result["total_candidates"]
+
+
+def test_lead_metrics_use_two_statements(db_session):
+    db_session.add(LeadORM(full_name="SP Lead", email=f"spl_{uuid.uuid4().hex[:8]}@test.com", status="future"))
+    db_session.commit()
+
+    result, statements = _live(avatar_dashboard_utils.get_lead_metrics, db_session)
+
+    assert len(statements) == 2
+    assert result["total_leads"] == db_session.query(func.count(LeadORM.id)).scalar()
+    assert result["future_leads"] == (
+        db_session.query(func.count(LeadORM.id)).filter(LeadORM.status == "future").scalar()
+    )
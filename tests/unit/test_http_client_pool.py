@@ -0,0 +1,94 @@
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from fapi.utils import http_client_pool
+
+
+@pytest.fixture
+def upstream():
+    """Route api.example.com through a scripted transport; collect requests and sleeps."""
+    state = {"responses": [], "requests": [], "sleeps": []}
+
+    def handler(request):
+        state["requests"].append(request)
+        outcome = state["responses"].pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    with patch.dict(http_client_pool._clients, {"https://api.example.com": client}), \
+         patch.object(http_client_pool.time, "sleep", side_effect=state["sleeps"].append):
+        yield state
+    client.close()
+
+
+def test_one_shared_client_per_base_url():
+    with patch.dict(http_client_pool._clients, clear=True):
+        first = http_client_pool.get_http_client("https://api.openai.com/v1/models")
+        again = http_client_pool.get_http_client("https://api.openai.com/v1/chat/completions")
+        other = http_client_pool.get_http_client("https://api.anthropic.com/v1/models")
+        assert first is again
+        assert other is not first
+        http_client_pool.close_all()
+        assert http_client_pool._clients == {}
+        assert first.is_closed
+
+
+def test_borrowers_cannot_close_the_shared_client():
+    openai = pytest.importorskip("openai")
+    from fapi.utils.llm_service import get_openai_client
+
+    with patch.dict(http_client_pool._clients, clear=True):
+        with get_openai_client("sk-test") as sdk:
+            assert sdk.max_retries == 0
+        sdk.close()
+        pooled = http_client_pool.get_http_client("https://api.openai.com")
+        assert not pooled.is_closed
+        assert isinstance(sdk, openai.OpenAI)
+        http_client_pool.close_all()
+        assert pooled.is_closed
+
+
+def test_retries_5xx_with_jittered_backoff(upstream):
+    upstream["responses"] = [httpx.Response(503), httpx.Response(502), httpx.Response(200, json={"ok": True})]
+
+    response = http_client_pool.get("https://api.example.com/v1/models", retries=2)
+
+    assert response.json() == {"ok": True}
+    assert len(upstream["requests"]) == 3
+    assert len(upstream["sleeps"]) == 2
+    assert all(0 <= delay <= http_client_pool.config.LLM_HTTP_RETRY_MAX_DELAY_SECONDS for delay in upstream["sleeps"])
+
+
+def test_honours_retry_after_on_429_and_returns_last_response(upstream):
+    upstream["responses"] = [httpx.Response(429, headers={"Retry-After": "3"}), httpx.Response(429)]
+
+    response = http_client_pool.post("https://api.example.com/v1/chat/completions", json={}, retries=1)
+
+    assert response.status_code == 429
+    assert upstream["sleeps"] == [3.0]
+
+
+def test_post_is_not_resent_after_a_server_error(upstream):
+    upstream["responses"] = [httpx.Response(502)]
+
+    response = http_client_pool.post("https://api.example.com/v1/chat/completions", json={}, retries=2)
+
+    assert response.status_code == 502
+    assert len(upstream["requests"]) == 1
+
+
+def test_client_errors_are_not_retried(upstream):
+    upstream["responses"] = [httpx.Response(401, json={"error": {"message": "Incorrect API key"}})]
+    assert http_client_pool.get("https://api.example.com/v1/models", retries=3).status_code == 401
+    assert upstream["sleeps"] == []
+
+
+def test_connect_errors_are_retried_then_raised(upstream):
+    upstream["responses"] = [httpx.ConnectError("refused"), httpx.ConnectError("refused")]
+    with pytest.raises(httpx.ConnectError):
+        http_client_pool.get("https://api.example.com/v1/models", retries=1)
+    assert len(upstream["requests"]) == 2
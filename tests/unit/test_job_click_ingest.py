@@ -0,0 +1,71 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import mysql
+from sqlalchemy.exc import IntegrityError
+
+from fapi.db.models import JobLinkClicksORM
+from fapi.utils import job_click_utils, table_fingerprint
+from fapi.utils.job_click_utils import upsert_job_clicks_batch
+
+
+@pytest.fixture
+def writes():
+    """Record the multi-row statements instead of running them (job_link_clicks needs MySQL)."""
+    calls = {"ensure": [], "upsert": []}
+    with patch.object(job_click_utils, "_validate_authuser_id", return_value=7), \
+         patch.object(job_click_utils, "_ensure_job_listings",
+                      side_effect=lambda db, ids: calls["ensure"].append(list(ids))), \
+         patch.object(job_click_utils, "_upsert_click_rows",
+                      side_effect=lambda db, uid, totals: calls["upsert"].append(dict(totals))):
+        yield calls
+
+
+def test_flush_is_deduped_and_written_with_one_statement_each(writes):
+    db = MagicMock()
+    clicks = [
+        {"job_listing_id": 11, "count": 2},
+        {"job_listing_id": 12},
+        {"job_listing_id": 11, "count": 3},
+        {"job_listing_id": None},
+        {"job_listing_id": "abc"},
+    ]
+
+    result = upsert_job_clicks_batch(db, authuser_id=7, clicks=clicks)
+
+    assert result["processed"] == 3
+    assert [f["index"] for f in result["failed"]] == [4]
+    assert writes["ensure"] == [[11, 12]]
+    assert writes["upsert"] == [{11: 5, 12: 1}]
+    assert db.begin_nested.call_count == 1
+    db.commit.assert_called_once()
+
+
+def test_failing_row_is_isolated_without_a_savepoint_per_row(writes):
+    db = MagicMock()
+
+    def upsert(db, uid, totals):
+        if 13 in totals:
+            raise IntegrityError("insert", {}, Exception("boom"))
+        writes["upsert"].append(dict(totals))
+
+    clicks = [{"job_listing_id": job_id} for job_id in range(10, 18)]
+    with patch.object(job_click_utils, "_upsert_click_rows", side_effect=upsert):
+        result = upsert_job_clicks_batch(db, authuser_id=7, clicks=clicks)
+
+    assert result["processed"] == 7
+    assert result["failed"] == [{"index": 3, "job_listing_id": 13, "error": "Could not record click"}]
+    assert sorted(job_id for totals in writes["upsert"] for job_id in totals) == [10, 11, 12, 14, 15, 16, 17]
+    # 8 rows with one bad row: 1 + 2 + 2 + 2 savepoints, not 8
+    assert db.begin_nested.call_count == 7
+
+
+def test_click_upsert_is_orm_enabled_and_bumps_the_table_version():
+    db = MagicMock()
+    job_click_utils._upsert_click_rows(db, 7, {11: 2, 12: 1})
+    stmt = db.execute.call_args.args[0]
+
+    assert stmt.entity_description["entity"] is JobLinkClicksORM
+    sql = str(stmt.compile(dialect=mysql.dialect()))
+    assert "ON DUPLICATE KEY UPDATE" in sql
+    assert table_fingerprint._DML_TARGET.match(sql).group(2) == JobLinkClicksORM.__tablename__
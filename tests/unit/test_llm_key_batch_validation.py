@@ -0,0 +1,74 @@
+"""Concurrent batch validation of stored LLM keys."""
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from fapi.core import config
+from fapi.utils.coderpad_openai_key import validate_llm_key_batch_for_user
+from fapi.utils.llm_provider_registry import provider_registry
+
+
+class _SlowProbe:
+    """Stands in for detect_and_validate: sleeps, and tracks concurrency per provider."""
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.running = {}
+        self.peak = {}
+
+    def __call__(self, api_key, override_provider_id=None):
+        provider = override_provider_id or "auto"
+        with self.lock:
+            self.running[provider] = self.running.get(provider, 0) + 1
+            self.peak[provider] = max(self.peak.get(provider, 0), self.running[provider])
+        time.sleep(self.delay)
+        with self.lock:
+            self.running[provider] -= 1
+        status = "invalid" if api_key.endswith("bad") else "active"
+        return {"status": status, "message": f"{provider}:{status}"}
+
+
+def test_batch_validation_fans_out_with_a_per_provider_cap():
+    probe = _SlowProbe()
+    items = [("sk-proj-1", "OpenAI"), ("gsk_2", "Groq"), ("sk-proj-3bad", "OpenAI"),
+             ("gsk_4", "Groq"), ("sk-proj-5", "OpenAI"), ("sk-proj-6", "OpenAI")]
+
+    started = time.monotonic()
+    with patch.object(provider_registry, "detect_and_validate", side_effect=probe), \
+         patch.object(config, "LLM_KEY_VALIDATION_PER_PROVIDER", 2), \
+         patch.dict("fapi.utils.llm_provider_registry._provider_slots", clear=True):
+        results = provider_registry.detect_and_validate_many(items)
+    elapsed = time.monotonic() - started
+
+    assert [r["message"] for r in results] == [
+        "OpenAI:active", "Groq:active", "OpenAI:invalid", "Groq:active", "OpenAI:active", "OpenAI:active",
+    ]
+    assert probe.peak == {"OpenAI": 2, "Groq": 2}
+    # 4 OpenAI keys two at a time: two rounds, not six serial probes
+    assert elapsed < 0.2 * 4
+
+
+def test_batch_statuses_are_persisted_in_one_commit():
+    db = MagicMock()
+    rows = {key_id: MagicMock(id=key_id, status="active") for key_id in (1, 2, 3)}
+    db.query.return_value.filter.return_value.all.return_value = list(rows.values())
+    stored = {1: "sk-proj-ok", 2: "gsk_bad", 3: None}
+
+    with patch("fapi.utils.coderpad_openai_key._candidate_id_for_user", return_value=10), \
+         patch("fapi.utils.coderpad_openai_key.get_stored_key_for_validation",
+               side_effect=lambda db, cid, key_id, provider: stored[key_id]), \
+         patch("fapi.utils.coderpad_openai_key.ensure_default_llm_key_for_candidate") as ensure_default, \
+         patch.object(provider_registry, "detect_and_validate", side_effect=_SlowProbe(delay=0)):
+        results = validate_llm_key_batch_for_user(
+            db, MagicMock(id=1),
+            [{"id": 1, "provider_name": "OpenAI"}, {"id": 2, "provider_name": "Groq"},
+             {"id": 3, "provider_name": "Groq", "source": "Own"}],
+        )
+
+    assert [(r["id"], r["status"]) for r in results] == [(1, "active"), (2, "invalid"), (3, "inactive")]
+    assert results[2] == {"id": 3, "source": "own", "status": "inactive", "message": "Key not found"}
+    assert rows[2].status == "invalid" and rows[2].failure_reason == "Groq:invalid"
+    assert rows[1].failure_reason is None
+    ensure_default.assert_called_once_with(db, 10)
+    db.commit.assert_called_once()
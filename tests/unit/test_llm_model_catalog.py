@@ -0,0 +1,132 @@
+"""Shared model catalog: write-through from validation, stale-while-revalidate refresh."""
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from fapi.utils import llm_model_catalog
+from fapi.utils.llm_model_catalog import ModelCatalog, model_catalog
+from fapi.utils.llm_provider_registry import (
+    FireworksProvider,
+    GroqProvider,
+    LLMProviderRegistry,
+    OpenAIProvider,
+    OpenRouterProvider,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_catalog():
+    model_catalog.clear()
+    # Metadata reads go through get_or_refresh, which would load OpenRouter's public list
+    with patch.object(OpenRouterProvider, "_fetch_public_models", return_value=None):
+        yield
+    model_catalog.clear()
+
+
+def test_missing_entry_is_fetched_inline_then_served_from_memory():
+    catalog = ModelCatalog()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return ["m1", "m2"], "m1"
+
+    first = catalog.get_or_refresh("OpenRouter", "public", fetch)
+    second = catalog.get_or_refresh("OpenRouter", "public", fetch)
+    assert first.models == ("m1", "m2") and second is first
+    assert len(calls) == 1
+
+
+def test_stale_entry_is_served_while_one_background_refresh_runs():
+    catalog = ModelCatalog()
+    catalog.put("OpenRouter", "public", ["old"], "old")
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return ["new"], "new"
+
+    with patch.object(llm_model_catalog.config, "LLM_MODEL_CATALOG_TTL_SECONDS", 0):
+        assert catalog.get_or_refresh("OpenRouter", "public", fetch).models == ("old",)
+        assert catalog.get_or_refresh("OpenRouter", "public", fetch).models == ("old",)
+        release.set()
+        deadline = time.monotonic() + 5
+        while catalog.get("OpenRouter", "public").models != ("new",) and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    assert catalog.get("OpenRouter", "public").models == ("new",)
+    assert len(calls) == 1
+
+
+def test_failed_refresh_keeps_the_previous_entry():
+    catalog = ModelCatalog()
+    catalog.put("OpenRouter", "public", ["old"], "old")
+    assert catalog._refresh("OpenRouter", "public", lambda: None).models == ("old",)
+
+
+def test_validation_fills_the_catalog_used_by_provider_metadata():
+    registry = LLMProviderRegistry()
+    groq = next(p for p in registry.list_providers_metadata() if p["id"] == "Groq")
+    assert groq["models"] == GroqProvider.fallback_models
+
+    with patch.object(GroqProvider, "validate_and_fetch_models",
+                      return_value=("active", "Key is active", ["llama-4"], "llama-4")):
+        registry.detect_and_validate("gsk_catalog_test_key")
+
+    assert model_catalog.get("Groq", "gsk_").models == ("llama-4",)
+    groq = next(p for p in registry.list_providers_metadata() if p["id"] == "Groq")
+    assert groq["models"] == ["llama-4"] and groq["default_model"] == "llama-4"
+    assert "gsk_catalog_test_key" not in str(model_catalog._entries)
+
+
+def test_account_scoped_models_never_reach_the_shared_catalog():
+    registry = LLMProviderRegistry()
+    private = "accounts/acme-123/models/support-bot"
+    public = "accounts/fireworks/models/llama-v3p3-70b-instruct"
+
+    with patch.object(FireworksProvider, "validate_and_fetch_models",
+                      return_value=("active", "Key is active", [private, public], private)):
+        result = registry.detect_and_validate("fw-catalog_test_key")
+
+    assert result["available_models"] == [private, public]
+    fireworks = next(p for p in registry.list_providers_metadata() if p["id"] == "Fireworks")
+    assert fireworks["models"] == [public] and fireworks["default_model"] == public
+
+    with patch.object(GroqProvider, "validate_and_fetch_models",
+                      return_value=("active", "Key is active", ["ft:llama-4:acme"], "ft:llama-4:acme")):
+        registry.detect_and_validate("gsk_private_catalog_key")
+    assert model_catalog.get("Groq", "gsk_") is None
+
+
+def test_expired_validation_entries_fall_back_to_the_static_list():
+    registry = LLMProviderRegistry()
+    model_catalog.put("Groq", "gsk_", ["llama-4"], "llama-4")
+
+    with patch.object(llm_model_catalog.config, "LLM_MODEL_CATALOG_TTL_SECONDS", 0):
+        groq = next(p for p in registry.list_providers_metadata() if p["id"] == "Groq")
+
+    assert groq["models"] == GroqProvider.fallback_models
+    assert groq["default_model"] == GroqProvider.fallback_models[0]
+
+
+def test_metadata_only_lists_the_providers_catalog_tier():
+    registry = LLMProviderRegistry()
+    model_catalog.put("OpenAI", "sk-svcacct-", ["gpt-svc-only"], "gpt-svc-only")
+    openai = next(p for p in registry.list_providers_metadata() if p["id"] == "OpenAI")
+    assert openai["models"] == OpenAIProvider.fallback_models
+
+    model_catalog.put("OpenAI", "sk-proj-", ["gpt-5"], "gpt-5")
+    openai = next(p for p in registry.list_providers_metadata() if p["id"] == "OpenAI")
+    assert openai["models"] == ["gpt-5"]
+
+
+def test_key_independent_catalogs_are_loaded_for_metadata():
+    registry = LLMProviderRegistry()
+    with patch.object(OpenRouterProvider, "_fetch_public_models", return_value=(["or/m1", "or/m2"], "or/m1")):
+        openrouter = next(p for p in registry.list_providers_metadata() if p["id"] == "OpenRouter")
+    assert openrouter["models"] == ["or/m1", "or/m2"] and openrouter["default_model"] == "or/m1"
+    assert model_catalog.get("OpenRouter", "public").models == ("or/m1", "or/m2")
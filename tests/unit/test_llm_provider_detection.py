@@ -0,0 +1,88 @@
+"""Provider racing and validation-outcome caching in LLMProviderRegistry."""
+import time
+from unittest.mock import patch
+
+import pytest
+
+from fapi.utils import llm_provider_registry
+from fapi.utils.llm_provider_registry import BaseLLMProvider, LLMProviderRegistry
+
+
+class _FakeProvider(BaseLLMProvider):
+    key_prefixes = []
+
+    def __init__(self, provider_id, status, delay):
+        self.provider_id = self.display_name = provider_id
+        self.status = status
+        self.delay = delay
+        self.calls = 0
+
+    def validate_and_fetch_models(self, api_key):
+        self.calls += 1
+        time.sleep(self.delay)
+        return self.status, f"{self.provider_id} says {self.status}", ["m1"], "m1"
+
+
+def _registry(*providers):
+    registry = LLMProviderRegistry()
+    registry._providers = {p.provider_id.lower(): p for p in providers}
+    return registry
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    llm_provider_registry._validation_cache.clear()
+    yield
+    llm_provider_registry._validation_cache.clear()
+
+
+def test_unknown_key_races_providers_and_returns_first_active():
+    slow = [_FakeProvider(f"Slow{i}", "inactive", 0.5) for i in range(4)]
+    winner = _FakeProvider("Winner", "active", 0.05)
+    registry = _registry(*slow, winner)
+
+    started = time.monotonic()
+    result = registry.detect_and_validate("mystery-key")
+
+    assert result["detected_provider"] == "Winner"
+    assert result["status"] == "active"
+    assert time.monotonic() - started < 0.5
+
+
+def test_without_an_active_provider_the_first_registered_answer_wins():
+    registry = _registry(
+        _FakeProvider("First", "invalid", 0.2),
+        _FakeProvider("Second", "inactive", 0.0),
+    )
+    assert registry.detect_and_validate("mystery-key")["detected_provider"] == "First"
+
+
+def test_definitive_outcomes_are_cached_by_key_hash():
+    provider = _FakeProvider("OnlyOne", "active", 0.0)
+    registry = _registry(provider)
+
+    first = registry.detect_and_validate("key-a")
+    first["available_models"].append("mutated")
+    second = registry.detect_and_validate("key-a")
+    registry.detect_and_validate("key-b")
+
+    assert provider.calls == 2
+    assert second["available_models"] == ["m1"]
+    assert "key-a" not in str(llm_provider_registry._validation_cache._data)
+
+
+def test_inactive_outcomes_are_reprobed():
+    provider = _FakeProvider("Flaky", "inactive", 0.0)
+    registry = _registry(provider)
+    registry.detect_and_validate("key-a")
+    registry.detect_and_validate("key-a")
+    assert provider.calls == 2
+
+
+def test_cache_can_be_disabled():
+    provider = _FakeProvider("OnlyOne", "active", 0.0)
+    registry = _registry(provider)
+    with patch.object(llm_provider_registry.config, "LLM_KEY_VALIDATION_CACHE_TTL_SECONDS", 0):
+        registry.detect_and_validate("key-a")
+        registry.detect_and_validate("key-a")
+    assert provider.calls == 2
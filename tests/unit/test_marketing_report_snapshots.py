@@ -0,0 +1,106 @@
+"""Weekly marketing report snapshot: built once per data version, shared by its consumers."""
+import uuid
+from datetime import date
+from unittest.mock import patch
+
+from fapi.db.models import (
+    AutomationWorkflowLogORM,
+    CandidateInterview,
+    CandidateMarketingORM,
+    CandidateORM,
+    MarketingReportSnapshotORM,
+)
+from fapi.utils import marketing_report_snapshots
+from fapi.utils.dynamic_weekly_report_utils import send_weekly_marketing_report
+from fapi.utils.marketing_report_snapshots import data_version, get_marketing_report, report_window
+
+REPORT_KEY = {"x-api-key": "wbl_marketing_secret_2024"}
+
+
+def _interview(db, candidate_id):
+    db.add(CandidateInterview(candidate_id=candidate_id, company="Snapshot Co", interview_date=date.today(),
+                              type_of_interview="Technical"))
+    db.commit()
+
+
+def _marketed_candidate(db):
+    candidate = CandidateORM(full_name="Snapshot Candidate", email=f"s_{uuid.uuid4().hex[:8]}@test.com",
+                             status="active", enrolled_date=date.today())
+    db.add(candidate)
+    db.flush()
+    db.add(CandidateMarketingORM(candidate_id=candidate.id, start_date=date.today(), status="active"))
+    db.commit()
+    return candidate
+
+
+def _row(report, candidate_id):
+    return next(c for c in report["candidates"] if c["id"] == candidate_id)
+
+
+def test_snapshot_is_reused_until_a_source_table_changes(db_session):
+    candidate = _marketed_candidate(db_session)
+    _interview(db_session, candidate.id)
+
+    with patch.object(marketing_report_snapshots, "build_marketing_report",
+                      wraps=marketing_report_snapshots.build_marketing_report) as build:
+        first = get_marketing_report(db_session)
+        second = get_marketing_report(db_session)
+        assert build.call_count == 1
+        assert second == first
+        assert _row(first, candidate.id)["technical_count"] == 1
+
+        _interview(db_session, candidate.id)
+        third = get_marketing_report(db_session)
+        assert build.call_count == 2
+        assert third["snapshot"]["data_version"] != first["snapshot"]["data_version"]
+        assert _row(third, candidate.id)["technical_count"] == 2
+
+        get_marketing_report(db_session, regenerate=True)
+        assert build.call_count == 3
+
+    window = report_window()
+    assert db_session.query(MarketingReportSnapshotORM).filter(
+        MarketingReportSnapshotORM.window_start == window[0],
+        MarketingReportSnapshotORM.window_end == window[1],
+    ).count() == 1
+
+
+def test_logins_and_fresh_activity_logs_do_not_rebuild_the_snapshot(db_session, admin_user):
+    _marketed_candidate(db_session)
+    first = get_marketing_report(db_session, regenerate=True)
+
+    admin_user.logincount = (admin_user.logincount or 0) + 1
+    db_session.commit()
+    assert data_version(db_session) == first["snapshot"]["data_version"]
+
+    db_session.add(AutomationWorkflowLogORM(id=uuid.uuid4().int >> 80, workflow_id=1, run_id=uuid.uuid4().hex,
+                                            records_processed=2))
+    db_session.commit()
+    assert data_version(db_session) != first["snapshot"]["data_version"]
+
+    with patch.object(marketing_report_snapshots, "build_marketing_report",
+                      wraps=marketing_report_snapshots.build_marketing_report) as build:
+        assert get_marketing_report(db_session) == first
+        assert build.call_count == 0
+        with patch.object(marketing_report_snapshots.config, "MARKETING_REPORT_ACTIVITY_MIN_AGE_SECONDS", 0):
+            get_marketing_report(db_session)
+        assert build.call_count == 1
+
+
+def test_weekly_job_and_report_data_share_the_snapshot(client, db_session):
+    candidate = _marketed_candidate(db_session)
+
+    with patch.object(marketing_report_snapshots, "build_marketing_report",
+                      wraps=marketing_report_snapshots.build_marketing_report) as build:
+        result = send_weekly_marketing_report(db_session)
+        assert result["status"] == "success" and result["records_processed"] >= 1
+
+        response = client.get("/api/report-data/", headers=REPORT_KEY)
+        assert response.status_code == 200
+        assert any(c["id"] == candidate.id for c in response.json()["candidates"])
+        assert build.call_count == 1
+
+        assert client.post("/api/report-data/regenerate").status_code == 401
+        response = client.post("/api/report-data/regenerate", headers=REPORT_KEY)
+        assert response.status_code == 200
+        assert build.call_count == 2
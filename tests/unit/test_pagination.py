@@ -0,0 +1,56 @@
+import uuid
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+
+from fapi.db.models import CandidateORM
+from fapi.utils import campaign_email_utils
+from fapi.utils.candidate_utils import get_all_candidates_paginated
+from fapi.utils.pagination_utils import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trips_typed_values():
+    token = encode_cursor("enrolled_date:desc", date(2024, 5, 1), 42)
+    assert decode_cursor(token, "enrolled_date:desc") == (date(2024, 5, 1), 42)
+    assert decode_cursor("", "enrolled_date:desc") is None
+
+
+@pytest.mark.parametrize("token", ["not-a-cursor", encode_cursor("full_name:asc", "a", 1)])
+def test_invalid_or_foreign_cursor_is_rejected(token):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(token, "enrolled_date:desc")
+    assert exc_info.value.status_code == 400
+
+
+def test_cursor_walk_matches_offset_order_with_ties_and_nulls(db_session, mock_redis):
+    tag = f"Keyset{uuid.uuid4().hex[:6]}"
+    dates = [date(2024, 1, 3), date(2024, 1, 2), date(2024, 1, 2), None, date(2024, 1, 1)]
+    for i, enrolled in enumerate(dates):
+        db_session.add(CandidateORM(
+            full_name=f"{tag} {i}", email=f"{tag.lower()}_{i}@test.com",
+            status="active", batchid=1, enrolled_date=enrolled,
+        ))
+    db_session.commit()
+
+    expected = get_all_candidates_paginated(
+        db_session, 1, 0, tag, "full_name", "enrolled_date:desc,id:desc"
+    )["data"]
+
+    seen, cursor = [], ""
+    while cursor is not None:
+        result = get_all_candidates_paginated(
+            db_session, 1, 2, tag, "full_name", "enrolled_date:desc", cursor, include_total=True
+        )
+        assert result["total"] == len(dates)
+        seen.extend(item["id"] for item in result["data"])
+        cursor = result["next_cursor"]
+
+    assert seen == [item["id"] for item in expected]
+
+
+@pytest.mark.parametrize("sort", ["created_at:desc,id:asc", "no_such_column:asc"])
+def test_cursor_mode_rejects_sorts_it_cannot_honour(db_session, sort):
+    with pytest.raises(HTTPException) as exc_info:
+        campaign_email_utils.get_paginated(db_session, 1, 10, None, "all", sort, cursor="")
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,101 @@
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from fapi.utils import code_execution_utils
+from fapi.utils.code_execution_utils import CodeExecutor
+from fapi.utils.python_worker_pool import PythonWorkerPool
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="warm workers need fork")
+
+
+@pytest.fixture
+def pool():
+    pool = PythonWorkerPool(size=1, max_runs=3, memory_mb=256)
+    pool.start(block=True)
+    yield pool
+    pool.shutdown()
+
+
+def _idle_worker(pool):
+    """Peek at the idle worker, waiting for a background respawn to finish."""
+    deadline = time.monotonic() + 10
+    while pool._idle.empty() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    worker = pool._idle.get_nowait()
+    pool._idle.put(worker)
+    return worker
+
+
+def test_runs_code_with_stdin_exit_code_and_traceback(pool):
+    assert pool.run("print(input() * 2)", "ab\n", 5) == {
+        "returncode": 0, "stdout": "abab\n", "stderr": "", "timed_out": False,
+    }
+    assert pool.run("import sys\nsys.exit(3)", "", 5)["returncode"] == 3
+
+    reply = pool.run("raise ValueError('boom')", "", 5)
+    assert reply["returncode"] == 1
+    assert reply["stderr"].startswith('Traceback (most recent call last):\n  File "')
+    assert ".py\", line 1" in reply["stderr"] and "raise ValueError('boom')" in reply["stderr"]
+    assert "python_sandbox_worker" not in reply["stderr"]
+
+
+def test_each_run_gets_a_fresh_process(pool):
+    pool.run("import builtins\nbuiltins.leaked = 1", "", 5)
+    reply = pool.run("import builtins\nprint(hasattr(builtins, 'leaked'))", "", 5)
+    assert reply["stdout"] == "False\n"
+
+
+def test_timeout_and_memory_limit(pool):
+    reply = pool.run("while True: pass", "", 1)
+    assert reply["timed_out"] is True
+
+    reply = pool.run("x = bytearray(1024 ** 3)", "", 5)
+    assert reply["returncode"] == 1
+    assert "MemoryError" in reply["stderr"]
+
+
+def test_worker_is_recycled_after_max_runs(pool):
+    first = _idle_worker(pool).process.pid
+    for _ in range(3):
+        pool.run("pass", "", 5)
+    assert _idle_worker(pool).process.pid != first
+
+
+def test_dead_worker_is_replaced_and_caller_falls_back(pool):
+    worker = _idle_worker(pool)
+    worker.process.kill()
+    worker.process.wait()
+
+    # No idle worker left: the caller runs the code cold
+    assert pool.run("print(1)", "", 5) is None
+    _idle_worker(pool)
+    assert pool.run("print(1)", "", 5)["stdout"] == "1\n"
+
+
+PARITY_PROGRAM = """
+import importlib.util, os, resource, sys
+print(__name__, sys.argv[0] == __file__, sys.path[0] == os.path.dirname(__file__))
+print(open(__file__).read().splitlines()[1])
+print(sys.path[1:])
+print(importlib.util.find_spec("python_worker_pool") is None)
+print(resource.getrlimit(resource.RLIMIT_CPU), resource.getrlimit(resource.RLIMIT_AS))
+print(input())
+"""
+
+
+def test_warm_and_cold_runs_see_the_same_environment(pool):
+    with patch.object(code_execution_utils, "python_worker_pool", pool):
+        warm = CodeExecutor._execute_python(PARITY_PROGRAM, "stdin line\n", 5)
+        with patch.object(pool, "run", return_value=None):
+            cold = CodeExecutor._execute_python(PARITY_PROGRAM, "stdin line\n", 5)
+
+    assert warm["status"] == "success", warm
+    assert warm == cold
+    lines = warm["output"].splitlines()
+    assert lines[0] == "__main__ True True"
+    assert lines[1] == "import importlib.util, os, resource, sys"
+    assert lines[3] == "True"  # the backend's own modules are not importable
+    assert lines[4] == f"(6, 6) ({256 * 1024 ** 2}, {256 * 1024 ** 2})"
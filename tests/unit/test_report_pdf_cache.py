@@ -0,0 +1,93 @@
+"""Marketing report PDF: rendered once per report data hash, served with ETag and Range support."""
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from fapi.utils import report_pdf_utils
+from fapi.utils.report_pdf_utils import ReportPdfCache, report_data_hash, report_pdf_cache
+
+PDF_URL = "/api/report-pdf?key=wbl_marketing_secret_2024"
+
+REPORT = {
+    "status": "success",
+    "summary": {"total_candidates": 1, "total_interviews": 2, "total_clicks": 3,
+                "start_date": "April 17", "end_date": "April 24, 2026"},
+    "candidates": [{"id": 1, "full_name": "Pdf Candidate", "email": "pdf@test.com", "outreach_count": 4,
+                    "linkedin_easy_apply_count": 0, "job_portal_automation_count": 1, "job_clicks": 3,
+                    "assessment_count": 0, "recruiter_call_count": 1, "technical_count": 1, "onsite_count": 0,
+                    "total_interviews": 2, "feedback_positive": 1, "feedback_negative": 0, "feedback_pending": 1}],
+}
+
+
+@pytest.fixture(autouse=True)
+def fresh_pdf_cache():
+    report_pdf_cache.clear()
+    yield
+    report_pdf_cache.clear()
+
+
+def test_same_data_is_rendered_once_even_when_requested_concurrently():
+    cache = ReportPdfCache(max_entries=4, ttl_seconds=60, workers=2)
+    release = threading.Event()
+    real_render = report_pdf_utils.render_report_pdf
+    calls = []
+
+    def slow_render(data, etag=None):
+        calls.append(1)
+        release.wait(5)
+        return real_render(data, etag=etag)
+
+    with patch.object(report_pdf_utils, "render_report_pdf", side_effect=slow_render):
+        first = cache.render_async(REPORT)
+        second = cache.render_async({**REPORT, "snapshot": {"data_version": "other"}})
+        assert second is first
+        release.set()
+        pdf = cache.get(REPORT, timeout=10)
+        assert cache.get(REPORT) is pdf
+
+        changed = {**REPORT, "summary": {**REPORT["summary"], "total_clicks": 4}}
+        assert cache.get(changed, timeout=10).etag != pdf.etag
+
+    assert len(calls) == 2
+    assert pdf.content.startswith(b"%PDF") and pdf.etag == report_data_hash(REPORT)
+
+
+def test_endpoint_serves_cached_bytes_with_etag_and_ranges(client):
+    with patch("fapi.api.routes.report_pdf.get_marketing_report", return_value=REPORT), \
+            patch.object(report_pdf_utils, "render_report_pdf", wraps=report_pdf_utils.render_report_pdf) as render:
+        full = client.get(PDF_URL)
+        assert full.status_code == 200
+        assert full.headers["accept-ranges"] == "bytes"
+        etag = full.headers["etag"]
+        size = len(full.content)
+
+        assert client.get(PDF_URL, headers={"If-None-Match": etag}).status_code == 304
+
+        part = client.get(PDF_URL, headers={"Range": "bytes=0-99"})
+        assert part.status_code == 206
+        assert part.content == full.content[:100]
+        assert part.headers["content-range"] == f"bytes 0-99/{size}"
+
+        tail = client.get(PDF_URL, headers={"Range": "bytes=-10", "If-Range": etag})
+        assert tail.status_code == 206 and tail.content == full.content[-10:]
+
+        stale = client.get(PDF_URL, headers={"Range": "bytes=0-99", "If-Range": '"outdated"'})
+        assert stale.status_code == 200 and stale.content == full.content
+
+        unsatisfiable = client.get(PDF_URL, headers={"Range": f"bytes={size}-"})
+        assert unsatisfiable.status_code == 416
+        assert unsatisfiable.headers["content-range"] == f"bytes */{size}"
+
+    assert render.call_count == 1
+
+
+def test_matching_etag_is_answered_without_rendering(client):
+    etag = report_data_hash(REPORT)
+    with patch("fapi.api.routes.report_pdf.get_marketing_report", return_value=REPORT), \
+            patch.object(report_pdf_utils, "render_report_pdf") as render:
+        response = client.get(PDF_URL, headers={"If-None-Match": f'"{etag}"'})
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == f'"{etag}"'
+    assert render.call_count == 0
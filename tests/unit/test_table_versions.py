@@ -0,0 +1,113 @@
+import uuid
+
+from sqlalchemy import insert, text
+from unittest.mock import patch
+
+from fapi.db.models import LeadORM, TableVersionORM
+from fapi.utils import table_fingerprint
+from fapi.utils.table_fingerprint import get_table_version, reconcile_table_versions
+
+
+def _add_lead(db_session):
+    lead = LeadORM(full_name="Version Test", email=f"v_{uuid.uuid4().hex[:8]}@test.com")
+    db_session.add(lead)
+    db_session.commit()
+    return lead
+
+
+def test_orm_writes_bump_version_and_row_count(db_session):
+    version, count = get_table_version(db_session, LeadORM)
+
+    lead = _add_lead(db_session)
+    assert get_table_version(db_session, LeadORM) == (version + 1, count + 1)
+
+    lead.full_name = "Renamed"
+    db_session.commit()
+    assert get_table_version(db_session, LeadORM) == (version + 2, count + 1)
+
+    db_session.delete(lead)
+    db_session.commit()
+    assert get_table_version(db_session, LeadORM) == (version + 3, count)
+
+
+def test_bulk_statements_bump_version_and_recount(db_session):
+    lead = _add_lead(db_session)
+    version, count = get_table_version(db_session, LeadORM)
+
+    db_session.query(LeadORM).filter(LeadORM.id == lead.id).delete()
+    db_session.commit()
+
+    assert get_table_version(db_session, LeadORM) == (version + 1, count - 1)
+
+
+def test_version_read_does_not_scan_with_checksum(db_session):
+    get_table_version(db_session, LeadORM)
+    with patch.object(table_fingerprint, "get_model_fingerprint") as fingerprint:
+        response = table_fingerprint.generate_version_for_model(db_session, LeadORM)
+    fingerprint.assert_not_called()
+    assert response.headers["X-Data-Version"]
+
+
+def test_reconcile_bumps_version_on_out_of_band_change(db_session):
+    version, _ = get_table_version(db_session, LeadORM)
+
+    with patch.object(table_fingerprint, "_polled_tables", {"lead"}):
+        with patch.object(table_fingerprint, "get_model_fingerprint", return_value="3|9|none|111"):
+            reconcile_table_versions(db_session)  # records the baseline
+        with patch.object(table_fingerprint, "get_model_fingerprint", return_value="3|9|none|222"):
+            assert reconcile_table_versions(db_session) >= 1
+
+    row = db_session.get(TableVersionORM, "lead")
+    db_session.refresh(row)
+    assert row.version == version + 1
+
+
+def test_core_and_text_writes_bump_version(db_session):
+    version, count = get_table_version(db_session, LeadORM)
+
+    db_session.execute(
+        insert(LeadORM.__table__).values(full_name="Core Lead", email=f"c_{uuid.uuid4().hex[:8]}@test.com")
+    )
+    db_session.commit()
+    assert get_table_version(db_session, LeadORM) == (version + 1, count + 1)
+
+    db_session.execute(text("INSERT INTO lead (full_name, email) VALUES (:n, :e)"),
+                       {"n": "Text Lead", "e": f"t_{uuid.uuid4().hex[:8]}@test.com"})
+    db_session.execute(text("DELETE FROM lead WHERE full_name = 'Core Lead'"))
+    db_session.commit()
+    assert get_table_version(db_session, LeadORM) == (version + 2, count + 1)
+
+
+def test_rolled_back_writes_do_not_bump(db_session):
+    version, _ = get_table_version(db_session, LeadORM)
+    _add_lead(db_session)
+    db_session.add(LeadORM(full_name="Discarded", email=f"d_{uuid.uuid4().hex[:8]}@test.com"))
+    db_session.flush()
+    db_session.rollback()
+    assert get_table_version(db_session, LeadORM) == (version + 1, db_session.query(LeadORM).count())
+
+
+def test_version_read_leaves_the_callers_transaction_alone(db_session):
+    db_session.query(TableVersionORM).filter(TableVersionORM.table_name == "lead").update({"row_count": None})
+    db_session.commit()
+    pending = LeadORM(full_name="Pending", email=f"p_{uuid.uuid4().hex[:8]}@test.com")
+    db_session.add(pending)
+    db_session.flush()
+    with patch.object(db_session, "commit") as commit, patch.object(db_session, "rollback") as rollback:
+        assert get_table_version(db_session, LeadORM) is not None
+    commit.assert_not_called()
+    rollback.assert_not_called()
+    assert pending in db_session
+    db_session.rollback()
+
+
+def test_tracked_write_does_not_trigger_a_reconcile_bump(db_session):
+    get_table_version(db_session, LeadORM)
+    with patch.object(table_fingerprint, "get_model_fingerprint", return_value="3|9|none|111"):
+        reconcile_table_versions(db_session)
+    _add_lead(db_session)
+    version, _ = get_table_version(db_session, LeadORM)
+
+    with patch.object(table_fingerprint, "get_model_fingerprint", return_value="4|10|none|333"):
+        reconcile_table_versions(db_session)
+    assert get_table_version(db_session, LeadORM)[0] == version